@@ -0,0 +1,61 @@
+"""add target lookup composite indexes
+
+Revision ID: 7a1e5c3b9d42
+Revises: 3f4b2c1d9a80
+Create Date: 2026-10-18 00:00:00.000000
+
+Indexes are built CONCURRENTLY so the migration does not hold a write lock on
+image or edit_event while it runs. CREATE INDEX CONCURRENTLY cannot run inside
+a transaction, hence the autocommit blocks.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a1e5c3b9d42"
+down_revision: Union[str, Sequence[str], None] = "3f4b2c1d9a80"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_image_target_discriminator_created",
+            "image",
+            ["target_id", "discriminator_key", sa.text("created_at DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_edit_event_target_created",
+            "edit_event",
+            ["target_type", "target_id", sa.text("created_at DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_edit_event_target_created",
+            table_name="edit_event",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_image_target_discriminator_created",
+            table_name="image",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
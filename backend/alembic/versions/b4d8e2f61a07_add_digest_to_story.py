@@ -0,0 +1,31 @@
+"""add digest to story
+
+Revision ID: b4d8e2f61a07
+Revises: 7bb886598fb1
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b4d8e2f61a07"
+down_revision: str | None = "7bb886598fb1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "story",
+        sa.Column("digest", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("story", "digest")
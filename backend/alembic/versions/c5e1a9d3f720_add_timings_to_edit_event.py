@@ -0,0 +1,51 @@
+"""add timings to edit_event
+
+Revision ID: c5e1a9d3f720
+Revises: b4d8e2f61a07
+Create Date: 2026-10-18 18:00:00.000000
+
+The (project_id, created_at) index serves the latency percentile query, which
+scans one user's projects over a time window. It is built CONCURRENTLY, hence
+the autocommit block.
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e1a9d3f720"
+down_revision: str | None = "b4d8e2f61a07"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "edit_event",
+        sa.Column("timings", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_edit_event_project_created",
+            "edit_event",
+            ["project_id", "created_at"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_edit_event_project_created",
+            table_name="edit_event",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("edit_event", "timings")
@@ -0,0 +1,63 @@
+"""add render job columns to edit_event
+
+Revision ID: d7f3b2c8e914
+Revises: c5e1a9d3f720
+Create Date: 2026-10-18 20:00:00.000000
+
+A PENDING edit event with job_queued_at set is a queued render job. The partial
+index keeps the worker's claim query cheap however large edit_event grows; it
+is built CONCURRENTLY, hence the autocommit block.
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7f3b2c8e914"
+down_revision: str | None = "c5e1a9d3f720"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "edit_event",
+        sa.Column("job_queued_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "edit_event",
+        sa.Column("job_claimed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "edit_event",
+        sa.Column("job_attempts", sa.Integer(), server_default="0", nullable=False),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_edit_event_job_queue",
+            "edit_event",
+            ["job_queued_at"],
+            unique=False,
+            postgresql_where=sa.text(
+                "status = 'pending' AND job_queued_at IS NOT NULL"
+            ),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_edit_event_job_queue",
+            table_name="edit_event",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("edit_event", "job_attempts")
+    op.drop_column("edit_event", "job_claimed_at")
+    op.drop_column("edit_event", "job_queued_at")
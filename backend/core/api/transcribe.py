@@ -3,7 +3,7 @@ import uuid
 from fastapi import APIRouter, File, UploadFile
 from loguru import logger
 
-from core.infrastructure.intelligence import async_openai_client
+from core.infrastructure.intelligence import async_openai_client, prompt_site
 
 router = APIRouter(prefix="/transcribe", tags=["transcribe"])
 
@@ -29,10 +29,11 @@ async def transcribe_whisper(file: UploadFile = File(...)) -> str:
         file_type=file.content_type,
     )
     file_tuple = (unique_file_name, audio_bytes, file.content_type)
-    transcript = await async_openai_client.audio.transcriptions.create(
-        model="whisper-1",
-        file=file_tuple,
-    )
+    with prompt_site("transcribe"):
+        transcript = await async_openai_client.audio.transcriptions.create(
+            model="whisper-1",
+            file=file_tuple,
+        )
     return transcript.text
 
 
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -19,6 +21,108 @@ class AppSettings(BaseSettings):
     """
 
     database_url: str
+    # Optional read replica. When set, read-only routes use it via
+    # get_async_read_session; unset means every session goes to the primary.
+    database_replica_url: str | None = None
+    # After a write, the client's reads stay on the primary for this long so it
+    # never reads a replica that has not caught up with its own write.
+    database_replica_pin_seconds: int = 5
+    # Connection pool, per engine and per process. Worst case a Cloud Run
+    # instance holds (pool_size + max_overflow) connections to each database.
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    # Seconds a checkout waits for a free connection before raising.
+    database_pool_timeout: float = 30.0
+    # Reconnect connections older than this (seconds); -1 disables recycling.
+    database_pool_recycle: int = 1800
+    # Test each connection with a cheap round trip at checkout, replacing
+    # connections the server or a proxy closed while they sat idle.
+    database_pool_pre_ping: bool = True
+    # Checkouts slower than this (seconds) are logged as warnings.
+    database_pool_checkout_warning_seconds: float = 0.5
+    # psycopg prepares a statement server-side once a connection has run it
+    # this many times; later executions skip parsing and planning. Set to -1
+    # behind a transaction-mode PgBouncer, which cannot keep prepared statements.
+    database_prepare_threshold: int = 2
+    # Postgres-backed cache of structured LLM responses (llm_cache.service).
+    # Off by default; entries expire after the TTL and the table is trimmed to
+    # max_entries, least recently hit first. Trimming sorts the table, so it
+    # runs on about one store in llm_cache_evict_every (1 = every store); the
+    # table can overshoot max_entries by roughly that many rows in between.
+    llm_cache_enabled: bool = False
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 10000
+    llm_cache_evict_every: int = 100
+    # Stories longer than this (characters) have their panels extracted
+    # map-reduce style: split into scene-bounded segments of about
+    # panel_segment_target_chars, extracted concurrently (at most
+    # panel_segment_concurrency LLM calls at once) and stitched back together.
+    # A story without scene breaks is one segment and stays a single call.
+    panel_segmentation_threshold_chars: int = 12000
+    panel_segment_target_chars: int = 6000
+    panel_segment_concurrency: int = 4
+    # POST .../panels/render renders at most this many panels of one batch at
+    # once; fal_async_client's process-wide slots still apply on top.
+    panel_render_concurrency: int = 6
+    # Renders requested with ?job=true are queued as PENDING edit events and
+    # run by render_job_workers workers per instance (0: this instance only
+    # enqueues; run scripts/run_render_workers.py elsewhere). Idle workers
+    # check for new jobs every render_job_poll_seconds. A claimed job whose
+    # worker has not finished it within render_job_lease_seconds is retried,
+    # at most render_job_max_attempts times in all.
+    render_job_workers: int = 4
+    render_job_poll_seconds: float = 2.0
+    render_job_lease_seconds: int = 600
+    render_job_max_attempts: int = 3
+    # GCS signed URLs (valid 60 minutes) are reused per object key until
+    # signed_url_cache_margin_seconds before they expire; at most
+    # signed_url_cache_size are kept per process (0 disables the cache).
+    signed_url_cache_size: int = 4096
+    signed_url_cache_margin_seconds: int = 900
+    # fal result images are downloaded over one pooled client per process:
+    # at most fal_download_max_connections connections, each attempt limited
+    # to fal_download_timeout_seconds, transient failures retried up to
+    # fal_download_max_attempts attempts, bodies over fal_download_max_bytes
+    # refused.
+    fal_download_max_connections: int = 20
+    fal_download_timeout_seconds: float = 30.0
+    fal_download_max_attempts: int = 3
+    fal_download_max_bytes: int = 32 * 1024 * 1024
+    # Story generation streams token deltas merged into one NDJSON line per
+    # story_stream_coalesce_chars characters or story_stream_coalesce_ms,
+    # whichever comes first. Either set to 0 sends one line per token.
+    story_stream_coalesce_chars: int = 256
+    story_stream_coalesce_ms: int = 40
+    # Story generation runs detached from the response that started it. The
+    # text so far is checkpointed to its edit event every
+    # story_stream_checkpoint_seconds; a finished run stays replayable from
+    # memory for story_stream_retention_seconds; a resume that sees no new
+    # checkpoint for story_stream_stale_seconds reports the stream interrupted.
+    story_stream_checkpoint_seconds: float = 2.0
+    story_stream_retention_seconds: int = 300
+    story_stream_stale_seconds: int = 30
+    # "edits": refinements ask the model for edit operations against the
+    # paragraph-numbered story and apply them locally, falling back to a full
+    # rewrite if they do not apply. "rewrite": always regenerate the story.
+    story_refine_mode: Literal["edits", "rewrite"] = "edits"
+    # Character refinement and single-panel prompts use a stored digest
+    # (summary, scene index, character mentions) instead of the full story
+    # once the story is at least this long. Shorter stories are sent whole.
+    story_digest_min_chars: int = 6000
+    # Budget for verbatim story paragraphs quoted alongside a digest.
+    story_digest_context_chars: int = 4000
+    # Every OpenAI request waits for a permit from the governor
+    # (intelligence/governor.py). Per model: at most openai_concurrency[model]
+    # requests in flight (openai_default_concurrency for unlisted models), and
+    # estimated tokens drawn from a bucket refilled at
+    # openai_tokens_per_minute[model] (unlisted models are not token-limited).
+    # Defaults match OpenAI usage tier 2; raise them with the account tier.
+    openai_concurrency: dict[str, int] = {"gpt-4o": 16, "gpt-4o-mini": 32}
+    openai_default_concurrency: int = 8
+    openai_tokens_per_minute: dict[str, int] = {
+        "gpt-4o": 450_000,
+        "gpt-4o-mini": 2_000_000,
+    }
     openai_api_key: str
     anthropic_api_key: str
     fal_api_key: str
@@ -42,6 +146,10 @@ class AppSettings(BaseSettings):
     # Cloud Run services authenticate via the attached service account (no key file).
     google_application_credentials: str = ""
 
+    # Shared secret for GET /metrics, sent by the scraper as
+    # "Authorization: Bearer <token>". Unset disables the endpoint (404).
+    metrics_bearer_token: str = ""
+
     # Deployment environment. Controls whether API docs are exposed.
     # Set to "production" via plain env var in Cloud Run (cloudrun.py).
     # Defaults to "development" locally — docs available at /docs.
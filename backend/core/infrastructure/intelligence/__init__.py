@@ -1,7 +1,10 @@
 from .openai import OpenAIModel, async_openai_client, instructor_client
+from .prompts import layered_messages, prompt_site
 
 __all__ = [
     "OpenAIModel",
     "async_openai_client",
     "instructor_client",
+    "layered_messages",
+    "prompt_site",
 ]
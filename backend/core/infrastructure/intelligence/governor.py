@@ -0,0 +1,306 @@
+"""
+Loop-bound concurrency and rate governor for all OpenAI traffic.
+
+fal calls are bounded by ConcurrentMediaGenerator's semaphore; OpenAI calls
+were not, so a burst of panel generations tripped 429s and the SDK's retries
+added seconds of latency for everyone. async_openai_client — and through it
+instructor_client and cached_completion — now sends every HTTP request through
+GovernedTransport, which first takes a permit from openai_governor for the
+request's model:
+
+  - concurrency: at most `limit` requests in flight. The limit starts at
+    OPENAI_CONCURRENCY[model] and adapts AIMD-style: a 429 halves it (at most
+    once per second, never below 1), every success adds 1/limit, up to the cap.
+  - tokens: the estimated cost (request bytes / 4 + max output tokens) is
+    drawn from a bucket holding one minute of OPENAI_TOKENS_PER_MINUTE,
+    refilled continuously. x-ratelimit-remaining-tokens on a response lowers
+    the bucket, so quota spent by other instances is accounted for.
+  - retry-after: a 429's retry-after(-ms) pauses the model's new requests
+    until it passes; the SDK's own retry then queues behind it.
+
+Each SDK retry attempt is a separate request and takes its own permit. A
+permit is held until the response body is read or closed, so a streamed
+completion occupies its slot for the whole stream.
+
+    openai_queue_wait_seconds   histogram  time waiting for a permit
+    openai_concurrency_limit    gauge      current adaptive limit
+    openai_in_flight            gauge      requests holding a permit
+    openai_rate_limited_total   counter    429 responses
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from typing import cast
+
+import httpx
+from openai import DefaultAsyncHttpxClient
+
+from core.config import settings
+from core.infrastructure.metrics import registry
+
+from .prompts import current_site
+
+# The SDK's defaults; a custom transport replaces the client's own pool.
+_CONNECTION_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+# Output budget assumed when a request sets no max_tokens.
+_DEFAULT_OUTPUT_TOKENS = 1024
+_DECREASE_INTERVAL_SECONDS = 1.0
+_OTHER = "other"
+
+QUEUE_WAIT = registry.histogram(
+    "openai_queue_wait_seconds",
+    "Time an OpenAI request waited for a governor permit.",
+    ("model", "site"),
+)
+CONCURRENCY_LIMIT = registry.gauge(
+    "openai_concurrency_limit",
+    "Current adaptive concurrency limit per model.",
+    ("model",),
+)
+IN_FLIGHT = registry.gauge(
+    "openai_in_flight", "OpenAI requests holding a permit.", ("model",)
+)
+RATE_LIMITED = registry.counter(
+    "openai_rate_limited_total", "OpenAI 429 responses.", ("model",)
+)
+
+
+def _retry_after_seconds(headers: Mapping[str, str]) -> float:
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return max(float(headers[name]) * scale, 0.0)
+        except (KeyError, ValueError):
+            continue
+    return 0.0
+
+
+class _ModelLane:
+    """Adaptive concurrency limit, token bucket and pause for one model."""
+
+    def __init__(
+        self,
+        model: str,
+        max_concurrency: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float],
+    ) -> None:
+        self.model = model
+        self.max_concurrency = max(max_concurrency, 1)
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.tokens_per_minute = tokens_per_minute
+        self.tokens = float(tokens_per_minute)
+        self.paused_until = 0.0
+        self._clock = clock
+        self._refilled_at = clock()
+        self._decreased_at = -math.inf
+        self._changed = asyncio.Event()
+        CONCURRENCY_LIMIT.set(self.limit, model=model)
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _refill(self, now: float) -> None:
+        if self.tokens_per_minute:
+            elapsed = now - self._refilled_at
+            self.tokens = min(
+                float(self.tokens_per_minute),
+                self.tokens + elapsed * self.tokens_per_minute / 60,
+            )
+        self._refilled_at = now
+
+    def _cost(self, tokens: int) -> float:
+        # A request bigger than the whole bucket waits for a full one.
+        return float(min(tokens, self.tokens_per_minute))
+
+    def _delay(self, tokens: int, now: float) -> float | None:
+        """Seconds until a request may start; None to wait for a release."""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= int(self.limit):
+            return None
+        if self.tokens_per_minute and self.tokens < self._cost(tokens):
+            return (self._cost(tokens) - self.tokens) * 60 / self.tokens_per_minute
+        return 0.0
+
+    async def acquire(self, tokens: int) -> None:
+        while True:
+            now = self._clock()
+            self._refill(now)
+            delay = self._delay(tokens, now)
+            if delay == 0.0:
+                break
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=delay)
+            except TimeoutError:
+                pass
+        self.in_flight += 1
+        if self.tokens_per_minute:
+            self.tokens -= self._cost(tokens)
+        IN_FLIGHT.set(self.in_flight, model=self.model)
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        IN_FLIGHT.set(self.in_flight, model=self.model)
+        self._notify()
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        now = self._clock()
+        if status_code == 429:
+            RATE_LIMITED.inc(model=self.model)
+            self.paused_until = max(
+                self.paused_until, now + _retry_after_seconds(headers)
+            )
+            if now - self._decreased_at >= _DECREASE_INTERVAL_SECONDS:
+                self.limit = max(self.limit / 2, 1.0)
+                self._decreased_at = now
+        elif status_code < 400:
+            self.limit = min(self.limit + 1 / self.limit, self.max_concurrency)
+        remaining = headers.get("x-ratelimit-remaining-tokens")
+        if self.tokens_per_minute and remaining is not None:
+            try:
+                self._refill(now)
+                self.tokens = min(self.tokens, float(remaining))
+            except ValueError:
+                pass
+        CONCURRENCY_LIMIT.set(self.limit, model=self.model)
+        self._notify()
+
+
+class Permit:
+    """One request's slot in a model lane; release() is idempotent."""
+
+    def __init__(self, lane: _ModelLane) -> None:
+        self._lane = lane
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._lane.release()
+
+
+class OpenAIGovernor:
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lanes: dict[str, _ModelLane] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _lane(self, model: str) -> _ModelLane:
+        """Return the lane for model, bound to the current running loop.
+
+        Same contract as ConcurrentMediaGenerator._get_loop_bound_state: one
+        set of lanes per process in production, fresh ones per test loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lanes = {}
+            self._loop = loop
+        lane = self._lanes.get(model)
+        if lane is None:
+            lane = _ModelLane(
+                model,
+                settings.openai_concurrency.get(
+                    model, settings.openai_default_concurrency
+                ),
+                settings.openai_tokens_per_minute.get(model, 0),
+                self._clock,
+            )
+            self._lanes[model] = lane
+        return lane
+
+    async def acquire(self, model: str, tokens: int) -> Permit:
+        lane = self._lane(model)
+        started = time.perf_counter()
+        await lane.acquire(tokens)
+        QUEUE_WAIT.observe(
+            time.perf_counter() - started, model=model, site=current_site()
+        )
+        return Permit(lane)
+
+    def observe(self, model: str, status_code: int, headers: Mapping[str, str]) -> None:
+        self._lane(model).observe(status_code, headers)
+
+
+def request_cost(request: httpx.Request) -> tuple[str, int]:
+    """(model, estimated tokens) of an OpenAI API request."""
+    try:
+        body = json.loads(request.content)
+    except Exception:
+        # Multipart uploads (audio) and unread streams.
+        return _OTHER, 0
+    if not isinstance(body, dict):
+        return _OTHER, 0
+    output = body.get("max_completion_tokens") or body.get("max_tokens")
+    prompt = len(request.content) // 4
+    return str(body.get("model") or _OTHER), prompt + int(
+        output or _DEFAULT_OUTPUT_TOKENS
+    )
+
+
+class _PermitReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, permit: Permit) -> None:
+        self._stream = stream
+        self._permit = permit
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+        self._permit.release()
+
+    async def aclose(self) -> None:
+        self._permit.release()
+        await self._stream.aclose()
+
+
+class GovernedTransport(httpx.AsyncBaseTransport):
+    """Wraps the SDK's transport; every request waits for a permit."""
+
+    def __init__(
+        self, governor: OpenAIGovernor, inner: httpx.AsyncBaseTransport
+    ) -> None:
+        self._governor = governor
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        model, tokens = request_cost(request)
+        permit = await self._governor.acquire(model, tokens)
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            permit.release()
+            raise
+        self._governor.observe(model, response.status_code, response.headers)
+        if response.is_stream_consumed:
+            # Built from bytes (mock transports); nothing left to wait for.
+            permit.release()
+        else:
+            response.stream = _PermitReleasingStream(
+                cast(httpx.AsyncByteStream, response.stream), permit
+            )
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+openai_governor = OpenAIGovernor()
+
+
+def default_transport() -> httpx.AsyncBaseTransport:
+    """A transport with the SDK's default connection pool."""
+    return httpx.AsyncHTTPTransport(limits=_CONNECTION_LIMITS)
+
+
+def governed_http_client(
+    inner: httpx.AsyncBaseTransport | None = None,
+) -> DefaultAsyncHttpxClient:
+    """The SDK's default HTTP client with every request governed."""
+    return DefaultAsyncHttpxClient(
+        transport=GovernedTransport(openai_governor, inner or default_transport())
+    )
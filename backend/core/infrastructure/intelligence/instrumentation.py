@@ -0,0 +1,221 @@
+"""
+Latency, token and queue metrics for every LLM and fal call, per call site.
+
+All series are labelled with the model and the enclosing prompt_site ("other"
+outside one) and rendered by GET /metrics:
+
+    openai_queue_wait_seconds          time waiting for a governor permit
+    llm_time_to_first_token_seconds    request sent -> first response bytes
+    llm_request_seconds                request sent -> response fully read
+    llm_requests_total{status}         responses by HTTP status, or "error"
+    llm_prompt_tokens_total            prompt tokens
+    llm_prompt_cached_tokens_total     prompt tokens served from prefix cache
+    llm_completion_tokens_total        completion tokens
+
+    fal_queue_wait_seconds             time waiting for the local semaphore
+    fal_queued_seconds                 submitted -> fal starts processing
+    fal_queue_position                 every position fal reports while queued
+    fal_request_seconds                submitted -> result
+    fal_download_seconds               fetching a result image, all attempts
+    fal_download_bytes                 size of each downloaded result image
+    fal_download_retries_total{reason} download attempts retried, by status
+                                       code or transport error
+
+Timings come from InstrumentedTransport, which sits under the governor in
+async_openai_client's HTTP stack, so raw SDK calls (streamed story generation,
+transcription) are timed as well as instructor ones; for a streamed completion
+time to first token is the first delta. Token usage comes from instructor's
+completion:response hook — raw SDK calls in this codebase report none
+(streams without include_usage, whisper). The model label of token series is
+the snapshot the provider answered with (e.g. gpt-4o-2024-08-06).
+"""
+
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any, cast
+
+import httpx
+from fal_client.client import Queued, Status
+
+from core.infrastructure.metrics import registry
+
+from .governor import request_cost
+from .prompts import current_site
+
+LLM_TTFT = registry.histogram(
+    "llm_time_to_first_token_seconds",
+    "Time from sending an LLM request to its first response bytes.",
+    ("model", "site"),
+)
+LLM_REQUEST_SECONDS = registry.histogram(
+    "llm_request_seconds",
+    "Time from sending an LLM request to reading its whole response.",
+    ("model", "site"),
+)
+LLM_REQUESTS = registry.counter(
+    "llm_requests_total",
+    "LLM responses by HTTP status ('error' when none arrived).",
+    ("model", "site", "status"),
+)
+PROMPT_TOKENS = registry.counter(
+    "llm_prompt_tokens_total",
+    "Prompt tokens sent to the LLM provider.",
+    ("model", "site"),
+)
+PROMPT_CACHED_TOKENS = registry.counter(
+    "llm_prompt_cached_tokens_total",
+    "Prompt tokens the provider served from its prefix cache.",
+    ("model", "site"),
+)
+COMPLETION_TOKENS = registry.counter(
+    "llm_completion_tokens_total",
+    "Completion tokens generated by the LLM provider.",
+    ("model", "site"),
+)
+
+FAL_QUEUE_WAIT = registry.histogram(
+    "fal_queue_wait_seconds",
+    "Time a fal call waited for a ConcurrentMediaGenerator slot.",
+    ("model", "site"),
+)
+FAL_QUEUED_SECONDS = registry.histogram(
+    "fal_queued_seconds",
+    "Time from submitting a fal request until fal started processing it.",
+    ("model", "site"),
+)
+FAL_QUEUE_POSITION = registry.histogram(
+    "fal_queue_position",
+    "Queue positions fal reported while a request was waiting.",
+    ("model",),
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250),
+)
+FAL_REQUEST_SECONDS = registry.histogram(
+    "fal_request_seconds",
+    "Time from submitting a fal request until its result arrived.",
+    ("model", "site"),
+)
+FAL_DOWNLOAD_SECONDS = registry.histogram(
+    "fal_download_seconds",
+    "Time to download a fal result image, retries included.",
+    ("site",),
+)
+FAL_DOWNLOAD_BYTES = registry.histogram(
+    "fal_download_bytes",
+    "Size of downloaded fal result images.",
+    ("site",),
+    buckets=(
+        64 * 1024,
+        256 * 1024,
+        512 * 1024,
+        1024**2,
+        2 * 1024**2,
+        4 * 1024**2,
+        8 * 1024**2,
+        16 * 1024**2,
+        32 * 1024**2,
+    ),
+)
+FAL_DOWNLOAD_RETRIES = registry.counter(
+    "fal_download_retries_total",
+    "fal result download attempts that failed and were retried.",
+    ("reason", "site"),
+)
+
+
+def record_usage(response: Any) -> None:
+    """instructor completion:response hook — count prompt/cached/output tokens."""
+    usage = getattr(response, "usage", None)
+    if usage is None or not isinstance(getattr(usage, "prompt_tokens", None), int):
+        return
+    labels = {"model": str(getattr(response, "model", None)), "site": current_site()}
+    PROMPT_TOKENS.inc(usage.prompt_tokens, **labels)
+    details = getattr(usage, "prompt_tokens_details", None)
+    PROMPT_CACHED_TOKENS.inc(getattr(details, "cached_tokens", None) or 0, **labels)
+    COMPLETION_TOKENS.inc(getattr(usage, "completion_tokens", None) or 0, **labels)
+
+
+class _TimedStream(httpx.AsyncByteStream):
+    def __init__(
+        self, stream: httpx.AsyncByteStream, started: float, labels: dict[str, str]
+    ) -> None:
+        self._stream = stream
+        self._started = started
+        self._labels = labels
+        self._first = True
+        self._finished = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            if self._first:
+                self._first = False
+                LLM_TTFT.observe(time.perf_counter() - self._started, **self._labels)
+            yield chunk
+        self._finish()
+
+    def _finish(self) -> None:
+        if not self._finished:
+            self._finished = True
+            LLM_REQUEST_SECONDS.observe(
+                time.perf_counter() - self._started, **self._labels
+            )
+
+    async def aclose(self) -> None:
+        self._finish()
+        await self._stream.aclose()
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Times every request to the provider, excluding time queued for it."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        model, _ = request_cost(request)
+        site = current_site()
+        labels = {"model": model, "site": site}
+        started = time.perf_counter()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            LLM_REQUESTS.inc(model=model, site=site, status="error")
+            raise
+        LLM_REQUESTS.inc(model=model, site=site, status=str(response.status_code))
+        if response.is_stream_consumed:
+            # Built from bytes (mock transports): the whole body is here.
+            elapsed = time.perf_counter() - started
+            LLM_TTFT.observe(elapsed, **labels)
+            LLM_REQUEST_SECONDS.observe(elapsed, **labels)
+        else:
+            response.stream = _TimedStream(
+                cast(httpx.AsyncByteStream, response.stream), started, labels
+            )
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class FalQueueObserver:
+    """Wraps a fal on_queue_update callback to record queue position and time."""
+
+    def __init__(
+        self, model: str, site: str, on_queue_update: Callable[[Status], None]
+    ) -> None:
+        self._model = model
+        self._site = site
+        self._on_queue_update = on_queue_update
+        self._submitted = time.perf_counter()
+        # Submitted -> processing; None while the request is still queued.
+        self.queued_seconds: float | None = None
+
+    def __call__(self, status: Status) -> None:
+        if isinstance(status, Queued):
+            FAL_QUEUE_POSITION.observe(status.position, model=self._model)
+        elif self.queued_seconds is None:
+            # First InProgress, or Completed for a request that never reported it.
+            self.queued_seconds = time.perf_counter() - self._submitted
+            FAL_QUEUED_SECONDS.observe(
+                self.queued_seconds, model=self._model, site=self._site
+            )
+        self._on_queue_update(status)
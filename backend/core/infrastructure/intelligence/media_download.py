@@ -0,0 +1,182 @@
+"""
+Downloads of fal's generated images over one pooled HTTP client per process.
+
+fal answers a render with a short-lived URL on its CDN, and every render path
+downloads that image before storing it in GCS. Each used to open its own
+httpx.AsyncClient, paying a TCP and TLS handshake per image. They now call
+fetch_generated_image, which shares one keep-alive pool:
+
+    image = await fetch_generated_image(fal_image_url, timings=timings)
+    image.content, image.media_type
+
+- at most FAL_DOWNLOAD_MAX_CONNECTIONS connections to fal's CDN;
+- FAL_DOWNLOAD_TIMEOUT_SECONDS per attempt (connecting: 5 s of it);
+- connection errors, timeouts, 408, 429 and 5xx are retried, up to
+  FAL_DOWNLOAD_MAX_ATTEMPTS attempts in all, after a full-jitter exponential
+  backoff; other 4xx fail at once;
+- a body over FAL_DOWNLOAD_MAX_BYTES is abandoned mid-stream with
+  GeneratedImageTooLargeError.
+
+Latency across all attempts, bytes and retries are reported as
+fal_download_seconds, fal_download_bytes and fal_download_retries_total (see
+instrumentation), and the latency as the "download" phase of timings.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+from loguru import logger
+
+from core.config import settings
+from core.infrastructure.phase_timings import PhaseTimings, TimingPhase
+
+from .instrumentation import (
+    FAL_DOWNLOAD_BYTES,
+    FAL_DOWNLOAD_RETRIES,
+    FAL_DOWNLOAD_SECONDS,
+)
+from .prompts import current_site
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+RETRY_BASE_SECONDS = 0.25
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+
+class GeneratedImageTooLargeError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class GeneratedImage:
+    content: bytes
+    # Content-Type without parameters, e.g. "image/png"; "" when absent.
+    media_type: str
+
+
+def _retry_reason(error: httpx.HTTPError) -> str | None:
+    """Why error is worth another attempt, as a metric label; None if not."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return str(status) if status in RETRY_STATUSES else None
+    if isinstance(error, httpx.TransportError):
+        return type(error).__name__
+    return None
+
+
+class GeneratedImageDownloader:
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """transport and sleep replace the network and the backoff in tests."""
+        self._transport = transport
+        self._sleep = sleep
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_loop_bound_client(self) -> httpx.AsyncClient:
+        """Return the pooled client bound to the current running loop.
+
+        Same contract as ConcurrentMediaGenerator._get_loop_bound_state: one
+        client for the life of the process in production, a fresh one per
+        test loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=settings.fal_download_max_connections,
+                    max_keepalive_connections=settings.fal_download_max_connections,
+                ),
+                timeout=httpx.Timeout(
+                    settings.fal_download_timeout_seconds,
+                    connect=CONNECT_TIMEOUT_SECONDS,
+                ),
+                follow_redirects=True,
+            )
+            self._loop = loop
+        assert self._client is not None
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pool, e.g. at shutdown; the next fetch opens a new one."""
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+    async def fetch(
+        self, url: str, timings: PhaseTimings | None = None
+    ) -> GeneratedImage:
+        client = self._get_loop_bound_client()
+        site = current_site()
+        started = time.perf_counter()
+        attempt = 1
+        try:
+            while True:
+                try:
+                    image = await self._download(client, url)
+                    break
+                except httpx.HTTPError as e:
+                    reason = _retry_reason(e)
+                    if reason is None or attempt >= settings.fal_download_max_attempts:
+                        raise
+                    FAL_DOWNLOAD_RETRIES.inc(reason=reason, site=site)
+                    delay = random.uniform(0, RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+                    logger.warning(
+                        f"fal download attempt {attempt} failed ({reason}); "
+                        f"retrying in {delay:.2f}s"
+                    )
+                    await self._sleep(delay)
+                    attempt += 1
+        finally:
+            elapsed = time.perf_counter() - started
+            FAL_DOWNLOAD_SECONDS.observe(elapsed, site=site)
+            if timings is not None:
+                timings.add(TimingPhase.DOWNLOAD, elapsed)
+        FAL_DOWNLOAD_BYTES.observe(len(image.content), site=site)
+        return image
+
+    async def _download(self, client: httpx.AsyncClient, url: str) -> GeneratedImage:
+        max_bytes = settings.fal_download_max_bytes
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            declared = response.headers.get("content-length")
+            if (
+                declared is not None
+                and declared.isdigit()
+                and int(declared) > max_bytes
+            ):
+                raise GeneratedImageTooLargeError(
+                    f"Generated image at {url} is {declared} bytes (max {max_bytes})"
+                )
+            chunks: list[bytes] = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise GeneratedImageTooLargeError(
+                        f"Generated image at {url} exceeds {max_bytes} bytes"
+                    )
+                chunks.append(chunk)
+            media_type = response.headers.get("content-type", "")
+            return GeneratedImage(
+                content=b"".join(chunks),
+                media_type=media_type.split(";")[0].strip(),
+            )
+
+
+generated_image_downloader = GeneratedImageDownloader()
+
+
+async def fetch_generated_image(
+    url: str, timings: PhaseTimings | None = None
+) -> GeneratedImage:
+    """Download a fal output image; adds its latency to timings if given."""
+    return await generated_image_downloader.fetch(url, timings)
@@ -1,10 +1,19 @@
 import asyncio
+import time
 from typing import Callable, NamedTuple
 
 import fal_client
 from fal_client.client import AnyJSON, Status
 
 from core.config import settings
+from core.infrastructure.phase_timings import PhaseTimings, TimingPhase
+
+from .instrumentation import (
+    FAL_QUEUE_WAIT,
+    FAL_REQUEST_SECONDS,
+    FalQueueObserver,
+)
+from .prompts import current_site
 
 MAX_CONCURRENT_REQUESTS = 10
 
@@ -63,13 +72,36 @@ class ConcurrentMediaGenerator:
         arguments: dict,
         on_queue_update: Callable[[Status], None],
         model: ImageGenerationModel = DEFAULT_IMAGE_GENERATION_MODEL,
+        timings: PhaseTimings | None = None,
     ) -> AnyJSON:
+        """Run one fal request; adds fal_queue / fal_run to timings if given.
+
+        fal_queue is the wait for a local slot plus fal's own queue; fal_run
+        is the rest, until the result arrived.
+        """
         model_name, arguments = self._get_model_and_arguments(arguments, model)
         semaphore, client = self._get_loop_bound_state()
+        site = current_site()
+        waited_from = time.perf_counter()
         async with semaphore:
-            return await client.subscribe(
-                model_name, arguments=arguments, on_queue_update=on_queue_update
-            )
+            submitted = time.perf_counter()
+            FAL_QUEUE_WAIT.observe(submitted - waited_from, model=model_name, site=site)
+            observer = FalQueueObserver(model_name, site, on_queue_update)
+            try:
+                return await client.subscribe(
+                    model_name, arguments=arguments, on_queue_update=observer
+                )
+            finally:
+                elapsed = time.perf_counter() - submitted
+                FAL_REQUEST_SECONDS.observe(elapsed, model=model_name, site=site)
+                if timings is not None:
+                    queued = (
+                        elapsed
+                        if observer.queued_seconds is None
+                        else observer.queued_seconds
+                    )
+                    timings.add(TimingPhase.FAL_QUEUE, submitted - waited_from + queued)
+                    timings.add(TimingPhase.FAL_RUN, elapsed - queued)
 
     def _get_model_and_arguments(
         self, arguments: dict, model: ImageGenerationModel
@@ -5,6 +5,9 @@ from openai import AsyncOpenAI
 
 from core.config import settings
 
+from .governor import default_transport, governed_http_client
+from .instrumentation import InstrumentedTransport, record_usage
+
 
 class OpenAIModel(Enum):
     GPT_4O = "gpt-4o"
@@ -12,5 +15,10 @@ class OpenAIModel(Enum):
     GPT_5 = "gpt-5"
 
 
-async_openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+async_openai_client = AsyncOpenAI(
+    api_key=settings.openai_api_key,
+    # Governor outermost, so provider latency excludes time queued for a permit.
+    http_client=governed_http_client(InstrumentedTransport(default_transport())),
+)
 instructor_client = instructor.from_openai(async_openai_client)
+instructor_client.on("completion:response", record_usage)
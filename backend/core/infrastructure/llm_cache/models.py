@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.common import ORMBase, get_current_datetime_utc
+
+
+class LLMResponseCacheEntry(ORMBase):
+    """One cached structured LLM response, addressed by a hash of its request.
+
+    `key` is sha256(model, response_model JSON schema, messages, call kwargs),
+    so any change to the prompt or the output schema misses. `response` is the
+    validated response_model instance dumped to JSON.
+    """
+
+    __tablename__ = "llm_response_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    response: Mapped[Any] = mapped_column(JSONB, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=get_current_datetime_utc, nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    # Bumped on every hit; eviction drops the least recently used rows first.
+    last_hit_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=get_current_datetime_utc,
+        nullable=False,
+        index=True,
+    )
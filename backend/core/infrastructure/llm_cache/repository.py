@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import LLMResponseCacheEntry
+
+
+class LLMResponseCacheRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_fresh_response(self, key: str, now: datetime) -> Any | None:
+        """Return the unexpired response for key and mark it used, in one statement."""
+        result = await self.db.execute(
+            update(LLMResponseCacheEntry)
+            .where(
+                LLMResponseCacheEntry.key == key,
+                LLMResponseCacheEntry.expires_at > now,
+            )
+            .values(
+                last_hit_at=now,
+                hit_count=LLMResponseCacheEntry.hit_count + 1,
+            )
+            .returning(LLMResponseCacheEntry.response)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none()
+
+    async def put_response(
+        self, key: str, model: str, response: Any, now: datetime, ttl: timedelta
+    ) -> None:
+        """Insert or replace the entry for key.
+
+        Two instances can miss on the same key concurrently; the later write
+        wins, which is harmless because both hold a valid response.
+        """
+        statement = insert(LLMResponseCacheEntry).values(
+            key=key,
+            model=model,
+            response=response,
+            hit_count=0,
+            created_at=now,
+            expires_at=now + ttl,
+            last_hit_at=now,
+        )
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[LLMResponseCacheEntry.key],
+                set_={
+                    "response": statement.excluded.response,
+                    "created_at": statement.excluded.created_at,
+                    "expires_at": statement.excluded.expires_at,
+                    "last_hit_at": statement.excluded.last_hit_at,
+                },
+            )
+        )
+
+    async def evict(self, now: datetime, max_entries: int) -> int:
+        """Delete expired entries and everything past the max_entries most recent."""
+        overflow = (
+            select(LLMResponseCacheEntry.key)
+            .order_by(LLMResponseCacheEntry.last_hit_at.desc())
+            .offset(max_entries)
+        )
+        result = await self.db.execute(
+            delete(LLMResponseCacheEntry)
+            .where(
+                or_(
+                    LLMResponseCacheEntry.expires_at <= now,
+                    LLMResponseCacheEntry.key.in_(overflow),
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return int(result.rowcount or 0)  # type: ignore[attr-defined]
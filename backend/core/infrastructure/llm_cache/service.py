@@ -0,0 +1,140 @@
+"""
+Content-addressed cache in front of instructor_client for repeatable LLM calls.
+
+Extraction calls (characters, panels, story identity) are often retried on
+identical input — a refresh, a network blip — and each retry pays full model
+latency and cost. cached_completion() has the same shape as
+instructor_client.chat.completions.create and returns the stored response when
+the exact same request was answered within LLM_CACHE_TTL_SECONDS:
+
+    characters = await cached_completion(
+        model="gpt-4o",
+        response_model=list[CharacterAttributes],
+        messages=[...],
+    )
+
+The key is sha256(model, response_model JSON schema, messages, other kwargs),
+so editing a prompt or a schema starts a fresh entry. Entries live in Postgres
+(llm_response_cache) so every Cloud Run instance shares them; the table is
+capped at LLM_CACHE_MAX_ENTRIES, least recently hit first. The cap is enforced
+on a random sample of stores (about one in LLM_CACHE_EVICT_EVERY), not on every
+miss, because trimming sorts the whole table.
+
+The cache is off unless LLM_CACHE_ENABLED is set. User-directed calls (refines)
+pass bypass_cache=True: the same instruction repeated should still produce a
+fresh answer. Cache failures are logged and never fail the call.
+"""
+
+import hashlib
+import json
+import random
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from loguru import logger
+from openai.types.chat import ChatCompletionMessageParam
+from pydantic import TypeAdapter
+
+from core.common import get_current_datetime_utc
+from core.config import settings
+from core.infrastructure.database import get_async_session_maker
+from core.infrastructure.intelligence import instructor_client
+from core.infrastructure.metrics import registry
+
+from .repository import LLMResponseCacheRepository
+
+T = TypeVar("T")
+
+CACHE_REQUESTS = registry.counter(
+    "llm_cache_requests_total",
+    "LLM response cache lookups by result (hit, miss, bypass, error).",
+    ("result",),
+)
+
+
+@lru_cache(maxsize=256)
+def _schema_fingerprint(response_model: Any) -> str:
+    schema = TypeAdapter(response_model).json_schema()
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+
+def cache_key(
+    model: str,
+    response_model: Any,
+    messages: list[ChatCompletionMessageParam],
+    kwargs: dict[str, Any],
+) -> str:
+    payload = {
+        "model": model,
+        "schema": _schema_fingerprint(response_model),
+        "messages": messages,
+        # Retry policy does not change the answer.
+        "kwargs": {k: v for k, v in kwargs.items() if k != "max_retries"},
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+async def _lookup(key: str) -> Any | None:
+    async with get_async_session_maker()() as db:
+        response = await LLMResponseCacheRepository(db).get_fresh_response(
+            key, get_current_datetime_utc()
+        )
+        await db.commit()
+        return response
+
+
+async def _store(key: str, model: str, response: Any) -> None:
+    now = get_current_datetime_utc()
+    async with get_async_session_maker()() as db:
+        repository = LLMResponseCacheRepository(db)
+        await repository.put_response(
+            key, model, response, now, timedelta(seconds=settings.llm_cache_ttl_seconds)
+        )
+        if random.randrange(max(settings.llm_cache_evict_every, 1)) == 0:
+            await repository.evict(now, settings.llm_cache_max_entries)
+        await db.commit()
+
+
+async def cached_completion(
+    *,
+    model: str,
+    response_model: type[T],
+    messages: list[ChatCompletionMessageParam],
+    bypass_cache: bool = False,
+    **kwargs: Any,
+) -> T:
+    """instructor_client.chat.completions.create, answered from cache when possible."""
+    if not settings.llm_cache_enabled or bypass_cache:
+        if settings.llm_cache_enabled:
+            CACHE_REQUESTS.inc(result="bypass")
+        return await instructor_client.chat.completions.create(
+            model=model, response_model=response_model, messages=messages, **kwargs
+        )
+
+    adapter = TypeAdapter(response_model)
+    key: str | None = None
+    try:
+        key = cache_key(model, response_model, messages, kwargs)
+        cached = await _lookup(key)
+        if cached is not None:
+            CACHE_REQUESTS.inc(result="hit")
+            return adapter.validate_python(cached)
+        CACHE_REQUESTS.inc(result="miss")
+    except Exception as exc:
+        # A stale schema or an unreachable database degrades to a plain call.
+        CACHE_REQUESTS.inc(result="error")
+        logger.warning("LLM cache lookup failed", error=str(exc))
+
+    response = await instructor_client.chat.completions.create(
+        model=model, response_model=response_model, messages=messages, **kwargs
+    )
+
+    if key is not None:
+        try:
+            await _store(key, model, adapter.dump_python(response, mode="json"))
+        except Exception as exc:
+            CACHE_REQUESTS.inc(result="error")
+            logger.warning("LLM cache store failed", error=str(exc))
+    return response
@@ -0,0 +1,61 @@
+"""
+Where one operation's time went, phase by phase, for EditEvent.timings.
+
+A service starts a PhaseTimings when an operation begins, times its phases and
+stores as_dict() with the event's final status:
+
+    timings = PhaseTimings()
+    with timings.phase(TimingPhase.DB):
+        ...  # TX1
+    fal_response = await fal_async_client.subscribe(..., timings=timings)
+    ...
+    await repository.edit_event.set_edit_event_status(
+        edit_event_id, EditEventStatus.SUCCEEDED, timings=timings.as_dict()
+    )
+
+Phases accumulate in milliseconds; a phase entered several times (or by
+concurrent calls) is summed, so phases can add up to more than "total", the
+wall time since the PhaseTimings was created. The final status write is the
+one DB round trip "db" cannot include.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import StrEnum
+
+
+class TimingPhase(StrEnum):
+    LLM = "llm"
+    FAL_QUEUE = "fal_queue"
+    FAL_RUN = "fal_run"
+    DOWNLOAD = "download"
+    UPLOAD = "upload"
+    DB = "db"
+    TOTAL = "total"
+
+
+class PhaseTimings:
+    def __init__(self, started: float | None = None) -> None:
+        """started: a time.perf_counter() value, if the operation began earlier."""
+        self._started = time.perf_counter() if started is None else started
+        self._ms: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: TimingPhase) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: TimingPhase, seconds: float) -> None:
+        self._ms[name] = self._ms.get(name, 0.0) + seconds * 1000
+
+    def as_dict(self) -> dict[str, float]:
+        """Milliseconds per phase, plus "total"."""
+        timings = {name: round(ms, 1) for name, ms in self._ms.items()}
+        timings[TimingPhase.TOTAL] = round(
+            (time.perf_counter() - self._started) * 1000, 1
+        )
+        return timings
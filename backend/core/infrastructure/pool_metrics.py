@@ -0,0 +1,171 @@
+"""
+Connection-pool metrics for the async SQLAlchemy engines.
+
+Every engine built by core.infrastructure.database uses
+InstrumentedAsyncAdaptedQueuePool and is passed through instrument_engine(),
+which reports under a `pool` label ("primary", "replica"):
+
+    db_pool_checkout_wait_seconds     histogram  time to obtain a usable
+                                                 connection: queue wait, new
+                                                 connection, pre-ping
+    db_pool_connection_age_seconds    histogram  age of the connection handed
+                                                 out at checkout
+    db_pool_checked_out               gauge      connections currently in use
+    db_pool_overflow                  gauge      connections open beyond
+                                                 pool_size (negative while the
+                                                 pool is still filling)
+    db_pool_size                      gauge      configured pool_size
+    db_pool_checkout_timeouts_total   counter    checkouts that hit pool_timeout
+    db_pool_connections_opened_total  counter
+    db_pool_connections_closed_total  counter
+    db_pool_invalidations_total       counter
+
+A checkout slower than DATABASE_POOL_CHECKOUT_WARNING_SECONDS logs a warning
+with the pool's state at that moment, so saturation shows up in the logs even
+without a scraper.
+"""
+
+import time
+from typing import Any, cast
+
+from loguru import logger
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+from sqlalchemy.pool.base import ConnectionPoolEntry
+
+from core.config import settings
+
+from .metrics import registry
+
+_CONNECTED_AT = "metrics_connected_at"
+
+CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to obtain a usable connection from the pool.",
+    ("pool",),
+    buckets=(
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+        30.0,
+    ),
+)
+CONNECTION_AGE = registry.histogram(
+    "db_pool_connection_age_seconds",
+    "Age of connections at checkout.",
+    ("pool",),
+    buckets=(1.0, 10.0, 60.0, 300.0, 600.0, 1800.0, 3600.0, 7200.0),
+)
+CHECKED_OUT = registry.gauge(
+    "db_pool_checked_out", "Connections currently checked out.", ("pool",)
+)
+OVERFLOW = registry.gauge(
+    "db_pool_overflow", "Connections open beyond pool_size.", ("pool",)
+)
+POOL_SIZE = registry.gauge("db_pool_size", "Configured pool_size.", ("pool",))
+CHECKOUT_TIMEOUTS = registry.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout.",
+    ("pool",),
+)
+CONNECTIONS_OPENED = registry.counter(
+    "db_pool_connections_opened_total", "DBAPI connections opened.", ("pool",)
+)
+CONNECTIONS_CLOSED = registry.counter(
+    "db_pool_connections_closed_total", "DBAPI connections closed.", ("pool",)
+)
+INVALIDATIONS = registry.counter(
+    "db_pool_invalidations_total", "Connections invalidated.", ("pool",)
+)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times checkouts.
+
+    SQLAlchemy's pool events fire once a connection has been obtained, so the
+    time spent waiting for one can only be measured around connect().
+    """
+
+    metrics_name = "default"
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            CHECKOUT_TIMEOUTS.inc(pool=self.metrics_name)
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            CHECKOUT_WAIT.observe(waited, pool=self.metrics_name)
+            if waited >= settings.database_pool_checkout_warning_seconds:
+                logger.warning(
+                    "Slow database pool checkout",
+                    pool=self.metrics_name,
+                    wait_seconds=round(waited, 3),
+                    checked_out=self.checkedout(),
+                    overflow=self.overflow(),
+                    pool_size=self.size(),
+                )
+
+    def recreate(self) -> "InstrumentedAsyncAdaptedQueuePool":
+        # engine.dispose() swaps in a recreated pool; keep reporting as the same pool.
+        pool = super().recreate()
+        assert isinstance(pool, InstrumentedAsyncAdaptedQueuePool)
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Report engine's pool under pool=name. Call once, right after creation."""
+    sync_engine = engine.sync_engine
+    pool = sync_engine.pool
+    if not isinstance(pool, InstrumentedAsyncAdaptedQueuePool):
+        raise TypeError(
+            f"instrument_engine needs InstrumentedAsyncAdaptedQueuePool, "
+            f"got {type(pool).__name__}"
+        )
+    pool.metrics_name = name
+
+    def current_pool() -> QueuePool:
+        # Looked up at scrape time — dispose() replaces the engine's pool.
+        return cast(QueuePool, sync_engine.pool)
+
+    CHECKED_OUT.set_function(lambda: current_pool().checkedout(), pool=name)
+    OVERFLOW.set_function(lambda: current_pool().overflow(), pool=name)
+    POOL_SIZE.set_function(lambda: current_pool().size(), pool=name)
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(_dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        record.info[_CONNECTED_AT] = time.monotonic()
+        CONNECTIONS_OPENED.inc(pool=name)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(
+        _dbapi_connection: Any, record: ConnectionPoolEntry, _proxy: Any
+    ) -> None:
+        connected_at = record.info.get(_CONNECTED_AT)
+        if connected_at is not None:
+            CONNECTION_AGE.observe(time.monotonic() - connected_at, pool=name)
+
+    @event.listens_for(sync_engine, "close")
+    def _on_close(_dbapi_connection: Any, _record: ConnectionPoolEntry) -> None:
+        CONNECTIONS_CLOSED.inc(pool=name)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(
+        _dbapi_connection: Any, _record: ConnectionPoolEntry, _exception: Any
+    ) -> None:
+        INVALIDATIONS.inc(pool=name)
@@ -7,7 +7,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth.api import get_current_user_id
 from core.config import settings
-from core.infrastructure.database import get_async_db_session
+from core.infrastructure.database import (
+    get_async_db_session,
+    get_async_read_session,
+)
 
 from .exceptions import BillingErrorCode
 from .schemas import (
@@ -39,7 +42,7 @@ def get_payments_service(
 
 
 def get_billing_status_service(
-    db: Annotated[AsyncSession, Depends(get_async_db_session)],
+    db: Annotated[AsyncSession, Depends(get_async_read_session)],
 ) -> BillingStatusService:
     return BillingStatusService(db)
 
@@ -1,19 +1,34 @@
+import asyncio
 import uuid
 from collections.abc import Sequence
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 from loguru import logger
 
 from core.auth.api import get_current_user_id
 
+from ..events import as_ndjson, frame_item_stream
 from ..exceptions import (
     CharacterExtractionError,
     CharacterRefinementError,
+    InvalidCursorError,
     NoStoryTextError,
     NotFoundError,
     UploadImageError,
 )
+from ..models.edit_event import EditEventOperationType
+from ..pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, legacy_page_limit
 from ..schemas.character import (
     CharacterRefineRequest,
     CharacterRenderEditRequest,
@@ -23,9 +38,16 @@ from ..schemas.character import (
     SetCanonicalRenderRequest,
 )
 from ..schemas.edit_event import EditEventResponseSchema
-from ..schemas.image import ImageResponseSchema
-from ..service import CharacterService, ImageService
-from .dependencies import get_character_service, get_image_service
+from ..schemas.image import ImageInclude, ImageResponseSchema
+from ..service import CharacterService, ImageService, RenderJobService
+from .dependencies import (
+    get_character_read_service,
+    get_character_service,
+    get_image_read_service,
+    get_render_job_service,
+)
+from .images import embed_signed_urls
+from .render_jobs import RENDER_JOB_ACCEPTED, render_job_accepted
 
 router = APIRouter(tags=["characters", "v2"])
 
@@ -70,21 +92,57 @@ async def extract_characters_from_story(
         )
 
 
+@router.post("/project/{project_id}/story/{story_id}/characters/stream")
+async def stream_extract_characters_from_story(
+    project_id: uuid.UUID,
+    story_id: uuid.UUID,
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    service: Annotated[CharacterService, Depends(get_character_service)],
+) -> StreamingResponse:
+    """Streaming variant of extract_characters_from_story, as NDJSON EventEnvelopes.
+
+    Each STREAM_CHUNK payload is one CharacterRenderReferencesSchema, sent as
+    soon as the LLM has finished that character and it is persisted.
+    """
+    try:
+        characters = await service.stream_extract_characters_from_story(
+            project_id, story_id
+        )
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NoStoryTextError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        content=as_ndjson(
+            frame_item_stream(
+                characters, lambda c: _build_character_full(c, None).model_dump()
+            )
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.get("/project/{project_id}/story/{story_id}/characters", status_code=200)
 async def get_characters_for_story(
     project_id: uuid.UUID,
     story_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[CharacterService, Depends(get_character_service)],
+    service: Annotated[CharacterService, Depends(get_character_read_service)],
 ) -> list[CharacterRenderReferencesSchema]:
     try:
         characters = await service.get_story_characters(project_id, story_id)
-        result = []
-        for character in characters:
-            render = await service.get_canonical_character_render(character.id)
-            refs = await service.get_character_reference_images(character.id)
-            result.append(_build_character_full(character, render, refs))
-        return result
+        # Gathered so the repository loaders batch each lookup across all
+        # characters — the query count does not grow with the character count.
+        renders = await asyncio.gather(
+            *(service.get_canonical_character_render(c.id) for c in characters)
+        )
+        refs = await asyncio.gather(
+            *(service.get_character_reference_images(c.id) for c in characters)
+        )
+        return [
+            _build_character_full(character, render, character_refs)
+            for character, render, character_refs in zip(characters, renders, refs)
+        ]
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -102,7 +160,7 @@ async def get_character(
     project_id: uuid.UUID,
     story_id: uuid.UUID,
     character_id: uuid.UUID,
-    service: Annotated[CharacterService, Depends(get_character_service)],
+    service: Annotated[CharacterService, Depends(get_character_read_service)],
 ) -> CharacterRenderReferencesSchema:
     try:
         character = await service.get_character(project_id, story_id, character_id)
@@ -204,22 +262,51 @@ async def get_character_history(
     story_id: uuid.UUID,
     character_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[CharacterService, Depends(get_character_service)],
-    limit: int = 20,
+    service: Annotated[CharacterService, Depends(get_character_read_service)],
+    response: Response,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 20,
+    cursor: str | None = None,
 ) -> list[EditEventResponseSchema]:
-    events = await service.get_character_history(character_id, limit=limit)
-    return [EditEventResponseSchema.model_validate(e) for e in events]
+    """Return one page of character edit events, newest first (X-Next-Cursor)."""
+    try:
+        page = await service.get_character_history(
+            character_id, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return [EditEventResponseSchema.model_validate(e) for e in page.items]
 
 
-@router.post("/project/{project_id}/story/{story_id}/character/{character_id}/render")
+@router.post(
+    "/project/{project_id}/story/{story_id}/character/{character_id}/render",
+    response_model=CharacterRenderReferencesSchema,
+    responses=RENDER_JOB_ACCEPTED,
+)
 async def render_character(
     project_id: uuid.UUID,
     story_id: uuid.UUID,
     character_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     service: Annotated[CharacterService, Depends(get_character_service)],
-) -> CharacterRenderReferencesSchema:
+    jobs: Annotated[RenderJobService, Depends(get_render_job_service)],
+    job: bool = False,
+) -> CharacterRenderReferencesSchema | JSONResponse:
+    """Render a character image via fal and store in GCS.
+
+    With ?job=true the render is queued instead: 202 with a RenderJobSchema.
+    """
     try:
+        if job:
+            return render_job_accepted(
+                await jobs.enqueue_render(
+                    project_id,
+                    story_id,
+                    character_id,
+                    EditEventOperationType.RENDER_CHARACTER,
+                )
+            )
         character, image = await service.render_character(
             user_id=user_id,
             project_id=project_id,
@@ -281,15 +368,35 @@ async def get_character_renders(
     story_id: uuid.UUID,
     character_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[CharacterService, Depends(get_character_service)],
+    service: Annotated[CharacterService, Depends(get_character_read_service)],
+    images: Annotated[ImageService, Depends(get_image_read_service)],
+    response: Response,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: str | None = None,
+    include: Annotated[list[ImageInclude] | None, Query()] = None,
 ) -> list[ImageResponseSchema]:
-    """Return all render variations for a character, ordered newest first.
+    """Return render variations for a character, newest first.
 
     Returns an empty list (not 404) when the character exists but has no renders.
+    Unpaginated unless limit or cursor is given; then one page, with more
+    signalled by the X-Next-Cursor header. ?include=signed_url embeds a signed
+    URL in each render.
     """
     try:
-        images = await service.get_character_renders(project_id, story_id, character_id)
-        return [ImageResponseSchema.model_validate(img) for img in images]
+        page = await service.get_character_renders(
+            project_id,
+            story_id,
+            character_id,
+            limit=legacy_page_limit(limit, cursor),
+            cursor=cursor,
+        )
+        if page.next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        renders = [ImageResponseSchema.model_validate(img) for img in page.items]
+        await embed_signed_urls(renders, include, images)
+        return renders
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -311,7 +418,7 @@ async def get_character_reference_images(
     story_id: uuid.UUID,
     character_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[ImageService, Depends(get_image_service)],
+    service: Annotated[ImageService, Depends(get_image_read_service)],
 ) -> list[ImageResponseSchema]:
     try:
         images = await service.get_character_reference_images(
@@ -365,6 +472,8 @@ async def delete_character_reference_image(
 @router.post(
     "/project/{project_id}/story/{story_id}/character/{character_id}/render/edit",
     status_code=201,
+    response_model=ImageResponseSchema,
+    responses=RENDER_JOB_ACCEPTED,
 )
 async def render_character_edit(
     project_id: uuid.UUID,
@@ -373,7 +482,9 @@ async def render_character_edit(
     body: CharacterRenderEditRequest,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     service: Annotated[CharacterService, Depends(get_character_service)],
-) -> ImageResponseSchema:
+    jobs: Annotated[RenderJobService, Depends(get_render_job_service)],
+    job: bool = False,
+) -> ImageResponseSchema | JSONResponse:
     """Edit an existing character render using fal's image-edit model.
 
     Optionally accepts a reference_image_id to guide the visual style of the edit.
@@ -383,8 +494,21 @@ async def render_character_edit(
     Side-effect: the reference image (if provided) remains associated with this
     character and will continue to appear in the character's referenceImages list.
     It is not consumed or removed by this call.
+    With ?job=true the edit is queued instead: 202 with a RenderJobSchema.
     """
     try:
+        if job:
+            return render_job_accepted(
+                await jobs.enqueue_render(
+                    project_id,
+                    story_id,
+                    character_id,
+                    EditEventOperationType.RENDER_CHARACTER_EDIT,
+                    instruction=body.instruction,
+                    source_image_id=body.source_image_id,
+                    reference_image_id=body.reference_image_id,
+                )
+            )
         image = await service.render_character_edit(
             user_id=user_id,
             project_id=project_id,
@@ -6,15 +6,17 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth.api import get_current_user_id
-from core.infrastructure.database import get_async_db_session
+from core.infrastructure.database import get_async_db_session, get_async_read_session
 
 from ..models import Project
 from ..repository import Repository
 from ..service import (
     CharacterService,
+    EditEventService,
     ImageService,
     PanelService,
     ProjectService,
+    RenderJobService,
     StoryService,
 )
 
@@ -68,3 +70,51 @@ async def get_panel_service(
     db: Annotated[AsyncSession, Depends(get_async_db_session)],
 ) -> PanelService:
     return PanelService(db_session=db)
+
+
+async def get_render_job_service(
+    db: Annotated[AsyncSession, Depends(get_async_db_session)],
+) -> RenderJobService:
+    return RenderJobService(db_session=db)
+
+
+# ---------------------------------------------------------------------------
+# Read-only variants — for GET routes. These use the replica when one is
+# configured (see get_async_read_session); never call a write path on them.
+# ---------------------------------------------------------------------------
+
+
+async def get_project_read_service(
+    db: Annotated[AsyncSession, Depends(get_async_read_session)],
+) -> ProjectService:
+    return ProjectService(db_session=db)
+
+
+async def get_story_read_service(
+    db: Annotated[AsyncSession, Depends(get_async_read_session)],
+) -> StoryService:
+    return StoryService(db_session=db)
+
+
+async def get_character_read_service(
+    db: Annotated[AsyncSession, Depends(get_async_read_session)],
+) -> CharacterService:
+    return CharacterService(db_session=db)
+
+
+async def get_image_read_service(
+    db: Annotated[AsyncSession, Depends(get_async_read_session)],
+) -> ImageService:
+    return ImageService(db=db, repository=Repository(db))
+
+
+async def get_edit_event_read_service(
+    db: Annotated[AsyncSession, Depends(get_async_read_session)],
+) -> EditEventService:
+    return EditEventService(db_session=db)
+
+
+async def get_panel_read_service(
+    db: Annotated[AsyncSession, Depends(get_async_read_session)],
+) -> PanelService:
+    return PanelService(db_session=db)
@@ -0,0 +1,49 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from core.auth.api import get_current_user_id
+from core.common.utils import get_current_datetime_utc
+
+from ..models.edit_event import EditEventOperationType, EditEventStatus
+from ..schemas import OperationLatencySchema
+from ..service import EditEventService
+from .dependencies import get_edit_event_read_service
+
+router = APIRouter(tags=["edit-events", "v2"])
+
+DEFAULT_LATENCY_WINDOW = timedelta(days=1)
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    """Read a naive query timestamp as UTC so it compares with aware ones."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+@router.get("/edit-events/latency")
+async def get_operation_latency(
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    service: Annotated[EditEventService, Depends(get_edit_event_read_service)],
+    since: datetime | None = None,
+    until: datetime | None = None,
+    operation_type: EditEventOperationType | None = None,
+    status: EditEventStatus = EditEventStatus.SUCCEEDED,
+) -> list[OperationLatencySchema]:
+    """p50/p95/p99 milliseconds per operation type and phase across your projects.
+
+    The window is [since, until); until defaults to now and since to one day
+    before until. Timestamps without an offset are taken as UTC. Only events
+    recorded with timings are counted.
+    """
+    until = _as_utc(until) or get_current_datetime_utc()
+    since = _as_utc(since) or until - DEFAULT_LATENCY_WINDOW
+    if since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    rows = await service.get_operation_latency(
+        user_id, since, until, operation_type=operation_type, status=status
+    )
+    return [OperationLatencySchema.model_validate(row._asdict()) for row in rows]
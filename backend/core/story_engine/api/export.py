@@ -8,7 +8,7 @@ from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth.api import get_current_user_id
-from core.infrastructure.database import get_async_db_session
+from core.infrastructure.database import get_async_read_session
 
 from ..exceptions import ExportError, NotFoundError
 from ..service.export_service import ExportService
@@ -17,7 +17,7 @@ router = APIRouter(tags=["export", "v2"])
 
 
 async def get_export_service(
-    db: Annotated[AsyncSession, Depends(get_async_db_session)],
+    db: Annotated[AsyncSession, Depends(get_async_read_session)],
 ) -> ExportService:
     return ExportService(db_session=db)
 
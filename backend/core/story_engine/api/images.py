@@ -1,4 +1,5 @@
 import uuid
+from collections.abc import Sequence
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -7,18 +8,40 @@ from loguru import logger
 from core.auth.api import get_current_user_id
 
 from ..exceptions import NotFoundError
-from ..schemas.image import ImageSignedUrlResponseSchema
+from ..schemas.image import (
+    ImageInclude,
+    ImageResponseSchema,
+    ImageSignedUrlResponseSchema,
+    ImageSignedUrlsRequest,
+)
 from ..service import ImageService
-from .dependencies import get_image_service
+from .dependencies import get_image_read_service
 
 router = APIRouter(tags=["images", "v2"])
 
 
+async def embed_signed_urls(
+    images: Sequence[ImageResponseSchema],
+    include: list[ImageInclude] | None,
+    service: ImageService,
+) -> None:
+    """Fill signed_url on listed images when the caller asked for ?include=signed_url.
+
+    Saves the client one GET /image/{id}/signed-url per image. The listing
+    endpoint has already checked the caller may see these images.
+    """
+    if not include or ImageInclude.SIGNED_URL not in include:
+        return
+    signed = await service.sign_object_keys(image.object_key for image in images)
+    for image in images:
+        image.signed_url, image.signed_url_expires_at = signed[image.object_key]
+
+
 @router.get("/image/{image_id}/signed-url", status_code=200)
 async def get_image_signed_url(
     image_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[ImageService, Depends(get_image_service)],
+    service: Annotated[ImageService, Depends(get_image_read_service)],
 ) -> ImageSignedUrlResponseSchema:
     try:
         url, expires_at = await service.get_signed_url(image_id, user_id)
@@ -33,3 +56,29 @@ async def get_image_signed_url(
             status_code=500,
             detail="An unexpected error occurred while generating the signed URL",
         )
+
+
+# Only reads, so it uses the read session despite being a POST.
+@router.post("/images/signed-urls", status_code=200)
+async def get_image_signed_urls(
+    body: ImageSignedUrlsRequest,
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    service: Annotated[ImageService, Depends(get_image_read_service)],
+) -> dict[uuid.UUID, ImageSignedUrlResponseSchema]:
+    """Signed URLs for up to MAX_SIGNED_URL_BATCH images, keyed by image id.
+
+    Ids of images that do not exist or belong to another user are absent from
+    the map, so one stale id does not fail a whole gallery.
+    """
+    try:
+        signed = await service.get_signed_urls(body.image_ids, user_id)
+        return {
+            image_id: ImageSignedUrlResponseSchema(url=url, expires_at=expires_at)
+            for image_id, (url, expires_at) in signed.items()
+        }
+    except Exception as e:
+        logger.exception(f"Unexpected error generating signed URLs: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="An unexpected error occurred while generating the signed URLs",
+        )
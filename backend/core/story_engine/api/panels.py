@@ -2,11 +2,11 @@
 Panel API endpoints — v2.
 
 Stories covered here:
-  20 — POST /panels/generate
+  20 — POST /panels/generate (and /panels/generate/stream)
   30 — GET  /panels
   40 — GET  /panel/{panel_id}
   50 — POST /panel/{panel_id}/generate
-  60 — POST /panel/{panel_id}/render
+  60 — POST /panel/{panel_id}/render (and /panels/render for many at once)
   70 — GET  /panel/{panel_id}/renders
   80 — GET  /panel/{panel_id}/history
 """
@@ -15,29 +15,53 @@ import uuid
 from collections.abc import Sequence
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 from loguru import logger
 
 from core.auth.api import get_current_user_id
 
+from ..events import as_ndjson, frame_item_stream
 from ..exceptions import (
+    InvalidCursorError,
     NoCharactersError,
     NoStoryTextError,
     NotFoundError,
     PanelAlreadyGeneratedError,
     UploadImageError,
 )
+from ..models.edit_event import EditEventOperationType
+from ..pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, legacy_page_limit
 from ..schemas.edit_event import EditEventResponseSchema
-from ..schemas.image import ImageResponseSchema
+from ..schemas.image import ImageInclude, ImageResponseSchema
 from ..schemas.panel import (
     PanelRefineRequest,
     PanelRenderEditRequest,
+    PanelRenderOutcomeSchema,
     PanelRenderReferencesSchema,
     PanelResponseSchema,
+    PanelsRenderRequest,
     SetCanonicalPanelRenderRequest,
 )
-from ..service import PanelService
-from .dependencies import get_panel_service
+from ..service import ImageService, PanelService, RenderJobService
+from ..service.panel_service import PanelRenderOutcome
+from .dependencies import (
+    get_image_read_service,
+    get_panel_read_service,
+    get_panel_service,
+    get_render_job_service,
+)
+from .images import embed_signed_urls
+from .render_jobs import RENDER_JOB_ACCEPTED, render_job_accepted
 
 router = APIRouter(tags=["panels", "v2"])
 
@@ -103,12 +127,23 @@ async def list_panels(
     project_id: uuid.UUID,
     story_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[PanelService, Depends(get_panel_service)],
+    service: Annotated[PanelService, Depends(get_panel_read_service)],
+    images: Annotated[ImageService, Depends(get_image_read_service)],
+    include: Annotated[list[ImageInclude] | None, Query()] = None,
 ) -> list[PanelRenderReferencesSchema]:
-    """Return all panels for a story ordered by order_index, with canonical renders."""
+    """Return all panels for a story ordered by order_index, with canonical renders.
+
+    ?include=signed_url embeds a signed URL in each canonical render.
+    """
     try:
         pairs = await service.get_panels(project_id, story_id)
-        return [_build_panel_full(panel, render) for panel, render in pairs]
+        panels = [_build_panel_full(panel, render) for panel, render in pairs]
+        await embed_signed_urls(
+            [p.canonical_render for p in panels if p.canonical_render],
+            include,
+            images,
+        )
+        return panels
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -133,7 +168,7 @@ async def get_panel(
     story_id: uuid.UUID,
     panel_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[PanelService, Depends(get_panel_service)],
+    service: Annotated[PanelService, Depends(get_panel_read_service)],
 ) -> PanelRenderReferencesSchema:
     """Return a single panel by ID, with canonical render."""
     try:
@@ -244,6 +279,8 @@ async def refine_panel(
 @router.post(
     "/project/{project_id}/story/{story_id}/panel/{panel_id}/render",
     status_code=200,
+    response_model=PanelRenderReferencesSchema,
+    responses=RENDER_JOB_ACCEPTED,
 )
 async def render_panel(
     project_id: uuid.UUID,
@@ -251,14 +288,26 @@ async def render_panel(
     panel_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     service: Annotated[PanelService, Depends(get_panel_service)],
-) -> PanelRenderReferencesSchema:
+    jobs: Annotated[RenderJobService, Depends(get_render_job_service)],
+    job: bool = False,
+) -> PanelRenderReferencesSchema | JSONResponse:
     """Render a panel image via fal and store in GCS.
 
     Returns the full panel payload including the new canonical render and
     reference images — mirrors render_character which returns the full
     CharacterRenderReferencesSchema so the client can update its cache slot.
+    With ?job=true the render is queued instead: 202 with a RenderJobSchema.
     """
     try:
+        if job:
+            return render_job_accepted(
+                await jobs.enqueue_render(
+                    project_id,
+                    story_id,
+                    panel_id,
+                    EditEventOperationType.RENDER_PANEL,
+                )
+            )
         panel, image = await service.render_panel(
             user_id=user_id,
             project_id=project_id,
@@ -277,6 +326,50 @@ async def render_panel(
         )
 
 
+def _build_render_outcome(outcome: PanelRenderOutcome) -> PanelRenderOutcomeSchema:
+    return PanelRenderOutcomeSchema(
+        panel_id=outcome.panel_id,
+        panel=(
+            _build_panel_full(outcome.panel, outcome.image)
+            if outcome.panel is not None
+            else None
+        ),
+        error=outcome.error,
+    )
+
+
+@router.post("/project/{project_id}/story/{story_id}/panels/render")
+async def render_story_panels(
+    project_id: uuid.UUID,
+    story_id: uuid.UUID,
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    service: Annotated[PanelService, Depends(get_panel_service)],
+    body: PanelsRenderRequest | None = None,
+) -> StreamingResponse:
+    """Render many panels at once, streamed as NDJSON EventEnvelopes.
+
+    Renders body.panel_ids, or every generated panel without a render when
+    omitted. Each STREAM_CHUNK payload is one PanelRenderOutcomeSchema, sent
+    as soon as that panel's render is stored (or has failed), in completion
+    order. STREAM_END carries the number of panels attempted.
+    """
+    try:
+        outcomes = await service.render_story_panels(
+            user_id=user_id,
+            project_id=project_id,
+            story_id=story_id,
+            panel_ids=body.panel_ids if body is not None else None,
+        )
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return StreamingResponse(
+        content=as_ndjson(
+            frame_item_stream(outcomes, lambda o: _build_render_outcome(o).model_dump())
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
 # ---------------------------------------------------------------------------
 # Story 70 — List all render variations for a panel
 # ---------------------------------------------------------------------------
@@ -291,12 +384,34 @@ async def list_panel_renders(
     story_id: uuid.UUID,
     panel_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[PanelService, Depends(get_panel_service)],
+    service: Annotated[PanelService, Depends(get_panel_read_service)],
+    images: Annotated[ImageService, Depends(get_image_read_service)],
+    response: Response,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: str | None = None,
+    include: Annotated[list[ImageInclude] | None, Query()] = None,
 ) -> list[ImageResponseSchema]:
-    """Return all render variations for a panel, ordered newest first."""
+    """Return render variations for a panel, newest first.
+
+    Unpaginated unless limit or cursor is given; then one page, with more
+    signalled by X-Next-Cursor. ?include=signed_url embeds a signed URL in
+    each render.
+    """
     try:
-        images = await service.get_panel_renders(project_id, story_id, panel_id)
-        return [ImageResponseSchema.model_validate(img) for img in images]
+        page = await service.get_panel_renders(
+            project_id,
+            story_id,
+            panel_id,
+            limit=legacy_page_limit(limit, cursor),
+            cursor=cursor,
+        )
+        if page.next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        renders = [ImageResponseSchema.model_validate(img) for img in page.items]
+        await embed_signed_urls(renders, include, images)
+        return renders
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -321,18 +436,25 @@ async def get_panel_history(
     story_id: uuid.UUID,
     panel_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[PanelService, Depends(get_panel_service)],
-    limit: int = 20,
+    service: Annotated[PanelService, Depends(get_panel_read_service)],
+    response: Response,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 20,
+    cursor: str | None = None,
 ) -> list[EditEventResponseSchema]:
-    """Return the edit history for a panel — all GENERATE_PANEL and RENDER_PANEL events."""
+    """Return one page of panel edit history — GENERATE_PANEL, RENDER_PANEL, … (X-Next-Cursor)."""
     try:
-        events = await service.get_panel_history(
+        page = await service.get_panel_history(
             project_id=project_id,
             story_id=story_id,
             panel_id=panel_id,
             limit=limit,
+            cursor=cursor,
         )
-        return [EditEventResponseSchema.model_validate(e) for e in events]
+        if page.next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        return [EditEventResponseSchema.model_validate(e) for e in page.items]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -383,9 +505,40 @@ async def generate_panels(
         )
 
 
+@router.post("/project/{project_id}/story/{story_id}/panels/generate/stream")
+async def stream_generate_panels(
+    project_id: uuid.UUID,
+    story_id: uuid.UUID,
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    service: Annotated[PanelService, Depends(get_panel_service)],
+) -> StreamingResponse:
+    """Streaming variant of generate_panels, as NDJSON EventEnvelopes.
+
+    Each STREAM_CHUNK payload is one PanelRenderReferencesSchema, sent as soon
+    as the LLM has finished that panel and it is persisted. STREAM_END carries
+    the panel count; a failure partway ends the stream with STREAM_ERROR.
+    """
+    try:
+        panels = await service.stream_generate_panels(project_id, story_id)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NoStoryTextError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NoCharactersError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return StreamingResponse(
+        content=as_ndjson(
+            frame_item_stream(panels, lambda p: _build_panel_full(p, None).model_dump())
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.post(
     "/project/{project_id}/story/{story_id}/panel/{panel_id}/render/edit",
     status_code=201,
+    response_model=ImageResponseSchema,
+    responses=RENDER_JOB_ACCEPTED,
 )
 async def render_panel_edit(
     project_id: uuid.UUID,
@@ -394,7 +547,9 @@ async def render_panel_edit(
     body: PanelRenderEditRequest,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     service: Annotated[PanelService, Depends(get_panel_service)],
-) -> ImageResponseSchema:
+    jobs: Annotated[RenderJobService, Depends(get_render_job_service)],
+    job: bool = False,
+) -> ImageResponseSchema | JSONResponse:
     """Edit an existing panel render using fal's image-edit model.
 
     Optionally accepts a reference_image_id to guide the visual style of the edit.
@@ -402,8 +557,21 @@ async def render_panel_edit(
 
     Side-effect: the reference image (if provided) is not consumed or removed by
     this call — it remains associated with the panel independently.
+    With ?job=true the edit is queued instead: 202 with a RenderJobSchema.
     """
     try:
+        if job:
+            return render_job_accepted(
+                await jobs.enqueue_render(
+                    project_id,
+                    story_id,
+                    panel_id,
+                    EditEventOperationType.RENDER_PANEL_EDIT,
+                    instruction=body.instruction,
+                    source_image_id=body.source_image_id,
+                    reference_image_id=body.reference_image_id,
+                )
+            )
         image = await service.render_panel_edit(
             user_id=user_id,
             project_id=project_id,
@@ -529,7 +697,7 @@ async def list_panel_reference_images(
     story_id: uuid.UUID,
     panel_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[PanelService, Depends(get_panel_service)],
+    service: Annotated[PanelService, Depends(get_panel_read_service)],
 ) -> list[ImageResponseSchema]:
     """Return all reference images for a panel, ordered newest first."""
     try:
@@ -16,7 +16,7 @@ from ..schemas import (
     StoryResponseSchema,
 )
 from ..service import ProjectService
-from .dependencies import get_project_service
+from .dependencies import get_project_read_service, get_project_service
 
 router = APIRouter(tags=["comic", "builder", "v2", "projects"])
 
@@ -24,7 +24,7 @@ router = APIRouter(tags=["comic", "builder", "v2", "projects"])
 @router.get("/projects")
 async def get_all_projects_of_user(
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[ProjectService, Depends(get_project_service)],
+    service: Annotated[ProjectService, Depends(get_project_read_service)],
 ) -> list[ProjectListResponseSchema]:
     projects = await service.get_all_projects_of_user(user_id)
     return [
@@ -52,6 +52,7 @@ async def create_project(
 @router.get("/projects/me")
 async def get_my_project(
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    # Primary session: this GET creates the default project on first call.
     service: Annotated[ProjectService, Depends(get_project_service)],
 ) -> ProjectRelationalStateSchema:
     """Return the user's default project, creating one if none exists.
@@ -66,7 +67,7 @@ async def get_my_project(
 async def get_project(
     project_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[ProjectService, Depends(get_project_service)],
+    service: Annotated[ProjectService, Depends(get_project_read_service)],
 ) -> ProjectRelationalStateSchema:
     project = await service.get_project_details(user_id, project_id)
     if project is None:
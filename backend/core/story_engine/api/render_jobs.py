@@ -0,0 +1,69 @@
+import uuid
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
+
+from core.auth.api import get_current_user_id
+
+from ..exceptions import NotFoundError
+from ..models import EditEvent
+from ..models.edit_event import EditEventStatus
+from ..render_jobs import render_job_workers
+from ..schemas import RenderJobSchema
+from ..service import RenderJobService
+from .dependencies import get_render_job_service
+
+router = APIRouter(tags=["render-jobs", "v2"])
+
+# Documents the alternative response of render endpoints called with ?job=true.
+RENDER_JOB_ACCEPTED: dict[int | str, dict[str, Any]] = {
+    status.HTTP_202_ACCEPTED: {
+        "model": RenderJobSchema,
+        "description": "Queued (?job=true); poll GET /render-jobs/{id}.",
+    }
+}
+
+
+def _build_render_job(event: EditEvent) -> RenderJobSchema:
+    assert event.job_queued_at is not None
+    if event.status != EditEventStatus.PENDING:
+        state = event.status
+    else:
+        state = "queued" if event.job_claimed_at is None else "running"
+    return RenderJobSchema(
+        id=event.id,
+        operation_type=event.operation_type,
+        target_type=event.target_type,
+        target_id=event.target_id,
+        status=event.status,
+        state=state,
+        attempts=event.job_attempts,
+        queued_at=event.job_queued_at,
+        started_at=event.job_claimed_at,
+        output_snapshot=event.output_snapshot,
+        timings=event.timings,
+    )
+
+
+def render_job_accepted(event: EditEvent) -> JSONResponse:
+    """202 response for a just-queued render; wakes this instance's workers."""
+    render_job_workers.notify()
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=_build_render_job(event).model_dump(),
+    )
+
+
+# Reads the primary, not a replica: a poller must not see a stale status.
+@router.get("/render-jobs/{job_id}")
+async def get_render_job(
+    job_id: uuid.UUID,
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    service: Annotated[RenderJobService, Depends(get_render_job_service)],
+) -> RenderJobSchema:
+    """Status of a render queued with ?job=true."""
+    try:
+        return _build_render_job(await service.get_render_job(user_id, job_id))
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
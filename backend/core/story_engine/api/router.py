@@ -3,10 +3,12 @@ from fastapi import APIRouter, Depends
 from core.payments.dependencies import require_entitlement
 
 from .character import router as character_router
+from .edit_events import router as edit_events_router
 from .export import router as export_router
 from .images import router as images_router
 from .panels import router as panels_router
 from .projects import router as projects_router
+from .render_jobs import router as render_jobs_router
 from .story import router as story_router
 
 router = APIRouter(
@@ -21,3 +23,5 @@ router.include_router(character_router)
 router.include_router(images_router)
 router.include_router(panels_router)
 router.include_router(export_router)
+router.include_router(edit_events_router)
+router.include_router(render_jobs_router)
@@ -1,13 +1,19 @@
 import uuid
-from typing import Annotated, AsyncIterator
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.responses import StreamingResponse
 
 from core.auth.api import get_current_user_id
 
-from ..events import EventEnvelope
-from ..exceptions import InvalidUserIDError, NotFoundError, NotOwnedError
+from ..events import as_ndjson
+from ..exceptions import (
+    InvalidCursorError,
+    InvalidUserIDError,
+    NotFoundError,
+    NotOwnedError,
+)
+from ..pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from ..schemas.edit_event import EditEventResponseSchema
 from ..schemas.story import (
     GenerateStoryRequest,
@@ -15,7 +21,7 @@ from ..schemas.story import (
     StoryUpdateSchema,
 )
 from ..service import StoryService
-from .dependencies import get_story_service
+from .dependencies import get_story_read_service, get_story_service
 
 router = APIRouter(tags=["story"])
 
@@ -25,7 +31,7 @@ async def get_story(
     project_id: uuid.UUID,
     story_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[StoryService, Depends(get_story_service)],
+    service: Annotated[StoryService, Depends(get_story_read_service)],
 ) -> StoryResponseSchema:
     story = await service.get_story(project_id, story_id)
     if story is None:
@@ -35,11 +41,6 @@ async def get_story(
     return StoryResponseSchema.model_validate(story)
 
 
-async def _as_ndjson(stream: AsyncIterator[EventEnvelope]) -> AsyncIterator[str]:
-    async for event in stream:
-        yield event.model_dump_json() + "\n"
-
-
 @router.post("/project/{project_id}/story/{story_id}/generate")
 async def generate_story(
     user_id: Annotated[
@@ -54,13 +55,41 @@ async def generate_story(
     try:
         stream = await service.generate_story(user_id, project_id, story_id, request)
         return StreamingResponse(
-            content=_as_ndjson(stream),
+            content=as_ndjson(stream),
             media_type="application/x-ndjson",
         )
     except (InvalidUserIDError, NotFoundError, NotOwnedError) as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.get("/project/{project_id}/story/{story_id}/generate/{stream_id}")
+async def resume_story_stream(
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    project_id: uuid.UUID,
+    story_id: uuid.UUID,
+    stream_id: uuid.UUID,
+    service: Annotated[StoryService, Depends(get_story_service)],
+    from_seq: Annotated[int, Query(ge=0)] = 0,
+) -> StreamingResponse:
+    """Reattach to a story generation after a dropped connection.
+
+    stream_id is the streamId of the envelopes already received; pass the
+    last seq seen + 1 as from_seq. Same NDJSON framing as POST .../generate.
+    """
+    try:
+        stream = await service.resume_story_stream(
+            user_id, project_id, story_id, stream_id, from_seq
+        )
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except NotOwnedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    return StreamingResponse(
+        content=as_ndjson(stream),
+        media_type="application/x-ndjson",
+    )
+
+
 # NOTE: This endpoint uses the plural "/projects/" prefix to match the projects
 # router convention, even though all other endpoints in this file use singular
 # "/project/". It lives here (story router) rather than the projects router solely
@@ -98,8 +127,20 @@ async def get_story_history(
     project_id: uuid.UUID,
     story_id: uuid.UUID,
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
-    service: Annotated[StoryService, Depends(get_story_service)],
-    limit: int = 20,
+    service: Annotated[StoryService, Depends(get_story_read_service)],
+    response: Response,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 20,
+    cursor: str | None = None,
 ) -> list[EditEventResponseSchema]:
-    events = await service.get_story_history(story_id, limit=limit)
-    return [EditEventResponseSchema.model_validate(e) for e in events]
+    """Return one page of story edit events, newest first.
+
+    Pass the X-Next-Cursor header from the previous page as `cursor` to
+    continue; the header is absent on the last page.
+    """
+    try:
+        page = await service.get_story_history(story_id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return [EditEventResponseSchema.model_validate(e) for e in page.items]
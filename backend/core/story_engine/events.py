@@ -1,12 +1,16 @@
 import uuid
+from collections.abc import AsyncIterator, Callable
 from enum import Enum
-from typing import Any
+from typing import Any, TypeVar
 
+from loguru import logger
 from pydantic import Field
 
 from core.common import AliasedBaseModel
 from core.common.utils import get_current_timestamp_ms
 
+T = TypeVar("T")
+
 
 class EventType(Enum):
     STREAM_START = "stream.start"
@@ -34,3 +38,48 @@ class EventEnvelope(AliasedBaseModel):
 
     payload: dict[str, Any] | None = None
     error: ErrorPayload | None = None
+
+
+async def as_ndjson(stream: AsyncIterator[EventEnvelope]) -> AsyncIterator[str]:
+    """Serialise envelopes as newline-delimited JSON for a StreamingResponse."""
+    async for event in stream:
+        yield event.model_dump_json() + "\n"
+
+
+async def frame_item_stream(
+    items: AsyncIterator[T], to_payload: Callable[[T], dict[str, Any]]
+) -> AsyncIterator[EventEnvelope]:
+    """Frame a stream of finished items (panels, characters) as envelopes.
+
+    STREAM_START, one STREAM_CHUNK per item carrying to_payload(item), then
+    STREAM_END with the item count. All share a stream_id and a gapless seq.
+    A failure mid-stream ends it with STREAM_ERROR instead — the HTTP status
+    is already 200 by then — and items already emitted stay persisted.
+    """
+    stream_id = str(uuid.uuid4())
+    seq = 0
+    yield EventEnvelope(stream_id=stream_id, seq=seq, event_type=EventType.STREAM_START)
+    try:
+        async for item in items:
+            seq += 1
+            yield EventEnvelope(
+                stream_id=stream_id,
+                seq=seq,
+                event_type=EventType.STREAM_CHUNK,
+                payload=to_payload(item),
+            )
+    except Exception as e:
+        logger.exception(f"Item stream {stream_id} failed after {seq} items: {e}")
+        yield EventEnvelope(
+            stream_id=stream_id,
+            seq=seq + 1,
+            event_type=EventType.STREAM_ERROR,
+            error=ErrorPayload(code="E_INTERNAL", message=str(e), retryable=True),
+        )
+        return
+    yield EventEnvelope(
+        stream_id=stream_id,
+        seq=seq + 1,
+        event_type=EventType.STREAM_END,
+        payload={"count": seq},
+    )
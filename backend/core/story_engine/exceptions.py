@@ -107,6 +107,12 @@ class CharacterRefinementError(BaseError):
     pass
 
 
+class StoryEditError(BaseError):
+    """A story edit plan does not apply cleanly to the story text."""
+
+    pass
+
+
 class FalResponseError(BaseError):
     """Error from Fal response."""
 
@@ -129,3 +135,9 @@ class ExportError(BaseError):
     """Export pre-condition failed — e.g. panels missing canonical renders."""
 
     pass
+
+
+class InvalidCursorError(BaseError):
+    """Pagination cursor could not be decoded."""
+
+    pass
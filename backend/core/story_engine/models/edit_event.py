@@ -5,7 +5,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -63,6 +63,23 @@ class EditEvent(ORMBase):
     status: Mapped[str] = mapped_column(
         String(20), nullable=False, default=EditEventStatus.PENDING
     )
+    # Milliseconds per phase (llm, fal_queue, fal_run, download, upload, db)
+    # plus total; see core.infrastructure.phase_timings. Set with the final status.
+    timings: Mapped[dict[str, float] | None] = mapped_column(
+        JSONB, nullable=True, default=None
+    )
+    # Render job queue (service/render_job_service.py). Set when the operation
+    # was queued rather than run inside its request; a worker claims the event
+    # by stamping job_claimed_at, and may reclaim it once the lease expires.
+    job_queued_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, default=None
+    )
+    job_claimed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, default=None
+    )
+    job_attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=get_current_datetime_utc
     )
@@ -89,3 +106,23 @@ class EditEvent(ORMBase):
             output_snapshot=output_snapshot,
             status=status.value,
         )
+
+
+# Serves EditEventRepository.get_edit_events_for_target (history endpoints).
+Index(
+    "ix_edit_event_target_created",
+    EditEvent.target_type,
+    EditEvent.target_id,
+    EditEvent.created_at.desc(),
+)
+
+# Serves EditEventRepository.get_operation_latency (time window per project).
+Index("ix_edit_event_project_created", EditEvent.project_id, EditEvent.created_at)
+
+# Serves EditEventRepository.claim_render_job: only queued jobs not yet
+# finished, oldest first.
+Index(
+    "ix_edit_event_job_queue",
+    EditEvent.job_queued_at,
+    postgresql_where=text("status = 'pending' AND job_queued_at IS NOT NULL"),
+)
@@ -5,7 +5,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -89,3 +89,14 @@ class Image(ORMBase):
             discriminator_key=discriminator_key,
             meta=meta or {},
         )
+
+
+# Serves every (target_id, discriminator_key) lookup in ImageRepository —
+# canonical render, render history, reference images — including the
+# ORDER BY created_at DESC, so LIMIT 1 reads a single index entry.
+Index(
+    "ix_image_target_discriminator_created",
+    Image.target_id,
+    Image.discriminator_key,
+    Image.created_at.desc(),
+)
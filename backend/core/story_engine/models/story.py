@@ -46,6 +46,10 @@ class Story(ORMBase):
     meta: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
     name: Mapped[str | None] = mapped_column(Text, nullable=True, default=None)
     description: Mapped[str | None] = mapped_column(Text, nullable=True, default=None)
+    # {"key": ..., "digest": {...}} — see service/story_digest_service.py
+    digest: Mapped[dict[str, Any] | None] = mapped_column(
+        JSONB, nullable=True, default=None
+    )
 
     project: Mapped[Project] = relationship("Project", back_populates="stories")
     source_event: Mapped[EditEvent | None] = relationship(
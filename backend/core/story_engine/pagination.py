@@ -0,0 +1,119 @@
+"""
+Keyset pagination for story-engine list endpoints.
+
+History and render lists are ordered newest first on (created_at, id). A page
+is read with
+
+    WHERE (created_at, id) < (:cursor_created_at, :cursor_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit + 1
+
+where the extra row only signals that another page exists. Deep pages cost
+the same as the first one, unlike OFFSET. The cursor handed to clients is an
+opaque url-safe token for the last row's (created_at, id). It is returned in
+the X-Next-Cursor response header so list bodies stay plain JSON arrays.
+
+Render lists were unbounded before they were paginated, and older clients do
+not follow X-Next-Cursor, so they page only when limit or cursor is passed
+(legacy_page_limit).
+"""
+
+from __future__ import annotations
+
+import base64
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, Protocol, TypeVar
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from .exceptions import InvalidCursorError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 100
+
+
+class _Keyed(Protocol):
+    @property
+    def created_at(self) -> datetime: ...
+
+    @property
+    def id(self) -> uuid.UUID: ...
+
+
+T = TypeVar("T")
+KeyedT = TypeVar("KeyedT", bound=_Keyed)
+
+
+@dataclass(frozen=True)
+class Cursor:
+    created_at: datetime
+    id: uuid.UUID
+
+    def encode(self) -> str:
+        raw = f"{self.created_at.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> Cursor:
+        """Parse a token from encode(). Raises InvalidCursorError on garbage."""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            created_at, row_id = raw.split("|")
+            return cls(datetime.fromisoformat(created_at), uuid.UUID(row_id))
+        except ValueError as e:  # covers binascii.Error and UnicodeDecodeError
+            raise InvalidCursorError(f"Invalid pagination cursor: {token!r}") from e
+
+    @classmethod
+    def from_token(cls, token: str | None) -> Cursor | None:
+        return cls.decode(token) if token else None
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+    @classmethod
+    def from_rows(cls, rows: list[KeyedT], limit: int | None) -> Page[KeyedT]:
+        """Build a page from up to limit + 1 rows fetched newest first.
+
+        A limit of None means rows is the whole list: one page, no cursor.
+        """
+        if limit is None or len(rows) <= limit:
+            return Page(items=rows)
+        items = rows[:limit]
+        last = items[-1]
+        return Page(items=items, next_cursor=Cursor(last.created_at, last.id).encode())
+
+
+def legacy_page_limit(limit: int | None, cursor: str | None) -> int | None:
+    """Page size for a list that was unbounded before it was paginated.
+
+    Callers that pass neither limit nor cursor still get the whole list (None);
+    asking for either one opts into pages of limit, MAX_PAGE_SIZE by default.
+    """
+    if limit is None and cursor is None:
+        return None
+    return limit or MAX_PAGE_SIZE
+
+
+def keyset_page(
+    stmt: Select[tuple[T]],
+    created_at: InstrumentedAttribute[datetime],
+    row_id: InstrumentedAttribute[uuid.UUID],
+    limit: int | None,
+    before: Cursor | None,
+) -> Select[tuple[T]]:
+    """Order stmt newest first on (created_at, id) and restrict it to one page."""
+    stmt = stmt.order_by(created_at.desc(), row_id.desc())
+    if before is not None:
+        stmt = stmt.where(
+            tuple_(created_at, row_id)
+            < tuple_(literal(before.created_at), literal(before.id))
+        )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
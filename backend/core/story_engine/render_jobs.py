@@ -0,0 +1,80 @@
+"""
+In-process pool of render job workers.
+
+Each worker loops: claim the oldest queued render job in a session of its own,
+run it (RenderJobService.run), repeat. With the queue empty it sleeps until
+notify() — a job enqueued on this instance — or RENDER_JOB_POLL_SECONDS pass,
+which picks up jobs enqueued elsewhere and claims whose lease expired.
+
+Claims use FOR UPDATE SKIP LOCKED, so pools on any number of instances, or a
+dedicated process (scripts/run_render_workers.py), can share one queue. The
+API process starts RENDER_JOB_WORKERS workers in its lifespan:
+
+    render_job_workers.start(settings.render_job_workers)
+    ...
+    await render_job_workers.stop()
+"""
+
+import asyncio
+
+from loguru import logger
+
+from core.config import settings
+from core.infrastructure.database import get_async_session_maker
+
+from .service.render_job_service import RenderJobService
+
+
+async def run_next_render_job() -> bool:
+    """Claim and run one queued render job; False when there was none."""
+    async with get_async_session_maker()() as db:
+        service = RenderJobService(db)
+        job = await service.claim_next()
+        if job is None:
+            return False
+        await service.run(job)
+        return True
+
+
+class RenderJobWorkers:
+    def __init__(self) -> None:
+        self._tasks: list[asyncio.Task[None]] = []
+        self._wake: asyncio.Event | None = None
+
+    def start(self, count: int) -> None:
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(count)]
+        if count:
+            logger.info(f"Started {count} render job workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers; a job cut short is retried once its lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers on this instance; a no-op when none are running."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                if await run_next_render_job():
+                    continue
+            except Exception as e:
+                # Claim or bookkeeping failed (database down); back off and retry.
+                logger.exception(f"Render job worker error: {e}")
+            assert self._wake is not None
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(), timeout=settings.render_job_poll_seconds
+                )
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+
+render_job_workers = RenderJobWorkers()
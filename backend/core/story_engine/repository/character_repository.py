@@ -2,7 +2,7 @@ import uuid
 from typing import Any
 
 from slugify import slugify
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import Character, Project, Story
@@ -39,6 +39,17 @@ class CharacterRepository:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_characters_by_ids(
+        self, character_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, Character]:
+        """Fetch many characters by ID in one query, keyed by ID. Missing IDs are absent."""
+        if not character_ids:
+            return {}
+        result = await self.db.execute(
+            select(Character).where(Character.id.in_(character_ids))
+        )
+        return {character.id: character for character in result.scalars().all()}
+
     async def get_character_for_user_in_project_and_story(
         self,
         user_id: uuid.UUID,
@@ -103,12 +114,23 @@ class CharacterRepository:
     async def set_canonical_render(
         self, character_id: uuid.UUID, story_id: uuid.UUID, image_id: uuid.UUID
     ) -> Character:
-        character = await self.get_character(character_id, story_id)
+        """Point the character at image_id with one UPDATE ... RETURNING round trip.
+
+        The returned Character (and any copy already in the session) carries the
+        new canonical_render_id and updated_at — no refresh needed.
+        """
+        result = await self.db.scalars(
+            update(Character)
+            .where(Character.id == character_id, Character.story_id == story_id)
+            .values(canonical_render_id=image_id)
+            .returning(Character),
+            execution_options={"populate_existing": True},
+        )
+        character = result.one_or_none()
         if character is None:
             raise NotFoundError(
                 f"Character {character_id} not found in story {story_id}"
             )
-        character.canonical_render_id = image_id
         return character
 
     async def delete_character(
@@ -1,14 +1,27 @@
 import uuid
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, NamedTuple
 
-from sqlalchemy import desc, select
+from sqlalchemy import Float, cast, func, insert, or_, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import EditEvent
+from ..models import EditEvent, Project
 from ..models.edit_event import EditEventOperationType, EditEventStatus
+from ..pagination import Cursor, keyset_page
 from .exception import NotFoundError
 
 
+class OperationLatency(NamedTuple):
+    """Latency percentiles of one phase of one operation type, in milliseconds."""
+
+    operation_type: str
+    phase: str
+    events: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
 class EditEventRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -17,6 +30,21 @@ class EditEventRepository:
         self.db.add(edit_event)
         return edit_event
 
+    async def bulk_create_edit_events(
+        self, values: list[dict[str, Any]]
+    ) -> list[EditEvent]:
+        """Insert many edit events with one multi-row INSERT ... RETURNING.
+
+        Rows must carry the same keys; results come back in `values` order.
+        """
+        if not values:
+            return []
+        result = await self.db.scalars(
+            insert(EditEvent).returning(EditEvent, sort_by_parameter_order=True),
+            values,
+        )
+        return list(result.all())
+
     async def create_edit_event(
         self,
         project_id: uuid.UUID,
@@ -37,11 +65,15 @@ class EditEventRepository:
         self.db.add(event)
         return event
 
+    async def get_edit_event(self, edit_event_id: uuid.UUID) -> EditEvent | None:
+        return await self.db.get(EditEvent, edit_event_id)
+
     async def update_edit_event(
         self,
         edit_event_id: uuid.UUID,
         status: EditEventStatus,
         output_snapshot: dict[str, Any] | None = None,
+        timings: dict[str, float] | None = None,
     ) -> EditEvent:
         event = await self.db.get(EditEvent, edit_event_id)
         if event is None:
@@ -50,20 +82,148 @@ class EditEventRepository:
         event.status = status.value
         if output_snapshot is not None:
             event.output_snapshot = output_snapshot
+        if timings is not None:
+            event.timings = timings
         return event
 
+    async def set_edit_event_status(
+        self,
+        edit_event_id: uuid.UUID,
+        status: EditEventStatus,
+        output_snapshot: dict[str, Any] | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> None:
+        """update_edit_event as a single UPDATE that reads nothing back.
+
+        Safe inside database.pipeline(). A loaded EditEvent is updated in place;
+        a missing row is a silent no-op rather than NotFoundError.
+        """
+        values: dict[str, Any] = {"status": status.value}
+        if output_snapshot is not None:
+            values["output_snapshot"] = output_snapshot
+        if timings is not None:
+            values["timings"] = timings
+        await self.db.execute(
+            update(EditEvent).where(EditEvent.id == edit_event_id).values(**values),
+            execution_options={"synchronize_session": "evaluate"},
+        )
+
+    async def set_input_snapshot(
+        self, edit_event_id: uuid.UUID, input_snapshot: dict[str, Any]
+    ) -> None:
+        await self.db.execute(
+            update(EditEvent)
+            .where(EditEvent.id == edit_event_id)
+            .values(input_snapshot=input_snapshot),
+            execution_options={"synchronize_session": "evaluate"},
+        )
+
+    async def claim_render_job(self, lease: timedelta) -> EditEvent | None:
+        """Claim the oldest queued render job no other worker holds.
+
+        A job is claimable while PENDING and either unclaimed or claimed longer
+        than `lease` ago (its worker died). FOR UPDATE SKIP LOCKED lets any
+        number of workers claim concurrently without blocking on, or taking,
+        the same row. The claim stamps job_claimed_at and counts the attempt;
+        the caller commits it.
+        """
+        next_job = (
+            select(EditEvent.id)
+            .where(
+                EditEvent.status == EditEventStatus.PENDING.value,
+                EditEvent.job_queued_at.is_not(None),
+                or_(
+                    EditEvent.job_claimed_at.is_(None),
+                    EditEvent.job_claimed_at < func.now() - lease,
+                ),
+            )
+            .order_by(EditEvent.job_queued_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.db.scalars(
+            update(EditEvent)
+            .where(EditEvent.id == next_job)
+            .values(job_claimed_at=func.now(), job_attempts=EditEvent.job_attempts + 1)
+            .returning(EditEvent),
+            execution_options={"populate_existing": True},
+        )
+        return result.one_or_none()
+
+    async def get_edit_event_for_user(
+        self, edit_event_id: uuid.UUID, user_id: uuid.UUID
+    ) -> EditEvent | None:
+        """The edit event, if it belongs to one of the user's projects."""
+        result = await self.db.execute(
+            select(EditEvent)
+            .join(Project, Project.id == EditEvent.project_id)
+            .where(EditEvent.id == edit_event_id, Project.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
     async def get_edit_events_for_target(
-        self, target_type: str, target_id: uuid.UUID, limit: int = 20
+        self,
+        target_type: str,
+        target_id: uuid.UUID,
+        limit: int = 20,
+        before: Cursor | None = None,
     ) -> list[EditEvent]:
-        stmt = (
-            select(EditEvent)
-            .where(
+        """Return edit events for a target newest first, starting after `before`."""
+        stmt = keyset_page(
+            select(EditEvent).where(
                 EditEvent.target_type == target_type,
                 EditEvent.target_id == target_id,
-            )
-            .order_by(desc(EditEvent.created_at))
-            .limit(limit)
+            ),
+            EditEvent.created_at,
+            EditEvent.id,
+            limit=limit,
+            before=before,
         )
         result = await self.db.execute(stmt)
         events = result.scalars().all()
         return list(events)
+
+    async def get_operation_latency(
+        self,
+        user_id: uuid.UUID,
+        since: datetime,
+        until: datetime,
+        operation_type: EditEventOperationType | None = None,
+        status: EditEventStatus | None = EditEventStatus.SUCCEEDED,
+    ) -> list[OperationLatency]:
+        """Percentiles of every timing phase per operation type, in SQL.
+
+        Covers events with timings in the user's projects created in
+        [since, until), by operation type and phase ("total" included).
+        """
+        phase = (
+            func.jsonb_each_text(EditEvent.timings)
+            .table_valued("key", "value")
+            .lateral("phase")
+        )
+        ms = cast(phase.c.value, Float)
+        stmt = (
+            select(
+                EditEvent.operation_type,
+                phase.c.key,
+                func.count(),
+                *(func.percentile_cont(p).within_group(ms) for p in (0.5, 0.95, 0.99)),
+            )
+            .join(Project, Project.id == EditEvent.project_id)
+            .join(phase, true())
+            .where(
+                Project.user_id == user_id,
+                EditEvent.created_at >= since,
+                EditEvent.created_at < until,
+                EditEvent.timings.is_not(None),
+            )
+            .group_by(EditEvent.operation_type, phase.c.key)
+            .order_by(EditEvent.operation_type, phase.c.key)
+        )
+        if operation_type is not None:
+            stmt = stmt.where(EditEvent.operation_type == operation_type.value)
+        if status is not None:
+            stmt = stmt.where(EditEvent.status == status.value)
+        result = await self.db.execute(stmt)
+        return [OperationLatency(*row) for row in result.all()]
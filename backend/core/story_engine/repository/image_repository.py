@@ -1,10 +1,11 @@
 import uuid
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import Image
 from ..models.image import ImageDiscriminatorKey
+from ..pagination import Cursor, keyset_page
 from .exception import NotFoundError
 
 
@@ -19,6 +20,26 @@ class ImageRepository:
     async def get_image(self, image_id: uuid.UUID) -> Image | None:
         return await self.db.get(Image, image_id)
 
+    async def get_images_by_ids(
+        self, image_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, Image]:
+        """Fetch many images by ID in one query, keyed by ID. Missing IDs are absent."""
+        if not image_ids:
+            return {}
+        result = await self.db.execute(select(Image).where(Image.id.in_(image_ids)))
+        return {image.id: image for image in result.scalars().all()}
+
+    async def get_user_images_by_ids(
+        self, image_ids: list[uuid.UUID], user_id: uuid.UUID
+    ) -> list[Image]:
+        """The user's images among image_ids, in one query; others are absent."""
+        if not image_ids:
+            return []
+        result = await self.db.execute(
+            select(Image).where(Image.id.in_(image_ids), Image.user_id == user_id)
+        )
+        return list(result.scalars().all())
+
     async def _get_reference_images(
         self, target_id: uuid.UUID, discriminator_key: ImageDiscriminatorKey
     ) -> list[Image]:
@@ -79,6 +100,69 @@ class ImageRepository:
         )
         return result.scalars().first()
 
+    async def get_canonical_renders_for_targets(
+        self,
+        target_ids: list[uuid.UUID],
+        discriminator_key: ImageDiscriminatorKey,
+    ) -> dict[uuid.UUID, Image]:
+        """Return the most recently created Image per target, keyed by target_id.
+
+        Set-based counterpart of get_canonical_render: one DISTINCT ON (target_id)
+        query regardless of how many targets are requested. Targets with no
+        matching image are absent from the returned dict.
+        """
+        if not target_ids:
+            return {}
+        result = await self.db.execute(
+            select(Image)
+            .where(
+                Image.target_id.in_(target_ids),
+                Image.discriminator_key == discriminator_key,
+            )
+            .distinct(Image.target_id)
+            .order_by(Image.target_id, Image.created_at.desc())
+        )
+        return {image.target_id: image for image in result.scalars().all()}
+
+    async def get_canonical_renders_for_keys(
+        self, keys: list[tuple[uuid.UUID, str]]
+    ) -> dict[tuple[uuid.UUID, str], Image]:
+        """Return the most recent Image per (target_id, discriminator_key) pair.
+
+        Like get_canonical_renders_for_targets, but each target carries its own
+        discriminator so mixed lookups still cost a single query.
+        """
+        if not keys:
+            return {}
+        result = await self.db.execute(
+            select(Image)
+            .where(tuple_(Image.target_id, Image.discriminator_key).in_(keys))
+            .distinct(Image.target_id, Image.discriminator_key)
+            .order_by(Image.target_id, Image.discriminator_key, Image.created_at.desc())
+        )
+        return {
+            (image.target_id, image.discriminator_key): image
+            for image in result.scalars().all()
+        }
+
+    async def get_images_for_keys(
+        self, keys: list[tuple[uuid.UUID, str]]
+    ) -> dict[tuple[uuid.UUID, str], list[Image]]:
+        """Return all Images per (target_id, discriminator_key) pair, newest first."""
+        if not keys:
+            return {}
+        result = await self.db.execute(
+            select(Image)
+            .where(tuple_(Image.target_id, Image.discriminator_key).in_(keys))
+            .order_by(Image.created_at.desc())
+        )
+        grouped: dict[tuple[uuid.UUID, str], list[Image]] = {}
+        for image in result.scalars().all():
+            grouped.setdefault((image.target_id, image.discriminator_key), []).append(
+                image
+            )
+        return grouped
+
     async def delete_images_for_target(
         self, target_id: uuid.UUID, discriminator_key: ImageDiscriminatorKey
     ) -> None:
@@ -91,16 +175,27 @@ class ImageRepository:
         )
 
     async def get_renders_for_target(
-        self, target_id: uuid.UUID, discriminator_key: ImageDiscriminatorKey
+        self,
+        target_id: uuid.UUID,
+        discriminator_key: ImageDiscriminatorKey,
+        limit: int | None = None,
+        before: Cursor | None = None,
     ) -> list[Image]:
-        """Return all Image rows for the given target and discriminator, newest first."""
+        """Return Image rows for the given target and discriminator, newest first.
+
+        Unbounded unless `limit` is given; `before` resumes after a cursor.
+        """
         result = await self.db.execute(
-            select(Image)
-            .where(
-                Image.target_id == target_id,
-                Image.discriminator_key == discriminator_key,
+            keyset_page(
+                select(Image).where(
+                    Image.target_id == target_id,
+                    Image.discriminator_key == discriminator_key,
+                ),
+                Image.created_at,
+                Image.id,
+                limit=limit,
+                before=before,
             )
-            .order_by(Image.created_at.desc())
         )
         return list(result.scalars().all())
 
@@ -0,0 +1,174 @@
+"""
+Request-scoped batching and memoisation for story-engine lookups.
+
+A Repository is built per request (services are constructed in FastAPI
+dependencies around a per-request session), so loaders hung off it live
+exactly as long as the request does.
+
+Each BatchLoader collects the keys requested within one event-loop tick and
+serves them with a single IN (...) query. Callers only benefit when lookups
+are issued concurrently (asyncio.gather); sequential awaits still work, one
+query each. Results are memoised per key until the session commits or rolls
+back, so a row fetched twice within one request costs one query.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+import weakref
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import Character, Image, Panel
+
+if TYPE_CHECKING:
+    from .repository import Repository
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# discriminator_key is read back from the database as a plain str; the
+# StrEnum members hash and compare equal to it, so either form works as a key.
+TargetKey = tuple[uuid.UUID, str]
+
+# Session.info key for the loaders built on that session. One request session
+# backs several Repository objects (one per service), so the commit/rollback
+# listeners are registered once per session and clear every loader set.
+_SESSION_LOADERS = "story_engine.repository_loaders"
+
+
+class BatchLoader(Generic[K, V]):
+    """Coalesce concurrent single-key lookups into one batched call.
+
+    batch_fn receives the de-duplicated keys of one tick and returns a dict of
+    the keys it found; missing keys resolve to default_factory(). The shared
+    lock serialises batches across loaders — AsyncSession does not allow
+    concurrent operations on one connection.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], Awaitable[Mapping[K, V]]],
+        default_factory: Callable[[], V],
+        lock: asyncio.Lock,
+    ) -> None:
+        self._batch_fn = batch_fn
+        self._default_factory = default_factory
+        self._lock = lock
+        self._memo: dict[K, asyncio.Future[V]] = {}
+        self._queue: list[K] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: K) -> V:
+        future = self._memo.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._memo[key] = future
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                loop.call_soon(self._dispatch)
+        # shield: one cancelled caller must not cancel the shared future
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: list[K]) -> list[V]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """Seed the memo with a row the caller already holds."""
+        if key in self._memo:
+            return
+        future: asyncio.Future[V] = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._memo[key] = future
+
+    def clear(self) -> None:
+        """Drop memoised results; in-flight batches still resolve their callers."""
+        self._memo = {key: f for key, f in self._memo.items() if not f.done()}
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._run(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, keys: list[K]) -> None:
+        futures = [self._memo[key] for key in keys]
+        try:
+            async with self._lock:
+                values = await self._batch_fn(keys)
+        except Exception as exc:
+            for key, future in zip(keys, futures):
+                # Failures are not memoised — the next load retries.
+                if self._memo.get(key) is future:
+                    del self._memo[key]
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key, future in zip(keys, futures):
+            if not future.done():
+                future.set_result(values.get(key, self._default_factory()))
+
+
+class RepositoryLoaders:
+    """The loaders available on Repository.loaders.
+
+    Keyed by primary key:
+      - character, panel, image → row or None
+    Keyed by (target_id, discriminator_key):
+      - canonical_render → most recent Image or None
+      - images_for_target → all Images, newest first
+    """
+
+    def __init__(self, db: AsyncSession, repository: Repository) -> None:
+        lock = asyncio.Lock()
+        self.character: BatchLoader[uuid.UUID, Character | None] = BatchLoader(
+            repository.character.get_characters_by_ids, lambda: None, lock
+        )
+        self.panel: BatchLoader[uuid.UUID, Panel | None] = BatchLoader(
+            repository.panel.get_panels_by_ids, lambda: None, lock
+        )
+        self.image: BatchLoader[uuid.UUID, Image | None] = BatchLoader(
+            repository.image.get_images_by_ids, lambda: None, lock
+        )
+        self.canonical_render: BatchLoader[TargetKey, Image | None] = BatchLoader(
+            repository.image.get_canonical_renders_for_keys, lambda: None, lock
+        )
+        self.images_for_target: BatchLoader[TargetKey, list[Image]] = BatchLoader(
+            repository.image.get_images_for_keys, list, lock
+        )
+        self._all: list[BatchLoader] = [
+            self.character,
+            self.panel,
+            self.image,
+            self.canonical_render,
+            self.images_for_target,
+        ]
+        _register_for_session(db.sync_session, self)
+
+    def clear(self) -> None:
+        for loader in self._all:
+            loader.clear()
+
+
+def _register_for_session(session: Session, loaders: RepositoryLoaders) -> None:
+    registered: weakref.WeakSet[RepositoryLoaders] | None = session.info.get(
+        _SESSION_LOADERS
+    )
+    if registered is None:
+        registered = weakref.WeakSet()
+        session.info[_SESSION_LOADERS] = registered
+        # Memoised rows may be stale once the transaction ends.
+        event.listen(session, "after_commit", _clear_session_loaders)
+        event.listen(session, "after_rollback", _clear_session_loaders)
+    registered.add(loaders)
+
+
+def _clear_session_loaders(session: Session) -> None:
+    for loaders in list(session.info.get(_SESSION_LOADERS, ())):
+        loaders.clear()
@@ -1,9 +1,10 @@
 import uuid
+from typing import Any
 
-from sqlalchemy import asc, delete, select
+from sqlalchemy import asc, delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import Panel
+from ..models import Image, Panel
 from ..models.panel_character import PanelCharacter
 from .exception import NotFoundError
 
@@ -23,6 +24,34 @@ class PanelRepository:
         self.db.add(join_row)
         return join_row
 
+    async def bulk_create_panels(self, values: list[dict[str, Any]]) -> list[Panel]:
+        """Insert many panels with one multi-row INSERT ... RETURNING.
+
+        Rows must carry the same keys. The returned Panels are fully loaded
+        and in the same order as `values`, so no refresh is needed.
+        """
+        if not values:
+            return []
+        result = await self.db.scalars(
+            insert(Panel).returning(Panel, sort_by_parameter_order=True), values
+        )
+        return list(result.all())
+
+    async def bulk_create_panel_characters(
+        self, pairs: list[tuple[uuid.UUID, uuid.UUID]]
+    ) -> None:
+        """Insert many (panel_id, character_id) join rows with one INSERT."""
+        if not pairs:
+            return
+        await self.db.execute(
+            insert(PanelCharacter).values(
+                [
+                    {"panel_id": panel_id, "character_id": character_id}
+                    for panel_id, character_id in pairs
+                ]
+            )
+        )
+
     async def get_panel(self, panel_id: uuid.UUID, story_id: uuid.UUID) -> Panel | None:
         result = await self.db.execute(
             select(Panel).where(
@@ -40,6 +69,41 @@ class PanelRepository:
         )
         return list(result.scalars().all())
 
+    async def count_panels_for_story(self, story_id: uuid.UUID) -> int:
+        result = await self.db.execute(
+            select(func.count()).select_from(Panel).where(Panel.story_id == story_id)
+        )
+        return result.scalar_one()
+
+    async def get_panels_with_canonical_render_for_story(
+        self, story_id: uuid.UUID
+    ) -> list[tuple[Panel, Image | None]]:
+        """Return every panel in a story paired with its canonical_render_id image.
+
+        One query via an outer join on canonical_render_id. The image is None
+        when the pointer is NULL — callers resolve the recency fallback in bulk
+        with ImageRepository.get_canonical_renders_for_targets.
+        """
+        result = await self.db.execute(
+            select(Panel, Image)
+            .outerjoin(Image, Image.id == Panel.canonical_render_id)
+            .where(Panel.story_id == story_id)
+            .order_by(asc(Panel.order_index))
+        )
+        return list(result.tuples().all())
+
+    async def get_panel_with_canonical_render(
+        self, panel_id: uuid.UUID, story_id: uuid.UUID
+    ) -> tuple[Panel, Image | None] | None:
+        """Single-panel variant of get_panels_with_canonical_render_for_story."""
+        result = await self.db.execute(
+            select(Panel, Image)
+            .outerjoin(Image, Image.id == Panel.canonical_render_id)
+            .where(Panel.id == panel_id, Panel.story_id == story_id)
+        )
+        row = result.tuples().one_or_none()
+        return (row[0], row[1]) if row is not None else None
+
     async def get_character_ids_for_panel(self, panel_id: uuid.UUID) -> list[uuid.UUID]:
         result = await self.db.execute(
             select(PanelCharacter.character_id).where(
@@ -48,18 +112,56 @@ class PanelRepository:
         )
         return list(result.scalars().all())
 
+    async def get_character_ids_for_panels(
+        self, panel_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, list[uuid.UUID]]:
+        """Batch get_character_ids_for_panel: one query, every panel_id keyed."""
+        character_ids: dict[uuid.UUID, list[uuid.UUID]] = {
+            panel_id: [] for panel_id in panel_ids
+        }
+        if not panel_ids:
+            return character_ids
+        result = await self.db.execute(
+            select(PanelCharacter.panel_id, PanelCharacter.character_id).where(
+                PanelCharacter.panel_id.in_(panel_ids)
+            )
+        )
+        for panel_id, character_id in result.tuples():
+            character_ids[panel_id].append(character_id)
+        return character_ids
+
     async def get_panel_by_id(self, panel_id: uuid.UUID) -> Panel | None:
         """Fetch a panel by ID alone — use only when story_id is not available."""
         result = await self.db.execute(select(Panel).where(Panel.id == panel_id))
         return result.scalar_one_or_none()
 
+    async def get_panels_by_ids(
+        self, panel_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, Panel]:
+        """Fetch many panels by ID in one query, keyed by ID. Missing IDs are absent."""
+        if not panel_ids:
+            return {}
+        result = await self.db.execute(select(Panel).where(Panel.id.in_(panel_ids)))
+        return {panel.id: panel for panel in result.scalars().all()}
+
     async def set_canonical_render(
         self, panel_id: uuid.UUID, story_id: uuid.UUID, image_id: uuid.UUID
     ) -> Panel:
-        panel = await self.get_panel(panel_id, story_id)
+        """Point the panel at image_id with one UPDATE ... RETURNING round trip.
+
+        The returned Panel (and any copy already in the session) carries the new
+        canonical_render_id and updated_at — no refresh needed.
+        """
+        result = await self.db.scalars(
+            update(Panel)
+            .where(Panel.id == panel_id, Panel.story_id == story_id)
+            .values(canonical_render_id=image_id)
+            .returning(Panel),
+            execution_options={"populate_existing": True},
+        )
+        panel = result.one_or_none()
         if panel is None:
             raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
-        panel.canonical_render_id = image_id
         return panel
 
     async def replace_panel_characters(
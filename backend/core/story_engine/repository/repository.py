@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from .character_repository import CharacterRepository
 from .edit_event_repository import EditEventRepository
 from .image_repository import ImageRepository
+from .loaders import RepositoryLoaders
 from .panel_repository import PanelRepository
 from .project_repository import ProjectRepository
 from .story_repository import StoryRepository
@@ -17,3 +18,4 @@ class Repository:
         self.edit_event = EditEventRepository(db)
         self.image = ImageRepository(db)
         self.panel = PanelRepository(db)
+        self.loaders = RepositoryLoaders(db, self)
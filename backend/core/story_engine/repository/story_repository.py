@@ -1,6 +1,7 @@
 import uuid
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -85,3 +86,13 @@ class StoryRepository:
         if source_event_id is not None:
             story.source_event_id = source_event_id
         return story
+
+    async def set_story_digest(
+        self, story_id: uuid.UUID, digest: dict[str, Any]
+    ) -> None:
+        """Store a story digest without bumping updated_at — it is derived data."""
+        await self.db.execute(
+            update(Story)
+            .where(Story.id == story_id)
+            .values(digest=digest, updated_at=Story.updated_at)
+        )
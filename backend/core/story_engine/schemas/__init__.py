@@ -1,4 +1,8 @@
-from .edit_event import EditEventResponseSchema
+from .edit_event import (
+    EditEventResponseSchema,
+    OperationLatencySchema,
+    RenderJobSchema,
+)
 from .image import ImageResponseSchema, ImageSignedUrlResponseSchema
 from .project import (
     ProjectCreateSchema,
@@ -18,12 +22,14 @@ __all__ = [
     "EditEventResponseSchema",
     "ImageResponseSchema",
     "ImageSignedUrlResponseSchema",
+    "OperationLatencySchema",
     "ProjectCreateSchema",
     "ProjectRenameSchema",
     "ProjectUpdateSchema",
     "ProjectResponseSchema",
     "ProjectListResponseSchema",
     "ProjectRelationalStateSchema",
+    "RenderJobSchema",
     "StoryCreateSchema",
     "StoryResponseSchema",
     "GenerateStoryRequest",
@@ -0,0 +1,63 @@
+"""
+Slug-constrained instructor response models, built once per slug set.
+
+The panel prompts force the LLM to pick character slugs from the story's
+actual characters by narrowing `characters` to a Literal of those slugs. The
+model has to be built at runtime, and building it — create_model, instructor
+wrapping it in its ResponseSchema mixin, generating the OpenAI JSON schema —
+costs far more CPU than anything else before the request goes out.
+
+Stories rarely change their cast between calls, so the finished models are
+kept in a bounded LRU keyed by the frozen slug set. The cached classes are
+already wrapped by instructor (openai_schema), so instructor skips its own
+per-call wrap, and their JSON schema is generated on the first build and
+served from instructor's schema cache afterwards.
+
+    model = constrained_panel_content_model(frozenset(character_slugs))
+    await instructor_client.chat.completions.create(response_model=model, ...)
+
+Any service that needs slug-constrained output should go through here so the
+cache is shared.
+"""
+
+from functools import lru_cache
+from typing import Literal, cast
+
+from instructor import OpenAISchema, openai_schema
+from pydantic import BaseModel, create_model
+
+from .panel import PanelContentBase
+
+# Distinct slug sets kept per process. A model plus its schema is a few KB.
+CONSTRAINED_MODEL_CACHE_SIZE = 256
+
+
+def _prepare(model: type[BaseModel]) -> type[BaseModel]:
+    """Wrap as instructor would per call and generate the JSON schema now."""
+    wrapped = cast(type[OpenAISchema], openai_schema(model))
+    wrapped.openai_schema  # noqa: B018
+    return wrapped
+
+
+@lru_cache(maxsize=CONSTRAINED_MODEL_CACHE_SIZE)
+def constrained_panel_content_model(slugs: frozenset[str]) -> type[BaseModel]:
+    """PanelContent with `characters` restricted to the given slugs."""
+    # Sorted so the enum in the JSON schema does not depend on set order.
+    CharacterSlug = Literal[tuple(sorted(slugs))]  # type: ignore[valid-type]
+    model = create_model(
+        "PanelContent",
+        __base__=PanelContentBase,
+        characters=(list[CharacterSlug], ...),  # type: ignore[valid-type]
+    )
+    return _prepare(model)
+
+
+@lru_cache(maxsize=CONSTRAINED_MODEL_CACHE_SIZE)
+def constrained_panels_response_model(slugs: frozenset[str]) -> type[BaseModel]:
+    """GeneratedPanelsResponse whose panels use constrained_panel_content_model."""
+    panel_model = constrained_panel_content_model(slugs)
+    model = create_model(
+        "GeneratedPanelsResponse",
+        panels=(list[panel_model], ...),  # type: ignore[valid-type]
+    )
+    return _prepare(model)
@@ -17,3 +17,35 @@ class EditEventResponseSchema(AliasedBaseModel):
     output_snapshot: dict[str, Any] | None = None
     status: str
     created_at: datetime
+
+
+class OperationLatencySchema(AliasedBaseModel):
+    """Latency percentiles of one timing phase of one operation type."""
+
+    operation_type: str
+    phase: str
+    events: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class RenderJobSchema(AliasedBaseModel):
+    """A render queued with ?job=true; id is its EditEvent's id.
+
+    state is "queued" until a worker claims the job, "running" while it
+    renders, then "succeeded" or "failed" like status. output_snapshot carries
+    {"image_id"} once it succeeded.
+    """
+
+    id: uuid.UUID
+    operation_type: str
+    target_type: str
+    target_id: uuid.UUID
+    status: str
+    state: str
+    attempts: int
+    queued_at: datetime
+    started_at: datetime | None = None
+    output_snapshot: dict[str, Any] | None = None
+    timings: dict[str, float] | None = None
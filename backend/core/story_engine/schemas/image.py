@@ -1,8 +1,20 @@
 import uuid
 from datetime import datetime
+from enum import StrEnum
+
+from pydantic import Field
 
 from core.common import AliasedBaseModel
 
+# Most image ids one POST /images/signed-urls call may ask for.
+MAX_SIGNED_URL_BATCH = 100
+
+
+class ImageInclude(StrEnum):
+    """Optional extras an image-listing endpoint embeds with ?include=."""
+
+    SIGNED_URL = "signed_url"
+
 
 class ImageResponseSchema(AliasedBaseModel):
     id: uuid.UUID
@@ -13,8 +25,15 @@ class ImageResponseSchema(AliasedBaseModel):
     height: int
     size_bytes: int
     created_at: datetime
+    # Only set when the listing was asked for ?include=signed_url.
+    signed_url: str | None = None
+    signed_url_expires_at: datetime | None = None
 
 
 class ImageSignedUrlResponseSchema(AliasedBaseModel):
     url: str
     expires_at: datetime
+
+
+class ImageSignedUrlsRequest(AliasedBaseModel):
+    image_ids: list[uuid.UUID] = Field(min_length=1, max_length=MAX_SIGNED_URL_BATCH)
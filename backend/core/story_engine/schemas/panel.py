@@ -25,7 +25,7 @@ class PanelContentBase(AliasedBaseModel):
     Literal constraint built from the story's actual character slugs, so the
     LLM is forced to pick from the exact slugs stored in the DB.
 
-    Used as __base__ in create_model(...) calls inside PanelService.
+    Used as __base__ by the cached factories in schemas/constrained.py.
     """
 
     background: str
@@ -106,3 +106,24 @@ class PanelRenderEditRequest(AliasedBaseModel):
     instruction: str
     source_image_id: uuid.UUID
     reference_image_id: uuid.UUID | None = None
+
+
+class PanelsRenderRequest(AliasedBaseModel):
+    """Request body for POST .../panels/render.
+
+    panel_ids selects the panels to render; omitted, every generated panel
+    without a render is rendered.
+    """
+
+    panel_ids: list[uuid.UUID] | None = None
+
+
+class PanelRenderOutcomeSchema(AliasedBaseModel):
+    """One panel's result in the POST .../panels/render stream.
+
+    panel is set when the render succeeded, error when it failed.
+    """
+
+    panel_id: uuid.UUID
+    panel: PanelRenderReferencesSchema | None = None
+    error: str | None = None
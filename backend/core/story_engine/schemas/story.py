@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any
+from typing import Annotated, Any, Literal
 
 from pydantic import Field
 
@@ -34,3 +34,51 @@ class StoryUpdateSchema(AliasedBaseModel):
 
 class GenerateStoryRequest(AliasedBaseModel):
     story_prompt: str
+
+
+# ---------------------------------------------------------------------------
+# Diff-based refinement — instructor response models
+# ---------------------------------------------------------------------------
+
+
+class ReplaceSpanEdit(AliasedBaseModel):
+    """Replace the single occurrence of `find` inside one paragraph."""
+
+    op: Literal["replace_span"]
+    paragraph: int
+    find: str
+    replace: str
+
+
+class ReplaceParagraphEdit(AliasedBaseModel):
+    op: Literal["replace_paragraph"]
+    paragraph: int
+    text: str
+
+
+class InsertAfterParagraphEdit(AliasedBaseModel):
+    """Insert a new paragraph after `paragraph`; -1 inserts before the first."""
+
+    op: Literal["insert_after_paragraph"]
+    paragraph: int
+    text: str
+
+
+class DeleteParagraphEdit(AliasedBaseModel):
+    op: Literal["delete_paragraph"]
+    paragraph: int
+
+
+StoryEdit = Annotated[
+    ReplaceSpanEdit
+    | ReplaceParagraphEdit
+    | InsertAfterParagraphEdit
+    | DeleteParagraphEdit,
+    Field(discriminator="op"),
+]
+
+
+class StoryEditPlan(AliasedBaseModel):
+    """Edits against the paragraph-numbered story; numbers are pre-edit."""
+
+    edits: list[StoryEdit]
@@ -0,0 +1,125 @@
+"""
+Scene-bounded story segmentation for map-reduce panel extraction.
+
+Long stories are extracted as several concurrent LLM calls, one per segment,
+instead of one call that has to emit every panel (output latency grows with
+the panel count, and long stories hit the output-token ceiling).
+
+Segments are cut only at scene breaks — ornament lines such as `***` or
+`---`, markdown headings, "Chapter ..." / "Scene ..." lines — and whole scenes
+are packed greedily up to a target size. A scene is never split, so a scene
+longer than the target is a segment on its own, and a story with no scene
+breaks is a single segment (and so a single call).
+
+The LLM tends to redraw the last beat of one segment as the first panel of the
+next. stitch_segment_panels drops those boundary duplicates when merging.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from difflib import SequenceMatcher
+from typing import Protocol, TypeVar
+
+from .story_edits import split_paragraphs
+
+# A line that is only an ornament (***, * * *, ---, ~~~, ###, #) ends a scene
+# and is dropped; a heading starts one and is kept. Headings are markdown
+# headings or a short single "Chapter 3" / "Part IV: The Flood" line, so prose
+# that merely opens with "Part of him..." is not a break.
+_ORNAMENT = re.compile(r"^\s*([*#~=\-]\s*){1,}\s*$")
+_HEADING = re.compile(
+    r"^\s*(#{1,6}\s+\S"
+    r"|(chapter|scene|part)\s+(\d+|[ivxlc]+|one|two|three|four|five|six|seven"
+    r"|eight|nine|ten|eleven|twelve)\b[^\n]{0,60}$)",
+    re.IGNORECASE,
+)
+
+# Panels within this many positions of a segment boundary are compared.
+BOUNDARY_WINDOW = 2
+# Background similarity at or above which two boundary panels are one beat.
+DUPLICATE_BACKGROUND_RATIO = 0.8
+
+
+class PanelLike(Protocol):
+    background: str
+    dialogue: str
+    characters: list[str]
+
+
+P = TypeVar("P", bound=PanelLike)
+
+
+def _scenes(text: str) -> list[list[str]]:
+    """Group paragraphs into scenes, splitting at ornaments and headings."""
+    scenes: list[list[str]] = [[]]
+    for paragraph in split_paragraphs(text):
+        if _ORNAMENT.match(paragraph):
+            scenes.append([])
+            continue
+        if _HEADING.match(paragraph) and scenes[-1]:
+            scenes.append([])
+        scenes[-1].append(paragraph)
+    return [scene for scene in scenes if scene]
+
+
+def split_story_into_segments(text: str, target_chars: int) -> list[str]:
+    """Split text at scene breaks into segments of roughly target_chars each.
+
+    Whole scenes are packed up to target_chars; a longer scene is its own
+    segment. Text without scene breaks comes back as one segment.
+    """
+    segments: list[str] = []
+    current: list[str] = []
+    for scene in _scenes(text):
+        block = "\n\n".join(scene)
+        if current and len("\n\n".join([*current, block])) > target_chars:
+            segments.append("\n\n".join(current))
+            current = []
+        current.append(block)
+    if current:
+        segments.append("\n\n".join(current))
+    return segments
+
+
+def segment_context(segment: str, max_chars: int = 600) -> str:
+    """The closing paragraph of a segment, given to the next one for continuity."""
+    paragraphs = split_paragraphs(segment)
+    return paragraphs[-1][-max_chars:] if paragraphs else ""
+
+
+def _normalise(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _is_same_beat(a: PanelLike, b: PanelLike) -> bool:
+    if set(a.characters) != set(b.characters):
+        return False
+    dialogue_a, dialogue_b = _normalise(a.dialogue), _normalise(b.dialogue)
+    if dialogue_a and dialogue_a == dialogue_b:
+        return True
+    if dialogue_a != dialogue_b:
+        return False
+    ratio = SequenceMatcher(
+        None, _normalise(a.background), _normalise(b.background)
+    ).ratio()
+    return ratio >= DUPLICATE_BACKGROUND_RATIO
+
+
+def stitch_segment_panels(segment_panels: Sequence[Sequence[P]]) -> list[P]:
+    """Concatenate per-segment panels in order, dropping boundary duplicates.
+
+    The first BOUNDARY_WINDOW panels of each segment are dropped if they match
+    one of the last BOUNDARY_WINDOW panels already merged: same characters and
+    either the same non-empty dialogue or, with no dialogue on either, nearly
+    the same background.
+    """
+    merged: list[P] = []
+    for panels in segment_panels:
+        tail = merged[-BOUNDARY_WINDOW:]
+        for index, panel in enumerate(panels):
+            if index < BOUNDARY_WINDOW and any(_is_same_beat(t, panel) for t in tail):
+                continue
+            merged.append(panel)
+    return merged
@@ -1,13 +1,17 @@
 from .character_service import CharacterService
+from .edit_event_service import EditEventService
 from .image_service import ImageService
 from .panel_service import PanelService
 from .project_service import ProjectService
+from .render_job_service import RenderJobService
 from .story_service import StoryService
 
 __all__ = [
     "CharacterService",
+    "EditEventService",
     "ImageService",
     "PanelService",
     "ProjectService",
+    "RenderJobService",
     "StoryService",
 ]
@@ -1,19 +1,27 @@
 import json
 import textwrap
-import time
 import uuid
+from collections.abc import AsyncIterator
 from io import BytesIO
 from typing import Any, Callable, cast
 
-import httpx
 from fal_client.client import Status
 from fastapi import UploadFile
 from loguru import logger
+from openai.types.chat import ChatCompletionMessageParam
 from slugify import slugify
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.infrastructure.intelligence import instructor_client
+from core.infrastructure.database import pipeline
+from core.infrastructure.intelligence import (
+    instructor_client,
+    layered_messages,
+    prompt_site,
+)
+from core.infrastructure.intelligence.media_download import fetch_generated_image
 from core.infrastructure.intelligence.media_generator import fal_async_client
+from core.infrastructure.llm_cache.service import cached_completion
+from core.infrastructure.phase_timings import PhaseTimings, TimingPhase
 
 from ..exceptions import (
     CharacterExtractorError,
@@ -22,14 +30,15 @@ from ..exceptions import (
     NoStoryTextError,
     NotFoundError,
 )
-from ..models import Character, EditEvent
+from ..models import Character, EditEvent, Story
 from ..models import Image as ImageModel
 from ..models.edit_event import (
     EditEventOperationType,
     EditEventStatus,
     EditEventTargetType,
 )
-from ..models.image import ImageContentType, ImageDiscriminatorKey
+from ..models.image import ImageDiscriminatorKey
+from ..pagination import Cursor, Page
 from ..repository import NotFoundError as RepositoryNotFoundError
 from ..repository import Repository
 from ..schemas.character import CharacterAttributesSchema as CharacterAttributes
@@ -38,7 +47,9 @@ from .image_service import (
     ImageService,
     extract_image_dimensions,
     get_gcs_upload_service,
+    image_content_type,
 )
+from .story_digest_service import StoryDigestService, character_story_context
 
 
 class CharacterService:
@@ -52,48 +63,53 @@ class CharacterService:
         self.image_service = image_service or ImageService(
             db=self.db, repository=self.repository
         )
+        self.story_digests = StoryDigestService(db_session)
 
-    def _build_character_refinement_prompt(
+    def _character_refinement_messages(
         self,
-        story_text: str,
+        story_context: str,
         character_attributes: dict[str, object],
         user_instruction: str,
-    ) -> str:
+    ) -> list[ChatCompletionMessageParam]:
         serialized_character = json.dumps(
             character_attributes, indent=2, sort_keys=True
         )
-        return textwrap.dedent(f"""
-            You are refining a character profile for a comic rendering system.
-            Preserve the character's identity unless the instruction explicitly asks you to change it.
-            Return a complete character profile with all fields filled in.
-
-            User instruction:
-            {user_instruction}
-
-            Story context:
-            {story_text}
-
-            Current character profile:
-            {serialized_character}
-        """).strip()
+        # Story first, instruction last: the story is the cacheable prefix.
+        return layered_messages(
+            system=textwrap.dedent("""
+                You refine character profiles for a comic generation pipeline.
+                Preserve the character's identity unless the instruction explicitly asks you to change it.
+                Return a complete character profile with all fields filled in.
+            """).strip(),
+            context=f"Story context:\n{story_context}",
+            instruction=(
+                f"Current character profile:\n{serialized_character}"
+                f"\n\nUser instruction:\n{user_instruction}"
+            ),
+        )
 
     async def get_character_history(
-        self, character_id: uuid.UUID, limit: int = 20
-    ) -> list[EditEvent]:
-        return await self.repository.edit_event.get_edit_events_for_target(
+        self, character_id: uuid.UUID, limit: int = 20, cursor: str | None = None
+    ) -> Page[EditEvent]:
+        events = await self.repository.edit_event.get_edit_events_for_target(
             target_type=EditEventTargetType.CHARACTER,
             target_id=character_id,
-            limit=limit,
+            limit=limit + 1,
+            before=Cursor.from_token(cursor),
         )
+        return Page.from_rows(events, limit)
 
     async def get_character_renders(
         self,
         project_id: uuid.UUID,
         story_id: uuid.UUID,
         character_id: uuid.UUID,
-    ) -> list[ImageModel]:
-        """Return all character_render Image rows for a character, newest first.
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Page[ImageModel]:
+        """Return one page of character_render Image rows, newest first.
 
+        With limit None every render is returned as a single page.
         Raises NotFoundError if the character does not exist in the story.
         project_id is included in the signature for consistency with other
         character service methods, though the character → story → project
@@ -106,10 +122,13 @@ class CharacterService:
             raise NotFoundError(
                 f"Character {character_id} not found in story {story_id}"
             )
-        return await self.repository.image.get_renders_for_target(
+        renders = await self.repository.image.get_renders_for_target(
             target_id=character_id,
             discriminator_key=ImageDiscriminatorKey.CHARACTER_RENDER,
+            limit=None if limit is None else limit + 1,
+            before=Cursor.from_token(cursor),
         )
+        return Page.from_rows(renders, limit)
 
     async def get_canonical_character_render(
         self, character_id: uuid.UUID
@@ -120,13 +139,16 @@ class CharacterService:
         Falls back to the most recent CHARACTER_RENDER image by created_at when
         canonical_render_id is NULL (covers existing characters and the period
         before the user has explicitly chosen one).
+
+        Goes through the request-scoped loaders, so concurrent calls for many
+        characters (asyncio.gather) are served by one query per step.
         """
-        character = await self.repository.character.get_character_by_id(character_id)
+        loaders = self.repository.loaders
+        character = await loaders.character.load(character_id)
         if character is not None and character.canonical_render_id is not None:
-            return await self.repository.image.get_image(character.canonical_render_id)
-        return await self.repository.image.get_canonical_render(
-            target_id=character_id,
-            discriminator_key=ImageDiscriminatorKey.CHARACTER_RENDER,
+            return await loaders.image.load(character.canonical_render_id)
+        return await loaders.canonical_render.load(
+            (character_id, ImageDiscriminatorKey.CHARACTER_RENDER)
         )
 
     async def get_character_reference_images(
@@ -137,7 +159,9 @@ class CharacterService:
         No ownership check — callers are responsible for verifying character
         access before calling this method.
         """
-        return await self.repository.image.get_character_reference_images(character_id)
+        return await self.repository.loaders.images_for_target.load(
+            (character_id, ImageDiscriminatorKey.CHARACTER_REFERENCE)
+        )
 
     async def set_canonical_render(
         self,
@@ -197,18 +221,9 @@ class CharacterService:
     async def extract_characters_from_story(
         self, project_id: uuid.UUID, story_id: uuid.UUID
     ) -> list[Character]:
-        story = await self.repository.story.get_story(project_id, story_id)
-        if story is None:
-            raise NotFoundError(f"Story {story_id} not found")
+        story_text = await self._get_story_text_for_extraction(project_id, story_id)
 
-        if story.story_text.strip() == "":
-            raise NoStoryTextError(
-                f"Story {story_id} has no text, generate story first to extract characters"
-            )
-
-        extracted_characters = await self._extract_characters_from_story(
-            story.story_text
-        )
+        extracted_characters = await self._extract_characters_from_story(story_text)
 
         # store characters in db
         characters = [
@@ -229,56 +244,114 @@ class CharacterService:
 
         return list(created_characters)
 
+    async def stream_extract_characters_from_story(
+        self, project_id: uuid.UUID, story_id: uuid.UUID
+    ) -> AsyncIterator[Character]:
+        """Streaming extract_characters_from_story: yields each character once saved.
+
+        Validation runs before this returns, so NotFoundError / NoStoryTextError
+        surface as exceptions rather than mid-stream. Each character is
+        committed before it is yielded.
+        """
+        story_text = await self._get_story_text_for_extraction(project_id, story_id)
+        return self._stream_and_persist_characters(story_id, story_text)
+
+    async def _stream_and_persist_characters(
+        self, story_id: uuid.UUID, story_text: str
+    ) -> AsyncIterator[Character]:
+        async for c in self._stream_characters_from_story(story_text):
+            character = Character(
+                story_id=story_id,
+                name=c.name,
+                slug=slugify(c.name),
+                attributes=c.model_dump(),
+            )
+            await self.repository.character.bulk_create_characters([character])
+            await self.db.commit()
+            yield character
+
+    async def _get_story_text_for_extraction(
+        self, project_id: uuid.UUID, story_id: uuid.UUID
+    ) -> str:
+        story = await self.repository.story.get_story(project_id, story_id)
+        if story is None:
+            raise NotFoundError(f"Story {story_id} not found")
+
+        if story.story_text.strip() == "":
+            raise NoStoryTextError(
+                f"Story {story_id} has no text, generate story first to extract characters"
+            )
+        return story.story_text
+
     async def _extract_characters_from_story(
         self, story_text: str
     ) -> list[CharacterAttributes]:
         try:
-            response = await instructor_client.chat.completions.create(
-                model="gpt-4o",
-                response_model=list[CharacterAttributes],
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a comic book writer. You will be given a story and you will need to extract the characters who affect the flow of the story.",
-                    },
-                    {"role": "user", "content": story_text},
-                ],
-            )
+            with prompt_site("character.extract"):
+                response = await cached_completion(
+                    model="gpt-4o",
+                    response_model=list[CharacterAttributes],
+                    messages=self._character_extraction_messages(story_text),
+                )
         except Exception as e:
             raise CharacterExtractorError(f"Error extracting characters: {e}") from e
 
         return response
 
+    async def _stream_characters_from_story(
+        self, story_text: str
+    ) -> AsyncIterator[CharacterAttributes]:
+        """Streaming _extract_characters_from_story via instructor's iterable mode."""
+        try:
+            async for character in instructor_client.chat.completions.create_iterable(
+                model="gpt-4o",
+                response_model=CharacterAttributes,
+                messages=self._character_extraction_messages(story_text),
+            ):
+                yield character
+        except Exception as e:
+            raise CharacterExtractorError(f"Error extracting characters: {e}") from e
+
+    def _character_extraction_messages(
+        self, story_text: str
+    ) -> list[ChatCompletionMessageParam]:
+        return layered_messages(
+            system="You are a comic book writer. You will be given a story and you will need to extract the characters who affect the flow of the story.",
+            context=story_text,
+        )
+
     async def _refine_character_profile(
         self,
-        story_text: str,
+        story_context: str,
         character_id: uuid.UUID,
         character_attributes: dict[str, object],
         instruction: str,
     ) -> CharacterAttributes:
-        prompt = self._build_character_refinement_prompt(
-            story_text, character_attributes, instruction
+        messages = self._character_refinement_messages(
+            story_context, character_attributes, instruction
         )
         try:
-            return await instructor_client.chat.completions.create(
-                model="gpt-4o",
-                response_model=CharacterAttributes,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You refine character profiles for a comic generation "
-                            "pipeline. Return the full updated profile."
-                        ),
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-            )
+            with prompt_site("character.refine"):
+                return await cached_completion(
+                    model="gpt-4o",
+                    response_model=CharacterAttributes,
+                    bypass_cache=True,
+                    messages=messages,
+                )
         except Exception as e:
             raise CharacterRefinementError(
                 f"Error refining character {character_id}: {e}"
             ) from e
 
+    async def _story_context_for_character(
+        self, story: Story, character_names: list[str]
+    ) -> str:
+        """Digest-based context for long stories; the full text otherwise."""
+        digest = await self.story_digests.get_digest(story)
+        if digest is None:
+            return story.story_text
+        return character_story_context(story.story_text, digest, character_names)
+
     async def get_story_characters(
         self, project_id: uuid.UUID, story_id: uuid.UUID
     ) -> list[Character]:
@@ -286,7 +359,12 @@ class CharacterService:
         if story is None:
             raise NotFoundError(f"Story {story_id} not found")
 
-        return await self.repository.character.get_all_characters_for_a_story(story_id)
+        characters = await self.repository.character.get_all_characters_for_a_story(
+            story_id
+        )
+        for character in characters:
+            self.repository.loaders.character.prime(character.id, character)
+        return characters
 
     async def get_character(
         self, project_id: uuid.UUID, story_id: uuid.UUID, character_id: uuid.UUID
@@ -333,42 +411,49 @@ class CharacterService:
         character_id: uuid.UUID,
         instruction: str,
     ) -> Character:
-        story = await self.repository.story.get_story(project_id, story_id)
-        if story is None:
-            raise NotFoundError(f"Story {story_id} not found")
-
-        # extract fields before they expire (ORM cost)
-        story_text = story.story_text
+        timings = PhaseTimings()
+        with timings.phase(TimingPhase.DB):
+            story = await self.repository.story.get_story(project_id, story_id)
+            if story is None:
+                raise NotFoundError(f"Story {story_id} not found")
 
-        character = await self.repository.character.get_character(
-            character_id, story_id
-        )
-        if character is None:
-            raise NotFoundError(
-                f"Character {character_id} not found in story {story_id}"
+            character = await self.repository.character.get_character(
+                character_id, story_id
             )
+            if character is None:
+                raise NotFoundError(
+                    f"Character {character_id} not found in story {story_id}"
+                )
 
-        # extract fields before they expire (ORM cost)
-        character_current_attributes = dict(character.attributes)
+            # extract fields before they expire (ORM cost)
+            character_current_attributes = dict(character.attributes)
+            character_names = [character.name, character.slug]
 
-        # TX1: create edit event
-        edit_event = await self.repository.edit_event.create_edit_event(
-            project_id=project_id,
-            target_type=EditEventTargetType.CHARACTER,
-            target_id=character_id,
-            operation_type=EditEventOperationType.REFINE_CHARACTER,
-            user_instruction=instruction,
-            input_snapshot=character_current_attributes,
-        )
-        await self.db.flush()  # assigns DB-generated id
-        edit_event_id = edit_event.id
-        await self.db.commit()
+            # TX1: create edit event
+            edit_event = await self.repository.edit_event.create_edit_event(
+                project_id=project_id,
+                target_type=EditEventTargetType.CHARACTER,
+                target_id=character_id,
+                operation_type=EditEventOperationType.REFINE_CHARACTER,
+                user_instruction=instruction,
+                input_snapshot=character_current_attributes,
+            )
+            await self.db.flush()  # assigns DB-generated id
+            edit_event_id = edit_event.id
+            await self.db.commit()
 
         try:
-            # External work: LLM refinement
-            refined_profile = await self._refine_character_profile(
-                story_text, character_id, character_current_attributes, instruction
-            )
+            # External work: story digest (cached per story version) + LLM refinement
+            with timings.phase(TimingPhase.LLM):
+                story_context = await self._story_context_for_character(
+                    story, character_names
+                )
+                refined_profile = await self._refine_character_profile(
+                    story_context,
+                    character_id,
+                    character_current_attributes,
+                    instruction,
+                )
             refined_attributes = refined_profile.model_dump()
 
             # TX2: persist refined attributes + complete edit event atomically
@@ -385,6 +470,7 @@ class CharacterService:
                     edit_event_id,
                     EditEventStatus.SUCCEEDED,
                     output_snapshot=refined_character.attributes,
+                    timings=timings.as_dict(),
                 )
             await self.db.commit()
 
@@ -398,7 +484,7 @@ class CharacterService:
             return refreshed_character
         except Exception:
             await self.repository.edit_event.update_edit_event(
-                edit_event_id, EditEventStatus.FAILED
+                edit_event_id, EditEventStatus.FAILED, timings=timings.as_dict()
             )
             await self.db.commit()
             raise
@@ -426,28 +512,27 @@ class CharacterService:
         Style: modern comic book illustration, sharp line art, subtle halftone texture, high detail, consistent lighting.
         """).strip()
 
-    async def _generate_image_render_response_and_time(
+    async def _generate_image_render_response(
         self,
         prompt: str,
         on_queue_update: Callable[[Status], None] | None = None,
+        timings: PhaseTimings | None = None,
     ) -> dict[str, Any]:
-        start = time.perf_counter()
         try:
-            response = await fal_async_client.subscribe(
-                arguments={
-                    "prompt": prompt,
-                },
-                on_queue_update=on_queue_update
-                or (lambda status: print(f"Status: {status}")),
-            )
+            with prompt_site("character.render"):
+                response = await fal_async_client.subscribe(
+                    arguments={
+                        "prompt": prompt,
+                    },
+                    on_queue_update=on_queue_update
+                    or (lambda status: logger.debug(f"Fal status: {status}")),
+                    timings=timings,
+                )
             return response
         except Exception as e:
             raise FalResponseError(
                 f"Error generating image render response: {e}"
             ) from e
-        finally:
-            end = time.perf_counter()
-            logger.info(f"Time taken: {end - start} seconds")
 
     def _get_character_url_from_fal_client_response(self, response: dict) -> str:
         try:
@@ -468,57 +553,53 @@ class CharacterService:
         project_id: uuid.UUID,
         story_id: uuid.UUID,
         character_id: uuid.UUID,
+        edit_event_id: uuid.UUID | None = None,
     ) -> tuple[Character, ImageModel]:
-        character = await self.repository.character.get_character(
-            character_id, story_id
-        )
-        if character is None:
-            raise NotFoundError(
-                f"Character {character_id} not found in story {story_id}"
-            )
+        """Render a character via fal and store the image in GCS.
 
-        # Snapshot attributes before external work
-        character_attributes = dict(character.attributes)
+        edit_event_id: a queued render job's PENDING event to record the render
+        on (see RenderJobService), instead of creating one.
+        """
+        timings = PhaseTimings()
+        with timings.phase(TimingPhase.DB):
+            character = await self.repository.character.get_character(
+                character_id, story_id
+            )
+            if character is None:
+                raise NotFoundError(
+                    f"Character {character_id} not found in story {story_id}"
+                )
 
-        # TX1: create edit event
-        edit_event = EditEvent.create_edit_event(
-            project_id=project_id,
-            target_type=EditEventTargetType.CHARACTER,
-            target_id=character_id,
-            operation_type=EditEventOperationType.RENDER_CHARACTER,
-            user_instruction="",
-            status=EditEventStatus.PENDING,
-        )
-        await self.repository.edit_event.add_edit_event_to_db(edit_event)
-        await self.db.flush()
-        edit_event_id = edit_event.id
-        await self.db.commit()
+            # Snapshot attributes before external work
+            character_attributes = dict(character.attributes)
+
+            # TX1: create edit event (a queued job brings its own)
+            if edit_event_id is None:
+                edit_event = EditEvent.create_edit_event(
+                    project_id=project_id,
+                    target_type=EditEventTargetType.CHARACTER,
+                    target_id=character_id,
+                    operation_type=EditEventOperationType.RENDER_CHARACTER,
+                    user_instruction="",
+                    status=EditEventStatus.PENDING,
+                )
+                await self.repository.edit_event.add_edit_event_to_db(edit_event)
+                await self.db.flush()
+                edit_event_id = edit_event.id
+            await self.db.commit()
 
         try:
             prompt = self._build_character_render_prompt(character_attributes)
-            render_response = await self._generate_image_render_response_and_time(
-                prompt
-            )
+            render_response = await self._generate_image_render_response(prompt)
             fal_image_url = self._get_character_url_from_fal_client_response(
                 render_response
             )
 
             # Download fal output bytes — fal URLs expire, we store in GCS for durability
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(fal_image_url)
-                resp.raise_for_status()
-                image_bytes = BytesIO(resp.content)
-                content_length = len(resp.content)
-                # Detect content type from response header, default to JPEG
-                raw_content_type = (
-                    resp.headers.get("content-type", "image/jpeg").split(";")[0].strip()
-                )
-                valid_content_types = {ct.value for ct in ImageContentType}
-                content_type = (
-                    ImageContentType(raw_content_type)
-                    if raw_content_type in valid_content_types
-                    else ImageContentType.JPEG
-                )
+            image = await fetch_generated_image(fal_image_url, timings=timings)
+            image_bytes = BytesIO(image.content)
+            content_length = len(image.content)
+            content_type = image_content_type(image.media_type)
 
             # Parse dimensions from the image header (PIL lazy-open, < 1ms).
             # Raises if fal returned malformed bytes — propagates to FAILED edit event.
@@ -529,7 +610,8 @@ class CharacterService:
             object_key = character_render_key(
                 user_id, project_id, story_id, character_id, edit_event_id
             )
-            receipt = gcs_service.upload(object_key, image_bytes, content_type)
+            with timings.phase(TimingPhase.UPLOAD):
+                receipt = gcs_service.upload(object_key, image_bytes, content_type)
 
             # Create Image row in the image table (Decision 5)
             image_model = ImageModel.create(
@@ -545,33 +627,29 @@ class CharacterService:
                 discriminator_key=ImageDiscriminatorKey.CHARACTER_RENDER,
                 meta={},
             )
-            await self.repository.image.create_image(image_model)
-            await self.db.flush()
-
-            # TX2: persist image row, set canonical, complete edit event atomically
-            await self.repository.character.set_canonical_render(
+            # TX2: persist image row, set canonical, complete edit event atomically.
+            # The INSERT and the edit-event UPDATE go out as one pipelined batch;
+            # set_canonical_render's UPDATE ... RETURNING yields the fresh character.
+            async with pipeline(self.db):
+                await self.repository.image.create_image(image_model)
+                await self.db.flush()
+                await self.repository.edit_event.set_edit_event_status(
+                    edit_event_id,
+                    EditEventStatus.SUCCEEDED,
+                    output_snapshot={"image_id": str(image_model.id)},
+                    timings=timings.as_dict(),
+                )
+            refreshed_character = await self.repository.character.set_canonical_render(
                 character_id, story_id, image_model.id
             )
-            await self.repository.edit_event.update_edit_event(
-                edit_event_id,
-                EditEventStatus.SUCCEEDED,
-                output_snapshot={"image_id": str(image_model.id)},
-            )
             await self.db.commit()
-            await self.db.refresh(image_model)
-
-            refreshed_character = await self.repository.character.get_character(
-                character_id, story_id
-            )
-            if refreshed_character is None:
-                raise NotFoundError(
-                    f"Character {character_id} not found in story {story_id}"
-                )
             return refreshed_character, image_model
 
         except Exception:
-            await self.repository.edit_event.update_edit_event(
-                edit_event_id, EditEventStatus.FAILED
+            # Discard any half-written TX2 (image row, canonical pointer) first.
+            await self.db.rollback()
+            await self.repository.edit_event.set_edit_event_status(
+                edit_event_id, EditEventStatus.FAILED, timings=timings.as_dict()
             )
             await self.db.commit()
             raise
@@ -601,6 +679,7 @@ class CharacterService:
         instruction: str,
         source_image_id: uuid.UUID,
         reference_image_id: uuid.UUID | None = None,
+        edit_event_id: uuid.UUID | None = None,
     ) -> ImageModel:
         """Edit an existing character render via fal image-edit model.
 
@@ -614,88 +693,93 @@ class CharacterService:
         POST .../upload-reference-image, which creates its own UPLOAD_REFERENCE_IMAGE
         edit event and persists the image row. That image will continue to appear in
         the character's referenceImages list after this call.
+
+        edit_event_id: as for render_character; the event's input_snapshot is
+        replaced with the one recorded here.
         """
-        character = (
-            await self.repository.character.get_character_for_user_in_project_and_story(
+        timings = PhaseTimings()
+        with timings.phase(TimingPhase.DB):
+            character = await self.repository.character.get_character_for_user_in_project_and_story(
                 user_id=user_id,
                 project_id=project_id,
                 story_id=story_id,
                 character_id=character_id,
             )
-        )
-        if character is None:
-            raise NotFoundError(
-                f"Character {character_id} not found for user {user_id} in project {project_id}"
-            )
-
-        source_image = await self.repository.image.get_image(source_image_id)
-        if source_image is None or source_image.target_id != character_id:
-            raise NotFoundError(
-                f"Source image {source_image_id} not found for character {character_id}"
-            )
-
-        gcs_service = get_gcs_upload_service()
-        source_signed_url, _ = gcs_service.generate_signed_url(source_image.object_key)
-        image_urls = [source_signed_url]
-
-        input_snapshot: dict[str, str] = {"source_image_id": str(source_image_id)}
+            if character is None:
+                raise NotFoundError(
+                    f"Character {character_id} not found for user {user_id} in project {project_id}"
+                )
 
-        if reference_image_id is not None:
-            reference_image = await self.repository.image.get_image(reference_image_id)
-            if reference_image is None or reference_image.target_id != character_id:
+            source_image = await self.repository.image.get_image(source_image_id)
+            if source_image is None or source_image.target_id != character_id:
                 raise NotFoundError(
-                    f"Reference image {reference_image_id} not found for character {character_id}"
+                    f"Source image {source_image_id} not found for character {character_id}"
                 )
-            reference_signed_url, _ = gcs_service.generate_signed_url(
-                reference_image.object_key
+
+            gcs_service = get_gcs_upload_service()
+            source_signed_url, _ = gcs_service.generate_signed_url(
+                source_image.object_key
             )
-            image_urls.append(reference_signed_url)
-            input_snapshot["reference_image_id"] = str(reference_image_id)
+            image_urls = [source_signed_url]
 
-        edit_event = EditEvent.create_edit_event(
-            project_id=project_id,
-            target_type=EditEventTargetType.CHARACTER,
-            target_id=character_id,
-            operation_type=EditEventOperationType.RENDER_CHARACTER_EDIT,
-            user_instruction=instruction,
-            input_snapshot=input_snapshot,
-            status=EditEventStatus.PENDING,
-        )
-        await self.repository.edit_event.add_edit_event_to_db(edit_event)
-        await self.db.flush()
-        edit_event_id = edit_event.id
-        await self.db.commit()
+            input_snapshot: dict[str, str] = {"source_image_id": str(source_image_id)}
+
+            if reference_image_id is not None:
+                reference_image = await self.repository.image.get_image(
+                    reference_image_id
+                )
+                if reference_image is None or reference_image.target_id != character_id:
+                    raise NotFoundError(
+                        f"Reference image {reference_image_id} not found for character {character_id}"
+                    )
+                reference_signed_url, _ = gcs_service.generate_signed_url(
+                    reference_image.object_key
+                )
+                image_urls.append(reference_signed_url)
+                input_snapshot["reference_image_id"] = str(reference_image_id)
+
+            if edit_event_id is None:
+                edit_event = EditEvent.create_edit_event(
+                    project_id=project_id,
+                    target_type=EditEventTargetType.CHARACTER,
+                    target_id=character_id,
+                    operation_type=EditEventOperationType.RENDER_CHARACTER_EDIT,
+                    user_instruction=instruction,
+                    input_snapshot=input_snapshot,
+                    status=EditEventStatus.PENDING,
+                )
+                await self.repository.edit_event.add_edit_event_to_db(edit_event)
+                await self.db.flush()
+                edit_event_id = edit_event.id
+            else:
+                await self.repository.edit_event.set_input_snapshot(
+                    edit_event_id, input_snapshot
+                )
+            await self.db.commit()
 
         try:
-            fal_response = await fal_async_client.subscribe(
-                arguments={"prompt": instruction, "image_urls": image_urls},
-                on_queue_update=lambda status: logger.info(f"Fal status: {status}"),
-            )
+            with prompt_site("character.render_edit"):
+                fal_response = await fal_async_client.subscribe(
+                    arguments={"prompt": instruction, "image_urls": image_urls},
+                    on_queue_update=lambda status: logger.info(f"Fal status: {status}"),
+                    timings=timings,
+                )
             fal_image_url = self._get_character_url_from_fal_client_response(
                 fal_response
             )
 
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(fal_image_url)
-                resp.raise_for_status()
-                image_bytes = BytesIO(resp.content)
-                content_length = len(resp.content)
-                raw_content_type = (
-                    resp.headers.get("content-type", "image/jpeg").split(";")[0].strip()
-                )
-                valid_content_types = {ct.value for ct in ImageContentType}
-                content_type = (
-                    ImageContentType(raw_content_type)
-                    if raw_content_type in valid_content_types
-                    else ImageContentType.JPEG
-                )
+            image = await fetch_generated_image(fal_image_url, timings=timings)
+            image_bytes = BytesIO(image.content)
+            content_length = len(image.content)
+            content_type = image_content_type(image.media_type)
 
             width, height = extract_image_dimensions(image_bytes)
 
             object_key = character_render_key(
                 user_id, project_id, story_id, character_id, edit_event_id
             )
-            receipt = gcs_service.upload(object_key, image_bytes, content_type)
+            with timings.phase(TimingPhase.UPLOAD):
+                receipt = gcs_service.upload(object_key, image_bytes, content_type)
 
             image_model = ImageModel.create(
                 project_id=project_id,
@@ -710,24 +794,26 @@ class CharacterService:
                 discriminator_key=ImageDiscriminatorKey.CHARACTER_RENDER,
                 meta={},
             )
-            await self.repository.image.create_image(image_model)
-            await self.db.flush()
-
+            async with pipeline(self.db):
+                await self.repository.image.create_image(image_model)
+                await self.db.flush()
+                await self.repository.edit_event.set_edit_event_status(
+                    edit_event_id,
+                    EditEventStatus.SUCCEEDED,
+                    output_snapshot={"image_id": str(image_model.id)},
+                    timings=timings.as_dict(),
+                )
             await self.repository.character.set_canonical_render(
                 character_id, story_id, image_model.id
             )
-            await self.repository.edit_event.update_edit_event(
-                edit_event_id,
-                EditEventStatus.SUCCEEDED,
-                output_snapshot={"image_id": str(image_model.id)},
-            )
             await self.db.commit()
-            await self.db.refresh(image_model)
             return image_model
 
         except Exception:
-            await self.repository.edit_event.update_edit_event(
-                edit_event_id, EditEventStatus.FAILED
+            # Discard any half-written TX2 (image row, canonical pointer) first.
+            await self.db.rollback()
+            await self.repository.edit_event.set_edit_event_status(
+                edit_event_id, EditEventStatus.FAILED, timings=timings.as_dict()
             )
             await self.db.commit()
             raise
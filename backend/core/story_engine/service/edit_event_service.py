@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.edit_event import EditEventOperationType, EditEventStatus
+from ..repository import Repository
+from ..repository.edit_event_repository import OperationLatency
+
+
+class EditEventService:
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+        self.repository = Repository(db_session)
+
+    async def get_operation_latency(
+        self,
+        user_id: uuid.UUID,
+        since: datetime,
+        until: datetime,
+        operation_type: EditEventOperationType | None = None,
+        status: EditEventStatus | None = EditEventStatus.SUCCEEDED,
+    ) -> list[OperationLatency]:
+        """p50/p95/p99 per operation type and timing phase over [since, until)."""
+        return await self.repository.edit_event.get_operation_latency(
+            user_id, since, until, operation_type=operation_type, status=status
+        )
@@ -205,6 +205,8 @@ class ExportService:
     ) -> list[tuple[Panel, ImageModel]]:
         """Return panels with canonical renders, ordered by order_index.
 
+        Uses PanelService.get_panels, so the lookup costs a fixed number of
+        queries however many panels the story has.
         Raises ExportError listing all positions missing a render.
         """
         pairs = await self.panel_service.get_panels(project_id, story_id)
@@ -214,7 +216,7 @@ class ExportService:
                 f"Panels at positions {missing} have no render — "
                 "render all panels before exporting"
             )
-        return [(p, r) for p, r in pairs]
+        return [(p, r) for p, r in pairs if r is not None]
 
     async def export_as_zip(self, project_id: uuid.UUID, story_id: uuid.UUID) -> bytes:
         pairs = await self._get_panels_for_export(project_id, story_id)
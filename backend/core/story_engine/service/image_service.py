@@ -1,6 +1,8 @@
+import asyncio
 import datetime
+import threading
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from functools import lru_cache
 from io import BytesIO
@@ -33,6 +35,7 @@ from ..models import (
     Image as ImageModel,
 )
 from ..repository import Repository
+from ..signed_url_cache import CREDENTIAL_REFRESHES, SignedUrlCache
 from ..storage_keys import character_reference_key, panel_reference_key
 
 ORIGINAL_QUALITY = 90
@@ -41,6 +44,14 @@ IMAGE_CONTENT_TYPE = ImageContentType.JPEG
 SIGNED_URL_EXPIRY_MINUTES = 60
 
 
+def image_content_type(media_type: str) -> ImageContentType:
+    """The ImageContentType for a Content-Type media type; JPEG if unrecognised."""
+    valid_content_types = {ct.value for ct in ImageContentType}
+    if media_type in valid_content_types:
+        return ImageContentType(media_type)
+    return ImageContentType.JPEG
+
+
 def extract_image_dimensions(image_bytes: BytesIO) -> tuple[int, int]:
     """Read width and height from image bytes using PIL header parsing.
 
@@ -213,6 +224,37 @@ class ImageService:
         url, expires_at = self.gcs_upload_service.generate_signed_url(image.object_key)
         return url, expires_at
 
+    async def get_signed_urls(
+        self,
+        image_ids: list[uuid.UUID],
+        user_id: uuid.UUID,
+    ) -> dict[uuid.UUID, tuple[str, datetime.datetime]]:
+        """Batch get_signed_url: one ownership query, then concurrent signing.
+
+        Images that do not exist or belong to another user are left out of the
+        result rather than failing the batch.
+        """
+        images = await self.repository.image.get_user_images_by_ids(image_ids, user_id)
+        signed = await self.sign_object_keys(image.object_key for image in images)
+        return {image.id: signed[image.object_key] for image in images}
+
+    async def sign_object_keys(
+        self, object_keys: Iterable[str]
+    ) -> dict[str, tuple[str, datetime.datetime]]:
+        """Signed URLs for already-authorised object keys, signed concurrently.
+
+        Cache hits return at once; a miss may be a remote IAM signBlob call,
+        so each signing runs in a worker thread instead of on the event loop.
+        """
+        keys = list(dict.fromkeys(object_keys))
+        urls = await asyncio.gather(
+            *(
+                asyncio.to_thread(self.gcs_upload_service.generate_signed_url, key)
+                for key in keys
+            )
+        )
+        return dict(zip(keys, urls))
+
     async def _get_authorized_character(
         self,
         user_id: uuid.UUID,
@@ -299,6 +341,13 @@ class GCSUploadService:
             credentials=self.credentials,
         )
         self.bucket = self.client.bucket(settings.gcp_storage_bucket)
+        self.signed_urls = SignedUrlCache(
+            settings.signed_url_cache_size,
+            datetime.timedelta(seconds=settings.signed_url_cache_margin_seconds),
+        )
+        # Signing runs in worker threads (ImageService.sign_object_keys); one
+        # thread refreshes the shared token while the others wait for it.
+        self.credentials_lock = threading.Lock()
 
     def upload(
         self, object_key: str, file_object: BinaryIO, content_type: ImageContentType
@@ -320,6 +369,12 @@ class GCSUploadService:
         return self.bucket.blob(object_key).download_as_bytes()  # type: ignore[no-any-return]
 
     def generate_signed_url(self, object_key: str) -> tuple[str, datetime.datetime]:
+        """A V4 GET URL for object_key, reused from self.signed_urls when fresh."""
+        return self.signed_urls.get_or_sign(
+            object_key, lambda: self._sign_url(object_key)
+        )
+
+    def _sign_url(self, object_key: str) -> tuple[str, datetime.datetime]:
         expiry = datetime.timedelta(minutes=SIGNED_URL_EXPIRY_MINUTES)
         blob = self.bucket.blob(object_key)
 
@@ -335,12 +390,18 @@ class GCSUploadService:
         # Requires roles/iam.serviceAccountTokenCreator on the SA (iam.py).
         extra: dict = {}
         if not hasattr(self.credentials, "sign_bytes"):
-            # Refresh to ensure token and service_account_email are populated.
-            self.credentials.refresh(Request())
-            extra = {
-                "service_account_email": self.credentials.service_account_email,
-                "access_token": self.credentials.token,
-            }
+            # The first refresh populates token and service_account_email.
+            # After that `valid` stays true until the token is within
+            # google-auth's refresh threshold of expiry, so the blocking
+            # metadata-server round trip happens about once per token.
+            with self.credentials_lock:
+                if not self.credentials.valid:
+                    self.credentials.refresh(Request())
+                    CREDENTIAL_REFRESHES.inc()
+                extra = {
+                    "service_account_email": self.credentials.service_account_email,
+                    "access_token": self.credentials.token,
+                }
 
         url = blob.generate_signed_url(
             expiration=expiry,
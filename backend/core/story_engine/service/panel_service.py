@@ -5,20 +5,35 @@ Currently implements:
   - generate_panels: bulk generate all panels for a story from story text
   - generate_panel: single panel generate/regenerate
   - render_panel: render a panel image via fal
+  - render_story_panels: render many panels of a story concurrently
 """
 
+import asyncio
 import textwrap
+import time
 import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from io import BytesIO
-from typing import Any
+from itertools import chain
+from typing import Any, cast
 
-import httpx
 from fastapi import UploadFile
 from loguru import logger
+from openai.types.chat import ChatCompletionMessageParam
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.infrastructure.intelligence import instructor_client
+from core.config import settings
+from core.infrastructure.database import pipeline
+from core.infrastructure.intelligence import (
+    instructor_client,
+    layered_messages,
+    prompt_site,
+)
+from core.infrastructure.intelligence.media_download import fetch_generated_image
 from core.infrastructure.intelligence.media_generator import fal_async_client
+from core.infrastructure.llm_cache.service import cached_completion
+from core.infrastructure.phase_timings import PhaseTimings, TimingPhase
 
 from ..exceptions import (
     FalResponseError,
@@ -27,22 +42,53 @@ from ..exceptions import (
     NotFoundError,
     PanelAlreadyGeneratedError,
 )
-from ..models import EditEvent, Panel
+from ..models import EditEvent, Panel, Story
 from ..models.edit_event import (
     EditEventOperationType,
     EditEventStatus,
     EditEventTargetType,
 )
 from ..models.image import Image as ImageModel
-from ..models.image import ImageContentType, ImageDiscriminatorKey
+from ..models.image import ImageDiscriminatorKey
+from ..pagination import Cursor, Page
 from ..repository import Repository
-from ..schemas.panel import GeneratedPanelsResponse, PanelContent, PanelContentBase
+from ..schemas.constrained import (
+    constrained_panel_content_model,
+    constrained_panels_response_model,
+)
+from ..schemas.panel import GeneratedPanelsResponse, PanelContent
+from ..segmentation import (
+    segment_context,
+    split_story_into_segments,
+    stitch_segment_panels,
+)
 from ..storage_keys import panel_render_key
 from .image_service import (
     ImageService,
     extract_image_dimensions,
     get_gcs_upload_service,
+    image_content_type,
 )
+from .story_digest_service import StoryDigestService, panel_story_context
+
+
+@dataclass(slots=True)
+class PanelRenderOutcome:
+    """One panel's result from render_story_panels: panel and image, or error."""
+
+    panel_id: uuid.UUID
+    panel: Panel | None = None
+    image: ImageModel | None = None
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class _PanelRenderJob:
+    panel_id: uuid.UUID
+    edit_event_id: uuid.UUID
+    attributes: dict[str, Any]
+    image_urls: list[str]
+    timings: PhaseTimings
 
 
 class PanelService:
@@ -56,6 +102,7 @@ class PanelService:
         self.image_service = image_service or ImageService(
             db=self.db, repository=self.repository
         )
+        self.story_digests = StoryDigestService(db_session)
 
     # -----------------------------------------------------------------------
     # generate_panels (bulk)
@@ -70,6 +117,79 @@ class PanelService:
         Per Decision 9: each panel gets its own EditEvent(GENERATE_PANEL, SUCCEEDED).
         Per Decision 3: character slugs in LLM output are resolved to character UUIDs.
         """
+        timings = PhaseTimings()
+        with timings.phase(TimingPhase.DB):
+            story_text, slug_to_id = await self._load_panel_generation_inputs(
+                project_id, story_id
+            )
+
+        # Call LLM to get structured panel content
+        with timings.phase(TimingPhase.LLM):
+            generated = await self._extract_panels_from_story(
+                story_text, list(slug_to_id.keys())
+            )
+
+        # Every panel's event carries the timings of the whole batch.
+        panels = await self._persist_generated_panels(
+            project_id,
+            story_id,
+            generated.panels,
+            slug_to_id,
+            timings=timings.as_dict(),
+        )
+        await self.db.commit()
+        return panels
+
+    async def stream_generate_panels(
+        self, project_id: uuid.UUID, story_id: uuid.UUID
+    ) -> AsyncIterator[Panel]:
+        """Streaming generate_panels: yields each panel as soon as it is persisted.
+
+        Validation runs before this returns, so NotFoundError / NoStoryTextError /
+        NoCharactersError surface as exceptions rather than mid-stream. Each
+        panel is committed with its EditEvent and join rows before it is
+        yielded; if the LLM stream fails partway, the panels already yielded
+        stay persisted.
+        """
+        story_text, slug_to_id = await self._load_panel_generation_inputs(
+            project_id, story_id
+        )
+        return self._stream_and_persist_panels(
+            project_id, story_id, story_text, slug_to_id
+        )
+
+    async def _stream_and_persist_panels(
+        self,
+        project_id: uuid.UUID,
+        story_id: uuid.UUID,
+        story_text: str,
+        slug_to_id: dict[str, uuid.UUID],
+    ) -> AsyncIterator[Panel]:
+        order_index = 0
+        # A streamed panel's llm time is the wait since the previous panel.
+        waited_from = time.perf_counter()
+        async for panel_content in self._stream_panels_from_story(
+            story_text, list(slug_to_id.keys())
+        ):
+            timings = PhaseTimings(started=waited_from)
+            timings.add(TimingPhase.LLM, time.perf_counter() - waited_from)
+            [panel] = await self._persist_generated_panels(
+                project_id,
+                story_id,
+                [panel_content],
+                slug_to_id,
+                start_index=order_index,
+                timings=timings.as_dict(),
+            )
+            await self.db.commit()
+            order_index += 1
+            yield panel
+            waited_from = time.perf_counter()
+
+    async def _load_panel_generation_inputs(
+        self, project_id: uuid.UUID, story_id: uuid.UUID
+    ) -> tuple[str, dict[str, uuid.UUID]]:
+        """Return (story_text, slug → character id), validating both exist."""
         story = await self.repository.story.get_story(project_id, story_id)
         if story is None:
             raise NotFoundError(f"Story {story_id} not found")
@@ -91,28 +211,66 @@ class PanelService:
             raise NoCharactersError(
                 f"Story {story_id} has no characters — extract characters before generating panels"
             )
+        return story_text, slug_to_id
 
-        # Call LLM to get structured panel content
-        generated = await self._extract_panels_from_story(
-            story_text, list(slug_to_id.keys())
-        )
+    async def _persist_generated_panels(
+        self,
+        project_id: uuid.UUID,
+        story_id: uuid.UUID,
+        generated_panels: list[PanelContent],
+        slug_to_id: dict[str, uuid.UUID],
+        start_index: int = 0,
+        timings: dict[str, float] | None = None,
+    ) -> list[Panel]:
+        """Persist generated panels, their join rows and EditEvents in bulk.
+
+        IDs are assigned client-side so every row can be built up front; the
+        whole story then costs three multi-row INSERTs (edit_event, panel,
+        panel_character) instead of several round trips per panel. EditEvents
+        go first because panel.source_event_id references them.
+
+        Panels get order_index start_index, start_index + 1, ... so streamed
+        batches continue where the previous one stopped.
+        """
+        event_rows: list[dict[str, Any]] = []
+        panel_rows: list[dict[str, Any]] = []
+        join_pairs: list[tuple[uuid.UUID, uuid.UUID]] = []
+
+        for order_index, panel_content in enumerate(generated_panels, start_index):
+            panel_id = uuid.uuid4()
+            edit_event_id = uuid.uuid4()
+            attributes = {
+                "background": panel_content.background,
+                "dialogue": panel_content.dialogue,
+                "characters": panel_content.characters,
+            }
 
-        panels: list[Panel] = []
-        for order_index, panel_content in enumerate(generated.panels):
-            panel = Panel.create(
-                story_id=story_id,
-                order_index=order_index,
-                attributes={
-                    "background": panel_content.background,
-                    "dialogue": panel_content.dialogue,
-                    "characters": panel_content.characters,
-                },
+            # Per-panel EditEvent (Decision 9)
+            event_rows.append(
+                {
+                    "id": edit_event_id,
+                    "project_id": project_id,
+                    "target_type": EditEventTargetType.PANEL.value,
+                    "target_id": panel_id,
+                    "operation_type": EditEventOperationType.GENERATE_PANEL.value,
+                    "user_instruction": "",
+                    "status": EditEventStatus.SUCCEEDED.value,
+                    "output_snapshot": attributes,
+                    "timings": timings,
+                }
+            )
+            panel_rows.append(
+                {
+                    "id": panel_id,
+                    "story_id": story_id,
+                    "order_index": order_index,
+                    "attributes": attributes,
+                    "source_event_id": edit_event_id,
+                }
             )
-            await self.repository.panel.create_panel(panel)
-            await self.db.flush()  # assign panel.id before using it
 
-            # Resolve slugs to character IDs and create join rows (Decision 3)
-            for slug in panel_content.characters:
+            # Resolve slugs to character IDs for join rows (Decision 3)
+            for slug in dict.fromkeys(panel_content.characters):
                 character_id = slug_to_id.get(slug)
                 if character_id is None:
                     logger.warning(
@@ -120,33 +278,11 @@ class PanelService:
                         f"{story_id} characters — skipping join row"
                     )
                     continue
-                await self.repository.panel.create_panel_character(
-                    panel_id=panel.id, character_id=character_id
-                )
-
-            # Per-panel EditEvent (Decision 9)
-            edit_event = EditEvent.create_edit_event(
-                project_id=project_id,
-                target_type=EditEventTargetType.PANEL,
-                target_id=panel.id,
-                operation_type=EditEventOperationType.GENERATE_PANEL,
-                user_instruction="",
-                status=EditEventStatus.SUCCEEDED,
-                output_snapshot=panel.attributes,
-            )
-            await self.repository.edit_event.add_edit_event_to_db(edit_event)
-            await self.db.flush()
-
-            # Link panel to its source event
-            panel.source_event_id = edit_event.id
-            panels.append(panel)
-
-        await self.db.commit()
-
-        # Refresh all panels so their IDs and timestamps are up-to-date
-        for panel in panels:
-            await self.db.refresh(panel)
+                join_pairs.append((panel_id, character_id))
 
+        await self.repository.edit_event.bulk_create_edit_events(event_rows)
+        panels = await self.repository.panel.bulk_create_panels(panel_rows)
+        await self.repository.panel.bulk_create_panel_characters(join_pairs)
         return panels
 
     # -----------------------------------------------------------------------
@@ -168,56 +304,62 @@ class PanelService:
         Creates panel_character join rows for each character the LLM assigns,
         mirroring the bulk generate_panels flow.
         """
-        story = await self.repository.story.get_story(project_id, story_id)
-        if story is None:
-            raise NotFoundError(f"Story {story_id} not found")
-
-        panel = await self.repository.panel.get_panel(panel_id, story_id)
-        if panel is None:
-            raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
+        timings = PhaseTimings()
+        with timings.phase(TimingPhase.DB):
+            story = await self.repository.story.get_story(project_id, story_id)
+            if story is None:
+                raise NotFoundError(f"Story {story_id} not found")
+
+            panel = await self.repository.panel.get_panel(panel_id, story_id)
+            if panel is None:
+                raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
 
-        # Guard: first-generation only
-        if panel.attributes:
-            raise PanelAlreadyGeneratedError(
-                f"Panel {panel_id} already has content — use /refine to update it"
-            )
+            # Guard: first-generation only
+            if panel.attributes:
+                raise PanelAlreadyGeneratedError(
+                    f"Panel {panel_id} already has content — use /refine to update it"
+                )
 
-        # Load characters to build slug list for constrained LLM extraction
-        characters = await self.repository.character.get_all_characters_for_a_story(
-            story_id
-        )
-        slug_to_id: dict[str, uuid.UUID] = {c.slug: c.id for c in characters}
-        character_slugs = list(slug_to_id.keys())
-        if not character_slugs:
-            raise NoCharactersError(
-                f"Story {story_id} has no characters — extract characters before generating panels"
+            # Load characters to build slug list for constrained LLM extraction
+            characters = await self.repository.character.get_all_characters_for_a_story(
+                story_id
             )
+            slug_to_id: dict[str, uuid.UUID] = {c.slug: c.id for c in characters}
+            character_slugs = list(slug_to_id.keys())
+            if not character_slugs:
+                raise NoCharactersError(
+                    f"Story {story_id} has no characters — extract characters before generating panels"
+                )
 
-        # Snapshot order_index and story_text before any commit
-        panel_order_index = panel.order_index
-        story_text = story.story_text
+            # Snapshot order_index and panel count before any commit
+            panel_order_index = panel.order_index
+            panel_count = await self.repository.panel.count_panels_for_story(story_id)
 
-        # TX1: create PENDING edit event
-        edit_event = EditEvent.create_edit_event(
-            project_id=project_id,
-            target_type=EditEventTargetType.PANEL,
-            target_id=panel_id,
-            operation_type=EditEventOperationType.GENERATE_PANEL,
-            user_instruction="",
-            status=EditEventStatus.PENDING,
-            input_snapshot={},
-        )
-        await self.repository.edit_event.add_edit_event_to_db(edit_event)
-        await self.db.flush()
-        edit_event_id = edit_event.id
-        await self.db.commit()
+            # TX1: create PENDING edit event
+            edit_event = EditEvent.create_edit_event(
+                project_id=project_id,
+                target_type=EditEventTargetType.PANEL,
+                target_id=panel_id,
+                operation_type=EditEventOperationType.GENERATE_PANEL,
+                user_instruction="",
+                status=EditEventStatus.PENDING,
+                input_snapshot={},
+            )
+            await self.repository.edit_event.add_edit_event_to_db(edit_event)
+            await self.db.flush()
+            edit_event_id = edit_event.id
+            await self.db.commit()
 
         try:
-            panel_content = await self._generate_panel_first_time(
-                story_text=story_text,
-                order_index=panel_order_index,
-                character_slugs=character_slugs,
-            )
+            with timings.phase(TimingPhase.LLM):
+                story_context = await self._story_context_for_panel(
+                    story, panel_order_index, panel_count
+                )
+                panel_content = await self._generate_panel_first_time(
+                    story_context=story_context,
+                    order_index=panel_order_index,
+                    character_slugs=character_slugs,
+                )
             new_attributes = {
                 "background": panel_content.background,
                 "dialogue": panel_content.dialogue,
@@ -237,6 +379,7 @@ class PanelService:
                 edit_event_id,
                 EditEventStatus.SUCCEEDED,
                 output_snapshot=new_attributes,
+                timings=timings.as_dict(),
             )
             await self.db.commit()
             await self.db.refresh(panel)
@@ -244,7 +387,7 @@ class PanelService:
 
         except Exception:
             await self.repository.edit_event.update_edit_event(
-                edit_event_id, EditEventStatus.FAILED
+                edit_event_id, EditEventStatus.FAILED, timings=timings.as_dict()
             )
             await self.db.commit()
             raise
@@ -267,51 +410,54 @@ class PanelService:
         persists the updated attributes under a REFINE_PANEL edit event.
         Mirrors refine_character in character_service.py.
         """
-        story = await self.repository.story.get_story(project_id, story_id)
-        if story is None:
-            raise NotFoundError(f"Story {story_id} not found")
+        timings = PhaseTimings()
+        with timings.phase(TimingPhase.DB):
+            story = await self.repository.story.get_story(project_id, story_id)
+            if story is None:
+                raise NotFoundError(f"Story {story_id} not found")
+
+            panel = await self.repository.panel.get_panel(panel_id, story_id)
+            if panel is None:
+                raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
 
-        panel = await self.repository.panel.get_panel(panel_id, story_id)
-        if panel is None:
-            raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
+            input_attrs = dict(panel.attributes)
+            if not input_attrs:
+                raise NotFoundError(
+                    f"Panel {panel_id} has no content yet — generate it before refining"
+                )
 
-        input_attrs = dict(panel.attributes)
-        if not input_attrs:
-            raise NotFoundError(
-                f"Panel {panel_id} has no content yet — generate it before refining"
+            characters = await self.repository.character.get_all_characters_for_a_story(
+                story_id
             )
+            slug_to_id: dict[str, uuid.UUID] = {c.slug: c.id for c in characters}
+            character_slugs = list(slug_to_id.keys())
+            if not character_slugs:
+                raise NoCharactersError(
+                    f"Story {story_id} has no characters — extract characters first"
+                )
 
-        characters = await self.repository.character.get_all_characters_for_a_story(
-            story_id
-        )
-        slug_to_id: dict[str, uuid.UUID] = {c.slug: c.id for c in characters}
-        character_slugs = list(slug_to_id.keys())
-        if not character_slugs:
-            raise NoCharactersError(
-                f"Story {story_id} has no characters — extract characters first"
+            # TX1: create PENDING edit event
+            edit_event = EditEvent.create_edit_event(
+                project_id=project_id,
+                target_type=EditEventTargetType.PANEL,
+                target_id=panel_id,
+                operation_type=EditEventOperationType.REFINE_PANEL,
+                user_instruction=instruction,
+                status=EditEventStatus.PENDING,
+                input_snapshot=input_attrs,
             )
-
-        # TX1: create PENDING edit event
-        edit_event = EditEvent.create_edit_event(
-            project_id=project_id,
-            target_type=EditEventTargetType.PANEL,
-            target_id=panel_id,
-            operation_type=EditEventOperationType.REFINE_PANEL,
-            user_instruction=instruction,
-            status=EditEventStatus.PENDING,
-            input_snapshot=input_attrs,
-        )
-        await self.repository.edit_event.add_edit_event_to_db(edit_event)
-        await self.db.flush()
-        edit_event_id = edit_event.id
-        await self.db.commit()
+            await self.repository.edit_event.add_edit_event_to_db(edit_event)
+            await self.db.flush()
+            edit_event_id = edit_event.id
+            await self.db.commit()
 
         try:
-            panel_content = await self._regenerate_panel(
-                existing_attributes=input_attrs,
-                instruction=instruction,
-                character_slugs=character_slugs,
-            )
+            with timings.phase(TimingPhase.LLM):
+                panel_content = await self._regenerate_panel(
+                    existing_attributes=input_attrs,
+                    instruction=instruction,
+                    character_slugs=character_slugs,
+                )
             new_attributes = {
                 "background": panel_content.background,
                 "dialogue": panel_content.dialogue,
@@ -331,6 +477,7 @@ class PanelService:
                 edit_event_id,
                 EditEventStatus.SUCCEEDED,
                 output_snapshot=new_attributes,
+                timings=timings.as_dict(),
             )
             await self.db.commit()
             await self.db.refresh(panel)
@@ -338,48 +485,54 @@ class PanelService:
 
         except Exception:
             await self.repository.edit_event.update_edit_event(
-                edit_event_id, EditEventStatus.FAILED
+                edit_event_id, EditEventStatus.FAILED, timings=timings.as_dict()
             )
             await self.db.commit()
             raise
 
+    async def _story_context_for_panel(
+        self, story: Story, order_index: int, panel_count: int
+    ) -> str:
+        """Digest-based context for long stories; the full text otherwise."""
+        digest = await self.story_digests.get_digest(story)
+        if digest is None:
+            return story.story_text
+        return panel_story_context(story.story_text, digest, order_index, panel_count)
+
     async def _generate_panel_first_time(
-        self, story_text: str, order_index: int, character_slugs: list[str]
+        self, story_context: str, order_index: int, character_slugs: list[str]
     ) -> PanelContent:
         """LLM call for first-time single panel generation."""
-        from typing import Literal
-
-        from pydantic import create_model
-
-        CharacterSlug = Literal[tuple(character_slugs)]  # type: ignore[valid-type]
-        ConstrainedPanelContent = create_model(
-            "PanelContent",
-            __base__=PanelContentBase,
-            characters=(list[CharacterSlug], ...),  # type: ignore[valid-type]
+        ConstrainedPanelContent = constrained_panel_content_model(
+            frozenset(character_slugs)
         )
 
-        slug_list = ", ".join(character_slugs)
-        prompt = textwrap.dedent(f"""
-            You are a comic book artist. Generate a single comic panel for panel #{order_index + 1}.
-
-            Story:
-            {story_text}
-
-            Characters in this story (use exactly these slugs): {slug_list}
-
-            Return a single panel with background description, dialogue, and character slugs.
-        """).strip()
+        with prompt_site("panel.generate"):
+            return await instructor_client.chat.completions.create(
+                model="gpt-4o",
+                response_model=ConstrainedPanelContent,  # type: ignore[arg-type]
+                messages=self._single_panel_messages(
+                    story_context, order_index, character_slugs
+                ),
+            )
 
-        return await instructor_client.chat.completions.create(
-            model="gpt-4o",
-            response_model=ConstrainedPanelContent,  # type: ignore[arg-type]
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Generate a single comic panel from story context.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+    def _single_panel_messages(
+        self, story_context: str, order_index: int, character_slugs: list[str]
+    ) -> list[ChatCompletionMessageParam]:
+        slug_list = ", ".join(character_slugs)
+        # Story and slugs are shared by every panel of the story; only the
+        # panel number varies, so it comes last.
+        return layered_messages(
+            system=(
+                "You are a comic book artist. Generate a single comic panel from "
+                "story context. Return a single panel with background "
+                "description, dialogue, and character slugs."
+            ),
+            context=(
+                f"Story:\n{story_context}\n\n"
+                f"Characters in this story (use exactly these slugs): {slug_list}"
+            ),
+            instruction=f"Generate panel #{order_index + 1}.",
         )
 
     async def _regenerate_panel(
@@ -390,92 +543,160 @@ class PanelService:
     ) -> PanelContent:
         """LLM call for panel regeneration using existing attributes and instruction."""
         import json
-        from typing import Literal
 
-        from pydantic import create_model
-
-        CharacterSlug = Literal[tuple(character_slugs)]  # type: ignore[valid-type]
-        ConstrainedPanelContent = create_model(
-            "PanelContent",
-            __base__=PanelContentBase,
-            characters=(list[CharacterSlug], ...),  # type: ignore[valid-type]
+        ConstrainedPanelContent = constrained_panel_content_model(
+            frozenset(character_slugs)
         )
 
         slug_list = ", ".join(character_slugs)
-        prompt = textwrap.dedent(f"""
-            You are a comic book artist. Refine this panel based on the instruction.
+        messages = layered_messages(
+            system=(
+                "You are a comic book artist. Refine a comic panel based on an "
+                "instruction. Return the updated panel."
+            ),
+            context=f"Characters in this story (use exactly these slugs): {slug_list}",
+            instruction=(
+                f"Current panel:\n{json.dumps(existing_attributes, indent=2)}"
+                f"\n\nInstruction: {instruction}"
+            ),
+        )
 
-            Current panel:
-            {json.dumps(existing_attributes, indent=2)}
+        with prompt_site("panel.refine"):
+            return await cached_completion(
+                model="gpt-4o",
+                response_model=ConstrainedPanelContent,  # type: ignore[arg-type]
+                bypass_cache=True,
+                messages=messages,
+            )
 
-            Instruction: {instruction}
+    async def _extract_panels_from_story(
+        self, story_text: str, character_slugs: list[str]
+    ) -> GeneratedPanelsResponse:
+        """Call instructor to extract structured panel content from story text.
 
-            Characters in this story (use exactly these slugs): {slug_list}
+        Uses a runtime-constrained Pydantic model (cached per slug set) so the
+        LLM can only emit slugs that exist in the DB — prevents silent join-row
+        mismatches.
 
-            Return the updated panel.
-        """).strip()
+        Stories longer than PANEL_SEGMENTATION_THRESHOLD_CHARS that split into
+        more than one scene-bounded segment go through
+        _extract_panels_segmented instead of a single call.
+        """
+        if len(story_text) > settings.panel_segmentation_threshold_chars:
+            segments = split_story_into_segments(
+                story_text, settings.panel_segment_target_chars
+            )
+            if len(segments) > 1:
+                return await self._extract_panels_segmented(segments, character_slugs)
 
-        return await instructor_client.chat.completions.create(
-            model="gpt-4o",
-            response_model=ConstrainedPanelContent,  # type: ignore[arg-type]
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Refine a comic panel based on an instruction.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+        ConstrainedResponse = constrained_panels_response_model(
+            frozenset(character_slugs)
         )
 
-    async def _extract_panels_from_story(
-        self, story_text: str, character_slugs: list[str]
+        with prompt_site("panel.extract"):
+            return await cached_completion(
+                model="gpt-4o",
+                response_model=ConstrainedResponse,  # type: ignore[arg-type]
+                messages=self._panel_extraction_messages(story_text, character_slugs),
+            )
+
+    async def _extract_panels_segmented(
+        self, segments: list[str], character_slugs: list[str]
     ) -> GeneratedPanelsResponse:
-        """Call instructor to extract structured panel content from story text.
+        """Map-reduce extraction: one LLM call per segment, then stitch.
 
-        Builds a runtime-constrained Pydantic model so the LLM can only emit
-        slugs that exist in the DB — prevents silent join-row mismatches.
+        At most PANEL_SEGMENT_CONCURRENCY calls run at once. Each segment is
+        told its position and shown the previous segment's closing paragraph
+        so it neither restarts nor repeats the story; stitching drops any
+        boundary panel drawn twice anyway. A failed segment cancels the rest
+        and fails the whole extraction.
         """
-        from typing import Literal
+        ConstrainedResponse = constrained_panels_response_model(
+            frozenset(character_slugs)
+        )
+        semaphore = asyncio.Semaphore(settings.panel_segment_concurrency)
+
+        async def extract(index: int) -> list[PanelContent]:
+            messages = self._panel_extraction_messages(
+                segments[index],
+                character_slugs,
+                part=(index + 1, len(segments)),
+                context=segment_context(segments[index - 1]) if index else None,
+            )
+            async with semaphore:
+                with prompt_site("panel.extract"):
+                    response = await cached_completion(
+                        model="gpt-4o",
+                        response_model=ConstrainedResponse,
+                        messages=messages,
+                    )
+            return cast(GeneratedPanelsResponse, response).panels
 
-        from pydantic import create_model
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(extract(i)) for i in range(len(segments))]
 
-        CharacterSlug = Literal[tuple(character_slugs)]  # type: ignore[valid-type]
-        ConstrainedPanelContent = create_model(
-            "PanelContent",
-            __base__=PanelContentBase,
-            characters=(list[CharacterSlug], ...),  # type: ignore[valid-type]
+        segment_panels = [task.result() for task in tasks]
+        panels = stitch_segment_panels(segment_panels)
+        logger.info(
+            f"Segmented panel extraction: {len(segments)} segments, "
+            f"{sum(map(len, segment_panels))} panels, {len(panels)} after stitching"
         )
-        ConstrainedResponse = create_model(
-            "GeneratedPanelsResponse",
-            panels=(list[ConstrainedPanelContent], ...),  # type: ignore[valid-type]
+        return cast(GeneratedPanelsResponse, ConstrainedResponse(panels=panels))
+
+    async def _stream_panels_from_story(
+        self, story_text: str, character_slugs: list[str]
+    ) -> AsyncIterator[PanelContent]:
+        """Streaming _extract_panels_from_story: yields each panel once complete.
+
+        Uses instructor's iterable streaming over the same constrained panel
+        model and prompt. Not cached — the response arrives incrementally.
+        """
+        ConstrainedPanelContent = constrained_panel_content_model(
+            frozenset(character_slugs)
         )
+        async for panel in instructor_client.chat.completions.create_iterable(
+            model="gpt-4o",
+            response_model=ConstrainedPanelContent,
+            messages=self._panel_extraction_messages(story_text, character_slugs),
+        ):
+            yield panel  # type: ignore[misc]
 
+    def _panel_extraction_messages(
+        self,
+        story_text: str,
+        character_slugs: list[str],
+        part: tuple[int, int] | None = None,
+        context: str | None = None,
+    ) -> list[ChatCompletionMessageParam]:
+        """Extraction prompt; `part` and `context` are set for story segments."""
         slug_list = ", ".join(character_slugs)
-        prompt = textwrap.dedent(f"""
+        system = textwrap.dedent("""
+            You extract structured comic panel data from story text.
+            Return well-structured panel descriptions suitable for illustration.
             You are a comic book artist and writer.
-            Extract a list of comic book panels from the following story.
+            Extract a list of comic book panels from the story.
             For each panel provide:
               - background: a brief visual description of the setting/scene
               - dialogue: key spoken or thought dialogue in the panel (empty string if none)
-              - characters: list of character slugs who appear — choose only from: {slug_list}
-
-            Story:
-            {story_text}
+              - characters: list of character slugs who appear, chosen from the given list
         """).strip()
-
-        return await instructor_client.chat.completions.create(
-            model="gpt-4o",
-            response_model=ConstrainedResponse,  # type: ignore[arg-type]
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You extract structured comic panel data from story text. "
-                        "Return well-structured panel descriptions suitable for illustration."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
+        instruction = f"Choose character slugs only from: {slug_list}"
+        if part is not None:
+            index, total = part
+            instruction += (
+                f"\n\nThe story above is part {index} of {total} of a longer "
+                "story. Extract panels only for this part."
+            )
+            if context:
+                instruction += (
+                    " For continuity, the previous part ended with the passage "
+                    "below — do not create panels for it.\n\n"
+                    f"Previous part ended:\n{context}"
+                )
+        return layered_messages(
+            system=system,
+            context=f"Story:\n{story_text}",
+            instruction=instruction,
         )
 
     # -----------------------------------------------------------------------
@@ -491,12 +712,12 @@ class PanelService:
         to the most-recently created PANEL_RENDER image when the pointer is NULL.
         Mirrors get_canonical_character_render in character_service.py.
         """
-        panel = await self.repository.panel.get_panel_by_id(panel_id)
+        loaders = self.repository.loaders
+        panel = await loaders.panel.load(panel_id)
         if panel is not None and panel.canonical_render_id is not None:
-            return await self.repository.image.get_image(panel.canonical_render_id)
-        return await self.repository.image.get_canonical_render(
-            target_id=panel_id,
-            discriminator_key=ImageDiscriminatorKey.PANEL_RENDER,
+            return await loaders.image.load(panel.canonical_render_id)
+        return await loaders.canonical_render.load(
+            (panel_id, ImageDiscriminatorKey.PANEL_RENDER)
         )
 
     # -----------------------------------------------------------------------
@@ -579,7 +800,9 @@ class PanelService:
 
     async def get_panel_reference_images(self, panel_id: uuid.UUID) -> list[ImageModel]:
         """Return all PANEL_REFERENCE images for a panel, newest first."""
-        return await self.repository.image.get_panel_reference_images(panel_id)
+        return await self.repository.loaders.images_for_target.load(
+            (panel_id, ImageDiscriminatorKey.PANEL_REFERENCE)
+        )
 
     async def delete_reference_image(
         self,
@@ -617,25 +840,21 @@ class PanelService:
 
     async def get_panels(
         self, project_id: uuid.UUID, story_id: uuid.UUID
-    ) -> list[tuple[Panel, Any]]:
+    ) -> list[tuple[Panel, ImageModel | None]]:
         """Return all panels for a story with their canonical renders.
 
         Returns list[tuple[Panel, Image | None]] ordered by order_index.
+        Query count is fixed regardless of panel count: one join for explicit
+        canonical_render_id pointers plus one DISTINCT ON fallback query.
         """
-        from ..models.image import Image as ImageModel
-
         story = await self.repository.story.get_story(project_id, story_id)
         if story is None:
             raise NotFoundError(f"Story {story_id} not found")
 
-        panels = await self.repository.panel.get_panels_for_story(story_id)
-
-        result: list[tuple[Panel, ImageModel | None]] = []
-        for panel in panels:
-            render = await self.get_canonical_panel_render(panel.id)
-            result.append((panel, render))
-
-        return result
+        pairs = await self.repository.panel.get_panels_with_canonical_render_for_story(
+            story_id
+        )
+        return await self._resolve_fallback_renders(pairs)
 
     # -----------------------------------------------------------------------
     # get_panel (for Story 40)
@@ -643,19 +862,39 @@ class PanelService:
 
     async def get_panel(
         self, project_id: uuid.UUID, story_id: uuid.UUID, panel_id: uuid.UUID
-    ) -> tuple[Panel, Any]:
+    ) -> tuple[Panel, ImageModel | None]:
         """Return a single panel with its canonical render."""
 
         story = await self.repository.story.get_story(project_id, story_id)
         if story is None:
             raise NotFoundError(f"Story {story_id} not found")
 
-        panel = await self.repository.panel.get_panel(panel_id, story_id)
-        if panel is None:
+        pair = await self.repository.panel.get_panel_with_canonical_render(
+            panel_id, story_id
+        )
+        if pair is None:
             raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
 
-        render = await self.get_canonical_panel_render(panel_id)
-        return panel, render
+        [resolved] = await self._resolve_fallback_renders([pair])
+        return resolved
+
+    async def _resolve_fallback_renders(
+        self, pairs: list[tuple[Panel, ImageModel | None]]
+    ) -> list[tuple[Panel, ImageModel | None]]:
+        """Fill in the most recent PANEL_RENDER for panels with no canonical pointer.
+
+        Set-based counterpart of get_canonical_panel_render — all fallbacks are
+        resolved in a single query (none at all when every pointer is set).
+        """
+        missing = [panel.id for panel, render in pairs if render is None]
+        fallbacks = await self.repository.image.get_canonical_renders_for_targets(
+            target_ids=missing,
+            discriminator_key=ImageDiscriminatorKey.PANEL_RENDER,
+        )
+        return [
+            (panel, render if render is not None else fallbacks.get(panel.id))
+            for panel, render in pairs
+        ]
 
     # -----------------------------------------------------------------------
     # render_panel (Story 60)
@@ -667,6 +906,7 @@ class PanelService:
         project_id: uuid.UUID,
         story_id: uuid.UUID,
         panel_id: uuid.UUID,
+        edit_event_id: uuid.UUID | None = None,
     ) -> tuple[Panel, ImageModel]:
         """Render a panel image via fal and store in GCS.
 
@@ -678,134 +918,360 @@ class PanelService:
           5. Create Image row (target_id=panel_id, discriminator_key=panel_render).
           6. Create EditEvent(RENDER_PANEL, SUCCEEDED).
           7. Return (panel, image) — mirrors render_character return signature.
-        """
-        story = await self.repository.story.get_story(project_id, story_id)
-        if story is None:
-            raise NotFoundError(f"Story {story_id} not found")
 
-        panel = await self.repository.panel.get_panel(panel_id, story_id)
-        if panel is None:
-            raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
-
-        # Capture attribute values before any commit
-        panel_attributes = dict(panel.attributes)
+        edit_event_id: a queued render job's PENDING event to record the render
+        on (see RenderJobService), instead of creating one.
+        """
+        timings = PhaseTimings()
+        with timings.phase(TimingPhase.DB):
+            story = await self.repository.story.get_story(project_id, story_id)
+            if story is None:
+                raise NotFoundError(f"Story {story_id} not found")
+
+            panel = await self.repository.panel.get_panel(panel_id, story_id)
+            if panel is None:
+                raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
 
-        # TX1: create PENDING edit event
-        edit_event = EditEvent.create_edit_event(
-            project_id=project_id,
-            target_type=EditEventTargetType.PANEL,
-            target_id=panel_id,
-            operation_type=EditEventOperationType.RENDER_PANEL,
-            user_instruction="",
-            status=EditEventStatus.PENDING,
-        )
-        await self.repository.edit_event.add_edit_event_to_db(edit_event)
-        await self.db.flush()
-        edit_event_id = edit_event.id
-        await self.db.commit()
+            # Capture attribute values before any commit
+            panel_attributes = dict(panel.attributes)
+
+            # TX1: create PENDING edit event (a queued job brings its own)
+            if edit_event_id is None:
+                edit_event = EditEvent.create_edit_event(
+                    project_id=project_id,
+                    target_type=EditEventTargetType.PANEL,
+                    target_id=panel_id,
+                    operation_type=EditEventOperationType.RENDER_PANEL,
+                    user_instruction="",
+                    status=EditEventStatus.PENDING,
+                )
+                await self.repository.edit_event.add_edit_event_to_db(edit_event)
+                await self.db.flush()
+                edit_event_id = edit_event.id
+            await self.db.commit()
 
         try:
             # Resolve character renders for image_urls (Decision 16)
-            character_ids = await self.repository.panel.get_character_ids_for_panel(
-                panel_id
-            )
-            gcs_service = get_gcs_upload_service()
-            image_urls: list[str] = []
-            for character_id in character_ids:
-                character_render = await self.repository.image.get_canonical_render(
-                    target_id=character_id,
-                    discriminator_key=ImageDiscriminatorKey.CHARACTER_RENDER,
+            with timings.phase(TimingPhase.DB):
+                character_ids = await self.repository.panel.get_character_ids_for_panel(
+                    panel_id
                 )
-                if character_render is None:
-                    logger.warning(
-                        f"Character {character_id} has no canonical render — "
-                        f"skipping for panel {panel_id} render"
-                    )
-                    continue
-                # Build a signed URL for the character render
-                signed_url, _ = gcs_service.generate_signed_url(
-                    character_render.object_key
+                signed_urls = await self._signed_character_render_urls(character_ids)
+            image_urls = [
+                signed_urls[character_id]
+                for character_id in character_ids
+                if character_id in signed_urls
+            ]
+
+            image_model = await self._render_panel_image(
+                user_id,
+                project_id,
+                story_id,
+                panel_id,
+                edit_event_id,
+                panel_attributes,
+                image_urls,
+                timings,
+            )
+            refreshed_panel = await self._record_panel_render(
+                story_id, panel_id, edit_event_id, image_model, timings
+            )
+            return refreshed_panel, image_model
+
+        except Exception:
+            await self._fail_panel_render(edit_event_id, timings)
+            raise
+
+    async def _signed_character_render_urls(
+        self, character_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, str]:
+        """Signed URL of each character's canonical render, keyed by character.
+
+        Characters with no render are absent — the panel renders without them.
+        """
+        gcs_service = get_gcs_upload_service()
+        character_renders = await self.repository.loaders.canonical_render.load_many(
+            [
+                (character_id, ImageDiscriminatorKey.CHARACTER_RENDER)
+                for character_id in character_ids
+            ]
+        )
+        signed_urls: dict[uuid.UUID, str] = {}
+        for character_id, character_render in zip(character_ids, character_renders):
+            if character_render is None:
+                logger.warning(
+                    f"Character {character_id} has no canonical render — "
+                    f"skipping it for panel render"
                 )
-                image_urls.append(signed_url)
+                continue
+            signed_urls[character_id], _ = gcs_service.generate_signed_url(
+                character_render.object_key
+            )
+        return signed_urls
 
-            # Build fal prompt from panel attributes
-            prompt = self._build_panel_render_prompt(panel_attributes)
+    async def _render_panel_image(
+        self,
+        user_id: uuid.UUID,
+        project_id: uuid.UUID,
+        story_id: uuid.UUID,
+        panel_id: uuid.UUID,
+        edit_event_id: uuid.UUID,
+        panel_attributes: dict[str, Any],
+        image_urls: list[str],
+        timings: PhaseTimings,
+    ) -> ImageModel:
+        """Render via fal and store the bytes in GCS; returns the unsaved Image row.
+
+        Touches no database state, so batch renders can run it concurrently.
+        """
+        # Build fal prompt from panel attributes
+        prompt = self._build_panel_render_prompt(panel_attributes)
 
-            # Call fal
+        # Call fal
+        with prompt_site("panel.render"):
             fal_response = await fal_async_client.subscribe(
                 arguments={"prompt": prompt, "image_urls": image_urls},
                 on_queue_update=lambda status: logger.debug(f"Fal status: {status}"),
+                timings=timings,
             )
-            fal_image_url = self._extract_fal_image_url(fal_response)
+        fal_image_url = self._extract_fal_image_url(fal_response)
 
-            # Download fal bytes and upload to GCS
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(fal_image_url)
-                resp.raise_for_status()
-                image_bytes = BytesIO(resp.content)
-                content_length = len(resp.content)
-                raw_ct = (
-                    resp.headers.get("content-type", "image/jpeg").split(";")[0].strip()
-                )
-                valid_cts = {ct.value for ct in ImageContentType}
-                content_type = (
-                    ImageContentType(raw_ct)
-                    if raw_ct in valid_cts
-                    else ImageContentType.JPEG
-                )
+        # Download fal bytes and upload to GCS
+        image = await fetch_generated_image(fal_image_url, timings=timings)
+        image_bytes = BytesIO(image.content)
+        content_length = len(image.content)
+        content_type = image_content_type(image.media_type)
 
-            # Parse dimensions from the image header (PIL lazy-open, < 1ms).
-            # Raises if fal returned malformed bytes — propagates to FAILED edit event.
-            width, height = extract_image_dimensions(image_bytes)  # resets seek to 0
+        # Parse dimensions from the image header (PIL lazy-open, < 1ms).
+        # Raises if fal returned malformed bytes — propagates to FAILED edit event.
+        width, height = extract_image_dimensions(image_bytes)  # resets seek to 0
 
-            object_key = panel_render_key(
-                user_id, project_id, story_id, panel_id, edit_event_id
+        object_key = panel_render_key(
+            user_id, project_id, story_id, panel_id, edit_event_id
+        )
+        # upload blocks on the GCS client; a thread keeps the loop (and the
+        # other renders of a bulk batch) running meanwhile.
+        with timings.phase(TimingPhase.UPLOAD):
+            receipt = await asyncio.to_thread(
+                get_gcs_upload_service().upload, object_key, image_bytes, content_type
             )
-            receipt = gcs_service.upload(object_key, image_bytes, content_type)
 
-            # Create Image row
-            image_model = ImageModel.create(
-                project_id=project_id,
-                user_id=user_id,
-                target_id=panel_id,
-                width=width,
-                height=height,
-                content_type=content_type,
-                object_key=receipt.object_key,
-                bucket=receipt.bucket,
-                size_bytes=content_length,
-                discriminator_key=ImageDiscriminatorKey.PANEL_RENDER,
-                meta={},
-            )
+        return ImageModel.create(
+            project_id=project_id,
+            user_id=user_id,
+            target_id=panel_id,
+            width=width,
+            height=height,
+            content_type=content_type,
+            object_key=receipt.object_key,
+            bucket=receipt.bucket,
+            size_bytes=content_length,
+            discriminator_key=ImageDiscriminatorKey.PANEL_RENDER,
+            meta={},
+        )
+
+    async def _record_panel_render(
+        self,
+        story_id: uuid.UUID,
+        panel_id: uuid.UUID,
+        edit_event_id: uuid.UUID,
+        image_model: ImageModel,
+        timings: PhaseTimings,
+    ) -> Panel:
+        """TX2: store the render, mark the edit event SUCCEEDED, make it canonical."""
+        # Image row + SUCCEEDED edit event sent as one pipelined batch
+        async with pipeline(self.db):
             await self.repository.image.create_image(image_model)
             await self.db.flush()
-
-            # Auto-set canonical render pointer (no edit event — RENDER_PANEL records it)
-            await self.repository.panel.set_canonical_render(
-                panel_id, story_id, image_model.id
-            )
-
-            # TX2: complete edit event
-            await self.repository.edit_event.update_edit_event(
+            await self.repository.edit_event.set_edit_event_status(
                 edit_event_id,
                 EditEventStatus.SUCCEEDED,
                 output_snapshot={"image_id": str(image_model.id)},
+                timings=timings.as_dict(),
             )
-            await self.db.commit()
-            await self.db.refresh(image_model)
 
-            # Refresh panel so canonical_render_id is up-to-date
-            refreshed_panel = await self.repository.panel.get_panel(panel_id, story_id)
-            if refreshed_panel is None:
-                raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
-            return refreshed_panel, image_model
+        # Auto-set canonical render pointer (no edit event — RENDER_PANEL records
+        # it). UPDATE ... RETURNING hands back the up-to-date panel, and raises
+        # NotFoundError if the panel was deleted while fal was rendering.
+        refreshed_panel = await self.repository.panel.set_canonical_render(
+            panel_id, story_id, image_model.id
+        )
+        await self.db.commit()
+        return refreshed_panel
 
-        except Exception:
-            await self.repository.edit_event.update_edit_event(
-                edit_event_id, EditEventStatus.FAILED
+    async def _fail_panel_render(
+        self, edit_event_id: uuid.UUID, timings: PhaseTimings
+    ) -> None:
+        # Discard any half-written TX2 (image row, canonical pointer) first.
+        await self.db.rollback()
+        await self.repository.edit_event.set_edit_event_status(
+            edit_event_id, EditEventStatus.FAILED, timings=timings.as_dict()
+        )
+        await self.db.commit()
+
+    # -----------------------------------------------------------------------
+    # render_story_panels (bulk render)
+    # -----------------------------------------------------------------------
+
+    async def render_story_panels(
+        self,
+        user_id: uuid.UUID,
+        project_id: uuid.UUID,
+        story_id: uuid.UUID,
+        panel_ids: list[uuid.UUID] | None = None,
+    ) -> AsyncIterator[PanelRenderOutcome]:
+        """Render many panels at once; yields each panel as its render finishes.
+
+        Renders panel_ids, or every generated panel that has no render yet.
+        Character render URLs are signed once for the whole batch, and at most
+        settings.panel_render_concurrency fal calls run at a time, so N panels
+        take about ceil(N / concurrency) fal round trips instead of N.
+
+        Validation and the PENDING RENDER_PANEL edit events are committed before
+        this returns, so NotFoundError surfaces as an exception rather than
+        mid-stream. Each panel is then recorded exactly as render_panel records
+        it; a failed panel gets a FAILED edit event and an outcome carrying the
+        error, and the rest of the batch carries on.
+        """
+        setup_started = time.perf_counter()
+        story = await self.repository.story.get_story(project_id, story_id)
+        if story is None:
+            raise NotFoundError(f"Story {story_id} not found")
+
+        pairs = await self._resolve_fallback_renders(
+            await self.repository.panel.get_panels_with_canonical_render_for_story(
+                story_id
             )
-            await self.db.commit()
-            raise
+        )
+        if panel_ids is None:
+            panels = [
+                panel for panel, render in pairs if render is None and panel.attributes
+            ]
+        else:
+            panels_by_id = {panel.id: panel for panel, _ in pairs}
+            missing = [pid for pid in panel_ids if pid not in panels_by_id]
+            if missing:
+                raise NotFoundError(f"Panels {missing} not found in story {story_id}")
+            panels = [panels_by_id[pid] for pid in dict.fromkeys(panel_ids)]
+
+        character_ids_by_panel = (
+            await self.repository.panel.get_character_ids_for_panels(
+                [panel.id for panel in panels]
+            )
+        )
+        signed_urls = await self._signed_character_render_urls(
+            list(dict.fromkeys(chain.from_iterable(character_ids_by_panel.values())))
+        )
+
+        # TX1: one PENDING edit event per panel, in a single INSERT
+        events = await self.repository.edit_event.bulk_create_edit_events(
+            [
+                {
+                    "project_id": project_id,
+                    "target_type": EditEventTargetType.PANEL.value,
+                    "target_id": panel.id,
+                    "operation_type": EditEventOperationType.RENDER_PANEL.value,
+                    "user_instruction": "",
+                    "status": EditEventStatus.PENDING.value,
+                }
+                for panel in panels
+            ]
+        )
+        jobs = [
+            _PanelRenderJob(
+                panel_id=panel.id,
+                edit_event_id=event.id,
+                attributes=dict(panel.attributes),
+                image_urls=[
+                    signed_urls[character_id]
+                    for character_id in character_ids_by_panel[panel.id]
+                    if character_id in signed_urls
+                ],
+                timings=PhaseTimings(started=setup_started),
+            )
+            for panel, event in zip(panels, events)
+        ]
+        await self.db.commit()
+
+        # Every panel's timings start with the batch and share its setup time.
+        setup_seconds = time.perf_counter() - setup_started
+        for job in jobs:
+            job.timings.add(TimingPhase.DB, setup_seconds)
+        return self._render_panels_concurrently(user_id, project_id, story_id, jobs)
+
+    async def _render_panels_concurrently(
+        self,
+        user_id: uuid.UUID,
+        project_id: uuid.UUID,
+        story_id: uuid.UUID,
+        jobs: list[_PanelRenderJob],
+    ) -> AsyncIterator[PanelRenderOutcome]:
+        # fal, download and upload run concurrently; every database write stays
+        # on this generator, so the session is never used by two tasks at once.
+        slots = asyncio.Semaphore(settings.panel_render_concurrency)
+
+        async def render(job: _PanelRenderJob) -> ImageModel:
+            waited_from = time.perf_counter()
+            async with slots:
+                job.timings.add(
+                    TimingPhase.FAL_QUEUE, time.perf_counter() - waited_from
+                )
+                return await self._render_panel_image(
+                    user_id,
+                    project_id,
+                    story_id,
+                    job.panel_id,
+                    job.edit_event_id,
+                    job.attributes,
+                    job.image_urls,
+                    job.timings,
+                )
+
+        tasks = {asyncio.create_task(render(job)): job for job in jobs}
+        unfinished = set(tasks)
+        try:
+            while unfinished:
+                done, _ = await asyncio.wait(
+                    unfinished, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    outcome = await self._finish_panel_render(
+                        story_id, tasks[task], task
+                    )
+                    unfinished.discard(task)
+                    yield outcome
+        finally:
+            if unfinished:
+                # The consumer stopped early (client disconnected): abandon the
+                # renders still running rather than leave their events PENDING.
+                for task in unfinished:
+                    task.cancel()
+                await asyncio.gather(*unfinished, return_exceptions=True)
+                for task in unfinished:
+                    await self.repository.edit_event.set_edit_event_status(
+                        tasks[task].edit_event_id,
+                        EditEventStatus.FAILED,
+                        timings=tasks[task].timings.as_dict(),
+                    )
+                await self.db.commit()
+
+    async def _finish_panel_render(
+        self,
+        story_id: uuid.UUID,
+        job: _PanelRenderJob,
+        task: asyncio.Task[ImageModel],
+    ) -> PanelRenderOutcome:
+        """Record one finished batch render (or its failure) and build its outcome."""
+        try:
+            image_model = task.result()
+            panel = await self._record_panel_render(
+                story_id, job.panel_id, job.edit_event_id, image_model, job.timings
+            )
+        except Exception as e:
+            logger.exception(f"Batch render of panel {job.panel_id} failed: {e}")
+            await self._fail_panel_render(job.edit_event_id, job.timings)
+            return PanelRenderOutcome(panel_id=job.panel_id, error=str(e))
+        return PanelRenderOutcome(panel_id=job.panel_id, panel=panel, image=image_model)
 
     async def render_panel_edit(
         self,
@@ -816,6 +1282,7 @@ class PanelService:
         instruction: str,
         source_image_id: uuid.UUID,
         reference_image_id: uuid.UUID | None = None,
+        edit_event_id: uuid.UUID | None = None,
     ) -> ImageModel:
         """Edit an existing panel render via fal image-edit model.
 
@@ -827,108 +1294,123 @@ class PanelService:
         Side-effect note: if reference_image_id is provided it must already exist
         as a PANEL_RENDER image for this panel — upload or render it first via the
         appropriate endpoint. That image persists independently of this call.
+
+        edit_event_id: as for render_panel; the event's input_snapshot is
+        replaced with the one recorded here.
         """
-        story = await self.repository.story.get_story(project_id, story_id)
-        if story is None:
-            raise NotFoundError(f"Story {story_id} not found")
+        timings = PhaseTimings()
+        with timings.phase(TimingPhase.DB):
+            story = await self.repository.story.get_story(project_id, story_id)
+            if story is None:
+                raise NotFoundError(f"Story {story_id} not found")
+
+            panel = await self.repository.panel.get_panel(panel_id, story_id)
+            if panel is None:
+                raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
 
-        panel = await self.repository.panel.get_panel(panel_id, story_id)
-        if panel is None:
-            raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
+            source_image = await self.repository.image.get_image(source_image_id)
+            if source_image is None or source_image.target_id != panel_id:
+                raise NotFoundError(
+                    f"Source image {source_image_id} not found for panel {panel_id}"
+                )
 
-        source_image = await self.repository.image.get_image(source_image_id)
-        if source_image is None or source_image.target_id != panel_id:
-            raise NotFoundError(
-                f"Source image {source_image_id} not found for panel {panel_id}"
+            gcs_service = get_gcs_upload_service()
+            source_signed_url, _ = gcs_service.generate_signed_url(
+                source_image.object_key
             )
 
-        gcs_service = get_gcs_upload_service()
-        source_signed_url, _ = gcs_service.generate_signed_url(source_image.object_key)
+            # URL order: [source, ...character_renders, optional_reference]
+            # Source anchors the edit; character renders enforce consistency;
+            # optional reference acts as a style guide.
+            image_urls = [source_signed_url]
 
-        # URL order: [source, ...character_renders, optional_reference]
-        # Source anchors the edit; character renders enforce consistency;
-        # optional reference acts as a style guide.
-        image_urls = [source_signed_url]
-
-        # Resolve character renders — same block as render_panel
-        character_ids = await self.repository.panel.get_character_ids_for_panel(
-            panel_id
-        )
-        character_render_ids: list[str] = []
-        for character_id in character_ids:
-            character_render = await self.repository.image.get_canonical_render(
-                target_id=character_id,
-                discriminator_key=ImageDiscriminatorKey.CHARACTER_RENDER,
+            # Resolve character renders — same block as render_panel
+            character_ids = await self.repository.panel.get_character_ids_for_panel(
+                panel_id
             )
-            if character_render is None:
-                logger.warning(
-                    f"Character {character_id} has no canonical render — "
-                    f"skipping for panel {panel_id} render/edit"
-                )
-                continue
-            signed_url, _ = gcs_service.generate_signed_url(character_render.object_key)
-            image_urls.append(signed_url)
-            character_render_ids.append(str(character_render.id))
-
-        input_snapshot: dict[str, object] = {
-            "source_image_id": str(source_image_id),
-            "character_render_ids": character_render_ids,
-        }
-
-        if reference_image_id is not None:
-            reference_image = await self.repository.image.get_image(reference_image_id)
-            if reference_image is None or reference_image.target_id != panel_id:
-                raise NotFoundError(
-                    f"Reference image {reference_image_id} not found for panel {panel_id}"
+            character_render_ids: list[str] = []
+            character_renders = (
+                await self.repository.loaders.canonical_render.load_many(
+                    [
+                        (character_id, ImageDiscriminatorKey.CHARACTER_RENDER)
+                        for character_id in character_ids
+                    ]
                 )
-            reference_signed_url, _ = gcs_service.generate_signed_url(
-                reference_image.object_key
             )
-            image_urls.append(reference_signed_url)
-            input_snapshot["reference_image_id"] = str(reference_image_id)
+            for character_id, character_render in zip(character_ids, character_renders):
+                if character_render is None:
+                    logger.warning(
+                        f"Character {character_id} has no canonical render — "
+                        f"skipping for panel {panel_id} render/edit"
+                    )
+                    continue
+                signed_url, _ = gcs_service.generate_signed_url(
+                    character_render.object_key
+                )
+                image_urls.append(signed_url)
+                character_render_ids.append(str(character_render.id))
 
-        edit_event = EditEvent.create_edit_event(
-            project_id=project_id,
-            target_type=EditEventTargetType.PANEL,
-            target_id=panel_id,
-            operation_type=EditEventOperationType.RENDER_PANEL_EDIT,
-            user_instruction=instruction,
-            input_snapshot=input_snapshot,
-            status=EditEventStatus.PENDING,
-        )
-        await self.repository.edit_event.add_edit_event_to_db(edit_event)
-        await self.db.flush()
-        edit_event_id = edit_event.id
-        await self.db.commit()
+            input_snapshot: dict[str, object] = {
+                "source_image_id": str(source_image_id),
+                "character_render_ids": character_render_ids,
+            }
+
+            if reference_image_id is not None:
+                reference_image = await self.repository.image.get_image(
+                    reference_image_id
+                )
+                if reference_image is None or reference_image.target_id != panel_id:
+                    raise NotFoundError(
+                        f"Reference image {reference_image_id} not found for panel {panel_id}"
+                    )
+                reference_signed_url, _ = gcs_service.generate_signed_url(
+                    reference_image.object_key
+                )
+                image_urls.append(reference_signed_url)
+                input_snapshot["reference_image_id"] = str(reference_image_id)
+
+            if edit_event_id is None:
+                edit_event = EditEvent.create_edit_event(
+                    project_id=project_id,
+                    target_type=EditEventTargetType.PANEL,
+                    target_id=panel_id,
+                    operation_type=EditEventOperationType.RENDER_PANEL_EDIT,
+                    user_instruction=instruction,
+                    input_snapshot=input_snapshot,
+                    status=EditEventStatus.PENDING,
+                )
+                await self.repository.edit_event.add_edit_event_to_db(edit_event)
+                await self.db.flush()
+                edit_event_id = edit_event.id
+            else:
+                await self.repository.edit_event.set_input_snapshot(
+                    edit_event_id, input_snapshot
+                )
+            await self.db.commit()
 
         try:
-            fal_response = await fal_async_client.subscribe(
-                arguments={"prompt": instruction, "image_urls": image_urls},
-                on_queue_update=lambda status: logger.debug(f"Fal status: {status}"),
-            )
+            with prompt_site("panel.render_edit"):
+                fal_response = await fal_async_client.subscribe(
+                    arguments={"prompt": instruction, "image_urls": image_urls},
+                    on_queue_update=lambda status: logger.debug(
+                        f"Fal status: {status}"
+                    ),
+                    timings=timings,
+                )
             fal_image_url = self._extract_fal_image_url(fal_response)
 
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(fal_image_url)
-                resp.raise_for_status()
-                image_bytes = BytesIO(resp.content)
-                content_length = len(resp.content)
-                raw_ct = (
-                    resp.headers.get("content-type", "image/jpeg").split(";")[0].strip()
-                )
-                valid_cts = {ct.value for ct in ImageContentType}
-                content_type = (
-                    ImageContentType(raw_ct)
-                    if raw_ct in valid_cts
-                    else ImageContentType.JPEG
-                )
+            image = await fetch_generated_image(fal_image_url, timings=timings)
+            image_bytes = BytesIO(image.content)
+            content_length = len(image.content)
+            content_type = image_content_type(image.media_type)
 
             width, height = extract_image_dimensions(image_bytes)
 
             object_key = panel_render_key(
                 user_id, project_id, story_id, panel_id, edit_event_id
             )
-            receipt = gcs_service.upload(object_key, image_bytes, content_type)
+            with timings.phase(TimingPhase.UPLOAD):
+                receipt = gcs_service.upload(object_key, image_bytes, content_type)
 
             image_model = ImageModel.create(
                 project_id=project_id,
@@ -943,26 +1425,28 @@ class PanelService:
                 discriminator_key=ImageDiscriminatorKey.PANEL_RENDER,
                 meta={},
             )
-            await self.repository.image.create_image(image_model)
-            await self.db.flush()
+            async with pipeline(self.db):
+                await self.repository.image.create_image(image_model)
+                await self.db.flush()
+                await self.repository.edit_event.set_edit_event_status(
+                    edit_event_id,
+                    EditEventStatus.SUCCEEDED,
+                    output_snapshot={"image_id": str(image_model.id)},
+                    timings=timings.as_dict(),
+                )
 
             # Auto-set canonical render pointer (no edit event — RENDER_PANEL_EDIT records it)
             await self.repository.panel.set_canonical_render(
                 panel_id, story_id, image_model.id
             )
-
-            await self.repository.edit_event.update_edit_event(
-                edit_event_id,
-                EditEventStatus.SUCCEEDED,
-                output_snapshot={"image_id": str(image_model.id)},
-            )
             await self.db.commit()
-            await self.db.refresh(image_model)
             return image_model
 
         except Exception:
-            await self.repository.edit_event.update_edit_event(
-                edit_event_id, EditEventStatus.FAILED
+            # Discard any half-written TX2 (image row, canonical pointer) first.
+            await self.db.rollback()
+            await self.repository.edit_event.set_edit_event_status(
+                edit_event_id, EditEventStatus.FAILED, timings=timings.as_dict()
             )
             await self.db.commit()
             raise
@@ -1028,9 +1512,17 @@ class PanelService:
     # -----------------------------------------------------------------------
 
     async def get_panel_renders(
-        self, project_id: uuid.UUID, story_id: uuid.UUID, panel_id: uuid.UUID
-    ) -> list[ImageModel]:
-        """Return all render Image rows for a panel, newest first."""
+        self,
+        project_id: uuid.UUID,
+        story_id: uuid.UUID,
+        panel_id: uuid.UUID,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Page[ImageModel]:
+        """Return one page of render Image rows for a panel, newest first.
+
+        With limit None every render is returned as a single page.
+        """
         story = await self.repository.story.get_story(project_id, story_id)
         if story is None:
             raise NotFoundError(f"Story {story_id} not found")
@@ -1039,10 +1531,13 @@ class PanelService:
         if panel is None:
             raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
 
-        return await self.repository.image.get_renders_for_target(
+        renders = await self.repository.image.get_renders_for_target(
             target_id=panel_id,
             discriminator_key=ImageDiscriminatorKey.PANEL_RENDER,
+            limit=None if limit is None else limit + 1,
+            before=Cursor.from_token(cursor),
         )
+        return Page.from_rows(renders, limit)
 
     # -----------------------------------------------------------------------
     # get_panel_history (for Story 80)
@@ -1054,8 +1549,9 @@ class PanelService:
         story_id: uuid.UUID,
         panel_id: uuid.UUID,
         limit: int = 20,
-    ) -> list[EditEvent]:
-        """Return all edit events for a panel, ordered newest first."""
+        cursor: str | None = None,
+    ) -> Page[EditEvent]:
+        """Return one page of edit events for a panel, newest first."""
         story = await self.repository.story.get_story(project_id, story_id)
         if story is None:
             raise NotFoundError(f"Story {story_id} not found")
@@ -1064,8 +1560,10 @@ class PanelService:
         if panel is None:
             raise NotFoundError(f"Panel {panel_id} not found in story {story_id}")
 
-        return await self.repository.edit_event.get_edit_events_for_target(
+        events = await self.repository.edit_event.get_edit_events_for_target(
             target_type=EditEventTargetType.PANEL,
             target_id=panel_id,
-            limit=limit,
+            limit=limit + 1,
+            before=Cursor.from_token(cursor),
         )
+        return Page.from_rows(events, limit)
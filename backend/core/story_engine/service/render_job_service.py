@@ -0,0 +1,209 @@
+"""
+RenderJobService — renders queued to run outside the request that asked.
+
+A synchronous render holds its request, a DB session and a socket for the whole
+fal round trip. With ?job=true the render endpoints call enqueue_render
+instead: it validates the target, commits a PENDING EditEvent with
+job_queued_at set and returns it, and the endpoint answers 202 with its id.
+
+Workers (core.story_engine.render_jobs) take jobs with claim_next and hand
+them to run, which calls the same PanelService / CharacterService render the
+synchronous endpoint does, recording on the queued event rather than a new
+one. The event's status is the job's status; GET /v2/render-jobs/{id}
+reports it.
+"""
+
+import uuid
+from datetime import timedelta
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.common.utils import get_current_datetime_utc
+from core.config import settings
+
+from ..exceptions import NotFoundError
+from ..models import EditEvent, Project
+from ..models.edit_event import (
+    EditEventOperationType,
+    EditEventStatus,
+    EditEventTargetType,
+)
+from ..repository import Repository
+from .character_service import CharacterService
+from .panel_service import PanelService
+
+RENDER_JOB_OPERATIONS = {
+    EditEventOperationType.RENDER_PANEL: EditEventTargetType.PANEL,
+    EditEventOperationType.RENDER_PANEL_EDIT: EditEventTargetType.PANEL,
+    EditEventOperationType.RENDER_CHARACTER: EditEventTargetType.CHARACTER,
+    EditEventOperationType.RENDER_CHARACTER_EDIT: EditEventTargetType.CHARACTER,
+}
+
+
+class RenderJobService:
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+        self.repository = Repository(db_session)
+
+    async def enqueue_render(
+        self,
+        project_id: uuid.UUID,
+        story_id: uuid.UUID,
+        target_id: uuid.UUID,
+        operation: EditEventOperationType,
+        instruction: str = "",
+        source_image_id: uuid.UUID | None = None,
+        reference_image_id: uuid.UUID | None = None,
+    ) -> EditEvent:
+        """Queue a render of a panel or character; returns its PENDING event.
+
+        The same NotFoundErrors the synchronous render raises up front are
+        raised here, so a bad request never becomes a job.
+        """
+        target_type = RENDER_JOB_OPERATIONS[operation]
+        story = await self.repository.story.get_story(project_id, story_id)
+        if story is None:
+            raise NotFoundError(f"Story {story_id} not found")
+
+        target = (
+            await self.repository.panel.get_panel(target_id, story_id)
+            if target_type == EditEventTargetType.PANEL
+            else await self.repository.character.get_character(target_id, story_id)
+        )
+        if target is None:
+            raise NotFoundError(
+                f"{target_type.capitalize()} {target_id} not found in story {story_id}"
+            )
+
+        # The render re-reads these ids from input_snapshot when it runs.
+        input_snapshot: dict[str, str] = {}
+        for key, image_id in (
+            ("source_image_id", source_image_id),
+            ("reference_image_id", reference_image_id),
+        ):
+            if image_id is None:
+                continue
+            image = await self.repository.image.get_image(image_id)
+            if image is None or image.target_id != target_id:
+                raise NotFoundError(
+                    f"Image {image_id} not found for {target_type} {target_id}"
+                )
+            input_snapshot[key] = str(image_id)
+
+        edit_event = EditEvent.create_edit_event(
+            project_id=project_id,
+            target_type=target_type,
+            target_id=target_id,
+            operation_type=operation,
+            user_instruction=instruction,
+            input_snapshot=input_snapshot or None,
+            status=EditEventStatus.PENDING,
+        )
+        edit_event.job_queued_at = get_current_datetime_utc()
+        await self.repository.edit_event.add_edit_event_to_db(edit_event)
+        await self.db.commit()
+        return edit_event
+
+    async def get_render_job(self, user_id: uuid.UUID, job_id: uuid.UUID) -> EditEvent:
+        event = await self.repository.edit_event.get_edit_event_for_user(
+            job_id, user_id
+        )
+        if event is None or event.job_queued_at is None:
+            raise NotFoundError(f"Render job {job_id} not found")
+        return event
+
+    async def claim_next(self) -> EditEvent | None:
+        """Claim the oldest runnable job and commit the claim; None if idle."""
+        job = await self.repository.edit_event.claim_render_job(
+            timedelta(seconds=settings.render_job_lease_seconds)
+        )
+        await self.db.commit()
+        return job
+
+    async def run(self, job: EditEvent) -> None:
+        """Run a claimed job; its event ends SUCCEEDED or FAILED."""
+        if job.job_attempts > settings.render_job_max_attempts:
+            logger.error(
+                f"Render job {job.id} abandoned after {job.job_attempts - 1} attempts"
+            )
+            await self._mark_failed(job.id)
+            return
+        job_id = job.id  # rollback expires job
+        try:
+            await self._render(job)
+        except Exception as e:
+            logger.exception(f"Render job {job_id} failed: {e}")
+            # A render marks its own event FAILED once under way; this covers
+            # errors before that point, e.g. the target deleted while queued.
+            await self.db.rollback()
+            await self._mark_failed(job_id)
+
+    async def _mark_failed(self, job_id: uuid.UUID) -> None:
+        await self.repository.edit_event.set_edit_event_status(
+            job_id, EditEventStatus.FAILED
+        )
+        await self.db.commit()
+
+    async def _render(self, job: EditEvent) -> None:
+        project = await self.db.get(Project, job.project_id)
+        if project is None:
+            raise NotFoundError(f"Project {job.project_id} not found")
+        operation = EditEventOperationType(job.operation_type)
+        snapshot = job.input_snapshot or {}
+        source_image_id = snapshot.get("source_image_id")
+        reference_image_id = snapshot.get("reference_image_id")
+
+        if RENDER_JOB_OPERATIONS[operation] == EditEventTargetType.PANEL:
+            panel = await self.repository.panel.get_panel_by_id(job.target_id)
+            if panel is None:
+                raise NotFoundError(f"Panel {job.target_id} not found")
+            panels = PanelService(self.db)
+            if operation == EditEventOperationType.RENDER_PANEL:
+                await panels.render_panel(
+                    project.user_id,
+                    job.project_id,
+                    panel.story_id,
+                    panel.id,
+                    edit_event_id=job.id,
+                )
+            else:
+                await panels.render_panel_edit(
+                    project.user_id,
+                    job.project_id,
+                    panel.story_id,
+                    panel.id,
+                    instruction=job.user_instruction,
+                    source_image_id=uuid.UUID(source_image_id),
+                    reference_image_id=(
+                        uuid.UUID(reference_image_id) if reference_image_id else None
+                    ),
+                    edit_event_id=job.id,
+                )
+            return
+
+        character = await self.repository.character.get_character_by_id(job.target_id)
+        if character is None:
+            raise NotFoundError(f"Character {job.target_id} not found")
+        characters = CharacterService(self.db)
+        if operation == EditEventOperationType.RENDER_CHARACTER:
+            await characters.render_character(
+                project.user_id,
+                job.project_id,
+                character.story_id,
+                character.id,
+                edit_event_id=job.id,
+            )
+        else:
+            await characters.render_character_edit(
+                project.user_id,
+                job.project_id,
+                character.story_id,
+                character.id,
+                instruction=job.user_instruction,
+                source_image_id=uuid.UUID(source_image_id),
+                reference_image_id=(
+                    uuid.UUID(reference_image_id) if reference_image_id else None
+                ),
+                edit_event_id=job.id,
+            )
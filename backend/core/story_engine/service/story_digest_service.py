@@ -0,0 +1,228 @@
+"""Per-version story digests for prompts that do not need the whole story.
+
+Character refinement and single-panel generation used to paste the full
+story_text into every prompt, so one editing session re-sent the same
+multi-thousand-token story dozens of times. A digest — a short summary, a
+scene index and the paragraphs each character appears in — is built once per
+story text version with gpt-4o-mini and stored on story.digest, keyed by the
+story's source_event_id (or a hash of the text when the story was never
+generated). Those prompts then carry the digest plus a few verbatim
+paragraphs chosen for the task.
+
+Character and panel extraction still read the full text: they are what turns
+the story into characters and panels in the first place.
+
+The digest of a freshly generated story is built in the background, so the
+first refinement after a generation usually finds it ready. Stories shorter
+than STORY_DIGEST_MIN_CHARS are sent whole. Digest failures are non-fatal:
+callers get None and fall back to the full text.
+"""
+
+import asyncio
+import hashlib
+import uuid
+from collections.abc import Sequence
+
+from loguru import logger
+from pydantic import BaseModel, Field, ValidationError
+from slugify import slugify
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.infrastructure.database import get_async_session_maker
+from core.infrastructure.intelligence import (
+    OpenAIModel,
+    layered_messages,
+    prompt_site,
+)
+from core.infrastructure.llm_cache.service import cached_completion
+from core.infrastructure.metrics import registry
+
+from ..models import Story
+from ..repository import Repository
+from ..story_edits import number_paragraphs, split_paragraphs
+
+STORY_DIGESTS = registry.counter(
+    "story_digests_total",
+    "Story digest lookups by outcome (hit, built, failed, skipped).",
+    ("outcome",),
+)
+
+
+class DigestScene(BaseModel):
+    title: str = Field(..., description="A few words naming the scene.")
+    summary: str = Field(..., description="One or two sentences: what happens.")
+    first_paragraph: int = Field(..., description="Number of its first paragraph.")
+    last_paragraph: int = Field(..., description="Number of its last paragraph.")
+
+
+class DigestCharacter(BaseModel):
+    name: str = Field(..., description="The character's name as used in the story.")
+    aliases: list[str] = Field(
+        default_factory=list,
+        description="Other names, titles or nicknames the story uses for them.",
+    )
+    paragraphs: list[int] = Field(
+        default_factory=list,
+        description="Numbers of every paragraph the character appears in.",
+    )
+
+
+class StoryDigest(BaseModel):
+    """A compact digest of a story whose paragraphs are numbered [0], [1], ...
+
+    Scenes cover the story in order without gaps. Characters include everyone
+    who speaks, acts or is acted upon.
+    """
+
+    summary: str = Field(
+        ..., description="Five to eight sentences covering the whole plot."
+    )
+    scenes: list[DigestScene]
+    characters: list[DigestCharacter]
+
+
+def story_digest_key(story_text: str, source_event_id: uuid.UUID | None) -> str:
+    """Identify one version of a story's text."""
+    if source_event_id is not None:
+        return str(source_event_id)
+    return "sha256:" + hashlib.sha256(story_text.encode()).hexdigest()
+
+
+async def build_story_digest(story_text: str) -> StoryDigest | None:
+    """Digest story_text, or None on failure. Never raises."""
+    try:
+        with prompt_site("story.digest"):
+            return await cached_completion(
+                model=OpenAIModel.GPT_4O_MINI.value,
+                response_model=StoryDigest,
+                max_retries=2,
+                messages=layered_messages(
+                    system=(
+                        "You index stories for a comic generation pipeline. "
+                        "Paragraph numbers must refer to the numbered story."
+                    ),
+                    context=number_paragraphs(split_paragraphs(story_text)),
+                ),
+            )
+    except Exception as exc:
+        logger.warning(f"Story digest failed — prompts will use full text: {exc}")
+        return None
+
+
+class StoryDigestService:
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+        self.repository = Repository(db_session)
+
+    async def get_digest(self, story: Story) -> StoryDigest | None:
+        """Return the digest for the story's current text, building it on a miss.
+
+        A freshly built digest is stored on the story and committed, so call
+        this outside any transaction the caller still needs open.
+        """
+        if len(story.story_text) < settings.story_digest_min_chars:
+            STORY_DIGESTS.inc(outcome="skipped")
+            return None
+
+        key = story_digest_key(story.story_text, story.source_event_id)
+        stored = story.digest
+        if stored and stored.get("key") == key:
+            try:
+                cached = StoryDigest.model_validate(stored["digest"])
+                STORY_DIGESTS.inc(outcome="hit")
+                return cached
+            except (KeyError, ValidationError):
+                pass
+
+        digest = await build_story_digest(story.story_text)
+        if digest is None:
+            STORY_DIGESTS.inc(outcome="failed")
+            return None
+        await self.repository.story.set_story_digest(
+            story.id, {"key": key, "digest": digest.model_dump(mode="json")}
+        )
+        await self.db.commit()
+        STORY_DIGESTS.inc(outcome="built")
+        return digest
+
+
+_warming: set[asyncio.Task[None]] = set()
+
+
+def schedule_story_digest(story_id: uuid.UUID, story_text: str) -> None:
+    """Build the digest of a just-written story version in the background."""
+    if len(story_text) < settings.story_digest_min_chars:
+        return
+    task = asyncio.create_task(_warm_story_digest(story_id))
+    # Held until done so the task is not garbage collected mid-run.
+    _warming.add(task)
+    task.add_done_callback(_warming.discard)
+
+
+async def _warm_story_digest(story_id: uuid.UUID) -> None:
+    try:
+        async with get_async_session_maker()() as db:
+            story = await db.get(Story, story_id)
+            if story is not None:
+                await StoryDigestService(db).get_digest(story)
+    except Exception as exc:
+        logger.warning(f"Background digest for story {story_id} failed: {exc}")
+
+
+# ---------------------------------------------------------------------------
+# Prompt context
+# ---------------------------------------------------------------------------
+
+
+def character_story_context(
+    story_text: str, digest: StoryDigest, names: Sequence[str]
+) -> str:
+    """Summary plus the paragraphs the named character appears in."""
+    paragraphs = split_paragraphs(story_text)
+    wanted = {slugify(name) for name in names if name}
+    indices: set[int] = set()
+    for character in digest.characters:
+        if {slugify(n) for n in (character.name, *character.aliases)} & wanted:
+            indices.update(character.paragraphs)
+    return _compose(digest, paragraphs, sorted(indices), scene_index=False)
+
+
+def panel_story_context(
+    story_text: str, digest: StoryDigest, order_index: int, panel_count: int
+) -> str:
+    """Summary, scene index, and the scene a panel at order_index falls in."""
+    paragraphs = split_paragraphs(story_text)
+    indices: list[int] = []
+    if digest.scenes:
+        position = order_index * len(digest.scenes) // max(panel_count, 1)
+        scene = digest.scenes[min(max(position, 0), len(digest.scenes) - 1)]
+        indices = list(range(scene.first_paragraph, scene.last_paragraph + 1))
+    return _compose(digest, paragraphs, indices, scene_index=True)
+
+
+def _compose(
+    digest: StoryDigest,
+    paragraphs: list[str],
+    indices: Sequence[int],
+    scene_index: bool,
+) -> str:
+    parts = [f"Summary:\n{digest.summary}"]
+    if scene_index and digest.scenes:
+        scenes = "\n".join(
+            f"- {s.title} (paragraphs {s.first_paragraph}-{s.last_paragraph}): "
+            f"{s.summary}"
+            for s in digest.scenes
+        )
+        parts.append(f"Scenes:\n{scenes}")
+
+    budget = settings.story_digest_context_chars
+    passages: list[str] = []
+    for i in indices:
+        if not 0 <= i < len(paragraphs) or len(paragraphs[i]) > budget:
+            continue
+        passages.append(f"[{i}] {paragraphs[i]}")
+        budget -= len(paragraphs[i])
+    if passages:
+        parts.append("Relevant passages:\n" + "\n\n".join(passages))
+    return "\n\n".join(parts)
@@ -9,7 +9,8 @@ import json
 from loguru import logger
 from pydantic import BaseModel, Field
 
-from core.infrastructure.intelligence import OpenAIModel, instructor_client
+from core.infrastructure.intelligence import OpenAIModel, prompt_site
+from core.infrastructure.llm_cache.service import cached_completion
 
 
 class StoryIdentity(BaseModel):
@@ -53,21 +54,22 @@ async def generate_story_identity(meta: dict) -> tuple[str, str] | None:
         return None
 
     try:
-        identity = await instructor_client.chat.completions.create(
-            model=OpenAIModel.GPT_4O_MINI.value,
-            response_model=StoryIdentity,
-            max_retries=2,
-            messages=[
-                {
-                    "role": "user",
-                    "content": (
-                        "Generate a name and description for a comic story "
-                        "based on the following metadata:\n\n"
-                        f"{json.dumps(meta, indent=2)}"
-                    ),
-                }
-            ],
-        )
+        with prompt_site("story.identity"):
+            identity = await cached_completion(
+                model=OpenAIModel.GPT_4O_MINI.value,
+                response_model=StoryIdentity,
+                max_retries=2,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": (
+                            "Generate a name and description for a comic story "
+                            "based on the following metadata:\n\n"
+                            f"{json.dumps(meta, indent=2)}"
+                        ),
+                    }
+                ],
+            )
         return identity.name, identity.description
     except Exception as exc:
         logger.warning(
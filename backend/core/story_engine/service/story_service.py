@@ -1,12 +1,22 @@
+import asyncio
 import textwrap
+import time
 import uuid
-from dataclasses import dataclass
-from typing import AsyncIterator, Protocol
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Protocol
 
-from openai.types.chat import ChatCompletionChunk
+from loguru import logger
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageParam
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.common.utils import get_current_timestamp_ms
+from core.config import settings
+from core.infrastructure.database import get_async_session_maker
+from core.infrastructure.intelligence import layered_messages, prompt_site
 from core.infrastructure.intelligence.openai import async_openai_client
+from core.infrastructure.llm_cache.service import cached_completion
+from core.infrastructure.metrics import registry
+from core.infrastructure.phase_timings import PhaseTimings, TimingPhase
 
 from ..events import ErrorPayload, EventEnvelope, EventType
 from ..exceptions import (
@@ -20,9 +30,19 @@ from ..models.edit_event import (
     EditEventStatus,
     EditEventTargetType,
 )
+from ..pagination import Cursor, Page
 from ..repository import Repository
 from ..repository.exception import NotFoundError as RepoNotFoundError
-from ..schemas.story import GenerateStoryRequest
+from ..schemas.story import GenerateStoryRequest, StoryEditPlan
+from ..story_edits import apply_story_edits, number_paragraphs, split_paragraphs
+from ..stream_runs import get_stream_run, start_stream_run
+from .story_digest_service import schedule_story_digest
+
+STORY_REFINEMENTS = registry.counter(
+    "story_refinements_total",
+    "Story refinements by how the text was produced (edits, rewrite, fallback).",
+    ("mode",),
+)
 
 
 class StoryStreamGenerator:
@@ -30,15 +50,16 @@ class StoryStreamGenerator:
 
     async def stream(self, prompt: str) -> AsyncIterator[ChatCompletionChunk]:
         """Stream story chunks from LLM."""
-        return await async_openai_client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": self._system_prompt()},
-                {"role": "user", "content": prompt},
-            ],
-            stream=True,
-            temperature=0.7,
-        )
+        with prompt_site("story.generate"):
+            return await async_openai_client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": self._system_prompt()},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+                temperature=0.7,
+            )
 
     def _system_prompt(self) -> str:
         return textwrap.dedent("""
@@ -52,6 +73,71 @@ class StoryStreamGenerator:
         """).strip()
 
 
+class StoryEditPlanner:
+    """Low-level LLM call for diff-based refinement: instruction -> edit plan."""
+
+    async def plan(self, story_text: str, instruction: str) -> StoryEditPlan:
+        with prompt_site("story.edit_plan"):
+            return await cached_completion(
+                model="gpt-4o",
+                response_model=StoryEditPlan,
+                # Same instruction twice should still be a fresh revision.
+                bypass_cache=True,
+                messages=self.messages(story_text, instruction),
+            )
+
+    def messages(
+        self, story_text: str, instruction: str
+    ) -> list[ChatCompletionMessageParam]:
+        numbered = number_paragraphs(split_paragraphs(story_text))
+        return layered_messages(
+            system=(
+                "You are a story editor. You revise stories by returning "
+                f"precise edit operations, never the full text.\n\n{self._rules()}"
+            ),
+            context=f"Story:\n{numbered}",
+            instruction=f"Instruction:\n{instruction}",
+        )
+
+    def _rules(self) -> str:
+        return textwrap.dedent("""
+            Revise the story according to the instruction that follows it.
+            Do not rewrite the story. Return the smallest list of edits that
+            carries out the instruction. Paragraphs are numbered [0], [1], ...;
+            every edit refers to the original numbering, even after other edits.
+              - replace_span: replace `find`, copied exactly from the paragraph,
+                with `replace`. `find` must occur exactly once in the paragraph;
+                include neighbouring words if needed. Use one edit per occurrence.
+              - replace_paragraph: replace the whole paragraph with `text`.
+              - insert_after_paragraph: add a new paragraph `text` after the
+                given one (-1 to insert before the first paragraph).
+              - delete_paragraph: remove the paragraph.
+        """).strip()
+
+
+async def _text_as_chunks(text: str) -> AsyncIterator[ChatCompletionChunk]:
+    """Local story text as an OpenAI-style stream, one paragraph per chunk."""
+    paragraphs = split_paragraphs(text)
+    deltas = ["", *(p if i == 0 else f"\n\n{p}" for i, p in enumerate(paragraphs))]
+    for delta in deltas:
+        yield _completion_chunk({"content": delta})
+    yield _completion_chunk({}, finish_reason="stop")
+
+
+def _completion_chunk(
+    delta: dict[str, str], finish_reason: str | None = None
+) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "local-story-edit",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "local",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+    )
+
+
 class StreamProcessor(Protocol):
     async def process(
         self, chunk: ChatCompletionChunk, accumulator: list[str]
@@ -82,6 +168,69 @@ class OpenAIStreamProcessor(StreamProcessor):
         raise ValueError(f"Unknown chunk: {chunk}")
 
 
+def _text_delta(chunk: ChatCompletionChunk) -> str | None:
+    """The chunk's content if it is a plain, non-empty text delta."""
+    if len(chunk.choices) != 1 or chunk.choices[0].finish_reason is not None:
+        return None
+    return chunk.choices[0].delta.content or None
+
+
+async def coalesce_chunks(
+    stream: AsyncIterator[ChatCompletionChunk],
+    max_chars: int,
+    max_delay_ms: int,
+    clock: Callable[[], float] = time.monotonic,
+) -> AsyncIterator[ChatCompletionChunk]:
+    """Merge consecutive text-delta chunks before they become envelopes.
+
+    OpenAI sends one chunk per token, and each would otherwise cost an
+    EventEnvelope, a JSON line and a write. Text deltas are buffered and
+    flushed as one chunk once the buffer holds max_chars characters or its
+    oldest delta is max_delay_ms old; any other chunk (the empty opening
+    delta, finish_reason) flushes the buffer and passes through. The delay is
+    checked as chunks arrive, so a stalled upstream holds back at most the
+    few characters already buffered. max_chars <= 1 or max_delay_ms <= 0
+    passes every chunk through unchanged.
+    """
+    if max_chars <= 1 or max_delay_ms <= 0:
+        async for chunk in stream:
+            yield chunk
+        return
+
+    max_delay = max_delay_ms / 1000
+    pending: list[ChatCompletionChunk] = []
+    parts: list[str] = []
+    pending_chars = 0
+    first_at = 0.0
+
+    def flush() -> ChatCompletionChunk:
+        nonlocal pending_chars
+        merged = pending[0]
+        if len(pending) > 1:
+            # Chunks are ours once read off the stream; reuse the first.
+            merged.choices[0].delta.content = "".join(parts)
+        pending.clear()
+        parts.clear()
+        pending_chars = 0
+        return merged
+
+    async for chunk in stream:
+        if (delta := _text_delta(chunk)) is None:
+            if pending:
+                yield flush()
+            yield chunk
+            continue
+        if not pending:
+            first_at = clock()
+        pending.append(chunk)
+        parts.append(delta)
+        pending_chars += len(delta)
+        if pending_chars >= max_chars or clock() - first_at >= max_delay:
+            yield flush()
+    if pending:
+        yield flush()
+
+
 @dataclass(frozen=True, slots=True)
 class StoryStreamContext:
     """Parameters for executing a story stream."""
@@ -90,6 +239,10 @@ class StoryStreamContext:
     user_input_text: str  # original user instruction
     constructed_prompt: str  # prompt that is actually sent to the LLM
     edit_event_id: uuid.UUID
+    # Set for refinements in "edits" mode: the story the edit plan applies to.
+    refine_base_text: str | None = None
+    # Started when the request arrived; stored with the final status.
+    timings: PhaseTimings = field(default_factory=PhaseTimings)
 
 
 class StoryService:
@@ -98,11 +251,13 @@ class StoryService:
         db_session: AsyncSession,
         stream_generator: StoryStreamGenerator | None = None,
         processor: StreamProcessor | None = None,
+        edit_planner: StoryEditPlanner | None = None,
     ):
         self.db = db_session
         self.repository = Repository(db_session)
         self.stream_generator = stream_generator or StoryStreamGenerator()
         self.processor = processor or OpenAIStreamProcessor()
+        self.edit_planner = edit_planner or StoryEditPlanner()
 
     async def _check_story_ownership(
         self, _user_id: uuid.UUID, story_with_project: Story
@@ -115,13 +270,15 @@ class StoryService:
     def _build_refinement_prompt(
         self, prev_story_text: str, user_instruction: str
     ) -> str:
+        # Story before instruction, so refinements of one story version share
+        # a cacheable prefix.
         return textwrap.dedent(f"""
-            You generated the previous story. The user is asking you to refine it according to the following instruction(s):
-            {user_instruction}
-
-            Here is the previous story:
+            You generated the previous story. Here is the previous story:
             {prev_story_text}
 
+            The user is asking you to refine it according to the following instruction(s):
+            {user_instruction}
+
             Please refine the previous story according to the user's instructions.
         """).strip()
 
@@ -131,11 +288,15 @@ class StoryService:
         return await self.repository.story.get_story(project_id, story_id)
 
     async def get_story_history(
-        self, story_id: uuid.UUID, limit: int = 20
-    ) -> list[EditEvent]:
-        return await self.repository.edit_event.get_edit_events_for_target(
-            target_type=EditEventTargetType.STORY, target_id=story_id, limit=limit
+        self, story_id: uuid.UUID, limit: int = 20, cursor: str | None = None
+    ) -> Page[EditEvent]:
+        events = await self.repository.edit_event.get_edit_events_for_target(
+            target_type=EditEventTargetType.STORY,
+            target_id=story_id,
+            limit=limit + 1,
+            before=Cursor.from_token(cursor),
         )
+        return Page.from_rows(events, limit)
 
     async def update_story(
         self,
@@ -167,35 +328,37 @@ class StoryService:
         story_id: uuid.UUID,
         request: GenerateStoryRequest,
     ) -> AsyncIterator[EventEnvelope]:
-        story_with_project = await self.repository.story.get_story_with_project(
-            story_id
-        )
-        if story_with_project is None:
-            raise NotFoundError(f"Story {story_id} not found")
+        timings = PhaseTimings()
+        with timings.phase(TimingPhase.DB):
+            story_with_project = await self.repository.story.get_story_with_project(
+                story_id
+            )
+            if story_with_project is None:
+                raise NotFoundError(f"Story {story_id} not found")
 
-        await self._check_story_ownership(user_id, story_with_project)
+            await self._check_story_ownership(user_id, story_with_project)
 
-        prev_story_text = story_with_project.story_text
+            prev_story_text = story_with_project.story_text
 
-        # If story_text field is empty, then it is a refinement attempt
-        is_refine = prev_story_text.strip() != ""
-        operation = (
-            EditEventOperationType.REFINE_STORY
-            if is_refine
-            else EditEventOperationType.GENERATE_STORY
-        )
+            # If story_text field is empty, then it is a refinement attempt
+            is_refine = prev_story_text.strip() != ""
+            operation = (
+                EditEventOperationType.REFINE_STORY
+                if is_refine
+                else EditEventOperationType.GENERATE_STORY
+            )
 
-        # TX1: create edit event
-        edit_event = await self.repository.edit_event.create_edit_event(
-            project_id=project_id,
-            target_type=EditEventTargetType.STORY,
-            target_id=story_id,
-            operation_type=operation,
-            user_instruction=request.story_prompt,
-        )
-        await self.db.flush()  # assigns DB-generated id
-        edit_event_id = edit_event.id
-        await self.db.commit()
+            # TX1: create edit event
+            edit_event = await self.repository.edit_event.create_edit_event(
+                project_id=project_id,
+                target_type=EditEventTargetType.STORY,
+                target_id=story_id,
+                operation_type=operation,
+                user_instruction=request.story_prompt,
+            )
+            await self.db.flush()  # assigns DB-generated id
+            edit_event_id = edit_event.id
+            await self.db.commit()
 
         if is_refine:
             constructed_prompt = self._build_refinement_prompt(
@@ -209,22 +372,200 @@ class StoryService:
             user_input_text=request.story_prompt,
             constructed_prompt=constructed_prompt,
             edit_event_id=edit_event_id,
+            refine_base_text=(
+                prev_story_text
+                if is_refine and settings.story_refine_mode == "edits"
+                else None
+            ),
+            timings=timings,
         )
 
-        return self._execute_streaming(params)
+        if is_refine and params.refine_base_text is None:
+            STORY_REFINEMENTS.inc(mode="rewrite")
+
+        # Generation outlives this response: a dropped client reconnects with
+        # resume_story_stream instead of paying for a second generation.
+        run = start_stream_run(str(edit_event_id), self._execute_detached(params))
+        return run.subscribe()
+
+    async def resume_story_stream(
+        self,
+        user_id: uuid.UUID,
+        project_id: uuid.UUID,
+        story_id: uuid.UUID,
+        stream_id: uuid.UUID,
+        from_seq: int = 0,
+    ) -> AsyncIterator[EventEnvelope]:
+        """Reattach to a story generation by stream_id (its edit event id).
+
+        A run still buffered on this instance replays from from_seq and then
+        follows it live. Otherwise — another instance, a restart, or past the
+        retention window — the stream is rebuilt from the edit event's
+        checkpoints: it restarts at seq 0 with STREAM_START (clients discard
+        what they have), sends the checkpointed text, and keeps polling until
+        the generation succeeds, fails or stops checkpointing.
+        """
+        story_with_project = await self.repository.story.get_story_with_project(
+            story_id
+        )
+        if story_with_project is None or story_with_project.project_id != project_id:
+            raise NotFoundError(f"Story {story_id} not found in project {project_id}")
+
+        await self._check_story_ownership(user_id, story_with_project)
+
+        run = get_stream_run(str(stream_id))
+        if run is None:
+            edit_event = await self.repository.edit_event.get_edit_event(stream_id)
+            if (
+                edit_event is None
+                or edit_event.target_type != EditEventTargetType.STORY
+                or edit_event.target_id != story_id
+            ):
+                raise NotFoundError(
+                    f"Stream {stream_id} not found for story {story_id}"
+                )
+
+        # End the lookup transaction so the request's connection goes back to
+        # the pool; the stream can stay open for minutes.
+        await self.db.commit()
+        if run is not None:
+            return run.subscribe(from_seq)
+        return self._follow_checkpoints(stream_id)
+
+    async def _follow_checkpoints(
+        self, edit_event_id: uuid.UUID
+    ) -> AsyncIterator[EventEnvelope]:
+        stream_id = str(edit_event_id)
+        seq = 0
+        sent = 0
+
+        def envelope(event_type: EventType, **fields: Any) -> EventEnvelope:
+            nonlocal seq
+            seq += 1
+            return EventEnvelope(
+                stream_id=stream_id, seq=seq - 1, event_type=event_type, **fields
+            )
+
+        yield envelope(EventType.STREAM_START, payload={"delta": ""})
+        while True:
+            # A short session per poll; nothing is held between checkpoints.
+            async with get_async_session_maker()() as db:
+                edit_event = await Repository(db).edit_event.get_edit_event(
+                    edit_event_id
+                )
+            # Deleted mid-stream (project deleted) counts as failed.
+            status = edit_event.status if edit_event else EditEventStatus.FAILED
+            snapshot = (edit_event.output_snapshot if edit_event else None) or {}
+            text = snapshot.get("storyText", "")
+            if len(text) > sent:
+                yield envelope(EventType.STREAM_CHUNK, payload={"delta": text[sent:]})
+                sent = len(text)
+
+            if status == EditEventStatus.SUCCEEDED:
+                yield envelope(EventType.STREAM_END, payload={"finish_reason": "stop"})
+                return
+            stale = edit_event is not None and (
+                get_current_timestamp_ms()
+                - snapshot.get(
+                    "checkpointAtMs", int(edit_event.created_at.timestamp() * 1000)
+                )
+                > settings.story_stream_stale_seconds * 1000
+            )
+            if status == EditEventStatus.FAILED or stale:
+                yield envelope(
+                    EventType.STREAM_ERROR,
+                    error=ErrorPayload(
+                        code="E_STREAM_INTERRUPTED",
+                        message="Story generation did not complete",
+                        retryable=True,
+                    ),
+                )
+                return
+            await asyncio.sleep(settings.story_stream_checkpoint_seconds)
+
+    async def _execute_detached(
+        self, params: StoryStreamContext
+    ) -> AsyncIterator[EventEnvelope]:
+        """_execute_streaming on a session of its own, not the request's."""
+        async with get_async_session_maker()() as db:
+            service = StoryService(
+                db, self.stream_generator, self.processor, self.edit_planner
+            )
+            async for event in service._execute_streaming(params):
+                yield event
+
+    async def _checkpoint(
+        self, edit_event_id: uuid.UUID, accumulator: list[str], seq: int
+    ) -> None:
+        await self.repository.edit_event.set_edit_event_status(
+            edit_event_id,
+            EditEventStatus.PENDING,
+            output_snapshot={
+                "storyText": "".join(accumulator),
+                "seq": seq,
+                "checkpointAtMs": get_current_timestamp_ms(),
+            },
+        )
+        await self.db.commit()
+
+    async def _refine_with_edits(self, story_text: str, instruction: str) -> str | None:
+        """Refined story from an edit plan, or None to fall back to a rewrite.
+
+        The model emits only the edits, so output tokens — and latency — scale
+        with the size of the change instead of the size of the story.
+        """
+        try:
+            plan = await self.edit_planner.plan(story_text, instruction)
+            refined = apply_story_edits(story_text, plan.edits)
+        except Exception as e:
+            logger.warning(
+                f"Story edit plan failed, rewriting: {type(e).__name__}: {e}"
+            )
+            return None
+        logger.info(f"Refined story with {len(plan.edits)} edits")
+        return refined
 
     async def _execute_streaming(
         self, params: StoryStreamContext
     ) -> AsyncIterator[EventEnvelope]:
         accumulator: list[str] = []
+        # Every envelope of one generation shares stream_id, with gapless seq.
+        stream_id = str(params.edit_event_id)
+        seq = 0
+        last_checkpoint = time.monotonic()
+        timings = params.timings
         try:
-            stream = await self.stream_generator.stream(params.constructed_prompt)
+            upstream: AsyncIterator[ChatCompletionChunk] | None = None
+            if params.refine_base_text is not None:
+                with timings.phase(TimingPhase.LLM):
+                    refined = await self._refine_with_edits(
+                        params.refine_base_text, params.user_input_text
+                    )
+                STORY_REFINEMENTS.inc(mode="edits" if refined else "fallback")
+                if refined is not None:
+                    upstream = _text_as_chunks(refined)
+            if upstream is None:
+                with timings.phase(TimingPhase.LLM):
+                    upstream = await self.stream_generator.stream(
+                        params.constructed_prompt
+                    )
+            stream = coalesce_chunks(
+                upstream,
+                max_chars=settings.story_stream_coalesce_chars,
+                max_delay_ms=settings.story_stream_coalesce_ms,
+            )
+            # Waiting on the stream is llm time; checkpoints are db time.
+            waited_from = time.perf_counter()
             async for chunk in stream:
+                timings.add(TimingPhase.LLM, time.perf_counter() - waited_from)
                 processed_chunk = await self.processor.process(chunk, accumulator)
-                yield processed_chunk
+                processed_chunk.stream_id = stream_id
+                processed_chunk.seq = seq
+                seq += 1
                 if processed_chunk.event_type == EventType.STREAM_END:
                     full_story = "".join(accumulator)
-                    # TX2: persist story + complete edit event atomically
+                    # TX2: persist story + complete edit event atomically,
+                    # before END so a client that sees END can read the story.
                     async with self.db.begin_nested():
                         await self.repository.story.update_story_with_story_text_and_user_input_text(
                             params.story_id,
@@ -236,15 +577,32 @@ class StoryService:
                             params.edit_event_id,
                             EditEventStatus.SUCCEEDED,
                             output_snapshot={"storyText": full_story},
+                            timings=timings.as_dict(),
                         )
                     await self.db.commit()
+                    schedule_story_digest(params.story_id, full_story)
+                    yield processed_chunk
                     break
+                yield processed_chunk
+                # Checkpoint the text so far for resume_story_stream.
+                if (
+                    time.monotonic() - last_checkpoint
+                    >= settings.story_stream_checkpoint_seconds
+                ):
+                    with timings.phase(TimingPhase.DB):
+                        await self._checkpoint(params.edit_event_id, accumulator, seq)
+                    last_checkpoint = time.monotonic()
+                waited_from = time.perf_counter()
         except Exception as e:
             await self.repository.edit_event.update_edit_event(
-                params.edit_event_id, EditEventStatus.FAILED
+                params.edit_event_id,
+                EditEventStatus.FAILED,
+                timings=timings.as_dict(),
             )
             await self.db.commit()
             yield EventEnvelope(
+                stream_id=stream_id,
+                seq=seq,
                 event_type=EventType.STREAM_ERROR,
                 error=ErrorPayload(code="E_INTERNAL", message=str(e), retryable=True),
             )
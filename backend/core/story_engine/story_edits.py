@@ -0,0 +1,83 @@
+"""
+Paragraph-indexed story text and the edit plans applied to it.
+
+Diff-based refinement shows the model the story with numbered paragraphs:
+
+    [0] The lighthouse stood alone on the rock.
+
+    [1] Every night Elias climbed the stairs...
+
+and gets back a StoryEditPlan (schemas/story.py) that names paragraphs by
+those numbers. apply_story_edits patches the text locally. Paragraph numbers
+always refer to the original story, whatever edits come before them in the
+plan, so the model never has to track shifting indices.
+
+Anything that does not apply cleanly — an unknown paragraph, a span that is
+missing or occurs more than once, an edit to a deleted paragraph, an empty
+plan — raises StoryEditError, and the caller falls back to a full rewrite.
+"""
+
+import re
+from collections import defaultdict
+from collections.abc import Sequence
+
+from .exceptions import StoryEditError
+from .schemas.story import (
+    DeleteParagraphEdit,
+    InsertAfterParagraphEdit,
+    ReplaceParagraphEdit,
+    ReplaceSpanEdit,
+    StoryEdit,
+)
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def split_paragraphs(text: str) -> list[str]:
+    return [p.strip() for p in _PARAGRAPH_BREAK.split(text) if p.strip()]
+
+
+def number_paragraphs(paragraphs: Sequence[str]) -> str:
+    """The story as the model sees it: `[i] paragraph`, blank-line separated."""
+    return "\n\n".join(f"[{i}] {p}" for i, p in enumerate(paragraphs))
+
+
+def apply_story_edits(text: str, edits: Sequence[StoryEdit]) -> str:
+    """Apply a plan to text; paragraphs come back blank-line separated."""
+    if not edits:
+        raise StoryEditError("Edit plan is empty")
+
+    paragraphs = split_paragraphs(text)
+    deleted: set[int] = set()
+    inserted_after: dict[int, list[str]] = defaultdict(list)
+
+    for edit in edits:
+        index = edit.paragraph
+        if isinstance(edit, InsertAfterParagraphEdit):
+            if not -1 <= index < len(paragraphs):
+                raise StoryEditError(f"Cannot insert after paragraph {index}")
+            inserted_after[index].append(edit.text.strip())
+            continue
+        if not 0 <= index < len(paragraphs):
+            raise StoryEditError(f"Paragraph {index} does not exist")
+        if index in deleted:
+            raise StoryEditError(f"Paragraph {index} was already deleted")
+
+        if isinstance(edit, ReplaceSpanEdit):
+            occurrences = paragraphs[index].count(edit.find) if edit.find else 0
+            if occurrences != 1:
+                raise StoryEditError(
+                    f"Span {edit.find!r} occurs {occurrences} times in paragraph {index}"
+                )
+            paragraphs[index] = paragraphs[index].replace(edit.find, edit.replace)
+        elif isinstance(edit, ReplaceParagraphEdit):
+            paragraphs[index] = edit.text.strip()
+        elif isinstance(edit, DeleteParagraphEdit):
+            deleted.add(index)
+
+    result = list(inserted_after[-1])
+    for index, paragraph in enumerate(paragraphs):
+        if index not in deleted:
+            result.append(paragraph)
+        result.extend(inserted_after[index])
+    return "\n\n".join(p for p in result if p)
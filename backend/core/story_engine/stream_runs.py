@@ -0,0 +1,95 @@
+"""
+In-process registry of running envelope streams, replayable by seq.
+
+A story generation used to live inside the HTTP response that started it: a
+dropped connection cancelled the LLM call and lost the text. Now the producer
+runs as a background task that no response owns, publishing each envelope into
+a StreamRun. Any number of responses subscribe, each from its own seq:
+
+    run = start_stream_run(stream_id, service_events)
+    return as_ndjson(run.subscribe(from_seq=0))
+
+    # later, after a reconnect
+    run = get_stream_run(stream_id)
+    return as_ndjson(run.subscribe(from_seq=last_seen + 1))
+
+Envelopes must carry a gapless seq from 0, so an envelope's seq is its index
+in the buffer. Finished runs stay replayable for STORY_STREAM_RETENTION_SECONDS;
+after that — or on another instance — callers fall back to the durable
+checkpoint the producer writes (see StoryService.resume_story_stream).
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from loguru import logger
+
+from core.config import settings
+
+from .events import EventEnvelope
+
+_runs: dict[str, "StreamRun"] = {}
+
+
+class StreamRun:
+    """Buffered envelopes of one stream plus a wake-up for live subscribers."""
+
+    def __init__(self, stream_id: str) -> None:
+        self.stream_id = stream_id
+        self.events: list[EventEnvelope] = []
+        self.done = False
+        self.task: asyncio.Task[None] | None = None
+        self._changed = asyncio.Event()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def publish(self, event: EventEnvelope) -> None:
+        self.events.append(event)
+        self._notify()
+
+    def finish(self) -> None:
+        self.done = True
+        self._notify()
+
+    async def subscribe(self, from_seq: int = 0) -> AsyncIterator[EventEnvelope]:
+        """Replay buffered envelopes from from_seq, then follow the live run."""
+        index = max(from_seq, 0)
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                return
+            await self._changed.wait()
+
+    async def _drive(self, events: AsyncIterator[EventEnvelope]) -> None:
+        try:
+            async for event in events:
+                self.publish(event)
+        except Exception as e:
+            # The producer publishes its own STREAM_ERROR before raising.
+            logger.warning(f"Stream {self.stream_id} ended with an error: {e}")
+        finally:
+            self.finish()
+            asyncio.get_running_loop().call_later(
+                settings.story_stream_retention_seconds,
+                _runs.pop,
+                self.stream_id,
+                None,
+            )
+
+
+def start_stream_run(stream_id: str, events: AsyncIterator[EventEnvelope]) -> StreamRun:
+    """Consume events in a background task and make them subscribable."""
+    run = StreamRun(stream_id)
+    _runs[stream_id] = run
+    # The registry holds the task, so it is not garbage collected mid-run.
+    run.task = asyncio.create_task(run._drive(events))
+    return run
+
+
+def get_stream_run(stream_id: str) -> StreamRun | None:
+    """The live or recently finished run for stream_id on this instance."""
+    return _runs.get(stream_id)
@@ -1,21 +1,31 @@
+import hmac
 from typing import AsyncGenerator
 
 import socketio
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.concurrency import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from loguru import logger
 from starlette.middleware.sessions import SessionMiddleware
 
 from core.api.routers import router as v1_router
 from core.auth.api import CSRFMiddleware
 from core.config import settings
-from core.infrastructure.database import configure_psycopg_json_dumps
+from core.infrastructure.database import (
+    ReadYourWritesMiddleware,
+    configure_psycopg_json_dumps,
+)
+from core.infrastructure.intelligence.media_download import (
+    generated_image_downloader,
+)
+from core.infrastructure.metrics import PROMETHEUS_CONTENT_TYPE, registry
 from core.logging import setup_logging
 from core.payments.exceptions import BillingEntitlementRequiredError
 from core.payments.schemas import BillingEntitlementRequiredResponse
 from core.sockets import register_sio_handlers, sio
+from core.story_engine.pagination import NEXT_CURSOR_HEADER
+from core.story_engine.render_jobs import render_job_workers
 
 
 @asynccontextmanager
@@ -28,8 +38,11 @@ async def lifecycle_manager(app: FastAPI) -> AsyncGenerator[None, None]:
     )
     register_sio_handlers()
     configure_psycopg_json_dumps()
+    render_job_workers.start(settings.render_job_workers)
     yield
     logger.info("StoryEngine shutting down")
+    await render_job_workers.stop()
+    await generated_image_downloader.aclose()
 
 
 _is_production = settings.env == "production"
@@ -57,6 +70,8 @@ fastapi_app.add_middleware(
 
 fastapi_app.add_middleware(CSRFMiddleware)
 
+fastapi_app.add_middleware(ReadYourWritesMiddleware)
+
 # Add both the app frontend and landing page url
 cors_origins = [settings.frontend_url, settings.landing_url]
 
@@ -66,6 +81,7 @@ fastapi_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -101,6 +117,21 @@ def health_check() -> dict[str, str]:
     return {"status": "ok", "message": "Server is running"}
 
 
+@fastapi_app.get("/metrics", include_in_schema=False)
+def metrics(request: Request) -> PlainTextResponse:
+    """In-process metrics (connection pools, ...) in Prometheus text format.
+
+    Only for a scraper holding METRICS_BEARER_TOKEN; 404 while it is unset.
+    """
+    if not settings.metrics_bearer_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    expected = f"Bearer {settings.metrics_bearer_token}"
+    presented = request.headers.get("authorization", "")
+    if not hmac.compare_digest(presented.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
 
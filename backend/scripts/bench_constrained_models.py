@@ -0,0 +1,124 @@
+"""
+Benchmark the per-call CPU cost of the slug-constrained panel response models.
+
+"uncached" is what PanelService did on every LLM call before: create_model a
+PanelContent (and GeneratedPanelsResponse) around a fresh Literal of the
+story's slugs, then let instructor wrap it and generate its OpenAI schema.
+"cached" goes through schemas/constrained.py, where repeat calls for the same
+slug set return a model instructor has already wrapped and schema'd.
+
+Only the work done before the request leaves the process is timed; no network.
+
+    uv run python -m scripts.bench_constrained_models
+    uv run python -m scripts.bench_constrained_models --slugs 2 8 32 --calls 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any, Literal
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False, dotenv_path=".env.local")
+
+from instructor.v2.core.response_model import prepare_response_model  # noqa: E402
+from instructor.v2.providers.openai.schema import generate_openai_schema  # noqa: E402
+from pydantic import BaseModel, create_model  # noqa: E402
+
+from core.story_engine.schemas.constrained import (  # noqa: E402
+    constrained_panel_content_model,
+    constrained_panels_response_model,
+)
+from core.story_engine.schemas.panel import PanelContentBase  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Per-call overhead of constrained panel models, uncached vs cached."
+    )
+    parser.add_argument("--slugs", type=int, nargs="+", default=[3, 10, 40])
+    parser.add_argument("--calls", type=int, default=200)
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# Per-call work
+# ---------------------------------------------------------------------------
+
+
+def _instructor_prepare(model: type[BaseModel]) -> dict[str, Any]:
+    """What instructor does with response_model before sending the request."""
+    prepared = prepare_response_model(model)
+    assert prepared is not None
+    return generate_openai_schema(prepared)
+
+
+def _uncached_panel(slugs: list[str]) -> dict[str, Any]:
+    CharacterSlug = Literal[tuple(slugs)]  # type: ignore[valid-type]
+    model = create_model(
+        "PanelContent",
+        __base__=PanelContentBase,
+        characters=(list[CharacterSlug], ...),  # type: ignore[valid-type]
+    )
+    return _instructor_prepare(model)
+
+
+def _uncached_panels(slugs: list[str]) -> dict[str, Any]:
+    CharacterSlug = Literal[tuple(slugs)]  # type: ignore[valid-type]
+    panel_model = create_model(
+        "PanelContent",
+        __base__=PanelContentBase,
+        characters=(list[CharacterSlug], ...),  # type: ignore[valid-type]
+    )
+    model = create_model(
+        "GeneratedPanelsResponse",
+        panels=(list[panel_model], ...),  # type: ignore[valid-type]
+    )
+    return _instructor_prepare(model)
+
+
+def _cached_panel(slugs: list[str]) -> dict[str, Any]:
+    return _instructor_prepare(constrained_panel_content_model(frozenset(slugs)))
+
+
+def _cached_panels(slugs: list[str]) -> dict[str, Any]:
+    return _instructor_prepare(constrained_panels_response_model(frozenset(slugs)))
+
+
+def _time_calls(
+    fn: Callable[[list[str]], dict[str, Any]], slugs: list[str], calls: int
+) -> list[float]:
+    timings: list[float] = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        fn(slugs)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return timings
+
+
+def main() -> None:
+    args = parse_args()
+    variants: dict[str, Callable[[list[str]], dict[str, Any]]] = {
+        "panel uncached": _uncached_panel,
+        "panel cached": _cached_panel,
+        "panels uncached": _uncached_panels,
+        "panels cached": _cached_panels,
+    }
+    print(f"{'slugs':>5}  {'variant':<16}  {'median us':>9}  {'p95 us':>8}")
+    for slug_count in args.slugs:
+        slugs = [f"character-{i}" for i in range(slug_count)]
+        for label, fn in variants.items():
+            # Warm-up; for the cached variants this is the one miss per slug set.
+            fn(slugs)
+            timings = _time_calls(fn, slugs, args.calls)
+            median = statistics.median(timings)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            print(f"{slug_count:>5}  {label:<16}  {median:>9.1f}  {p95:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
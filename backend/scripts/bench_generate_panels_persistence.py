@@ -0,0 +1,203 @@
+"""
+Benchmark the persistence step of PanelService.generate_panels.
+
+Compares the previous per-panel path (add + flush per panel, one join row and
+one EditEvent per panel, refresh loop after commit) with the bulk path
+(PanelService._persist_generated_panels: one multi-row INSERT per table).
+Only persistence is timed — the LLM call is replaced by synthetic panels.
+
+Creates a throwaway user/project/story/characters and deletes them (cascade)
+at the end.
+
+    uv run python -m scripts.bench_generate_panels_persistence
+    uv run python -m scripts.bench_generate_panels_persistence --sizes 10 50 200 --repeats 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False, dotenv_path=".env.local")
+
+from sqlalchemy import text  # noqa: E402, I001
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+import core.payments.models  # noqa: E402, F401
+from core.auth.models.user import User  # noqa: E402
+from core.config import settings  # noqa: E402
+from core.infrastructure.database import configure_psycopg_json_dumps  # noqa: E402
+from core.story_engine.models import (  # noqa: E402
+    Character,
+    EditEvent,
+    Panel,
+    Project,
+    Story,
+)
+from core.story_engine.models.edit_event import (  # noqa: E402
+    EditEventOperationType,
+    EditEventStatus,
+    EditEventTargetType,
+)
+from core.story_engine.models.panel_character import PanelCharacter  # noqa: E402
+from core.story_engine.schemas.panel import PanelContent  # noqa: E402
+from core.story_engine.service import PanelService  # noqa: E402
+
+configure_psycopg_json_dumps()
+
+CHARACTERS_PER_STORY = 6
+CHARACTERS_PER_PANEL = 3
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time generate_panels persistence, per-row vs bulk."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeats", type=int, default=5)
+    return parser.parse_args()
+
+
+def _synthetic_panels(count: int, slugs: list[str]) -> list[PanelContent]:
+    return [
+        PanelContent(
+            background=f"Background for panel {i}",
+            dialogue=f"Dialogue for panel {i}",
+            characters=[
+                slugs[(i + offset) % len(slugs)]
+                for offset in range(CHARACTERS_PER_PANEL)
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+async def _persist_per_row(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    story_id: uuid.UUID,
+    generated_panels: list[PanelContent],
+    slug_to_id: dict[str, uuid.UUID],
+) -> list[Panel]:
+    """The persistence loop generate_panels used before the bulk path."""
+    panels: list[Panel] = []
+    for order_index, panel_content in enumerate(generated_panels):
+        panel = Panel.create(
+            story_id=story_id,
+            order_index=order_index,
+            attributes={
+                "background": panel_content.background,
+                "dialogue": panel_content.dialogue,
+                "characters": panel_content.characters,
+            },
+        )
+        db.add(panel)
+        await db.flush()
+        for slug in panel_content.characters:
+            db.add(PanelCharacter(panel_id=panel.id, character_id=slug_to_id[slug]))
+        edit_event = EditEvent.create_edit_event(
+            project_id=project_id,
+            target_type=EditEventTargetType.PANEL,
+            target_id=panel.id,
+            operation_type=EditEventOperationType.GENERATE_PANEL,
+            user_instruction="",
+            status=EditEventStatus.SUCCEEDED,
+            output_snapshot=panel.attributes,
+        )
+        db.add(edit_event)
+        await db.flush()
+        panel.source_event_id = edit_event.id
+        panels.append(panel)
+    await db.commit()
+    for panel in panels:
+        await db.refresh(panel)
+    return panels
+
+
+async def _persist_bulk(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    story_id: uuid.UUID,
+    generated_panels: list[PanelContent],
+    slug_to_id: dict[str, uuid.UUID],
+) -> list[Panel]:
+    panels = await PanelService(db)._persist_generated_panels(
+        project_id, story_id, generated_panels, slug_to_id
+    )
+    await db.commit()
+    return panels
+
+
+async def _run() -> None:
+    args = parse_args()
+    engine = create_async_engine(settings.database_url, echo=False)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as db:
+        user = User(
+            email=f"bench-{uuid.uuid4()}@example.com", password_hash="not-a-hash"
+        )
+        db.add(user)
+        await db.flush()
+        project = Project(user_id=user.id)
+        db.add(project)
+        await db.flush()
+        user_id, project_id = user.id, project.id
+        await db.commit()
+
+    try:
+        print(f"{'panels':>7}  {'per-row ms':>11}  {'bulk ms':>9}  {'speedup':>8}")
+        for size in args.sizes:
+            timings: dict[str, list[float]] = {"per_row": [], "bulk": []}
+            for _ in range(args.repeats):
+                for label, persist in (
+                    ("per_row", _persist_per_row),
+                    ("bulk", _persist_bulk),
+                ):
+                    async with session_maker() as db:
+                        story = Story(project_id=project_id, story_text="bench")
+                        db.add(story)
+                        await db.flush()
+                        characters = [
+                            Character(
+                                story_id=story.id,
+                                name=f"Character {i}",
+                                slug=f"character-{i}",
+                                attributes={},
+                            )
+                            for i in range(CHARACTERS_PER_STORY)
+                        ]
+                        db.add_all(characters)
+                        await db.commit()
+                        slug_to_id = {c.slug: c.id for c in characters}
+                        generated = _synthetic_panels(size, list(slug_to_id))
+
+                        started = time.perf_counter()
+                        panels = await persist(
+                            db, project_id, story.id, generated, slug_to_id
+                        )
+                        elapsed = (time.perf_counter() - started) * 1000
+                        assert len(panels) == size
+                        timings[label].append(elapsed)
+
+            per_row = statistics.median(timings["per_row"])
+            bulk = statistics.median(timings["bulk"])
+            print(f"{size:>7}  {per_row:>11.1f}  {bulk:>9.1f}  {per_row / bulk:>7.1f}x")
+    finally:
+        async with session_maker() as db:
+            await db.execute(text('DELETE FROM "user" WHERE id = :id'), {"id": user_id})
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_run())
@@ -0,0 +1,329 @@
+"""
+Benchmark the database writes around a render (render_panel / render_character).
+
+Compares the previous sequential path (PENDING EditEvent INSERT + COMMIT; then
+Image INSERT, SELECT + UPDATE of the target, EditEvent UPDATE, COMMIT, refresh
+and re-read) with the pipelined path the services use now
+(database.pipeline() + set_edit_event_status + UPDATE ... RETURNING). fal, the
+download and the GCS upload are skipped — only the database work is timed.
+
+Like render_panel, both variants read the panel's characters between the two
+transactions (the read that resolves character renders for fal), so TX2 starts
+inside an open transaction.
+
+Traffic goes through an in-process TCP proxy that delays every packet by half
+of --rtt-ms in each direction, a stand-in for `tc qdisc ... netem delay` that
+needs no root. The "RTTs" column is median latency / RTT: the number of network
+round trips the sequence waits on.
+
+Creates a throwaway user/project/story/panel and deletes them (cascade) at the
+end.
+
+    uv run python -m scripts.bench_render_completion
+    uv run python -m scripts.bench_render_completion --rtt-ms 2 10 --repeats 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False, dotenv_path=".env.local")
+
+from sqlalchemy import text  # noqa: E402, I001
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+import core.payments.models  # noqa: E402, F401
+from core.auth.models.user import User  # noqa: E402
+from core.config import settings  # noqa: E402
+from core.infrastructure.database import (  # noqa: E402
+    configure_psycopg_json_dumps,
+    pipeline,
+)
+from core.story_engine.models import EditEvent, Panel, Project, Story  # noqa: E402
+from core.story_engine.models.edit_event import (  # noqa: E402
+    EditEventOperationType,
+    EditEventStatus,
+    EditEventTargetType,
+)
+from core.story_engine.models.image import Image as ImageModel  # noqa: E402
+from core.story_engine.models.image import (  # noqa: E402
+    ImageContentType,
+    ImageDiscriminatorKey,
+)
+from core.story_engine.repository import Repository  # noqa: E402
+
+configure_psycopg_json_dumps()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Round trips and latency of render DB writes, sequential vs pipelined."
+    )
+    parser.add_argument("--rtt-ms", type=float, nargs="+", default=[2.0, 10.0, 50.0])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument(
+        "--prepare-threshold",
+        type=int,
+        default=settings.database_prepare_threshold,
+        help="psycopg prepare_threshold for the benchmark engine; -1 disables.",
+    )
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# Latency proxy
+# ---------------------------------------------------------------------------
+
+
+class LatencyProxy:
+    """Forward TCP to upstream, delaying each chunk by rtt/2 in each direction."""
+
+    def __init__(self, upstream_host: str, upstream_port: int, rtt_ms: float) -> None:
+        self.upstream_host = upstream_host
+        self.upstream_port = upstream_port
+        self.one_way_delay = rtt_ms / 2000
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return int(self._server.sockets[0].getsockname()[1])
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(
+        self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter
+    ) -> None:
+        server_reader, server_writer = await asyncio.open_connection(
+            self.upstream_host, self.upstream_port
+        )
+        await asyncio.gather(
+            self._pump(client_reader, server_writer),
+            self._pump(server_reader, client_writer),
+            return_exceptions=True,
+        )
+
+    async def _pump(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Delay line: each chunk leaves one_way_delay after it arrived.
+
+        Chunks sent back to back are not delayed behind each other, so a
+        pipelined batch pays the latency once, as it would on a real link.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[tuple[float, bytes]] = asyncio.Queue()
+
+        async def forward() -> None:
+            while True:
+                deadline, chunk = await queue.get()
+                if not chunk:
+                    break
+                await asyncio.sleep(max(0.0, deadline - loop.time()))
+                writer.write(chunk)
+                await writer.drain()
+
+        forwarder = asyncio.create_task(forward())
+        try:
+            while chunk := await reader.read(65536):
+                queue.put_nowait((loop.time() + self.one_way_delay, chunk))
+        finally:
+            queue.put_nowait((0.0, b""))
+            await forwarder
+            writer.close()
+
+
+# ---------------------------------------------------------------------------
+# Write sequences
+# ---------------------------------------------------------------------------
+
+
+def _pending_event(project_id: uuid.UUID, panel_id: uuid.UUID) -> EditEvent:
+    return EditEvent.create_edit_event(
+        project_id=project_id,
+        target_type=EditEventTargetType.PANEL,
+        target_id=panel_id,
+        operation_type=EditEventOperationType.RENDER_PANEL,
+        user_instruction="",
+        status=EditEventStatus.PENDING,
+    )
+
+
+def _image(
+    user_id: uuid.UUID, project_id: uuid.UUID, panel_id: uuid.UUID
+) -> ImageModel:
+    return ImageModel.create(
+        project_id=project_id,
+        user_id=user_id,
+        target_id=panel_id,
+        width=1024,
+        height=1024,
+        content_type=ImageContentType.JPEG,
+        object_key=f"bench/{uuid.uuid4()}.jpg",
+        bucket="bench",
+        size_bytes=1,
+        discriminator_key=ImageDiscriminatorKey.PANEL_RENDER,
+        meta={},
+    )
+
+
+async def _render_sequential(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    project_id: uuid.UUID,
+    story_id: uuid.UUID,
+    panel_id: uuid.UUID,
+) -> Panel:
+    """The writes render_panel issued before pipelining."""
+    repository = Repository(db)
+    edit_event = _pending_event(project_id, panel_id)
+    await repository.edit_event.add_edit_event_to_db(edit_event)
+    await db.flush()
+    edit_event_id = edit_event.id
+    await db.commit()
+    await repository.panel.get_character_ids_for_panel(panel_id)
+
+    image_model = _image(user_id, project_id, panel_id)
+    await repository.image.create_image(image_model)
+    await db.flush()
+    panel = await repository.panel.get_panel(panel_id, story_id)
+    assert panel is not None
+    panel.canonical_render_id = image_model.id
+    await repository.edit_event.update_edit_event(
+        edit_event_id,
+        EditEventStatus.SUCCEEDED,
+        output_snapshot={"image_id": str(image_model.id)},
+    )
+    await db.commit()
+    await db.refresh(image_model)
+    refreshed_panel = await repository.panel.get_panel(panel_id, story_id)
+    assert refreshed_panel is not None
+    return refreshed_panel
+
+
+async def _render_pipelined(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    project_id: uuid.UUID,
+    story_id: uuid.UUID,
+    panel_id: uuid.UUID,
+) -> Panel:
+    """The writes render_panel issues now."""
+    repository = Repository(db)
+    edit_event = _pending_event(project_id, panel_id)
+    await repository.edit_event.add_edit_event_to_db(edit_event)
+    await db.flush()
+    edit_event_id = edit_event.id
+    await db.commit()
+    await repository.panel.get_character_ids_for_panel(panel_id)
+
+    image_model = _image(user_id, project_id, panel_id)
+    async with pipeline(db):
+        await repository.image.create_image(image_model)
+        await db.flush()
+        await repository.edit_event.set_edit_event_status(
+            edit_event_id,
+            EditEventStatus.SUCCEEDED,
+            output_snapshot={"image_id": str(image_model.id)},
+        )
+    panel = await repository.panel.set_canonical_render(
+        panel_id, story_id, image_model.id
+    )
+    await db.commit()
+    return panel
+
+
+RenderWrites = Callable[
+    [AsyncSession, uuid.UUID, uuid.UUID, uuid.UUID, uuid.UUID], Awaitable[Panel]
+]
+
+
+async def _run() -> None:
+    args = parse_args()
+    url = make_url(settings.database_url)
+    assert url.host is not None
+    prepare_threshold = None if args.prepare_threshold < 0 else args.prepare_threshold
+
+    setup_engine = create_async_engine(settings.database_url, echo=False)
+    setup_maker = async_sessionmaker(setup_engine, expire_on_commit=False)
+    async with setup_maker() as db:
+        user = User(
+            email=f"bench-{uuid.uuid4()}@example.com", password_hash="not-a-hash"
+        )
+        db.add(user)
+        await db.flush()
+        project = Project(user_id=user.id)
+        db.add(project)
+        await db.flush()
+        story = Story(project_id=project.id, story_text="bench")
+        db.add(story)
+        await db.flush()
+        panel = Panel.create(story_id=story.id, order_index=0, attributes={})
+        db.add(panel)
+        await db.commit()
+        ids = (user.id, project.id, story.id, panel.id)
+
+    variants: dict[str, RenderWrites] = {
+        "sequential": _render_sequential,
+        "pipelined": _render_pipelined,
+    }
+    try:
+        print(
+            f"{'rtt ms':>6}  {'variant':<10}  {'median ms':>9}  {'p95 ms':>7}  "
+            f"{'RTTs':>5}"
+        )
+        for rtt_ms in args.rtt_ms:
+            proxy = LatencyProxy(url.host, url.port or 5432, rtt_ms)
+            port = await proxy.start()
+            engine = create_async_engine(
+                url.set(host="127.0.0.1", port=port),
+                echo=False,
+                pool_pre_ping=False,
+                connect_args={"prepare_threshold": prepare_threshold},
+            )
+            session_maker = async_sessionmaker(engine, expire_on_commit=False)
+            try:
+                # Open the pooled connection outside the timed region.
+                async with session_maker() as db:
+                    await db.execute(text("SELECT 1"))
+                for label, render_writes in variants.items():
+                    timings: list[float] = []
+                    for _ in range(args.repeats):
+                        # Timed through session close: a transaction left open
+                        # is rolled back when the connection returns to the pool.
+                        started = time.perf_counter()
+                        async with session_maker() as db:
+                            await render_writes(db, *ids)
+                        timings.append((time.perf_counter() - started) * 1000)
+                    median = statistics.median(timings)
+                    p95 = statistics.quantiles(timings, n=20)[-1]
+                    print(
+                        f"{rtt_ms:>6.1f}  {label:<10}  {median:>9.1f}  {p95:>7.1f}  "
+                        f"{median / rtt_ms:>5.1f}"
+                    )
+            finally:
+                await engine.dispose()
+                await proxy.stop()
+    finally:
+        async with setup_maker() as db:
+            await db.execute(text('DELETE FROM "user" WHERE id = :id'), {"id": ids[0]})
+            await db.commit()
+        await setup_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_run())
@@ -0,0 +1,132 @@
+"""
+Benchmark single-call vs segmented (map-reduce) panel extraction.
+
+The LLM is a fake with a fixed time-to-first-token plus a per-output-token
+cost, emitting about one panel per --chars-per-panel characters of story. That
+is the shape that matters: a single call's latency grows with the number of
+panels it has to emit, while segmented extraction pays roughly one segment's
+worth of output per wave of --concurrency calls.
+
+No network and no database; PanelService runs on an unbound session.
+
+    uv run python -m scripts.bench_segmented_panel_extraction
+    uv run python -m scripts.bench_segmented_panel_extraction --lengths 8000 40000 --time-scale 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+from unittest.mock import patch
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False, dotenv_path=".env.local")
+
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from core.config import settings  # noqa: E402
+from core.story_engine.schemas.panel import PanelContent  # noqa: E402
+from core.story_engine.service.panel_service import PanelService  # noqa: E402
+
+SLUGS = ["mira", "tobias", "the-warden"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Panel extraction latency, single call vs segmented."
+    )
+    parser.add_argument(
+        "--lengths", type=int, nargs="+", default=[6000, 15000, 30000, 60000]
+    )
+    parser.add_argument("--ttft", type=float, default=0.5, help="seconds")
+    parser.add_argument("--per-token", type=float, default=0.02, help="seconds")
+    parser.add_argument("--tokens-per-panel", type=int, default=60)
+    parser.add_argument("--chars-per-panel", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--target-chars", type=int, default=6000)
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=1.0,
+        help="multiply every simulated delay (e.g. 0.1 for a quick run)",
+    )
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# Synthetic story and fake LLM
+# ---------------------------------------------------------------------------
+
+
+def _story(length: int) -> str:
+    paragraph = (
+        "Mira crossed the flooded courtyard while Tobias kept watch from the "
+        "broken tower, counting the lanterns that still burned along the wall. "
+        "The Warden's bell rang twice, then fell silent, and the rain came "
+        "harder across the slate roofs of the old prison."
+    )
+    paragraphs: list[str] = []
+    while sum(len(p) + 2 for p in paragraphs) < length:
+        if paragraphs and len(paragraphs) % 6 == 0:
+            paragraphs.append("* * *")
+        paragraphs.append(paragraph)
+    return "\n\n".join(paragraphs)
+
+
+def _fake_completion(args: argparse.Namespace, calls: list[int]) -> Any:
+    async def completion(
+        *, model: str, response_model: Any, messages: list[Any], **kwargs: Any
+    ) -> Any:
+        prompt = str(messages[-1]["content"])
+        panel_count = max(1, len(prompt) // args.chars_per_panel)
+        calls.append(panel_count)
+        delay = args.ttft + panel_count * args.tokens_per_panel * args.per_token
+        await asyncio.sleep(delay * args.time_scale)
+        panels = [
+            PanelContent(
+                background="The flooded courtyard at night",
+                dialogue=f"Line {len(calls)}.{i}",
+                characters=SLUGS[: 1 + i % len(SLUGS)],
+            )
+            for i in range(panel_count)
+        ]
+        return response_model(panels=panels)
+
+    return completion
+
+
+async def _run(args: argparse.Namespace, story: str, segmented: bool) -> str:
+    service = PanelService(AsyncSession())
+    # Segmentation is automatic above the threshold; move it to force a path.
+    threshold = 0 if segmented else len(story) + 1
+    calls: list[int] = []
+    with (
+        patch.object(settings, "panel_segmentation_threshold_chars", threshold),
+        patch.object(settings, "panel_segment_target_chars", args.target_chars),
+        patch.object(settings, "panel_segment_concurrency", args.concurrency),
+        patch(
+            "core.story_engine.service.panel_service.cached_completion",
+            _fake_completion(args, calls),
+        ),
+    ):
+        started = time.perf_counter()
+        response = await service._extract_panels_from_story(story, SLUGS)
+        elapsed = (time.perf_counter() - started) / args.time_scale
+    return f"{len(calls):>5}  {len(response.panels):>6}  {elapsed:>9.2f}"
+
+
+async def main() -> None:
+    args = parse_args()
+    print(f"{'chars':>6}  {'path':<9}  {'calls':>5}  {'panels':>6}  {'seconds':>9}")
+    for length in args.lengths:
+        story = _story(length)
+        for label, segmented in (("single", False), ("segmented", True)):
+            row = await _run(args, story, segmented)
+            print(f"{len(story):>6}  {label:<9}  {row}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,211 @@
+"""
+Benchmark digest-based prompts against full-story prompts, per operation type.
+
+For each story length the script plays one editing session — every character
+refined once and every panel generated once — and reports, per operation,
+input tokens per call and p50 latency with the full story in the prompt
+(before) and with the story digest (after). The prompts are the real ones
+(CharacterService._character_refinement_messages,
+PanelService._single_panel_messages); the digest is synthetic but shaped like
+what gpt-4o-mini returns. The one-off digest build is reported separately.
+
+Latency is simulated: TTFT + input tokens x prefill cost + output tokens x
+per-token cost, tokens estimated as chars / 4. Extraction operations read the
+full text either way and are not shown.
+
+    uv run python -m scripts.bench_story_digests
+    uv run python -m scripts.bench_story_digests --sizes 20 80 --panels 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import statistics
+from typing import Any
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False, dotenv_path=".env.local")
+
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from core.config import settings  # noqa: E402
+from core.story_engine.service import CharacterService, PanelService  # noqa: E402
+from core.story_engine.service.story_digest_service import (  # noqa: E402
+    StoryDigest,
+    character_story_context,
+    number_paragraphs,
+    panel_story_context,
+    split_paragraphs,
+)
+
+CHARACTERS = ["elias", "morrow", "ada", "the-ferryman"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Input tokens and p50 latency, full story vs digest prompts."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[20, 60, 120], help="paragraphs"
+    )
+    parser.add_argument("--panels", type=int, default=16)
+    parser.add_argument("--ttft", type=float, default=0.5, help="seconds")
+    parser.add_argument("--per-token", type=float, default=0.02, help="seconds")
+    parser.add_argument("--prefill", type=float, default=0.0002, help="s / token")
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+SENTENCES = [
+    "The tide pulled at the rocks below the lighthouse.",
+    "Salt had crusted the windows into a pale, uneven frost.",
+    "Somewhere across the bay a bell rang for the last ferry.",
+    "The lamp turned its slow circle over the black water.",
+    "Gulls argued over the harbour roofs until the rain came.",
+]
+
+
+def _story(paragraphs: int) -> str:
+    out = []
+    for i in range(paragraphs):
+        who = CHARACTERS[i % len(CHARACTERS)].replace("-", " ").title()
+        body = " ".join(SENTENCES[(i + k) % len(SENTENCES)] for k in range(4))
+        out.append(f"{who} waited. {body} ({i})")
+    return "\n\n".join(out)
+
+
+def _digest(paragraphs: int) -> StoryDigest:
+    scenes = [
+        {
+            "title": f"Scene {n + 1}",
+            "summary": "The keeper and the harbour face another night of storms.",
+            "first_paragraph": start,
+            "last_paragraph": min(start + 3, paragraphs - 1),
+        }
+        for n, start in enumerate(range(0, paragraphs, 4))
+    ]
+    characters = [
+        {
+            "name": slug.replace("-", " ").title(),
+            "paragraphs": list(range(k, paragraphs, len(CHARACTERS))),
+        }
+        for k, slug in enumerate(CHARACTERS)
+    ]
+    return StoryDigest.model_validate(
+        {
+            "summary": "A lighthouse keeper holds the light through a season of "
+            "storms while the harbour town waits for the last ferry. " * 3,
+            "scenes": scenes,
+            "characters": characters,
+        }
+    )
+
+
+ATTRIBUTES: dict[str, object] = {
+    "name": "Elias",
+    "brief": "The lighthouse keeper.",
+    "character_type": "humanoid",
+    "visual_form": "Weathered man in an oilskin coat",
+    "color_palette": ["slate", "amber"],
+    "distinctive_markers": ["Brass lamp key"],
+    "demeanor": "Patient",
+    "role": "Protagonist",
+}
+
+
+def _tokens(text: str) -> int:
+    return math.ceil(len(text) / 4)
+
+
+def _message_tokens(messages: list[Any]) -> int:
+    return _tokens("\n".join(str(m["content"]) for m in messages))
+
+
+# ---------------------------------------------------------------------------
+# Session
+# ---------------------------------------------------------------------------
+
+
+def _session(
+    characters: CharacterService,
+    panels: PanelService,
+    story: str,
+    digest: StoryDigest | None,
+    panel_count: int,
+) -> dict[str, list[int]]:
+    """Input tokens of every call one editing session makes, per operation."""
+    calls: dict[str, list[int]] = {"refine_character": [], "generate_panel": []}
+    for slug in CHARACTERS:
+        context = (
+            story if digest is None else character_story_context(story, digest, [slug])
+        )
+        messages = characters._character_refinement_messages(
+            context, ATTRIBUTES, "Give them a scar."
+        )
+        calls["refine_character"].append(_message_tokens(messages))
+    for index in range(panel_count):
+        context = (
+            story
+            if digest is None
+            else panel_story_context(story, digest, index, panel_count)
+        )
+        messages = panels._single_panel_messages(context, index, CHARACTERS)
+        calls["generate_panel"].append(_message_tokens(messages))
+    return calls
+
+
+OUTPUT_TOKENS = {"refine_character": 250, "generate_panel": 120}
+
+
+async def main() -> None:
+    args = parse_args()
+    characters = CharacterService(AsyncSession())
+    panels = PanelService(AsyncSession())
+
+    def latency(input_tokens: int, output_tokens: int) -> float:
+        seconds: float = (
+            args.ttft + input_tokens * args.prefill + output_tokens * args.per_token
+        )
+        return seconds
+
+    print(
+        f"{'paras':>5}  {'operation':<17}  {'in tok before':>13}  {'after':>6}"
+        f"  {'p50 s before':>12}  {'after':>6}"
+    )
+    for size in args.sizes:
+        story = _story(size)
+        digest = _digest(size)
+        if len(story) < settings.story_digest_min_chars:
+            print(f"{size:>5}  (below STORY_DIGEST_MIN_CHARS — sent whole)")
+            continue
+        before = _session(characters, panels, story, None, args.panels)
+        after = _session(characters, panels, story, digest, args.panels)
+        for operation, output_tokens in OUTPUT_TOKENS.items():
+            p50_before = statistics.median(
+                latency(t, output_tokens) for t in before[operation]
+            )
+            p50_after = statistics.median(
+                latency(t, output_tokens) for t in after[operation]
+            )
+            print(
+                f"{size:>5}  {operation:<17}"
+                f"  {statistics.median(before[operation]):>13.0f}"
+                f"  {statistics.median(after[operation]):>6.0f}"
+                f"  {p50_before:>12.2f}  {p50_after:>6.2f}"
+            )
+        build_in = _tokens(number_paragraphs(split_paragraphs(story)))
+        build_out = _tokens(digest.model_dump_json())
+        print(
+            f"{size:>5}  {'digest (once)':<17}  {'':>13}  {build_in:>6}"
+            f"  {'':>12}  {latency(build_in, build_out):>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
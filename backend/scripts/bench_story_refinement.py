@@ -0,0 +1,234 @@
+"""
+Benchmark diff-based story refinement against full rewrites.
+
+The corpus is built in-script: three story lengths, each refined with four
+typical instructions (rename a character, change the ending, add a scene, cut
+a paragraph). For every case both strategies produce the same refined story:
+
+  rewrite  the model re-emits the whole story (the old refine path)
+  edits    the model emits a StoryEditPlan; apply_story_edits patches locally
+
+By default the model is simulated: latency = TTFT + input tokens x prefill
+cost + output tokens x per-token cost, with tokens estimated as chars / 4. The
+prompts are the real ones (StoryService._build_refinement_prompt and
+StoryEditPlanner.messages); the edit plans are the ones a model should return.
+Local apply time is measured, not simulated.
+
+--live sends every case to gpt-4o both ways and reports the real usage and
+wall time (needs OPENAI_API_KEY; costs money).
+
+    uv run python -m scripts.bench_story_refinement
+    uv run python -m scripts.bench_story_refinement --live --sizes 6 18
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False, dotenv_path=".env.local")
+
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from core.infrastructure.intelligence import instructor_client  # noqa: E402
+from core.infrastructure.intelligence.openai import async_openai_client  # noqa: E402
+from core.story_engine.schemas.story import StoryEditPlan  # noqa: E402
+from core.story_engine.service.story_service import (  # noqa: E402
+    StoryEditPlanner,
+    StoryService,
+    StoryStreamGenerator,
+)
+from core.story_engine.story_edits import (  # noqa: E402
+    apply_story_edits,
+    split_paragraphs,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Story refinement latency and tokens, rewrite vs edits."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[6, 18, 45], help="paragraphs"
+    )
+    parser.add_argument("--ttft", type=float, default=0.5, help="seconds")
+    parser.add_argument("--per-token", type=float, default=0.02, help="seconds")
+    parser.add_argument("--prefill", type=float, default=0.0002, help="s / token")
+    parser.add_argument("--live", action="store_true")
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+SENTENCES = [
+    "The tide pulled at the rocks below the lighthouse.",
+    "Elias counted the steps as he climbed, as he had every night for years.",
+    "Salt had crusted the windows into a pale, uneven frost.",
+    "Somewhere across the bay a bell rang for the last ferry.",
+    "He trimmed the wick and watched the flame steady itself.",
+]
+
+
+def _story(paragraphs: int) -> str:
+    out = []
+    for i in range(paragraphs):
+        body = " ".join(SENTENCES[(i + k) % len(SENTENCES)] for k in range(4))
+        if i % 3 == 1:
+            body += " Morrow watched from the harbour wall."
+        out.append(f"{body} ({i})")
+    return "\n\n".join(out)
+
+
+def _rename(paragraphs: list[str]) -> list[dict[str, Any]]:
+    return [
+        {
+            "op": "replace_span",
+            "paragraph": i,
+            "find": "Morrow watched",
+            "replace": "Vane watched",
+        }
+        for i, p in enumerate(paragraphs)
+        if "Morrow" in p
+    ]
+
+
+def _ending(paragraphs: list[str]) -> list[dict[str, Any]]:
+    return [
+        {
+            "op": "replace_paragraph",
+            "paragraph": len(paragraphs) - 1,
+            "text": "At dawn the ferry returned, and Elias let the lamp go dark "
+            "knowing the harbour was safe.",
+        }
+    ]
+
+
+def _scene(paragraphs: list[str]) -> list[dict[str, Any]]:
+    return [
+        {
+            "op": "insert_after_paragraph",
+            "paragraph": len(paragraphs) // 2,
+            "text": "Under the stairs Elias found a letter, its wax seal broken "
+            "and its ink run by years of damp. It was addressed to him.",
+        }
+    ]
+
+
+def _cut(paragraphs: list[str]) -> list[dict[str, Any]]:
+    return [{"op": "delete_paragraph", "paragraph": min(2, len(paragraphs) - 1)}]
+
+
+INSTRUCTIONS: list[tuple[str, str, Callable[[list[str]], list[dict[str, Any]]]]] = [
+    ("rename", "Rename Morrow to Vane.", _rename),
+    ("ending", "Give the story a hopeful ending.", _ending),
+    ("scene", "Add a scene where Elias finds an old letter.", _scene),
+    ("cut", "Cut the third paragraph.", _cut),
+]
+
+
+@dataclass
+class Result:
+    input_tokens: int
+    output_tokens: int
+    seconds: float
+
+
+def _tokens(text: str) -> int:
+    return math.ceil(len(text) / 4)
+
+
+def _message_text(messages: list[Any]) -> str:
+    return "\n".join(str(m["content"]) for m in messages)
+
+
+# ---------------------------------------------------------------------------
+# Simulated and live runs
+# ---------------------------------------------------------------------------
+
+
+def _simulate(args: argparse.Namespace, prompt: str, output: str) -> Result:
+    input_tokens, output_tokens = _tokens(prompt), _tokens(output)
+    seconds = args.ttft + input_tokens * args.prefill + output_tokens * args.per_token
+    return Result(input_tokens, output_tokens, seconds)
+
+
+async def _live_rewrite(messages: list[Any]) -> Result:
+    started = time.perf_counter()
+    completion = await async_openai_client.chat.completions.create(
+        model="gpt-4o", messages=messages, temperature=0.7
+    )
+    usage = completion.usage
+    assert usage is not None
+    return Result(
+        usage.prompt_tokens, usage.completion_tokens, time.perf_counter() - started
+    )
+
+
+async def _live_edits(messages: list[Any]) -> Result:
+    started = time.perf_counter()
+    _, completion = await instructor_client.chat.completions.create_with_completion(
+        model="gpt-4o", response_model=StoryEditPlan, messages=messages
+    )
+    usage = completion.usage
+    return Result(
+        usage.prompt_tokens, usage.completion_tokens, time.perf_counter() - started
+    )
+
+
+async def main() -> None:
+    args = parse_args()
+    service = StoryService(AsyncSession())
+    planner = StoryEditPlanner()
+    system_prompt = StoryStreamGenerator()._system_prompt()
+
+    print(
+        f"{'paras':>5}  {'case':<7}  {'path':<7}  {'in tok':>7}  {'out tok':>7}"
+        f"  {'seconds':>8}  {'apply us':>8}"
+    )
+    for size in args.sizes:
+        story = _story(size)
+        paragraphs = split_paragraphs(story)
+        for name, instruction, build_plan in INSTRUCTIONS:
+            plan = StoryEditPlan.model_validate({"edits": build_plan(paragraphs)})
+            started = time.perf_counter()
+            refined = apply_story_edits(story, plan.edits)
+            apply_us = (time.perf_counter() - started) * 1_000_000
+
+            rewrite_messages: list[Any] = [
+                {"role": "system", "content": system_prompt},
+                {
+                    "role": "user",
+                    "content": service._build_refinement_prompt(story, instruction),
+                },
+            ]
+            edit_messages: list[Any] = planner.messages(story, instruction)
+            if args.live:
+                rewrite = await _live_rewrite(rewrite_messages)
+                edits = await _live_edits(edit_messages)
+            else:
+                rewrite = _simulate(args, _message_text(rewrite_messages), refined)
+                plan_json = json.dumps(plan.model_dump(by_alias=True))
+                edits = _simulate(args, _message_text(edit_messages), plan_json)
+
+            for path, result, apply in (
+                ("rewrite", rewrite, ""),
+                ("edits", edits, f"{apply_us:.0f}"),
+            ):
+                print(
+                    f"{size:>5}  {name:<7}  {path:<7}  {result.input_tokens:>7}"
+                    f"  {result.output_tokens:>7}  {result.seconds:>8.2f}  {apply:>8}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
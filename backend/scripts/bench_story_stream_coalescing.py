@@ -0,0 +1,155 @@
+"""
+Benchmark CPU and bytes on the wire for the story NDJSON stream.
+
+Feeds a synthetic OpenAI chunk stream (one chunk per token) through
+OpenAIStreamProcessor and as_ndjson, the way StoryService frames a generation,
+either chunk by chunk ("per-token", the old framing) or through coalesce_chunks
+first. Each chunk is built fresh per run (coalescing merges chunks in place)
+but outside the timed section. Token arrival is simulated with a
+fake clock advancing --token-ms per token, so the time-based flush behaves as
+it would against the live API while the run itself never sleeps.
+
+CPU is process time for coalescing, framing and serialisation. "lines" is the number of NDJSON writes the response makes.
+
+    uv run python -m scripts.bench_story_stream_coalescing
+    uv run python -m scripts.bench_story_stream_coalescing --tokens 500 2000 --chars 64 256 --ms 20 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import AsyncIterator
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False, dotenv_path=".env.local")
+
+from openai.types.chat import ChatCompletionChunk  # noqa: E402
+
+from core.story_engine.events import EventEnvelope, as_ndjson  # noqa: E402
+from core.story_engine.service.story_service import (  # noqa: E402
+    OpenAIStreamProcessor,
+    coalesce_chunks,
+)
+
+WORDS = "the lantern swung once and the harbour went dark beneath the gulls".split()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Story stream framing cost, per-token vs coalesced."
+    )
+    parser.add_argument("--tokens", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--chars", type=int, nargs="+", default=[256])
+    parser.add_argument("--ms", type=int, nargs="+", default=[40])
+    parser.add_argument(
+        "--token-ms", type=float, default=15.0, help="simulated gap between tokens"
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# Synthetic stream
+# ---------------------------------------------------------------------------
+
+
+def _chunk(
+    content: str | None, finish_reason: str | None = None
+) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": content},
+                    "finish_reason": finish_reason,
+                }
+            ],
+        }
+    )
+
+
+def _chunks(tokens: int) -> list[ChatCompletionChunk]:
+    body = [_chunk(f" {WORDS[i % len(WORDS)]}") for i in range(tokens)]
+    return [_chunk(""), *body, _chunk(None, "stop")]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _arrivals(
+    chunks: list[ChatCompletionChunk], clock: FakeClock, token_ms: float
+) -> AsyncIterator[ChatCompletionChunk]:
+    for chunk in chunks:
+        clock.now += token_ms / 1000
+        yield chunk
+
+
+async def _events(
+    chunks: AsyncIterator[ChatCompletionChunk],
+) -> AsyncIterator[EventEnvelope]:
+    """StoryService._execute_streaming without the database writes."""
+    processor = OpenAIStreamProcessor()
+    accumulator: list[str] = []
+    stream_id = "bench"
+    seq = 0
+    async for chunk in chunks:
+        event = await processor.process(chunk, accumulator)
+        event.stream_id = stream_id
+        event.seq = seq
+        seq += 1
+        yield event
+
+
+async def _run(
+    tokens: int,
+    token_ms: float,
+    max_chars: int | None,
+    max_delay_ms: int,
+) -> tuple[float, int, int]:
+    clock = FakeClock()
+    chunks = _arrivals(_chunks(tokens), clock, token_ms)
+    if max_chars is not None:
+        chunks = coalesce_chunks(chunks, max_chars, max_delay_ms, clock=clock)
+    events = _events(chunks)
+    size = lines = 0
+    started = time.process_time()
+    async for line in as_ndjson(events):
+        size += len(line.encode())
+        lines += 1
+    return (time.process_time() - started) * 1000, size, lines
+
+
+async def main() -> None:
+    args = parse_args()
+    print(f"{'tokens':>6}  {'framing':<16}  {'lines':>6}  {'bytes':>8}  {'cpu ms':>7}")
+    for tokens in args.tokens:
+        variants: list[tuple[str, int | None, int]] = [("per-token", None, 0)]
+        variants += [
+            (f"{chars}c/{ms}ms", chars, ms) for chars in args.chars for ms in args.ms
+        ]
+        for label, max_chars, max_delay_ms in variants:
+            runs = [
+                await _run(tokens, args.token_ms, max_chars, max_delay_ms)
+                for _ in range(args.repeats)
+            ]
+            cpu = statistics.median(run[0] for run in runs)
+            _, size, lines = runs[0]
+            print(f"{tokens:>6}  {label:<16}  {lines:>6}  {size:>8}  {cpu:>7.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
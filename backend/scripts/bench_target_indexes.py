@@ -0,0 +1,304 @@
+"""
+Benchmark the polymorphic image / edit_event lookups with and without the
+composite target indexes (migration 7a1e5c3b9d42).
+
+Seeds a scratch schema with copies of the image and edit_event tables (no FKs,
+only the pre-migration discriminator_key index), runs EXPLAIN ANALYZE for each
+repository query against a sample of targets, adds the composite indexes and
+runs them again. The statements are captured from the real repository methods,
+so the benchmark tracks whatever SQL the repositories actually issue.
+
+    uv run python -m scripts.bench_target_indexes
+    uv run python -m scripts.bench_target_indexes --images 100000 --edit-events 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False, dotenv_path=".env.local")
+
+from sqlalchemy import text  # noqa: E402, I001
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine  # noqa: E402
+from sqlalchemy.sql import ClauseElement  # noqa: E402
+
+import core.auth.models  # noqa: E402, F401
+from core.config import settings  # noqa: E402
+from core.story_engine.models.image import ImageDiscriminatorKey  # noqa: E402
+from core.story_engine.repository.edit_event_repository import (  # noqa: E402
+    EditEventRepository,
+)
+from core.story_engine.repository.image_repository import ImageRepository  # noqa: E402
+
+DISCRIMINATOR_KEYS = [key.value for key in ImageDiscriminatorKey]
+TARGET_TYPES = ["story", "character", "panel"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN ANALYZE target lookups before/after composite indexes."
+    )
+    parser.add_argument("--images", type=int, default=1_000_000)
+    parser.add_argument("--edit-events", type=int, default=5_000_000)
+    parser.add_argument(
+        "--targets",
+        type=int,
+        default=100_000,
+        help="Distinct target_ids the seeded rows are spread across.",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=25,
+        help="Targets sampled per query; the median execution time is reported.",
+    )
+    parser.add_argument("--schema", default="bench_target_indexes")
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Leave the scratch schema in place after the run.",
+    )
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# Statement capture
+# ---------------------------------------------------------------------------
+
+
+class _EmptyResult:
+    def scalars(self) -> _EmptyResult:
+        return self
+
+    def first(self) -> None:
+        return None
+
+    def all(self) -> list[Any]:
+        return []
+
+
+class _CapturingSession:
+    """Stands in for AsyncSession and records the statement instead of running it."""
+
+    def __init__(self) -> None:
+        self.statement: ClauseElement | None = None
+
+    async def execute(self, statement: ClauseElement) -> _EmptyResult:
+        self.statement = statement
+        return _EmptyResult()
+
+
+async def _capture(call: Callable[[Any], Awaitable[object]]) -> str:
+    session = _CapturingSession()
+    await call(session)
+    assert session.statement is not None
+    compiled = session.statement.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    return str(compiled)
+
+
+def _repository_queries(
+    target_ids: list[uuid.UUID],
+) -> dict[str, Callable[[uuid.UUID], Awaitable[str]]]:
+    """Map a label to a coroutine that renders that query's SQL for one target."""
+    render = ImageDiscriminatorKey.PANEL_RENDER
+    batch = target_ids[:20]
+    return {
+        "image.get_canonical_render": lambda t: _capture(
+            lambda db: ImageRepository(db).get_canonical_render(t, render)
+        ),
+        "image.get_renders_for_target": lambda t: _capture(
+            lambda db: ImageRepository(db).get_renders_for_target(t, render)
+        ),
+        "image._get_reference_images": lambda t: _capture(
+            lambda db: ImageRepository(db).get_character_reference_images(t)
+        ),
+        "image.get_canonical_renders_for_targets(20)": lambda t: _capture(
+            lambda db: ImageRepository(db).get_canonical_renders_for_targets(
+                [t, *batch[1:]], render
+            )
+        ),
+        "edit_event.get_edit_events_for_target": lambda t: _capture(
+            lambda db: EditEventRepository(db).get_edit_events_for_target("panel", t)
+        ),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+
+async def _seed(conn: AsyncConnection, args: argparse.Namespace) -> None:
+    schema = args.schema
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {schema}"))
+    for table in ("image", "edit_event"):
+        await conn.execute(
+            text(
+                f"CREATE TABLE {schema}.{table} "
+                f"(LIKE public.{table} INCLUDING DEFAULTS)"
+            )
+        )
+        await conn.execute(text(f"ALTER TABLE {schema}.{table} ADD PRIMARY KEY (id)"))
+    # The only secondary index image had before the migration.
+    await conn.execute(text(f"CREATE INDEX ON {schema}.image (discriminator_key)"))
+    await conn.execute(
+        text(
+            f"CREATE TABLE {schema}.target AS "
+            "SELECT g AS n, gen_random_uuid() AS id "
+            "FROM generate_series(0, :targets - 1) g"
+        ),
+        {"targets": args.targets},
+    )
+
+    started = time.perf_counter()
+    await conn.execute(
+        text(
+            f"INSERT INTO {schema}.image (id, created_at, project_id, user_id, "
+            "target_id, width, height, content_type, object_key, bucket, "
+            "size_bytes, discriminator_key, meta) "
+            "SELECT gen_random_uuid(), now() - random() * interval '365 days', "
+            "gen_random_uuid(), gen_random_uuid(), t.id, 1024, 1024, 'image/png', "
+            "'bench/' || g, 'bench', 1, (CAST(:keys AS text[]))[1 + g % 4], '{}'::jsonb "
+            f"FROM generate_series(1, :n) g JOIN {schema}.target t "
+            "ON t.n = g % :targets"
+        ),
+        {"n": args.images, "targets": args.targets, "keys": DISCRIMINATOR_KEYS},
+    )
+    await conn.execute(
+        text(
+            f"INSERT INTO {schema}.edit_event (id, project_id, target_type, "
+            "target_id, operation_type, user_instruction, status, created_at) "
+            "SELECT gen_random_uuid(), gen_random_uuid(), (CAST(:types AS text[]))[1 + g % 3], "
+            "t.id, 'render_panel', '', 'succeeded', "
+            "now() - random() * interval '365 days' "
+            f"FROM generate_series(1, :n) g JOIN {schema}.target t "
+            "ON t.n = g % :targets"
+        ),
+        {"n": args.edit_events, "targets": args.targets, "types": TARGET_TYPES},
+    )
+    await conn.execute(text(f"ANALYZE {schema}.image"))
+    await conn.execute(text(f"ANALYZE {schema}.edit_event"))
+    print(
+        f"seeded {args.images:,} images and {args.edit_events:,} edit events "
+        f"across {args.targets:,} targets in {time.perf_counter() - started:.1f}s"
+    )
+
+
+async def _add_composite_indexes(conn: AsyncConnection, schema: str) -> None:
+    """Same definitions as migration 7a1e5c3b9d42, built non-concurrently."""
+    started = time.perf_counter()
+    await conn.execute(
+        text(
+            f"CREATE INDEX ix_image_target_discriminator_created ON {schema}.image "
+            "(target_id, discriminator_key, created_at DESC)"
+        )
+    )
+    await conn.execute(
+        text(
+            f"CREATE INDEX ix_edit_event_target_created ON {schema}.edit_event "
+            "(target_type, target_id, created_at DESC)"
+        )
+    )
+    await conn.execute(text(f"ANALYZE {schema}.image"))
+    await conn.execute(text(f"ANALYZE {schema}.edit_event"))
+    print(f"built composite indexes in {time.perf_counter() - started:.1f}s")
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+def _scan_nodes(plan: dict[str, Any]) -> set[str]:
+    """Collect 'Node Type [index]' labels for every scan in a plan tree."""
+    nodes: set[str] = set()
+    node_type = plan.get("Node Type", "")
+    if "Scan" in node_type:
+        index = plan.get("Index Name")
+        nodes.add(f"{node_type} [{index}]" if index else node_type)
+    for child in plan.get("Plans", []):
+        nodes |= _scan_nodes(child)
+    return nodes
+
+
+async def _measure(
+    conn: AsyncConnection,
+    queries: dict[str, Callable[[uuid.UUID], Awaitable[str]]],
+    target_ids: list[uuid.UUID],
+) -> dict[str, tuple[float, set[str]]]:
+    results: dict[str, tuple[float, set[str]]] = {}
+    for label, render_sql in queries.items():
+        timings: list[float] = []
+        nodes: set[str] = set()
+        for target_id in target_ids:
+            sql = await render_sql(target_id)
+            row = await conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"))
+            [explain] = row.scalar_one()
+            timings.append(explain["Execution Time"])
+            nodes |= _scan_nodes(explain["Plan"])
+        results[label] = (statistics.median(timings), nodes)
+    return results
+
+
+def _report(
+    before: dict[str, tuple[float, set[str]]],
+    after: dict[str, tuple[float, set[str]]],
+) -> None:
+    width = max(len(label) for label in before)
+    print()
+    print(f"{'query':<{width}}  {'before ms':>10}  {'after ms':>10}  {'speedup':>8}")
+    for label, (before_ms, before_nodes) in before.items():
+        after_ms, after_nodes = after[label]
+        speedup = before_ms / after_ms if after_ms else float("inf")
+        print(
+            f"{label:<{width}}  {before_ms:>10.3f}  {after_ms:>10.3f}  {speedup:>7.1f}x"
+        )
+        print(f"{'':<{width}}    before: {', '.join(sorted(before_nodes))}")
+        print(f"{'':<{width}}    after:  {', '.join(sorted(after_nodes))}")
+
+
+async def _run() -> None:
+    args = parse_args()
+    engine = create_async_engine(settings.database_url, echo=False)
+    try:
+        async with engine.begin() as conn:
+            await _seed(conn, args)
+
+        async with engine.connect() as conn:
+            await conn.execute(text(f"SET search_path TO {args.schema}"))
+            rows = await conn.execute(
+                text("SELECT id FROM target ORDER BY random() LIMIT :n"),
+                {"n": args.samples},
+            )
+            target_ids = list(rows.scalars().all())
+            queries = _repository_queries(target_ids)
+
+            before = await _measure(conn, queries, target_ids)
+            await _add_composite_indexes(conn, args.schema)
+            await conn.commit()
+            after = await _measure(conn, queries, target_ids)
+            await conn.rollback()
+
+        _report(before, after)
+    finally:
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_run())
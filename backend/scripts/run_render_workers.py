@@ -0,0 +1,48 @@
+"""
+Run render job workers outside the API process.
+
+Set RENDER_JOB_WORKERS=0 on the API service so it only enqueues, and run this
+wherever renders should happen; any number of copies share the queue.
+
+    uv run python -m scripts.run_render_workers --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False, dotenv_path=".env.local")
+
+import core.auth.models  # noqa: E402, I001, F401
+from core.config import settings  # noqa: E402
+from core.infrastructure.database import configure_psycopg_json_dumps  # noqa: E402
+from core.story_engine.render_jobs import render_job_workers  # noqa: E402
+
+configure_psycopg_json_dumps()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run render job workers.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=max(settings.render_job_workers, 1),
+        help="Number of concurrent workers.",
+    )
+    return parser.parse_args()
+
+
+async def _run() -> None:
+    args = parse_args()
+    render_job_workers.start(args.workers)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await render_job_workers.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(_run())
@@ -0,0 +1,29 @@
+"""
+Shared helpers for tests that assert on the SQL a code path issues.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+
+@contextmanager
+def count_queries(target: Any = Engine) -> Iterator[list[str]]:
+    """Record every SQL statement executed inside the block.
+
+    target defaults to the Engine class, which covers every engine — including
+    the app's own engine when the code under test runs behind api_client. Pass
+    a specific sync engine to scope the count to one session's connection.
+    """
+    statements: list[str] = []
+
+    def _record(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(target, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(target, "before_cursor_execute", _record)
@@ -0,0 +1,109 @@
+"""
+Slug-constrained instructor response models (schemas/constrained.py).
+
+Test invariants:
+  1. The same slug set returns the same model class regardless of order.
+  2. Models reject slugs outside the set and keep the PanelContent shape.
+  3. The models are pre-wrapped by instructor, so instructor reuses them as is.
+  4. The cache is bounded.
+  5. PanelService passes the cached model to instructor on every call.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+from instructor.v2.core.response_model import prepare_response_model
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.story_engine.models import Character, Panel, Project, Story
+from core.story_engine.schemas.constrained import (
+    CONSTRAINED_MODEL_CACHE_SIZE,
+    constrained_panel_content_model,
+    constrained_panels_response_model,
+)
+from core.story_engine.schemas.panel import PanelContentBase
+from tests.auth_helpers import auth_cookie_header
+
+
+def test_same_slug_set_returns_same_model() -> None:
+    first = constrained_panel_content_model(frozenset(["bob", "alice"]))
+    second = constrained_panel_content_model(frozenset(["alice", "bob"]))
+    other = constrained_panel_content_model(frozenset(["alice"]))
+
+    assert first is second
+    assert first is not other
+    assert constrained_panels_response_model(
+        frozenset(["bob", "alice"])
+    ) is constrained_panels_response_model(frozenset(["alice", "bob"]))
+
+
+def test_model_enforces_slugs() -> None:
+    model = constrained_panels_response_model(frozenset(["bob", "alice"]))
+
+    parsed = model.model_validate(
+        {"panels": [{"background": "b", "dialogue": "d", "characters": ["bob"]}]}
+    )
+    panel = parsed.panels[0]  # type: ignore[attr-defined]
+    assert isinstance(panel, PanelContentBase)
+    assert panel.model_dump()["characters"] == ["bob"]
+
+    with pytest.raises(ValidationError):
+        model.model_validate(
+            {"panels": [{"background": "b", "dialogue": "d", "characters": ["eve"]}]}
+        )
+
+    schema = constrained_panel_content_model(frozenset(["bob", "alice"]))
+    enum = schema.model_json_schema()["properties"]["characters"]["items"]["enum"]
+    assert enum == ["alice", "bob"]
+
+
+def test_instructor_reuses_cached_model() -> None:
+    model = constrained_panel_content_model(frozenset(["alice"]))
+    assert prepare_response_model(model) is model
+
+
+def test_cache_is_bounded() -> None:
+    info = constrained_panel_content_model.cache_info()
+    assert info.maxsize == CONSTRAINED_MODEL_CACHE_SIZE
+    for i in range(CONSTRAINED_MODEL_CACHE_SIZE + 1):
+        constrained_panel_content_model(frozenset([f"slug-{i}"]))
+    assert constrained_panel_content_model.cache_info().currsize == (
+        CONSTRAINED_MODEL_CACHE_SIZE
+    )
+
+
+async def test_panel_service_passes_cached_model(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    character: Character,
+) -> None:
+    panels = [
+        Panel.create(story_id=story.id, order_index=i, attributes={}) for i in (0, 1)
+    ]
+    db_session.add_all(panels)
+    await db_session.commit()
+
+    content = MagicMock(background="A dark forest", dialogue="Run.", characters=[])
+    with patch(
+        "core.story_engine.service.panel_service.instructor_client.chat.completions.create",
+        new_callable=AsyncMock,
+        return_value=content,
+    ) as create:
+        for panel in panels:
+            response = await api_client.post(
+                f"/api/comic-builder/v2/project/{project.id}/story/{story.id}"
+                f"/panel/{panel.id}/generate",
+                headers=auth_cookie_header(user.id),
+            )
+            assert response.status_code == 200
+
+    models = [call.kwargs["response_model"] for call in create.await_args_list]
+    assert len(models) == 2
+    assert models[0] is models[1]
+    assert models[0] is constrained_panel_content_model(frozenset([character.slug]))
@@ -0,0 +1,210 @@
+"""
+Per-phase timings on EditEvent and GET /v2/edit-events/latency.
+
+Test invariants:
+  1. A panel refine stores its llm and db time and total on the edit event.
+  2. The latency endpoint returns p50/p95/p99 per operation type and phase,
+     computed over the caller's own events in the [since, until) window.
+  3. The endpoint narrows by operation type, and rejects since >= until.
+     Timestamps without an offset are read as UTC.
+  4. Returns 401 when no auth cookie is provided.
+"""
+
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.story_engine.models import Character, Panel, Project, Story
+from core.story_engine.models.edit_event import (
+    EditEvent,
+    EditEventOperationType,
+    EditEventStatus,
+    EditEventTargetType,
+)
+from core.story_engine.schemas.panel import PanelContent
+from tests.auth_helpers import auth_cookie_header
+
+LATENCY_URL = "/api/comic-builder/v2/edit-events/latency"
+WINDOW_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _event(
+    project: Project,
+    operation: EditEventOperationType,
+    timings: dict[str, float],
+    created_at: datetime,
+) -> EditEvent:
+    event = EditEvent.create_edit_event(
+        project_id=project.id,
+        target_type=EditEventTargetType.PANEL,
+        target_id=uuid.uuid4(),
+        operation_type=operation,
+        user_instruction="",
+        status=EditEventStatus.SUCCEEDED,
+    )
+    event.timings = timings
+    event.created_at = created_at
+    return event
+
+
+def _window(**overrides: str) -> dict[str, str]:
+    return {
+        "since": WINDOW_START.isoformat(),
+        "until": (WINDOW_START + timedelta(hours=1)).isoformat(),
+        **overrides,
+    }
+
+
+async def test_refine_panel_stores_phase_timings(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    character: Character,
+) -> None:
+    panel = Panel.create(
+        story_id=story.id,
+        order_index=0,
+        attributes={"background": "A forest", "dialogue": "", "characters": []},
+    )
+    db_session.add(panel)
+    await db_session.commit()
+
+    with patch(
+        "core.story_engine.service.panel_service.instructor_client.chat.completions.create",
+        new_callable=AsyncMock,
+        return_value=PanelContent(
+            background="A moonlit forest", dialogue="", characters=[]
+        ),
+    ):
+        response = await api_client.post(
+            f"/api/comic-builder/v2/project/{project.id}"
+            f"/story/{story.id}/panel/{panel.id}/refine",
+            json={"instruction": "Make it night."},
+            headers=auth_cookie_header(user.id),
+        )
+    assert response.status_code == 200
+
+    event = (
+        await db_session.execute(
+            select(EditEvent).where(
+                EditEvent.target_id == panel.id,
+                EditEvent.operation_type == EditEventOperationType.REFINE_PANEL,
+            )
+        )
+    ).scalar_one()
+    assert event.timings is not None
+    assert set(event.timings) == {"db", "llm", "total"}
+    assert event.timings["total"] >= event.timings["llm"] >= 0
+
+
+async def test_latency_percentiles_per_operation_and_phase(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    user_factory: Callable[..., Awaitable[User]],
+) -> None:
+    other_project = Project(user_id=(await user_factory()).id)
+    db_session.add(other_project)
+    await db_session.flush()
+    inside = WINDOW_START + timedelta(minutes=5)
+    db_session.add_all(
+        [
+            *(
+                _event(
+                    project,
+                    EditEventOperationType.RENDER_PANEL,
+                    {"fal_run": ms, "total": ms + 100},
+                    inside,
+                )
+                for ms in (100.0, 200.0, 300.0, 400.0, 500.0)
+            ),
+            _event(
+                project,
+                EditEventOperationType.REFINE_PANEL,
+                {"llm": 80.0, "total": 90.0},
+                inside,
+            ),
+            # Outside the window, or someone else's: never counted.
+            _event(
+                project,
+                EditEventOperationType.RENDER_PANEL,
+                {"fal_run": 9000.0, "total": 9100.0},
+                WINDOW_START + timedelta(hours=1),
+            ),
+            _event(
+                other_project,
+                EditEventOperationType.RENDER_PANEL,
+                {"fal_run": 9000.0, "total": 9100.0},
+                inside,
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    response = await api_client.get(
+        LATENCY_URL, params=_window(), headers=auth_cookie_header(user.id)
+    )
+
+    assert response.status_code == 200
+    rows = {(row["operationType"], row["phase"]): row for row in response.json()}
+    assert set(rows) == {
+        ("refine_panel", "llm"),
+        ("refine_panel", "total"),
+        ("render_panel", "fal_run"),
+        ("render_panel", "total"),
+    }
+    fal_run = rows[("render_panel", "fal_run")]
+    assert fal_run["events"] == 5
+    assert fal_run["p50Ms"] == 300.0
+    assert fal_run["p95Ms"] == 480.0
+    assert fal_run["p99Ms"] == 496.0
+    assert rows[("render_panel", "total")]["p50Ms"] == 400.0
+
+    narrowed = await api_client.get(
+        LATENCY_URL,
+        params=_window(operation_type="refine_panel"),
+        headers=auth_cookie_header(user.id),
+    )
+    assert {row["operationType"] for row in narrowed.json()} == {"refine_panel"}
+
+
+async def test_latency_rejects_empty_window(
+    api_client: AsyncClient, user: User
+) -> None:
+    response = await api_client.get(
+        LATENCY_URL,
+        params=_window(until=WINDOW_START.isoformat()),
+        headers=auth_cookie_header(user.id),
+    )
+    assert response.status_code == 400
+
+
+async def test_latency_reads_naive_timestamps_as_utc(
+    api_client: AsyncClient, user: User
+) -> None:
+    naive_since = await api_client.get(
+        LATENCY_URL,
+        params={"since": "2026-01-01T00:00:00"},
+        headers=auth_cookie_header(user.id),
+    )
+    naive_window = await api_client.get(
+        LATENCY_URL,
+        params={"since": "2026-01-01T01:00:00", "until": "2026-01-01T00:00:00Z"},
+        headers=auth_cookie_header(user.id),
+    )
+    assert naive_since.status_code == 200
+    assert naive_window.status_code == 400
+
+
+async def test_latency_401_no_token(api_client: AsyncClient) -> None:
+    response = await api_client.get(LATENCY_URL)
+    assert response.status_code == 401
@@ -0,0 +1,165 @@
+"""
+Tests for POST /v2/images/signed-urls and ?include=signed_url on render listings.
+
+Test invariants:
+  1. The batch endpoint returns a map of image id -> {url, expiresAt} for the
+     caller's images, signing each object key once; ids that do not exist or
+     belong to another user are left out.
+  2. An empty batch or one over MAX_SIGNED_URL_BATCH ids returns 422.
+  3. Panel list, panel renders and character renders embed signedUrl and
+     signedUrlExpiresAt with ?include=signed_url and leave them null without.
+  4. Returns 401 when no auth cookie is provided.
+"""
+
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.story_engine.models import Character, Panel, Project, Story
+from core.story_engine.models.image import Image as ImageModel
+from core.story_engine.models.image import ImageContentType, ImageDiscriminatorKey
+from core.story_engine.schemas.image import MAX_SIGNED_URL_BATCH
+from tests.auth_helpers import auth_cookie_header
+
+BATCH_URL = "/api/comic-builder/v2/images/signed-urls"
+EXPIRES_AT = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+GENERATE_SIGNED_URL = (
+    "core.story_engine.service.image_service.GCSUploadService.generate_signed_url"
+)
+
+
+def _signer() -> MagicMock:
+    return MagicMock(side_effect=lambda key: (f"https://signed/{key}", EXPIRES_AT))
+
+
+def _image(
+    user: User,
+    project: Project,
+    target_id: uuid.UUID,
+    discriminator_key: ImageDiscriminatorKey,
+    object_key: str | None = None,
+) -> ImageModel:
+    return ImageModel.create(
+        project_id=project.id,
+        user_id=user.id,
+        target_id=target_id,
+        width=512,
+        height=512,
+        content_type=ImageContentType.JPEG,
+        object_key=object_key or f"renders/{uuid.uuid4()}.jpg",
+        bucket="test-bucket",
+        size_bytes=2048,
+        discriminator_key=discriminator_key,
+    )
+
+
+async def test_batch_signs_only_the_callers_images(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    character: Character,
+    user_factory: Callable[..., Awaitable[User]],
+) -> None:
+    stranger = await user_factory()
+    stranger_project = Project(user_id=stranger.id)
+    db_session.add(stranger_project)
+    await db_session.flush()
+    key = ImageDiscriminatorKey.CHARACTER_RENDER
+    mine = [_image(user, project, character.id, key) for _ in range(3)]
+    # Two rows for one object key are signed once.
+    shared = _image(user, project, character.id, key, object_key=mine[0].object_key)
+    theirs = _image(stranger, stranger_project, uuid.uuid4(), key)
+    db_session.add_all([*mine, shared, theirs])
+    await db_session.commit()
+
+    signer = _signer()
+    requested = [*mine, shared, theirs]
+    with patch(GENERATE_SIGNED_URL, signer):
+        response = await api_client.post(
+            BATCH_URL,
+            json={"imageIds": [str(i.id) for i in requested] + [str(uuid.uuid4())]},
+            headers=auth_cookie_header(user.id),
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        str(image.id): {
+            "url": f"https://signed/{image.object_key}",
+            "expiresAt": EXPIRES_AT.isoformat().replace("+00:00", "Z"),
+        }
+        for image in [*mine, shared]
+    }
+    assert signer.call_count == 3
+
+
+async def test_batch_size_is_bounded(api_client: AsyncClient, user: User) -> None:
+    empty = await api_client.post(
+        BATCH_URL, json={"imageIds": []}, headers=auth_cookie_header(user.id)
+    )
+    too_many = await api_client.post(
+        BATCH_URL,
+        json={"imageIds": [str(uuid.uuid4()) for _ in range(MAX_SIGNED_URL_BATCH + 1)]},
+        headers=auth_cookie_header(user.id),
+    )
+    assert empty.status_code == 422
+    assert too_many.status_code == 422
+
+
+async def test_listings_embed_signed_urls_on_request(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    character: Character,
+) -> None:
+    panel = Panel.create(story_id=story.id, order_index=0, attributes={})
+    db_session.add(panel)
+    await db_session.flush()
+    panel_render = _image(user, project, panel.id, ImageDiscriminatorKey.PANEL_RENDER)
+    character_render = _image(
+        user, project, character.id, ImageDiscriminatorKey.CHARACTER_RENDER
+    )
+    db_session.add_all([panel_render, character_render])
+    await db_session.flush()
+    panel.canonical_render_id = panel_render.id
+    await db_session.commit()
+
+    base = f"/api/comic-builder/v2/project/{project.id}/story/{story.id}"
+    urls = {
+        f"{base}/panels": lambda body: body[0]["canonicalRender"],
+        f"{base}/panel/{panel.id}/renders": lambda body: body[0],
+        f"{base}/character/{character.id}/renders": lambda body: body[0],
+    }
+    for url, image_of in urls.items():
+        with patch(GENERATE_SIGNED_URL, _signer()):
+            plain = await api_client.get(url, headers=auth_cookie_header(user.id))
+            signed = await api_client.get(
+                url,
+                params={"include": "signed_url"},
+                headers=auth_cookie_header(user.id),
+            )
+        assert plain.status_code == 200, url
+        assert signed.status_code == 200, url
+        assert image_of(plain.json())["signedUrl"] is None
+        image = image_of(signed.json())
+        assert image["signedUrl"] == f"https://signed/{image['objectKey']}"
+        assert datetime.fromisoformat(image["signedUrlExpiresAt"]) == EXPIRES_AT
+
+    unknown = await api_client.get(
+        f"{base}/panels",
+        params={"include": "thumbnails"},
+        headers=auth_cookie_header(user.id),
+    )
+    assert unknown.status_code == 422
+
+
+async def test_batch_signed_urls_401_no_token(api_client: AsyncClient) -> None:
+    response = await api_client.post(BATCH_URL, json={"imageIds": [str(uuid.uuid4())]})
+    assert response.status_code == 401
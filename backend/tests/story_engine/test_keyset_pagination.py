@@ -0,0 +1,202 @@
+"""
+Keyset pagination for history and render list endpoints.
+
+Test invariants:
+  1. Following X-Next-Cursor walks every history row exactly once, newest
+     first, even when rows share a created_at timestamp.
+  2. The last page carries no X-Next-Cursor header.
+  3. Render lists page the same way once limit or cursor is passed; without
+     either they return every render, past MAX_PAGE_SIZE, with no cursor.
+  4. A malformed cursor returns 400; an out-of-range limit returns 422.
+  5. Cursor tokens round-trip and are opaque url-safe strings.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.story_engine.models import Panel, Project, Story
+from core.story_engine.models.edit_event import (
+    EditEvent,
+    EditEventOperationType,
+    EditEventStatus,
+    EditEventTargetType,
+)
+from core.story_engine.models.image import Image as ImageModel
+from core.story_engine.models.image import ImageContentType, ImageDiscriminatorKey
+from core.story_engine.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, Cursor
+from tests.auth_helpers import auth_cookie_header
+
+
+def _panel_url(project_id: uuid.UUID, story_id: uuid.UUID, panel_id: uuid.UUID) -> str:
+    return (
+        f"/api/comic-builder/v2/project/{project_id}/story/{story_id}/panel/{panel_id}"
+    )
+
+
+async def _walk(
+    api_client: AsyncClient, url: str, user: User, limit: int
+) -> list[list[str]]:
+    """Follow X-Next-Cursor until exhausted; return the ids on each page."""
+    pages: list[list[str]] = []
+    params: dict[str, str | int] = {"limit": limit}
+    while True:
+        response = await api_client.get(
+            url, params=params, headers=auth_cookie_header(user.id)
+        )
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.json()])
+        next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if next_cursor is None:
+            return pages
+        params = {"limit": limit, "cursor": next_cursor}
+
+
+async def test_panel_history_pages_cover_every_event_once(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    """Seven events, three sharing one timestamp, walked two at a time."""
+    panel = Panel.create(story_id=story.id, order_index=0, attributes={})
+    db_session.add(panel)
+    await db_session.flush()
+
+    base = datetime.now(timezone.utc)
+    offsets = [0, 1, 2, 2, 2, 3, 4]
+    events = []
+    for offset in offsets:
+        event = EditEvent.create_edit_event(
+            project_id=project.id,
+            target_type=EditEventTargetType.PANEL,
+            target_id=panel.id,
+            operation_type=EditEventOperationType.RENDER_PANEL,
+            user_instruction="",
+            status=EditEventStatus.SUCCEEDED,
+        )
+        event.created_at = base + timedelta(seconds=offset)
+        events.append(event)
+    db_session.add_all(events)
+    await db_session.commit()
+
+    pages = await _walk(
+        api_client,
+        _panel_url(project.id, story.id, panel.id) + "/history",
+        user,
+        limit=2,
+    )
+
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    expected = [
+        str(e.id)
+        for e in sorted(events, key=lambda e: (e.created_at, e.id), reverse=True)
+    ]
+    assert [event_id for page in pages for event_id in page] == expected
+
+
+async def test_panel_renders_page_and_last_page_has_no_cursor(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    panel = Panel.create(story_id=story.id, order_index=0, attributes={})
+    db_session.add(panel)
+    await db_session.flush()
+
+    base = datetime.now(timezone.utc)
+    renders = []
+    for i in range(5):
+        image = ImageModel.create(
+            project_id=project.id,
+            user_id=user.id,
+            target_id=panel.id,
+            width=512,
+            height=512,
+            content_type=ImageContentType.JPEG,
+            object_key=f"test/renders/{uuid.uuid4()}.jpg",
+            bucket="test-bucket",
+            size_bytes=1024,
+            discriminator_key=ImageDiscriminatorKey.PANEL_RENDER,
+        )
+        image.created_at = base + timedelta(seconds=i)
+        renders.append(image)
+    db_session.add_all(renders)
+    await db_session.commit()
+
+    url = _panel_url(project.id, story.id, panel.id) + "/renders"
+    pages = await _walk(api_client, url, user, limit=5)
+    assert pages == [[str(r.id) for r in reversed(renders)]]
+
+    pages = await _walk(api_client, url, user, limit=3)
+    assert [len(page) for page in pages] == [3, 2]
+
+
+async def test_render_lists_stay_unbounded_without_limit_or_cursor(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    panel = Panel.create(story_id=story.id, order_index=0, attributes={})
+    db_session.add(panel)
+    await db_session.flush()
+    db_session.add_all(
+        ImageModel.create(
+            project_id=project.id,
+            user_id=user.id,
+            target_id=panel.id,
+            width=512,
+            height=512,
+            content_type=ImageContentType.JPEG,
+            object_key=f"test/renders/{uuid.uuid4()}.jpg",
+            bucket="test-bucket",
+            size_bytes=1024,
+            discriminator_key=ImageDiscriminatorKey.PANEL_RENDER,
+        )
+        for _ in range(MAX_PAGE_SIZE + 1)
+    )
+    await db_session.commit()
+
+    url = _panel_url(project.id, story.id, panel.id) + "/renders"
+    response = await api_client.get(url, headers=auth_cookie_header(user.id))
+
+    assert response.status_code == 200
+    assert len(response.json()) == MAX_PAGE_SIZE + 1
+    assert NEXT_CURSOR_HEADER not in response.headers
+    paged = await _walk(api_client, url, user, limit=MAX_PAGE_SIZE)
+    assert [len(page) for page in paged] == [MAX_PAGE_SIZE, 1]
+
+
+async def test_invalid_cursor_and_limit_are_rejected(
+    api_client: AsyncClient,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    url = f"/api/comic-builder/v2/project/{project.id}/story/{story.id}/history"
+
+    response = await api_client.get(
+        url, params={"cursor": "not-a-cursor"}, headers=auth_cookie_header(user.id)
+    )
+    assert response.status_code == 400
+
+    response = await api_client.get(
+        url, params={"limit": 0}, headers=auth_cookie_header(user.id)
+    )
+    assert response.status_code == 422
+
+
+def test_cursor_round_trips_as_url_safe_token() -> None:
+    cursor = Cursor(datetime.now(timezone.utc), uuid.uuid4())
+    token = cursor.encode()
+
+    assert Cursor.decode(token) == cursor
+    assert all(c.isalnum() or c in "-_" for c in token)
@@ -0,0 +1,128 @@
+"""
+Batched canonical-render loading for PanelService.get_panels / get_panel.
+
+Test invariants:
+  1. get_panels issues the same number of queries for 1 panel and for 8 panels.
+  2. Explicit canonical_render_id pointers win over the most recent render.
+  3. Panels with no pointer fall back to their most recent PANEL_RENDER.
+  4. Panels with no render at all resolve to None.
+  5. get_panel resolves the same render as get_panels for that panel.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.story_engine.models import Panel, Project, Story
+from core.story_engine.models.image import Image as ImageModel
+from core.story_engine.models.image import ImageContentType, ImageDiscriminatorKey
+from core.story_engine.service import PanelService
+from tests.db_helpers import count_queries
+
+
+def _render(
+    user: User, project: Project, panel: Panel, created_at: datetime
+) -> ImageModel:
+    image = ImageModel.create(
+        project_id=project.id,
+        user_id=user.id,
+        target_id=panel.id,
+        width=512,
+        height=512,
+        content_type=ImageContentType.JPEG,
+        object_key=f"test/renders/{uuid.uuid4()}.jpg",
+        bucket="test-bucket",
+        size_bytes=1024,
+        discriminator_key=ImageDiscriminatorKey.PANEL_RENDER,
+    )
+    image.created_at = created_at
+    return image
+
+
+async def _seed_panels(
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    count: int,
+) -> list[Panel]:
+    """Seed `count` panels, each with two renders and no canonical pointer."""
+    panels = [
+        Panel.create(story_id=story.id, order_index=i, attributes={})
+        for i in range(count)
+    ]
+    db_session.add_all(panels)
+    await db_session.flush()
+
+    base = datetime.now(timezone.utc)
+    for panel in panels:
+        db_session.add(_render(user, project, panel, base))
+        db_session.add(_render(user, project, panel, base + timedelta(seconds=1)))
+    await db_session.commit()
+    return panels
+
+
+async def test_get_panels_query_count_is_independent_of_panel_count(
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    """Listing 1 panel and listing 8 panels cost the same number of queries."""
+    service = PanelService(db_session)
+    await _seed_panels(db_session, user, project, story, count=1)
+
+    with count_queries(db_session.bind.sync_engine) as one_panel:
+        pairs = await service.get_panels(project.id, story.id)
+    assert len(pairs) == 1
+
+    second_story = Story(project_id=project.id, story_text="Another tale")
+    db_session.add(second_story)
+    await db_session.commit()
+    await _seed_panels(db_session, user, project, second_story, count=8)
+
+    with count_queries(db_session.bind.sync_engine) as eight_panels:
+        pairs = await service.get_panels(project.id, second_story.id)
+    assert len(pairs) == 8
+    assert all(render is not None for _, render in pairs)
+
+    assert len(eight_panels) == len(one_panel)
+    assert len(eight_panels) <= 3  # story check + pointer join + fallback
+
+
+async def test_get_panels_resolves_pointer_fallback_and_missing_renders(
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    """Pointer beats recency, fallback picks the newest render, no render → None."""
+    pinned, fallback, bare = [
+        Panel.create(story_id=story.id, order_index=i, attributes={}) for i in range(3)
+    ]
+    db_session.add_all([pinned, fallback, bare])
+    await db_session.flush()
+
+    base = datetime.now(timezone.utc)
+    pinned_old = _render(user, project, pinned, base)
+    pinned_new = _render(user, project, pinned, base + timedelta(seconds=1))
+    fallback_old = _render(user, project, fallback, base)
+    fallback_new = _render(user, project, fallback, base + timedelta(seconds=1))
+    db_session.add_all([pinned_old, pinned_new, fallback_old, fallback_new])
+    await db_session.flush()
+    pinned.canonical_render_id = pinned_old.id
+    await db_session.commit()
+
+    service = PanelService(db_session)
+    pairs = await service.get_panels(project.id, story.id)
+    render_ids = {panel.id: render.id if render else None for panel, render in pairs}
+
+    assert render_ids[pinned.id] == pinned_old.id
+    assert render_ids[fallback.id] == fallback_new.id
+    assert render_ids[bare.id] is None
+
+    _, single = await service.get_panel(project.id, story.id, fallback.id)
+    assert single is not None
+    assert single.id == fallback_new.id
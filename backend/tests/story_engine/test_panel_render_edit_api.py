@@ -13,7 +13,7 @@ Test invariants (fixture-backed, no fal/GCS):
 
 import uuid
 from io import BytesIO
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 from httpx import AsyncClient
 from PIL import Image as PILImage
@@ -21,6 +21,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth.models.user import User
+from core.infrastructure.intelligence.media_download import GeneratedImage
 from core.story_engine.models import Character, Panel, Project, Story
 from core.story_engine.models.edit_event import EditEvent, EditEventOperationType
 from core.story_engine.models.image import Image as ImageModel
@@ -227,15 +228,6 @@ async def test_render_panel_edit_includes_character_renders_in_fal_call(
         bucket="test-bucket",
     )
 
-    mock_httpx_resp = MagicMock()
-    mock_httpx_resp.content = jpeg_bytes
-    mock_httpx_resp.headers = {"content-type": "image/jpeg"}
-    mock_httpx_resp.raise_for_status = MagicMock()
-    mock_httpx_ctx = AsyncMock()
-    mock_httpx_ctx.__aenter__ = AsyncMock(return_value=mock_httpx_ctx)
-    mock_httpx_ctx.__aexit__ = AsyncMock(return_value=False)
-    mock_httpx_ctx.get = AsyncMock(return_value=mock_httpx_resp)
-
     captured_fal_args: dict = {}
 
     async def _capture_fal(**kwargs: object) -> dict:
@@ -261,8 +253,8 @@ async def test_render_panel_edit_includes_character_renders_in_fal_call(
             side_effect=_capture_fal,
         ),
         patch(
-            "core.story_engine.service.panel_service.httpx.AsyncClient",
-            return_value=mock_httpx_ctx,
+            "core.story_engine.service.panel_service.fetch_generated_image",
+            return_value=GeneratedImage(jpeg_bytes, "image/jpeg"),
         ),
     ):
         response = await api_client.post(
@@ -0,0 +1,323 @@
+"""
+Tests for POST .../story/{story_id}/panels/render (bulk render).
+
+Test invariants:
+  1. Without a body, every generated panel lacking a render is rendered, each
+     with its own Image row, canonical pointer and SUCCEEDED RENDER_PANEL event;
+     the NDJSON stream has one chunk per panel and STREAM_END with the count.
+  2. At most panel_render_concurrency fal calls run at once, and a character
+     shared by several panels has its render URL signed once per batch.
+     GCS uploads run off the event loop, so a batch's uploads overlap.
+  3. panelIds selects exactly those panels; an unknown panel ID returns 404.
+  4. A failing panel yields an outcome with its error and a FAILED event,
+     without stopping the rest of the batch.
+  5. Returns 401 when no auth cookie is provided.
+"""
+
+import asyncio
+import json
+import threading
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+from PIL import Image as PILImage
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.config import settings
+from core.infrastructure.intelligence.media_download import GeneratedImage
+from core.story_engine.models import Character, Panel, Project, Story
+from core.story_engine.models.edit_event import (
+    EditEvent,
+    EditEventOperationType,
+    EditEventStatus,
+)
+from core.story_engine.models.image import Image as ImageModel
+from core.story_engine.models.image import ImageContentType, ImageDiscriminatorKey
+from core.story_engine.models.panel_character import PanelCharacter
+from core.story_engine.service.image_service import StorageReceipt
+from tests.auth_helpers import auth_cookie_header
+
+
+def _url(project_id: uuid.UUID, story_id: uuid.UUID) -> str:
+    return f"/api/comic-builder/v2/project/{project_id}/story/{story_id}/panels/render"
+
+
+def _jpeg_bytes() -> bytes:
+    buf = BytesIO()
+    PILImage.new("RGB", (1, 1), color=(255, 0, 0)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+class FakeFal:
+    """fal stand-in that records how many calls overlap."""
+
+    def __init__(self, fail_prompt: str | None = None) -> None:
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self._fail_prompt = fail_prompt
+
+    async def subscribe(self, arguments: dict, **_: Any) -> dict:
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        if self._fail_prompt and self._fail_prompt in arguments["prompt"]:
+            raise RuntimeError("fal exploded")
+        return {"images": [{"url": "https://fal.ai/render/out.jpg"}]}
+
+
+async def _post(
+    api_client: AsyncClient,
+    user: User,
+    project: Project,
+    story: Story,
+    fal: FakeFal,
+    body: dict | None = None,
+    signed_url: MagicMock | None = None,
+    upload: Callable[..., StorageReceipt] | None = None,
+) -> tuple[int, list[dict]]:
+    with (
+        patch(
+            "core.story_engine.service.panel_service.fal_async_client.subscribe",
+            side_effect=fal.subscribe,
+        ),
+        patch(
+            "core.story_engine.service.image_service.GCSUploadService.upload",
+            side_effect=upload
+            or (lambda key, *_: StorageReceipt(object_key=key, bucket="test-bucket")),
+        ),
+        patch(
+            "core.story_engine.service.image_service.GCSUploadService.generate_signed_url",
+            signed_url
+            or MagicMock(return_value=("https://signed", datetime.now(timezone.utc))),
+        ),
+        patch(
+            "core.story_engine.service.panel_service.fetch_generated_image",
+            return_value=GeneratedImage(_jpeg_bytes(), "image/jpeg"),
+        ),
+    ):
+        response = await api_client.post(
+            _url(project.id, story.id),
+            json=body,
+            headers=auth_cookie_header(user.id),
+        )
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    return response.status_code, events
+
+
+async def _add_panels(
+    db_session: AsyncSession, story: Story, count: int, **attributes: Any
+) -> list[Panel]:
+    panels = [
+        Panel.create(
+            story_id=story.id,
+            order_index=index,
+            attributes={
+                "background": f"Scene {index}",
+                "dialogue": "",
+                "characters": [],
+                **attributes,
+            },
+        )
+        for index in range(count)
+    ]
+    db_session.add_all(panels)
+    await db_session.commit()
+    return panels
+
+
+async def _render_events(
+    db_session: AsyncSession, panel_ids: list[uuid.UUID]
+) -> dict[uuid.UUID, EditEvent]:
+    result = await db_session.execute(
+        select(EditEvent).where(
+            EditEvent.target_id.in_(panel_ids),
+            EditEvent.operation_type == EditEventOperationType.RENDER_PANEL,
+        )
+    )
+    return {event.target_id: event for event in result.scalars().all()}
+
+
+async def test_renders_every_unrendered_panel(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    panels = await _add_panels(db_session, story, 3)
+    ungenerated = Panel.create(story_id=story.id, order_index=3, attributes={})
+    db_session.add(ungenerated)
+    await db_session.commit()
+
+    fal = FakeFal()
+    status, events = await _post(api_client, user, project, story, fal)
+    # A second batch finds nothing left to render.
+    _, second = await _post(api_client, user, project, story, fal)
+
+    assert status == 200
+    assert [e["eventType"] for e in events] == [
+        "stream.start",
+        *["stream.chunk"] * 3,
+        "stream.end",
+    ]
+    assert events[-1]["payload"] == {"count": 3}
+    chunks = [e["payload"] for e in events[1:-1]]
+    assert {c["panelId"] for c in chunks} == {str(p.id) for p in panels}
+    assert all(c["error"] is None for c in chunks)
+    assert all(c["panel"]["canonicalRender"] is not None for c in chunks)
+    assert second[-1]["payload"] == {"count": 0}
+    assert fal.calls == 3
+
+    rendered = await _render_events(
+        db_session, [ungenerated.id, *[p.id for p in panels]]
+    )
+    assert set(rendered) == {p.id for p in panels}
+    assert all(e.status == EditEventStatus.SUCCEEDED for e in rendered.values())
+    for panel in panels:
+        await db_session.refresh(panel)
+        assert panel.canonical_render_id is not None
+
+
+async def test_uploads_overlap_off_the_event_loop(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "panel_render_concurrency", 2)
+    await _add_panels(db_session, story, 2)
+    # Each upload blocks until the other one has started: run one at a time
+    # on the loop, the first would time out.
+    both_uploading = threading.Barrier(2, timeout=5)
+
+    def upload(key: str, *_: Any) -> StorageReceipt:
+        both_uploading.wait()
+        return StorageReceipt(object_key=key, bucket="test-bucket")
+
+    status, events = await _post(
+        api_client, user, project, story, FakeFal(), upload=upload
+    )
+
+    assert status == 200
+    assert [e["payload"]["error"] for e in events[1:-1]] == [None, None]
+
+
+async def test_fan_out_is_bounded_and_characters_signed_once(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    character: Character,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "panel_render_concurrency", 2)
+    db_session.add(
+        ImageModel.create(
+            project_id=project.id,
+            user_id=user.id,
+            target_id=character.id,
+            width=512,
+            height=512,
+            content_type=ImageContentType.JPEG,
+            object_key=f"char/{character.id}.jpg",
+            bucket="test-bucket",
+            size_bytes=2048,
+            discriminator_key=ImageDiscriminatorKey.CHARACTER_RENDER,
+        )
+    )
+    panels = await _add_panels(db_session, story, 5, characters=[character.slug])
+    db_session.add_all(
+        PanelCharacter(panel_id=panel.id, character_id=character.id) for panel in panels
+    )
+    await db_session.commit()
+
+    fal = FakeFal()
+    signed_url = MagicMock(return_value=("https://signed", datetime.now(timezone.utc)))
+    status, events = await _post(
+        api_client, user, project, story, fal, signed_url=signed_url
+    )
+
+    assert status == 200
+    assert events[-1]["payload"] == {"count": 5}
+    assert fal.peak == 2
+    signed_url.assert_called_once_with(f"char/{character.id}.jpg")
+
+
+async def test_selected_panels_only(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    panels = await _add_panels(db_session, story, 3)
+
+    status, events = await _post(
+        api_client,
+        user,
+        project,
+        story,
+        FakeFal(),
+        body={"panelIds": [str(panels[2].id)]},
+    )
+    missing, _ = await _post(
+        api_client,
+        user,
+        project,
+        story,
+        FakeFal(),
+        body={"panelIds": [str(uuid.uuid4())]},
+    )
+
+    assert status == 200
+    assert [e["payload"]["panelId"] for e in events[1:-1]] == [str(panels[2].id)]
+    assert set(await _render_events(db_session, [p.id for p in panels])) == {
+        panels[2].id
+    }
+    assert missing == 404
+
+
+async def test_failed_panel_does_not_stop_the_batch(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    panels = await _add_panels(db_session, story, 3)
+
+    status, events = await _post(
+        api_client, user, project, story, FakeFal(fail_prompt="Scene 1")
+    )
+
+    assert status == 200
+    assert events[-1]["eventType"] == "stream.end"
+    outcomes = {e["payload"]["panelId"]: e["payload"] for e in events[1:-1]}
+    assert outcomes[str(panels[1].id)]["error"] == "fal exploded"
+    assert outcomes[str(panels[1].id)]["panel"] is None
+    assert outcomes[str(panels[0].id)]["error"] is None
+    rendered = await _render_events(db_session, [p.id for p in panels])
+    assert rendered[panels[1].id].status == EditEventStatus.FAILED
+    assert rendered[panels[0].id].status == EditEventStatus.SUCCEEDED
+    assert rendered[panels[2].id].status == EditEventStatus.SUCCEEDED
+
+
+async def test_render_story_panels_401_no_token(
+    api_client: AsyncClient, project: Project, story: Story
+) -> None:
+    response = await api_client.post(_url(project.id, story.id))
+    assert response.status_code == 401
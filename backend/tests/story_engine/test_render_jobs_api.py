@@ -0,0 +1,249 @@
+"""
+Tests for render jobs: render endpoints with ?job=true, the worker claim loop
+and GET /v2/render-jobs/{job_id}.
+
+Test invariants:
+  1. ?job=true answers 202 with a queued job without calling fal; a worker
+     run renders it onto the same EditEvent, which the status endpoint then
+     reports as succeeded with the new image in outputSnapshot.
+  2. With the queue empty, run_next_render_job returns False.
+  3. A claim skips jobs locked by another transaction and jobs claimed within
+     the lease, and reclaims a job whose lease expired, counting the attempt.
+  4. A job whose target was deleted while queued, or that is past the attempt
+     cap, ends FAILED without calling fal.
+  5. Enqueueing an unknown target returns 404 and queues nothing; another
+     user's job returns 404; no auth cookie returns 401.
+"""
+
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from unittest.mock import AsyncMock, patch
+
+from httpx import AsyncClient
+from PIL import Image as PILImage
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.config import settings
+from core.infrastructure.intelligence.media_download import GeneratedImage
+from core.story_engine.models import Panel, Project, Story
+from core.story_engine.models.edit_event import (
+    EditEvent,
+    EditEventOperationType,
+    EditEventStatus,
+)
+from core.story_engine.render_jobs import run_next_render_job
+from core.story_engine.repository import Repository
+from core.story_engine.service import RenderJobService
+from core.story_engine.service.image_service import StorageReceipt
+from tests.auth_helpers import auth_cookie_header
+
+FAL_SUBSCRIBE = "core.story_engine.service.panel_service.fal_async_client.subscribe"
+
+
+def _render_url(project: Project, story: Story, panel_id: uuid.UUID) -> str:
+    return (
+        f"/api/comic-builder/v2/project/{project.id}"
+        f"/story/{story.id}/panel/{panel_id}/render"
+    )
+
+
+def _job_url(job_id: str | uuid.UUID) -> str:
+    return f"/api/comic-builder/v2/render-jobs/{job_id}"
+
+
+def _jpeg_bytes() -> bytes:
+    buf = BytesIO()
+    PILImage.new("RGB", (1, 1), color=(255, 0, 0)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+async def _run_worker_once(fal: AsyncMock) -> bool:
+    with (
+        patch(FAL_SUBSCRIBE, fal),
+        patch(
+            "core.story_engine.service.image_service.GCSUploadService.upload",
+            side_effect=lambda key, *_: StorageReceipt(
+                object_key=key, bucket="test-bucket"
+            ),
+        ),
+        patch(
+            "core.story_engine.service.image_service.GCSUploadService.generate_signed_url",
+            return_value=("https://signed", datetime.now(timezone.utc)),
+        ),
+        patch(
+            "core.story_engine.service.panel_service.fetch_generated_image",
+            return_value=GeneratedImage(_jpeg_bytes(), "image/jpeg"),
+        ),
+    ):
+        return await run_next_render_job()
+
+
+def _fal() -> AsyncMock:
+    return AsyncMock(return_value={"images": [{"url": "https://fal.ai/out.jpg"}]})
+
+
+async def _add_panel(db_session: AsyncSession, story: Story) -> Panel:
+    panel = Panel.create(
+        story_id=story.id,
+        order_index=0,
+        attributes={"background": "A harbour", "dialogue": "", "characters": []},
+    )
+    db_session.add(panel)
+    await db_session.commit()
+    return panel
+
+
+async def _enqueue(db_session: AsyncSession, story: Story, panel: Panel) -> EditEvent:
+    return await RenderJobService(db_session).enqueue_render(
+        story.project_id, story.id, panel.id, EditEventOperationType.RENDER_PANEL
+    )
+
+
+async def test_job_render_is_queued_then_run_by_a_worker(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    panel = await _add_panel(db_session, story)
+    fal = _fal()
+
+    with patch(FAL_SUBSCRIBE, fal):
+        response = await api_client.post(
+            _render_url(project, story, panel.id),
+            params={"job": "true"},
+            headers=auth_cookie_header(user.id),
+        )
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["state"] == "queued"
+    assert job["status"] == "pending"
+    assert job["operationType"] == "render_panel"
+    assert job["targetId"] == str(panel.id)
+    fal.assert_not_called()
+
+    assert await _run_worker_once(fal) is True
+    assert await _run_worker_once(fal) is False
+    fal.assert_awaited_once()
+
+    status = await api_client.get(
+        _job_url(job["id"]), headers=auth_cookie_header(user.id)
+    )
+    assert status.status_code == 200
+    done = status.json()
+    assert done["state"] == "succeeded"
+    assert done["attempts"] == 1
+    assert done["startedAt"] is not None
+    await db_session.refresh(panel)
+    assert done["outputSnapshot"] == {"image_id": str(panel.canonical_render_id)}
+
+    # The job's event is the render's event: no second RENDER_PANEL row.
+    events = (
+        await db_session.execute(
+            select(EditEvent).where(EditEvent.target_id == panel.id)
+        )
+    ).scalars()
+    assert [e.id for e in events] == [uuid.UUID(job["id"])]
+
+
+async def test_claim_skips_locked_and_leased_jobs(
+    db_session: AsyncSession,
+    user: User,
+    story: Story,
+) -> None:
+    panel = await _add_panel(db_session, story)
+    first = await _enqueue(db_session, story, panel)
+    second = await _enqueue(db_session, story, panel)
+    lease = timedelta(seconds=settings.render_job_lease_seconds)
+
+    # One worker's claim is still uncommitted: its row is locked, so another
+    # worker takes the next job instead of waiting.
+    engine = db_session.bind
+    async with AsyncSession(engine) as worker_a, AsyncSession(engine) as worker_b:
+        claimed_a = await Repository(worker_a).edit_event.claim_render_job(lease)
+        claimed_b = await Repository(worker_b).edit_event.claim_render_job(lease)
+        assert claimed_a is not None and claimed_a.id == first.id
+        assert claimed_b is not None and claimed_b.id == second.id
+        await worker_a.commit()
+        await worker_b.commit()
+
+    # Both claimed within the lease: nothing to take.
+    assert await RenderJobService(db_session).claim_next() is None
+
+    # The first worker died: once its lease runs out the job is taken again.
+    await db_session.refresh(first)
+    first.job_claimed_at = datetime.now(timezone.utc) - lease - timedelta(minutes=1)
+    await db_session.commit()
+    reclaimed = await RenderJobService(db_session).claim_next()
+    assert reclaimed is not None
+    assert reclaimed.id == first.id
+    assert reclaimed.job_attempts == 2
+
+
+async def test_deleted_target_and_attempt_cap_fail_the_job(
+    db_session: AsyncSession,
+    user: User,
+    story: Story,
+) -> None:
+    deleted = await _add_panel(db_session, story)
+    orphaned = await _enqueue(db_session, story, deleted)
+    await db_session.delete(deleted)
+    await db_session.commit()
+
+    panel = await _add_panel(db_session, story)
+    exhausted = await _enqueue(db_session, story, panel)
+    exhausted.job_attempts = settings.render_job_max_attempts
+    await db_session.commit()
+
+    fal = _fal()
+    assert await _run_worker_once(fal) is True
+    assert await _run_worker_once(fal) is True
+
+    fal.assert_not_called()
+    for event in (orphaned, exhausted):
+        await db_session.refresh(event)
+        assert event.status == EditEventStatus.FAILED
+    assert exhausted.job_attempts == settings.render_job_max_attempts + 1
+
+
+async def test_render_job_404s(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    user_factory: Callable[..., Awaitable[User]],
+) -> None:
+    unknown = await api_client.post(
+        _render_url(project, story, uuid.uuid4()),
+        params={"job": "true"},
+        headers=auth_cookie_header(user.id),
+    )
+    assert unknown.status_code == 404
+    queued = await db_session.execute(
+        select(EditEvent).where(EditEvent.project_id == project.id)
+    )
+    assert queued.scalars().all() == []
+
+    job = await _enqueue(db_session, story, await _add_panel(db_session, story))
+    stranger = await user_factory()
+    response = await api_client.get(
+        _job_url(job.id), headers=auth_cookie_header(stranger.id)
+    )
+    assert response.status_code == 404
+    assert (
+        await api_client.get(
+            _job_url(uuid.uuid4()), headers=auth_cookie_header(user.id)
+        )
+    ).status_code == 404
+
+
+async def test_get_render_job_401_no_token(api_client: AsyncClient) -> None:
+    response = await api_client.get(_job_url(uuid.uuid4()))
+    assert response.status_code == 401
@@ -0,0 +1,254 @@
+"""
+Request-scoped loaders on Repository and the batched character list route.
+
+Test invariants:
+  1. GET …/characters issues the same number of queries for 2 and 6 characters.
+  2. The list still resolves pointer-vs-fallback renders and reference images
+     per character.
+  3. Loads issued in the same tick share one batch; repeated keys hit the memo.
+  4. Committing the session clears the memo so later loads see fresh rows,
+     for every Repository on the session, with one listener per event no
+     matter how many Repository objects share it.
+  5. A failed batch propagates to every caller and is not memoised.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.story_engine.models import Character, Project, Story
+from core.story_engine.models.image import Image as ImageModel
+from core.story_engine.models.image import ImageContentType, ImageDiscriminatorKey
+from core.story_engine.repository import Repository
+from core.story_engine.repository.loaders import BatchLoader
+from tests.auth_helpers import auth_cookie_header
+from tests.db_helpers import count_queries
+
+
+def _characters_url(project_id: uuid.UUID, story_id: uuid.UUID) -> str:
+    return f"/api/comic-builder/v2/project/{project_id}/story/{story_id}/characters"
+
+
+def _image(
+    user: User,
+    project: Project,
+    target_id: uuid.UUID,
+    discriminator_key: ImageDiscriminatorKey,
+    created_at: datetime,
+) -> ImageModel:
+    image = ImageModel.create(
+        project_id=project.id,
+        user_id=user.id,
+        target_id=target_id,
+        width=512,
+        height=512,
+        content_type=ImageContentType.JPEG,
+        object_key=f"test/images/{uuid.uuid4()}.jpg",
+        bucket="test-bucket",
+        size_bytes=1024,
+        discriminator_key=discriminator_key,
+    )
+    image.created_at = created_at
+    return image
+
+
+async def _seed_characters(
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    count: int,
+) -> dict[uuid.UUID, tuple[uuid.UUID, uuid.UUID]]:
+    """Seed characters with two renders and one reference each.
+
+    Even-indexed characters pin their older render; odd ones fall back to the
+    newest. Returns {character_id: (expected_render_id, reference_id)}.
+    """
+    characters = [
+        Character(story_id=story.id, name=f"Hero {i}", slug=f"hero-{i}", attributes={})
+        for i in range(count)
+    ]
+    db_session.add_all(characters)
+    await db_session.flush()
+
+    base = datetime.now(timezone.utc)
+    expected: dict[uuid.UUID, tuple[uuid.UUID, uuid.UUID]] = {}
+    for i, character in enumerate(characters):
+        old, new, ref = (
+            _image(
+                user, project, character.id, ImageDiscriminatorKey.CHARACTER_RENDER, t
+            )
+            for t in (base, base + timedelta(seconds=1), base)
+        )
+        ref.discriminator_key = ImageDiscriminatorKey.CHARACTER_REFERENCE
+        db_session.add_all([old, new, ref])
+        await db_session.flush()
+        if i % 2 == 0:
+            character.canonical_render_id = old.id
+            expected[character.id] = (old.id, ref.id)
+        else:
+            expected[character.id] = (new.id, ref.id)
+    await db_session.commit()
+    return expected
+
+
+async def test_character_list_query_count_is_independent_of_character_count(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    """Listing 2 characters and listing 6 characters cost the same queries.
+
+    Two is the smallest seed that exercises both the pinned and fallback
+    render paths, each of which contributes one batched query.
+    """
+    await _seed_characters(db_session, user, project, story, count=2)
+    with count_queries() as two_characters:
+        response = await api_client.get(
+            _characters_url(project.id, story.id),
+            headers=auth_cookie_header(user.id),
+        )
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+    second_story = Story(project_id=project.id, story_text="Another tale")
+    db_session.add(second_story)
+    await db_session.commit()
+    await _seed_characters(db_session, user, project, second_story, count=6)
+
+    with count_queries() as six_characters:
+        response = await api_client.get(
+            _characters_url(project.id, second_story.id),
+            headers=auth_cookie_header(user.id),
+        )
+    assert response.status_code == 200
+    assert len(response.json()) == 6
+
+    assert len(six_characters) == len(two_characters)
+
+
+async def test_character_list_resolves_renders_and_references(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    """Pinned renders win, the rest fall back to newest; refs attach per character."""
+    expected = await _seed_characters(db_session, user, project, story, count=4)
+
+    response = await api_client.get(
+        _characters_url(project.id, story.id),
+        headers=auth_cookie_header(user.id),
+    )
+    assert response.status_code == 200
+
+    for item in response.json():
+        render_id, reference_id = expected[uuid.UUID(item["character"]["id"])]
+        assert item["canonicalRender"]["id"] == str(render_id)
+        assert [ref["id"] for ref in item["referenceImages"]] == [str(reference_id)]
+
+
+async def test_loader_batches_same_tick_loads_and_memoises(
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    """Concurrent loads share one query; repeat loads are free until commit."""
+    expected = await _seed_characters(db_session, user, project, story, count=3)
+    character_ids = list(expected)
+    repository = Repository(db_session)
+    sync_engine = db_session.bind.sync_engine
+
+    with count_queries(sync_engine) as first:
+        characters = await repository.loaders.character.load_many(
+            [*character_ids, character_ids[0], uuid.uuid4()]
+        )
+    assert len(first) == 1
+    assert [c.id for c in characters[:3] if c] == character_ids
+    assert characters[3] is characters[0]
+    assert characters[4] is None
+
+    with count_queries(sync_engine) as repeat:
+        await repository.loaders.character.load(character_ids[1])
+    assert repeat == []
+
+    await db_session.commit()
+    with count_queries(sync_engine) as after_commit:
+        await repository.loaders.character.load(character_ids[1])
+    assert len(after_commit) == 1
+
+
+async def test_repositories_on_one_session_share_one_listener(
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    expected = await _seed_characters(db_session, user, project, story, count=1)
+    (character_id,) = expected
+    session = db_session.sync_session
+    repositories = [Repository(db_session)]
+    listeners = (
+        len(session.dispatch.after_commit),
+        len(session.dispatch.after_rollback),
+    )
+    repositories += [Repository(db_session) for _ in range(2)]
+    assert (
+        len(session.dispatch.after_commit),
+        len(session.dispatch.after_rollback),
+    ) == listeners
+
+    for repository in repositories:
+        await repository.loaders.character.load(character_id)
+    await db_session.commit()
+
+    sync_engine = db_session.bind.sync_engine
+    for repository in repositories:
+        with count_queries(sync_engine) as after_commit:
+            await repository.loaders.character.load(character_id)
+        assert len(after_commit) == 1
+
+
+async def test_loader_failed_batch_is_not_memoised() -> None:
+    """Every waiter sees the error; the next load retries the batch."""
+    calls: list[list[int]] = []
+
+    async def flaky(keys: list[int]) -> dict[int, str]:
+        calls.append(keys)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return {key: str(key) for key in keys}
+
+    loader: BatchLoader[int, str | None] = BatchLoader(
+        flaky, lambda: None, asyncio.Lock()
+    )
+
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    assert await loader.load(1) == "1"
+    assert calls == [[1, 2], [1]]
+
+
+async def test_loader_load_many_with_no_keys_issues_no_batch() -> None:
+    calls: list[list[int]] = []
+
+    async def record(keys: list[int]) -> dict[int, int]:
+        calls.append(keys)
+        return {}
+
+    loader: BatchLoader[int, int | None] = BatchLoader(
+        record, lambda: None, asyncio.Lock()
+    )
+    assert await loader.load_many([]) == []
+    assert calls == []
@@ -0,0 +1,232 @@
+"""
+Segmented (map-reduce) panel extraction for long stories.
+
+Test invariants:
+  1. Stories split only at scene breaks; ornament lines are dropped and
+     headings kept, but prose opening with "Part"/"Chapter"/"Scene" is not a
+     break. No segment exceeds the target unless one scene does; a story
+     without scene breaks is one segment.
+  2. Stitching drops a segment's leading panels that repeat the previous
+     segment's closing beat, and keeps distinct panels.
+  3. A story over PANEL_SEGMENTATION_THRESHOLD_CHARS is extracted with one
+     LLM call per segment, at most PANEL_SEGMENT_CONCURRENCY in flight.
+  4. Through the API, merged panels persist in story order with sequential
+     order_index; a short story, or a long one without scene breaks, still
+     makes a single call.
+"""
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.config import settings
+from core.story_engine.models import Character, Project, Story
+from core.story_engine.schemas.panel import PanelContent
+from core.story_engine.segmentation import (
+    split_story_into_segments,
+    stitch_segment_panels,
+)
+from core.story_engine.service.panel_service import PanelService
+from tests.auth_helpers import auth_cookie_header
+
+CREATE = (
+    "core.story_engine.service.panel_service.instructor_client.chat.completions.create"
+)
+
+
+def _scene(label: str, paragraphs: int = 3) -> str:
+    return "\n\n".join(
+        f"{label} paragraph {i}: " + " ".join(["the rain kept falling."] * 8)
+        for i in range(paragraphs)
+    )
+
+
+def _long_story(scenes: int) -> str:
+    return "\n\n* * *\n\n".join(_scene(f"Scene {i}") for i in range(scenes))
+
+
+@pytest.fixture
+def segmented(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "panel_segmentation_threshold_chars", 1000)
+    monkeypatch.setattr(settings, "panel_segment_target_chars", 700)
+    monkeypatch.setattr(settings, "panel_segment_concurrency", 2)
+
+
+def _prompt(kwargs: Mapping[str, Any]) -> str:
+    """The user messages of a fake LLM call — story context, then instruction."""
+    return "\n\n".join(m["content"] for m in kwargs["messages"][1:])
+
+
+def _segment_label(kwargs: dict[str, Any]) -> str:
+    """Which scene a fake LLM call was given, from its prompt."""
+    story = _prompt(kwargs).split("Story:\n", 1)[1]
+    return story.split(" paragraph", 1)[0].strip()
+
+
+def test_split_story_at_scene_breaks() -> None:
+    story = "\n\n".join(
+        [
+            _scene("Opening", 2),
+            "***",
+            _scene("Middle", 2),
+            "Chapter 2",
+            _scene("Ending", 2),
+        ]
+    )
+
+    segments = split_story_into_segments(story, target_chars=500)
+
+    assert [s.split(" paragraph", 1)[0] for s in segments] == [
+        "Opening",
+        "Middle",
+        "Chapter 2\n\nEnding",
+    ]
+    assert all("***" not in s for s in segments)
+    assert split_story_into_segments(story, target_chars=100_000) == [
+        story.replace("\n\n***\n\n", "\n\n")
+    ]
+
+
+def test_prose_opening_with_heading_words_is_not_a_break() -> None:
+    story = "\n\n".join(
+        [
+            _scene("Opening", 1),
+            "Part of him wanted to run.",
+            "Chapter of his life closed.",
+            "Scene after scene played in his head.",
+            _scene("Ending", 1),
+        ]
+    )
+
+    assert split_story_into_segments(story, target_chars=100) == [story]
+    headed = "\n\n".join([_scene("Opening", 1), "Part IV: The Flood", "Rain."])
+    assert split_story_into_segments(headed, target_chars=100) == [
+        _scene("Opening", 1),
+        "Part IV: The Flood\n\nRain.",
+    ]
+
+
+def test_scenes_are_never_split() -> None:
+    long_scene = _scene("Long", 6)
+    story = "\n\n***\n\n".join([_scene("Opening", 1), long_scene])
+
+    assert split_story_into_segments(long_scene, target_chars=500) == [long_scene]
+    assert split_story_into_segments(story, target_chars=500) == [
+        _scene("Opening", 1),
+        long_scene,
+    ]
+
+
+def test_stitch_drops_boundary_duplicates() -> None:
+    first = [
+        PanelContent(background="Gate", dialogue="Open it.", characters=["mira"]),
+        PanelContent(background="Dark hall", dialogue="", characters=["tobias"]),
+    ]
+    second = [
+        # Same beat as the end of the previous segment, slightly reworded.
+        PanelContent(background="A dark hall", dialogue="", characters=["tobias"]),
+        PanelContent(background="Gate", dialogue="Open it.", characters=["mira"]),
+        PanelContent(background="Tower", dialogue="Run!", characters=["mira"]),
+    ]
+
+    merged = stitch_segment_panels([first, second])
+
+    assert [p.background for p in merged] == ["Gate", "Dark hall", "Tower"]
+    # A different speaker is a different beat.
+    third = [PanelContent(background="Tower", dialogue="Run!", characters=["tobias"])]
+    assert len(stitch_segment_panels([merged, third])) == 4
+
+
+@pytest.mark.usefixtures("segmented")
+async def test_long_story_fans_out_with_bounded_concurrency() -> None:
+    story = _long_story(5)
+    in_flight = 0
+    peak = 0
+
+    async def create(**kwargs: Any) -> Any:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        label = _segment_label(kwargs)
+        return kwargs["response_model"](
+            panels=[{"background": label, "dialogue": label, "characters": []}]
+        )
+
+    with patch(CREATE, new=create):
+        response = await PanelService(AsyncSession())._extract_panels_from_story(
+            story, ["mira"]
+        )
+
+    assert [p.background for p in response.panels] == [f"Scene {i}" for i in range(5)]
+    assert peak == settings.panel_segment_concurrency
+
+
+@pytest.mark.usefixtures("segmented")
+async def test_generate_panels_persists_segments_in_order(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    character: Character,
+) -> None:
+    story.story_text = _long_story(3)
+    await db_session.commit()
+    prompts: list[str] = []
+
+    async def create(**kwargs: Any) -> Any:
+        label = _segment_label(kwargs)
+        prompts.append(_prompt(kwargs))
+        # Later segments finish first; order must still follow the story.
+        await asyncio.sleep(0.01 * (3 - int(label.split()[-1])))
+        return kwargs["response_model"](
+            panels=[
+                {"background": f"{label} a", "dialogue": f"{label}?", "characters": []},
+                {"background": f"{label} b", "dialogue": f"{label}!", "characters": []},
+            ]
+        )
+
+    with patch(CREATE, new=create):
+        response = await api_client.post(
+            f"/api/comic-builder/v2/project/{project.id}/story/{story.id}/panels/generate",
+            headers=auth_cookie_header(user.id),
+        )
+
+    assert response.status_code == 201
+    panels = [item["panel"] for item in response.json()]
+    assert [p["orderIndex"] for p in panels] == list(range(6))
+    assert [p["attributes"]["background"] for p in panels] == [
+        "Scene 0 a",
+        "Scene 0 b",
+        "Scene 1 a",
+        "Scene 1 b",
+        "Scene 2 a",
+        "Scene 2 b",
+    ]
+    assert len(prompts) == 3
+    assert all("part" in p and "of 3" in p for p in prompts)
+    assert sum("Previous part ended" in p for p in prompts) == 2
+
+
+@pytest.mark.usefixtures("segmented")
+@pytest.mark.parametrize("paragraphs", [2, 12], ids=["short", "no-scene-breaks"])
+async def test_short_or_unbroken_story_is_a_single_call(paragraphs: int) -> None:
+    panels = [PanelContent(background="Gate", dialogue="", characters=[])]
+    story = _scene("Unbroken", paragraphs)
+
+    with patch(
+        CREATE, new_callable=AsyncMock, return_value={"panels": panels}
+    ) as create:
+        await PanelService(AsyncSession())._extract_panels_from_story(story, ["mira"])
+
+    assert create.await_count == 1
+    assert create.await_args is not None
+    assert "part 1 of" not in _prompt(create.await_args.kwargs)
@@ -0,0 +1,152 @@
+"""
+Tests for GCS signed-URL caching (core.story_engine.signed_url_cache) in
+GCSUploadService.generate_signed_url.
+
+Test invariants:
+  1. A second request for the same object key returns the cached URL and
+     expiry without signing again, and counts a hit and the time it saved.
+  2. A URL within the safety margin of its expiry is signed afresh.
+  3. The least recently used URL is evicted past max_size; size 0 disables.
+  4. IAM signing refreshes the access token only while it is not valid, not
+     once per signature, and once in all when many threads sign at once.
+"""
+
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from core.story_engine.service.image_service import (
+    SIGNED_URL_EXPIRY_MINUTES,
+    GCSUploadService,
+)
+from core.story_engine.signed_url_cache import (
+    CREDENTIAL_REFRESHES,
+    SIGN_SECONDS,
+    SIGN_SECONDS_SAVED,
+    SIGNED_URL_LOOKUPS,
+    SignedUrlCache,
+)
+
+MARGIN = datetime.timedelta(minutes=15)
+
+
+class FakeComputeCredentials:
+    """Token-only credentials, like Cloud Run's: no sign_bytes."""
+
+    def __init__(self) -> None:
+        self.valid = False
+        self.token: str | None = None
+        self.service_account_email = "default"
+        self.refreshes = 0
+
+    def refresh(self, request: object) -> None:
+        time.sleep(0.01)  # a metadata-server round trip
+        self.refreshes += 1
+        self.valid = True
+        self.token = f"token-{self.refreshes}"
+        self.service_account_email = "renderer@example.iam.gserviceaccount.com"
+
+
+def _service(credentials: object, max_size: int = 16) -> GCSUploadService:
+    service = GCSUploadService.__new__(GCSUploadService)
+    service.credentials = credentials
+    service.bucket = MagicMock()
+    service.bucket.blob.side_effect = lambda key: MagicMock(
+        generate_signed_url=MagicMock(return_value=f"https://signed/{key}")
+    )
+    service.signed_urls = SignedUrlCache(max_size, MARGIN)
+    service.credentials_lock = threading.Lock()
+    return service
+
+
+def _signer(expires_in: datetime.timedelta) -> MagicMock:
+    return MagicMock(
+        side_effect=lambda: (
+            "https://signed",
+            datetime.datetime.now(datetime.timezone.utc) + expires_in,
+        )
+    )
+
+
+def test_cached_url_is_returned_without_signing() -> None:
+    service = _service(MagicMock(spec=["sign_bytes"]))
+    hits = SIGNED_URL_LOOKUPS.value(result="hit")
+    misses = SIGNED_URL_LOOKUPS.value(result="miss")
+    signed_before = SIGN_SECONDS.count()
+    saved_before = SIGN_SECONDS_SAVED.value()
+
+    first = service.generate_signed_url("char/a.jpg")
+    second = service.generate_signed_url("char/a.jpg")
+    other = service.generate_signed_url("char/b.jpg")
+
+    assert second == first
+    assert first[0] == "https://signed/char/a.jpg"
+    assert other[0] == "https://signed/char/b.jpg"
+    remaining = first[1] - datetime.datetime.now(datetime.timezone.utc)
+    assert remaining <= datetime.timedelta(minutes=SIGNED_URL_EXPIRY_MINUTES)
+    assert service.bucket.blob.call_count == 2
+    assert SIGNED_URL_LOOKUPS.value(result="hit") == hits + 1
+    assert SIGNED_URL_LOOKUPS.value(result="miss") == misses + 2
+    assert SIGN_SECONDS.count() == signed_before + 2
+    assert SIGN_SECONDS_SAVED.value() > saved_before
+
+
+def test_url_near_expiry_is_signed_again() -> None:
+    cache = SignedUrlCache(16, MARGIN)
+    sign = _signer(MARGIN - datetime.timedelta(seconds=1))
+
+    cache.get_or_sign("char/a.jpg", sign)
+    cache.get_or_sign("char/a.jpg", sign)
+
+    assert sign.call_count == 2
+
+
+def test_least_recently_used_url_is_evicted() -> None:
+    cache = SignedUrlCache(2, MARGIN)
+    sign = _signer(datetime.timedelta(hours=1))
+
+    cache.get_or_sign("a", sign)
+    cache.get_or_sign("b", sign)
+    cache.get_or_sign("a", sign)  # a is now the most recently used
+    cache.get_or_sign("c", sign)  # evicts b
+    assert sign.call_count == 3
+    cache.get_or_sign("a", sign)
+    assert sign.call_count == 3
+    cache.get_or_sign("b", sign)
+    assert sign.call_count == 4
+
+    disabled = SignedUrlCache(0, MARGIN)
+    disabled.get_or_sign("a", sign)
+    disabled.get_or_sign("a", sign)
+    assert sign.call_count == 6
+
+
+def test_iam_signing_refreshes_token_only_when_invalid() -> None:
+    credentials = FakeComputeCredentials()
+    service = _service(credentials)
+    refreshes = CREDENTIAL_REFRESHES.value()
+
+    service.generate_signed_url("char/a.jpg")
+    service.generate_signed_url("char/b.jpg")
+    credentials.valid = False  # token reached google-auth's refresh threshold
+    service.generate_signed_url("char/c.jpg")
+
+    assert credentials.refreshes == 2
+    assert CREDENTIAL_REFRESHES.value() == refreshes + 2
+    blob = service.bucket.blob.call_args_list
+    assert [call.args[0] for call in blob] == ["char/a.jpg", "char/b.jpg", "char/c.jpg"]
+
+
+def test_concurrent_signers_share_one_refresh() -> None:
+    credentials = FakeComputeCredentials()
+    service = _service(credentials)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        urls = list(
+            pool.map(service.generate_signed_url, [f"char/{i}.jpg" for i in range(16)])
+        )
+
+    assert len(urls) == 16
+    assert credentials.refreshes == 1
@@ -24,6 +24,7 @@ from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth.models.user import User
+from core.infrastructure.intelligence.media_download import GeneratedImage
 from core.story_engine.models import Character, Panel, Project, Story
 from core.story_engine.models import Image as ImageModel
 from core.story_engine.models.edit_event import (
@@ -180,19 +181,10 @@ async def test_render_character_creates_image_row_with_character_render_discrimi
             return_value=mock_gcs_service,
         ),
         patch(
-            "core.story_engine.service.character_service.httpx.AsyncClient",
-        ) as mock_httpx_cls,
+            "core.story_engine.service.character_service.fetch_generated_image",
+            return_value=GeneratedImage(fake_image_bytes, "image/jpeg"),
+        ),
     ):
-        mock_resp = MagicMock()
-        mock_resp.content = fake_image_bytes
-        mock_resp.headers = {"content-type": "image/jpeg"}
-        mock_resp.raise_for_status = MagicMock()
-        mock_httpx_ctx = AsyncMock()
-        mock_httpx_ctx.__aenter__ = AsyncMock(return_value=mock_httpx_ctx)
-        mock_httpx_ctx.__aexit__ = AsyncMock(return_value=False)
-        mock_httpx_ctx.get = AsyncMock(return_value=mock_resp)
-        mock_httpx_cls.return_value = mock_httpx_ctx
-
         service = CharacterService(db_session=db_session)
         returned_character, returned_image = await service.render_character(
             user_id=user.id,
@@ -241,19 +233,10 @@ async def test_render_character_does_not_update_render_url(
             return_value=mock_gcs_service,
         ),
         patch(
-            "core.story_engine.service.character_service.httpx.AsyncClient",
-        ) as mock_httpx_cls,
+            "core.story_engine.service.character_service.fetch_generated_image",
+            return_value=GeneratedImage(fake_image_bytes, "image/jpeg"),
+        ),
     ):
-        mock_resp = MagicMock()
-        mock_resp.content = fake_image_bytes
-        mock_resp.headers = {"content-type": "image/jpeg"}
-        mock_resp.raise_for_status = MagicMock()
-        mock_httpx_ctx = AsyncMock()
-        mock_httpx_ctx.__aenter__ = AsyncMock(return_value=mock_httpx_ctx)
-        mock_httpx_ctx.__aexit__ = AsyncMock(return_value=False)
-        mock_httpx_ctx.get = AsyncMock(return_value=mock_resp)
-        mock_httpx_cls.return_value = mock_httpx_ctx
-
         service = CharacterService(db_session=db_session)
         returned_character, _ = await service.render_character(
             user_id=user.id,
@@ -283,17 +266,6 @@ async def test_render_character_twice_creates_two_image_rows(
     mock_gcs_service = MagicMock()
     mock_gcs_service.upload.return_value = mock_receipt
 
-    def _make_mock_httpx() -> AsyncMock:
-        mock_resp = MagicMock()
-        mock_resp.content = fake_image_bytes
-        mock_resp.headers = {"content-type": "image/jpeg"}
-        mock_resp.raise_for_status = MagicMock()
-        mock_httpx_ctx = AsyncMock()
-        mock_httpx_ctx.__aenter__ = AsyncMock(return_value=mock_httpx_ctx)
-        mock_httpx_ctx.__aexit__ = AsyncMock(return_value=False)
-        mock_httpx_ctx.get = AsyncMock(return_value=mock_resp)
-        return mock_httpx_ctx
-
     with (
         patch(
             "core.story_engine.service.character_service.fal_async_client.subscribe",
@@ -305,8 +277,8 @@ async def test_render_character_twice_creates_two_image_rows(
             return_value=mock_gcs_service,
         ),
         patch(
-            "core.story_engine.service.character_service.httpx.AsyncClient",
-            side_effect=[_make_mock_httpx(), _make_mock_httpx()],
+            "core.story_engine.service.character_service.fetch_generated_image",
+            return_value=GeneratedImage(fake_image_bytes, "image/jpeg"),
         ),
     ):
         service = CharacterService(db_session=db_session)
@@ -9,6 +9,8 @@ Test invariants:
   5. output_snapshot on each EditEvent contains the panel attributes dict.
   6. Returns 400 when story has no text (NoStoryTextError).
   7. Returns 404 when story does not exist.
+  8. Persistence is one INSERT per table (edit_event, panel, panel_character)
+     regardless of panel count, and duplicate slugs yield a single join row.
 """
 
 import uuid
@@ -28,6 +30,7 @@ from core.story_engine.models.edit_event import (
 )
 from core.story_engine.models.panel_character import PanelCharacter
 from tests.auth_helpers import auth_cookie_header
+from tests.db_helpers import count_queries
 
 
 def _auth_headers(user_id: uuid.UUID) -> dict[str, str]:
@@ -258,3 +261,59 @@ async def test_generate_panels_returns_404_when_story_does_not_exist(
         headers=_auth_headers(user.id),
     )
     assert response.status_code == 404
+
+
+async def test_generate_panels_persists_with_one_insert_per_table(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    character: Character,
+) -> None:
+    """A 12-panel story costs three INSERTs total; repeated slugs are de-duplicated."""
+    mock_response = MagicMock()
+    mock_response.panels = [
+        MagicMock(
+            background=f"Scene {i}",
+            dialogue=f"Line {i}",
+            characters=[character.slug, character.slug, "unknown-slug"],
+        )
+        for i in range(12)
+    ]
+
+    with (
+        patch(
+            "core.story_engine.service.panel_service.instructor_client.chat.completions.create",
+            new_callable=AsyncMock,
+            return_value=mock_response,
+        ),
+        count_queries() as statements,
+    ):
+        response = await api_client.post(
+            f"/api/comic-builder/v2/project/{project.id}/story/{story.id}/panels/generate",
+            headers=_auth_headers(user.id),
+        )
+
+    assert response.status_code == 201
+    assert len(response.json()) == 12
+
+    inserts = [s.split("(")[0].strip() for s in statements if s.startswith("INSERT")]
+    assert sorted(inserts) == [
+        "INSERT INTO edit_event",
+        "INSERT INTO panel",
+        "INSERT INTO panel_character",
+    ]
+
+    join_rows = (
+        (
+            await db_session.execute(
+                select(PanelCharacter).where(
+                    PanelCharacter.character_id == character.id
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert len(join_rows) == 12
@@ -11,11 +11,13 @@ Test invariants:
   6. Characters with no render are skipped gracefully (no exception).
   7. Returns 404 for a panel that does not exist.
   8. EditEvent is marked FAILED when fal raises an exception.
+  9. The canonical pointer is set to the image the response returns.
+  10. A panel deleted mid-render leaves a FAILED EditEvent and no Image row.
 """
 
 import uuid
 from io import BytesIO
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 from httpx import AsyncClient
 from PIL import Image as PILImage
@@ -23,6 +25,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth.models.user import User
+from core.infrastructure.intelligence.media_download import GeneratedImage
 from core.story_engine.models import Character, Panel, Project, Story
 from core.story_engine.models.edit_event import (
     EditEvent,
@@ -33,7 +36,7 @@ from core.story_engine.models.edit_event import (
 from core.story_engine.models.image import Image as ImageModel
 from core.story_engine.models.image import ImageContentType, ImageDiscriminatorKey
 from core.story_engine.models.panel_character import PanelCharacter
-from core.story_engine.repository import Repository
+from core.story_engine.repository import NotFoundError, Repository
 from core.story_engine.service.image_service import StorageReceipt
 from tests.auth_helpers import auth_cookie_header
 
@@ -53,16 +56,11 @@ def _mock_fal_response(url: str = "https://fal.ai/render/test-image.jpg") -> dic
     return {"images": [{"url": url}]}
 
 
-def _make_mock_httpx(fake_bytes: bytes | None = None) -> AsyncMock:
-    mock_resp = MagicMock()
-    mock_resp.content = fake_bytes if fake_bytes is not None else _minimal_jpeg_bytes()
-    mock_resp.headers = {"content-type": "image/jpeg"}
-    mock_resp.raise_for_status = MagicMock()
-    mock_httpx_ctx = AsyncMock()
-    mock_httpx_ctx.__aenter__ = AsyncMock(return_value=mock_httpx_ctx)
-    mock_httpx_ctx.__aexit__ = AsyncMock(return_value=False)
-    mock_httpx_ctx.get = AsyncMock(return_value=mock_resp)
-    return mock_httpx_ctx
+def _generated_image(fake_bytes: bytes | None = None) -> GeneratedImage:
+    return GeneratedImage(
+        content=fake_bytes if fake_bytes is not None else _minimal_jpeg_bytes(),
+        media_type="image/jpeg",
+    )
 
 
 async def test_render_panel_creates_image_row_with_panel_render_discriminator(
@@ -97,8 +95,8 @@ async def test_render_panel_creates_image_row_with_panel_render_discriminator(
             return_value=mock_receipt,
         ),
         patch(
-            "core.story_engine.service.panel_service.httpx.AsyncClient",
-            return_value=_make_mock_httpx(),
+            "core.story_engine.service.panel_service.fetch_generated_image",
+            return_value=_generated_image(),
         ),
     ):
         response = await api_client.post(
@@ -153,8 +151,8 @@ async def test_render_panel_creates_edit_event_render_panel_succeeded(
             return_value=mock_receipt,
         ),
         patch(
-            "core.story_engine.service.panel_service.httpx.AsyncClient",
-            return_value=_make_mock_httpx(),
+            "core.story_engine.service.panel_service.fetch_generated_image",
+            return_value=_generated_image(),
         ),
     ):
         response = await api_client.post(
@@ -209,8 +207,8 @@ async def test_render_panel_output_snapshot_contains_image_id(
             return_value=mock_receipt,
         ),
         patch(
-            "core.story_engine.service.panel_service.httpx.AsyncClient",
-            return_value=_make_mock_httpx(),
+            "core.story_engine.service.panel_service.fetch_generated_image",
+            return_value=_generated_image(),
         ),
     ):
         response = await api_client.post(
@@ -266,8 +264,8 @@ async def test_render_panel_twice_creates_two_image_rows(
                 return_value=mock_receipt,
             ),
             patch(
-                "core.story_engine.service.panel_service.httpx.AsyncClient",
-                return_value=_make_mock_httpx(),
+                "core.story_engine.service.panel_service.fetch_generated_image",
+                return_value=_generated_image(),
             ),
         ):
             await api_client.post(
@@ -378,8 +376,8 @@ async def test_render_panel_characters_without_render_skipped_gracefully(
             return_value=mock_receipt,
         ),
         patch(
-            "core.story_engine.service.panel_service.httpx.AsyncClient",
-            return_value=_make_mock_httpx(),
+            "core.story_engine.service.panel_service.fetch_generated_image",
+            return_value=_generated_image(),
         ),
     ):
         response = await api_client.post(
@@ -453,3 +451,110 @@ async def test_render_panel_edit_event_marked_failed_on_fal_error(
     event = result.scalar_one_or_none()
     assert event is not None
     assert event.status == EditEventStatus.FAILED
+
+
+async def test_render_panel_sets_canonical_pointer_to_returned_render(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    """The stored canonical pointer and the returned render are the same image."""
+    panel = Panel.create(
+        story_id=story.id,
+        order_index=0,
+        attributes={"background": "Forest", "dialogue": "Hi", "characters": []},
+    )
+    db_session.add(panel)
+    await db_session.commit()
+
+    with (
+        patch(
+            "core.story_engine.service.panel_service.fal_async_client.subscribe",
+            new_callable=AsyncMock,
+            return_value=_mock_fal_response(),
+        ),
+        patch(
+            "core.story_engine.service.image_service.GCSUploadService.upload",
+            return_value=StorageReceipt(object_key="test-key", bucket="test-bucket"),
+        ),
+        patch(
+            "core.story_engine.service.panel_service.fetch_generated_image",
+            return_value=_generated_image(),
+        ),
+    ):
+        response = await api_client.post(
+            f"/api/comic-builder/v2/project/{project.id}/story/{story.id}"
+            f"/panel/{panel.id}/render",
+            headers=_auth_headers(user.id),
+        )
+
+    assert response.status_code == 200
+    image = (
+        await db_session.execute(
+            select(ImageModel).where(ImageModel.target_id == panel.id)
+        )
+    ).scalar_one()
+    await db_session.refresh(panel)
+    assert panel.canonical_render_id == image.id
+    assert response.json()["canonicalRender"]["id"] == str(image.id)
+
+
+async def test_render_panel_deleted_mid_render_rolls_back_image(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    """If the canonical pointer cannot be set, the image insert is rolled back."""
+    panel = Panel.create(
+        story_id=story.id,
+        order_index=0,
+        attributes={"background": "Forest", "dialogue": "Hi", "characters": []},
+    )
+    db_session.add(panel)
+    await db_session.commit()
+
+    with (
+        patch(
+            "core.story_engine.service.panel_service.fal_async_client.subscribe",
+            new_callable=AsyncMock,
+            return_value=_mock_fal_response(),
+        ),
+        patch(
+            "core.story_engine.service.image_service.GCSUploadService.upload",
+            return_value=StorageReceipt(object_key="test-key", bucket="test-bucket"),
+        ),
+        patch(
+            "core.story_engine.service.panel_service.fetch_generated_image",
+            return_value=_generated_image(),
+        ),
+        patch(
+            "core.story_engine.repository.panel_repository.PanelRepository"
+            ".set_canonical_render",
+            new_callable=AsyncMock,
+            side_effect=NotFoundError(f"Panel {panel.id} not found"),
+        ),
+    ):
+        response = await api_client.post(
+            f"/api/comic-builder/v2/project/{project.id}/story/{story.id}"
+            f"/panel/{panel.id}/render",
+            headers=_auth_headers(user.id),
+        )
+
+    assert response.status_code == 500
+    event = (
+        await db_session.execute(
+            select(EditEvent).where(
+                EditEvent.target_id == panel.id,
+                EditEvent.operation_type == EditEventOperationType.RENDER_PANEL,
+            )
+        )
+    ).scalar_one()
+    assert event.status == EditEventStatus.FAILED
+    images = await db_session.execute(
+        select(ImageModel).where(ImageModel.target_id == panel.id)
+    )
+    assert images.scalars().all() == []
@@ -0,0 +1,239 @@
+"""
+Story digests for character refinement and single-panel prompts.
+
+Test invariants:
+  1. Refining a character of a long story sends the digest summary plus the
+     paragraphs that character appears in, not the full story.
+  2. The digest is built once per story text version and stored on the story
+     without bumping updated_at; a new version rebuilds it.
+  3. Short stories and failed digests fall back to the full story text.
+  4. First-time panel generation quotes the scene matching the panel's
+     position in the story.
+  5. Generating a story builds its digest in the background.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from openai.types.chat import ChatCompletionChunk
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.config import settings
+from core.story_engine.models import Character, Panel, Project, Story
+from core.story_engine.service import (
+    CharacterService,
+    PanelService,
+    story_digest_service,
+)
+from core.story_engine.service.story_digest_service import (
+    StoryDigest,
+    StoryDigestService,
+)
+from tests.auth_helpers import auth_cookie_header
+
+DIGEST = "core.story_engine.service.story_digest_service.cached_completion"
+REFINE = "core.story_engine.service.character_service.cached_completion"
+CREATE = "core.story_engine.service.story_service.async_openai_client.chat.completions.create"
+PANEL = (
+    "core.story_engine.service.panel_service.instructor_client.chat.completions.create"
+)
+
+PARAGRAPHS = [
+    "The beacons of Gondor were lit at midnight.",
+    "Aragorn took the Paths of the Dead beneath the mountain.",
+    "Far away, the hobbits crossed the marshes in silence.",
+    "At the Black Gate, Aragorn called out the Dark Lord.",
+]
+
+STORY_DIGEST = StoryDigest.model_validate(
+    {
+        "summary": "A war for Middle-earth.",
+        "scenes": [
+            {
+                "title": "Beacons",
+                "summary": "Gondor calls for aid.",
+                "first_paragraph": 0,
+                "last_paragraph": 1,
+            },
+            {
+                "title": "The Gate",
+                "summary": "The last stand.",
+                "first_paragraph": 2,
+                "last_paragraph": 3,
+            },
+        ],
+        "characters": [
+            {"name": "Aragorn", "aliases": ["Strider"], "paragraphs": [1, 3]},
+            {"name": "Frodo", "paragraphs": [2]},
+        ],
+    }
+)
+
+
+@pytest.fixture(autouse=True)
+def digest_every_story(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "story_digest_min_chars", 10)
+
+
+@pytest_asyncio.fixture
+async def long_story(db_session: AsyncSession, story: Story) -> Story:
+    story.story_text = "\n\n".join(PARAGRAPHS)
+    await db_session.commit()
+    return story
+
+
+def _refined(character: Character) -> MagicMock:
+    return MagicMock(model_dump=MagicMock(return_value=dict(character.attributes)))
+
+
+def _prompt(mock: AsyncMock) -> str:
+    assert mock.await_args is not None
+    messages: list[dict[str, Any]] = mock.await_args.kwargs["messages"]
+    return "\n\n".join(str(m["content"]) for m in messages[1:])
+
+
+async def test_character_refinement_uses_digest_passages(
+    db_session: AsyncSession, long_story: Story, character: Character
+) -> None:
+    updated_at = long_story.updated_at
+
+    with (
+        patch(DIGEST, new_callable=AsyncMock, return_value=STORY_DIGEST) as digest,
+        patch(REFINE, new_callable=AsyncMock, return_value=_refined(character)) as llm,
+    ):
+        for _ in range(2):
+            await CharacterService(db_session).refine_character(
+                long_story.project_id, long_story.id, character.id, "Older"
+            )
+
+    digest.assert_awaited_once()
+    prompt = _prompt(llm)
+    assert "A war for Middle-earth." in prompt
+    assert PARAGRAPHS[1] in prompt and PARAGRAPHS[3] in prompt
+    assert PARAGRAPHS[0] not in prompt and PARAGRAPHS[2] not in prompt
+
+    await db_session.refresh(long_story)
+    assert long_story.digest is not None
+    assert long_story.digest["digest"]["summary"] == "A war for Middle-earth."
+    assert long_story.updated_at == updated_at
+
+
+async def test_new_story_version_rebuilds_digest(
+    db_session: AsyncSession, long_story: Story
+) -> None:
+    service = StoryDigestService(db_session)
+
+    with patch(DIGEST, new_callable=AsyncMock, return_value=STORY_DIGEST) as digest:
+        await service.get_digest(long_story)
+        await service.get_digest(long_story)
+        long_story.story_text += "\n\nThe ring was destroyed."
+        await db_session.commit()
+        await service.get_digest(long_story)
+
+    assert digest.await_count == 2
+
+
+@pytest.mark.parametrize("case", ["short", "failed"])
+async def test_full_text_without_a_digest(
+    db_session: AsyncSession,
+    long_story: Story,
+    character: Character,
+    monkeypatch: pytest.MonkeyPatch,
+    case: str,
+) -> None:
+    if case == "short":
+        monkeypatch.setattr(settings, "story_digest_min_chars", 10_000)
+    digest = AsyncMock(side_effect=RuntimeError("boom"))
+
+    with (
+        patch(DIGEST, digest),
+        patch(REFINE, new_callable=AsyncMock, return_value=_refined(character)) as llm,
+    ):
+        await CharacterService(db_session).refine_character(
+            long_story.project_id, long_story.id, character.id, "Older"
+        )
+
+    assert (digest.await_count == 0) == (case == "short")
+    assert long_story.story_text in _prompt(llm)
+
+
+async def test_panel_generation_quotes_scene_for_panel_position(
+    db_session: AsyncSession, long_story: Story, character: Character
+) -> None:
+    panels = [
+        Panel.create(story_id=long_story.id, order_index=i, attributes={})
+        for i in range(4)
+    ]
+    db_session.add_all(panels)
+    await db_session.commit()
+    content = MagicMock(background="The Gate", dialogue="", characters=["aragorn"])
+
+    with (
+        patch(DIGEST, new_callable=AsyncMock, return_value=STORY_DIGEST),
+        patch(PANEL, new_callable=AsyncMock, return_value=content) as llm,
+    ):
+        await PanelService(db_session).generate_panel(
+            long_story.project_id, long_story.id, panels[3].id
+        )
+
+    prompt = _prompt(llm)
+    assert "- The Gate (paragraphs 2-3): The last stand." in prompt
+    assert PARAGRAPHS[2] in prompt and PARAGRAPHS[3] in prompt
+    assert PARAGRAPHS[0] not in prompt
+
+
+async def _stream(text: str) -> AsyncIterator[ChatCompletionChunk]:
+    for content, finish_reason in ((text, None), (None, "stop")):
+        yield ChatCompletionChunk.model_validate(
+            {
+                "id": "chatcmpl-test",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": content},
+                        "finish_reason": finish_reason,
+                    }
+                ],
+            }
+        )
+
+
+async def test_generated_story_digest_is_built_in_background(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+) -> None:
+    story = Story(project_id=project.id, story_text="")
+    db_session.add(story)
+    await db_session.commit()
+
+    with (
+        patch(
+            CREATE,
+            new_callable=AsyncMock,
+            return_value=_stream("\n\n".join(PARAGRAPHS)),
+        ),
+        patch(DIGEST, new_callable=AsyncMock, return_value=STORY_DIGEST) as digest,
+    ):
+        response = await api_client.post(
+            f"/api/comic-builder/v2/project/{project.id}/story/{story.id}/generate",
+            json={"storyPrompt": "The war of the ring"},
+            headers=auth_cookie_header(user.id),
+        )
+        assert response.status_code == 200
+        await asyncio.gather(*story_digest_service._warming)
+
+    digest.assert_awaited_once()
+    await db_session.refresh(story)
+    assert story.digest is not None
+    assert story.digest["key"] == str(story.source_event_id)
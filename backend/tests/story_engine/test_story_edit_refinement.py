@@ -0,0 +1,217 @@
+"""
+Diff-based story refinement (STORY_REFINE_MODE=edits).
+
+Test invariants:
+  1. Edits address paragraphs by their original numbers; spans, whole
+     paragraphs, insertions (including before the first) and deletions apply.
+  2. Plans that do not apply cleanly raise StoryEditError.
+  3. A refinement streams and persists the locally patched story without a
+     rewrite call.
+  4. A plan that fails to apply falls back to the full rewrite stream.
+  5. STORY_REFINE_MODE=rewrite never asks for an edit plan.
+"""
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from openai.types.chat import ChatCompletionChunk
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.config import settings
+from core.story_engine.exceptions import StoryEditError
+from core.story_engine.models import Project, Story
+from core.story_engine.schemas.story import StoryEditPlan
+from core.story_engine.story_edits import apply_story_edits
+from tests.auth_helpers import auth_cookie_header
+
+CREATE = "core.story_engine.service.story_service.async_openai_client.chat.completions.create"
+PLAN = "core.story_engine.service.story_service.StoryEditPlanner.plan"
+
+STORY = (
+    "Elias kept the lamp.\n\n"
+    "Morrow came at dusk and Morrow did not knock.\n\n"
+    "The light went out."
+)
+
+
+def _plan(*edits: dict[str, Any]) -> StoryEditPlan:
+    return StoryEditPlan.model_validate({"edits": list(edits)})
+
+
+def _chunk(
+    content: str | None, finish_reason: str | None = None
+) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chatcmpl-test",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": content},
+                    "finish_reason": finish_reason,
+                }
+            ],
+        }
+    )
+
+
+async def _rewrite(text: str) -> AsyncIterator[ChatCompletionChunk]:
+    for chunk in (_chunk(""), _chunk(text), _chunk(None, "stop")):
+        yield chunk
+
+
+@pytest_asyncio.fixture
+async def written_story(db_session: AsyncSession, project: Project) -> Story:
+    story = Story(project_id=project.id, story_text=STORY)
+    db_session.add(story)
+    await db_session.commit()
+    return story
+
+
+async def _refine(api_client: AsyncClient, user: User, story: Story) -> str:
+    response = await api_client.post(
+        f"/api/comic-builder/v2/project/{story.project_id}/story/{story.id}/generate",
+        json={"storyPrompt": "Rename Morrow to Vane"},
+        headers=auth_cookie_header(user.id),
+    )
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    assert events[-1]["eventType"] == "stream.end"
+    return "".join(
+        e["payload"]["delta"] for e in events if e["eventType"] == "stream.chunk"
+    )
+
+
+def test_edits_apply_against_original_numbering() -> None:
+    plan = _plan(
+        {"op": "insert_after_paragraph", "paragraph": -1, "text": "A storm rose."},
+        {"op": "delete_paragraph", "paragraph": 0},
+        {
+            "op": "replace_span",
+            "paragraph": 1,
+            "find": "Morrow came",
+            "replace": "Vane came",
+        },
+        {
+            "op": "replace_span",
+            "paragraph": 1,
+            "find": "Morrow did",
+            "replace": "he did",
+        },
+        {"op": "insert_after_paragraph", "paragraph": 1, "text": "Glass broke."},
+        {"op": "replace_paragraph", "paragraph": 2, "text": "The light held."},
+    )
+
+    assert apply_story_edits(STORY, plan.edits) == (
+        "A storm rose.\n\n"
+        "Vane came at dusk and he did not knock.\n\n"
+        "Glass broke.\n\n"
+        "The light held."
+    )
+
+
+@pytest.mark.parametrize(
+    "edits",
+    [
+        [],
+        [{"op": "replace_span", "paragraph": 1, "find": "Morrow", "replace": "Vane"}],
+        [{"op": "replace_span", "paragraph": 0, "find": "Morrow", "replace": "Vane"}],
+        [{"op": "replace_paragraph", "paragraph": 3, "text": "Out of range."}],
+        [{"op": "insert_after_paragraph", "paragraph": -2, "text": "Nowhere."}],
+        [
+            {"op": "delete_paragraph", "paragraph": 2},
+            {"op": "replace_paragraph", "paragraph": 2, "text": "Too late."},
+        ],
+    ],
+    ids=["empty", "ambiguous", "missing", "range", "insert-range", "deleted"],
+)
+def test_edits_that_do_not_apply_raise(edits: list[dict[str, Any]]) -> None:
+    with pytest.raises(StoryEditError):
+        apply_story_edits(STORY, _plan(*edits).edits)
+
+
+async def test_refinement_applies_edit_plan_without_rewrite(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    written_story: Story,
+) -> None:
+    plan = _plan(
+        {
+            "op": "replace_span",
+            "paragraph": 1,
+            "find": "Morrow came",
+            "replace": "Vane came",
+        },
+        {
+            "op": "replace_span",
+            "paragraph": 1,
+            "find": "Morrow did",
+            "replace": "Vane did",
+        },
+    )
+
+    with (
+        patch(PLAN, new_callable=AsyncMock, return_value=plan) as planner,
+        patch(CREATE, new_callable=AsyncMock) as rewrite,
+    ):
+        streamed = await _refine(api_client, user, written_story)
+
+    expected = STORY.replace("Morrow", "Vane")
+    assert streamed == expected
+    planner.assert_awaited_once_with(STORY, "Rename Morrow to Vane")
+    rewrite.assert_not_awaited()
+    await db_session.refresh(written_story)
+    assert written_story.story_text == expected
+
+
+async def test_refinement_falls_back_to_rewrite_when_plan_fails(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    written_story: Story,
+) -> None:
+    ambiguous = _plan(
+        {"op": "replace_span", "paragraph": 1, "find": "Morrow", "replace": "Vane"}
+    )
+    rewritten = STORY.replace("Morrow", "Vane")
+
+    with (
+        patch(PLAN, new_callable=AsyncMock, return_value=ambiguous),
+        patch(
+            CREATE, new_callable=AsyncMock, return_value=_rewrite(rewritten)
+        ) as rewrite,
+    ):
+        streamed = await _refine(api_client, user, written_story)
+
+    assert streamed == rewritten
+    rewrite.assert_awaited_once()
+    await db_session.refresh(written_story)
+    assert written_story.story_text == rewritten
+
+
+async def test_rewrite_mode_skips_edit_planning(
+    api_client: AsyncClient,
+    user: User,
+    written_story: Story,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "story_refine_mode", "rewrite")
+
+    with (
+        patch(PLAN, new_callable=AsyncMock) as planner,
+        patch(CREATE, new_callable=AsyncMock, return_value=_rewrite("New story.")),
+    ):
+        streamed = await _refine(api_client, user, written_story)
+
+    assert streamed == "New story."
+    planner.assert_not_awaited()
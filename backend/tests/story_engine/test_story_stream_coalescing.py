@@ -0,0 +1,144 @@
+"""
+Coalesced delta framing for the story NDJSON stream (POST …/generate).
+
+Test invariants:
+  1. Consecutive text deltas merge until STORY_STREAM_COALESCE_CHARS
+     characters or STORY_STREAM_COALESCE_MS have accumulated.
+  2. The opening empty delta and the finish chunk are never merged; they
+     flush pending text first, so order is preserved.
+  3. Disabling coalescing passes every chunk through.
+  4. Through the API, every envelope shares one streamId with gapless seq,
+     and the concatenated deltas equal the persisted story text.
+"""
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+from openai.types.chat import ChatCompletionChunk
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.config import settings
+from core.story_engine.models import Project, Story
+from core.story_engine.service.story_service import coalesce_chunks
+from tests.auth_helpers import auth_cookie_header
+
+CREATE = "core.story_engine.service.story_service.async_openai_client.chat.completions.create"
+
+
+def _chunk(
+    content: str | None, finish_reason: str | None = None
+) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chatcmpl-test",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": content},
+                    "finish_reason": finish_reason,
+                }
+            ],
+        }
+    )
+
+
+def _completion(tokens: list[str]) -> list[ChatCompletionChunk]:
+    return [_chunk(""), *(_chunk(t) for t in tokens), _chunk(None, "stop")]
+
+
+async def _arrive(
+    chunks: list[ChatCompletionChunk], clock: list[float], gap: float
+) -> AsyncIterator[ChatCompletionChunk]:
+    for chunk in chunks:
+        clock[0] += gap
+        yield chunk
+
+
+async def _coalesce(
+    tokens: list[str], max_chars: int, max_delay_ms: int, gap: float = 0.0
+) -> list[tuple[str | None, str | None]]:
+    clock = [0.0]
+    merged = coalesce_chunks(
+        _arrive(_completion(tokens), clock, gap),
+        max_chars,
+        max_delay_ms,
+        clock=lambda: clock[0],
+    )
+    return [
+        (c.choices[0].delta.content, c.choices[0].finish_reason) async for c in merged
+    ]
+
+
+async def test_deltas_merge_up_to_max_chars() -> None:
+    chunks = await _coalesce(["ab", "cd", "ef", "gh", "i"], 4, 1000)
+
+    assert chunks == [
+        ("", None),
+        ("abcd", None),
+        ("efgh", None),
+        ("i", None),
+        (None, "stop"),
+    ]
+
+
+async def test_deltas_flush_after_max_delay() -> None:
+    # 20 ms between tokens, 40 ms budget: the third token triggers a flush.
+    chunks = await _coalesce(["a", "b", "c", "d", "e"], 256, 40, gap=0.02)
+
+    assert [content for content, _ in chunks] == ["", "abc", "de", None]
+
+
+async def test_disabled_coalescing_passes_chunks_through() -> None:
+    tokens = ["a", "b", "c"]
+
+    assert await _coalesce(tokens, 0, 40) == await _coalesce(tokens, 256, 0)
+    assert len(await _coalesce(tokens, 0, 40)) == len(tokens) + 2
+
+
+async def test_generate_story_stream_is_coalesced_and_sequenced(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "story_stream_coalesce_chars", 10)
+    story = Story(project_id=project.id, story_text="")
+    db_session.add(story)
+    await db_session.commit()
+    tokens = [f" word{i}" for i in range(12)]
+
+    async def completion() -> AsyncIterator[ChatCompletionChunk]:
+        for chunk in _completion(tokens):
+            yield chunk
+
+    with patch(CREATE, new_callable=AsyncMock, return_value=completion()):
+        response = await api_client.post(
+            f"/api/comic-builder/v2/project/{project.id}/story/{story.id}/generate",
+            json={"storyPrompt": "A lighthouse keeper"},
+            headers=auth_cookie_header(user.id),
+        )
+
+    assert response.status_code == 200
+    events: list[dict[str, Any]] = [
+        json.loads(line) for line in response.text.splitlines() if line
+    ]
+    chunks = [e for e in events if e["eventType"] == "stream.chunk"]
+    assert events[0]["eventType"] == "stream.start"
+    assert events[-1]["eventType"] == "stream.end"
+    assert len(chunks) == len(tokens) // 2
+    assert [e["seq"] for e in events] == list(range(len(events)))
+    assert len({e["streamId"] for e in events}) == 1
+    assert events[0]["streamId"] is not None
+
+    await db_session.refresh(story)
+    assert "".join(e["payload"]["delta"] for e in chunks) == story.story_text
+    assert story.story_text == "".join(tokens)
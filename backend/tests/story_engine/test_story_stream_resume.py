@@ -0,0 +1,323 @@
+"""
+Resumable story generation — GET …/generate/{stream_id}?from_seq=N.
+
+Test invariants:
+  1. Generation keeps running and persists the story after the client that
+     started it disconnects.
+  2. Resuming on the same instance replays from from_seq and follows the live
+     run; seq continues where the client left off.
+  3. The text so far is checkpointed to the edit event while streaming.
+  4. Without an in-memory run, a finished generation replays from the edit
+     event; a stalled one replays its checkpoint and ends in STREAM_ERROR.
+  5. Unknown stream ids and other users get 404 / 403.
+  6. A resumed stream, live or rebuilt from checkpoints, holds no connection
+     from the request's session while it is open.
+"""
+
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any, cast
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from openai.types.chat import ChatCompletionChunk
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.config import settings
+from core.story_engine import stream_runs
+from core.story_engine.events import EventEnvelope
+from core.story_engine.models import EditEvent, Project, Story
+from core.story_engine.models.edit_event import EditEventStatus
+from core.story_engine.schemas.story import GenerateStoryRequest
+from core.story_engine.service import StoryService
+from tests.auth_helpers import auth_cookie_header
+
+CREATE = "core.story_engine.service.story_service.async_openai_client.chat.completions.create"
+
+
+def _chunk(
+    content: str | None, finish_reason: str | None = None
+) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chatcmpl-test",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": content},
+                    "finish_reason": finish_reason,
+                }
+            ],
+        }
+    )
+
+
+async def _from_queue(
+    queue: "asyncio.Queue[ChatCompletionChunk]",
+) -> AsyncIterator[ChatCompletionChunk]:
+    while True:
+        chunk = await queue.get()
+        yield chunk
+        if chunk.choices[0].finish_reason is not None:
+            return
+
+
+@pytest.fixture(autouse=True)
+def per_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    # One envelope per token keeps seq arithmetic in these tests obvious.
+    monkeypatch.setattr(settings, "story_stream_coalesce_chars", 0)
+
+
+@pytest_asyncio.fixture
+async def empty_story(db_session: AsyncSession, project: Project) -> Story:
+    story = Story(project_id=project.id, story_text="")
+    db_session.add(story)
+    await db_session.commit()
+    return story
+
+
+def _resume_url(story: Story, stream_id: str, from_seq: int = 0) -> str:
+    return (
+        f"/api/comic-builder/v2/project/{story.project_id}/story/{story.id}"
+        f"/generate/{stream_id}?from_seq={from_seq}"
+    )
+
+
+def _events(body: str) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in body.splitlines() if line]
+
+
+async def test_disconnect_then_resume_continues_the_same_generation(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    empty_story: Story,
+) -> None:
+    queue: asyncio.Queue[ChatCompletionChunk] = asyncio.Queue()
+    for chunk in (_chunk(""), _chunk("Once"), _chunk(" upon")):
+        queue.put_nowait(chunk)
+
+    with patch(CREATE, new_callable=AsyncMock, return_value=_from_queue(queue)):
+        stream = await StoryService(db_session).generate_story(
+            user.id,
+            empty_story.project_id,
+            empty_story.id,
+            GenerateStoryRequest(story_prompt="A lighthouse keeper"),
+        )
+        received = [await anext(stream), await anext(stream)]
+        # The client drops.
+        await cast(AsyncGenerator[EventEnvelope, None], stream).aclose()
+
+        stream_id = received[0].stream_id
+        assert stream_id is not None
+        run = stream_runs.get_stream_run(stream_id)
+        assert run is not None and not run.done
+
+        # Upstream keeps generating with nobody listening.
+        queue.put_nowait(_chunk(" a time"))
+        queue.put_nowait(_chunk(None, "stop"))
+        assert run.task is not None
+        await run.task
+
+    response = await api_client.get(
+        _resume_url(empty_story, stream_id, from_seq=2),
+        headers=auth_cookie_header(user.id),
+    )
+
+    assert response.status_code == 200
+    resumed = _events(response.text)
+    assert [e["seq"] for e in resumed] == [2, 3, 4]
+    assert {e["streamId"] for e in resumed} == {stream_id}
+    assert resumed[-1]["eventType"] == "stream.end"
+    text = "".join(
+        e.payload["delta"]
+        for e in received
+        if e.payload and e.event_type.value == "stream.chunk"
+    ) + "".join(e["payload"]["delta"] for e in resumed[:-1])
+    assert text == "Once upon a time"
+
+    await db_session.refresh(empty_story)
+    assert empty_story.story_text == "Once upon a time"
+
+
+async def test_streaming_checkpoints_text_to_edit_event(
+    db_session: AsyncSession,
+    user: User,
+    empty_story: Story,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "story_stream_checkpoint_seconds", 0)
+    queue: asyncio.Queue[ChatCompletionChunk] = asyncio.Queue()
+    for chunk in (_chunk(""), _chunk("Dark"), _chunk(" water")):
+        queue.put_nowait(chunk)
+
+    with patch(CREATE, new_callable=AsyncMock, return_value=_from_queue(queue)):
+        stream = await StoryService(db_session).generate_story(
+            user.id,
+            empty_story.project_id,
+            empty_story.id,
+            GenerateStoryRequest(story_prompt="A lighthouse keeper"),
+        )
+        events = [await anext(stream) for _ in range(3)]
+        stream_id = events[0].stream_id
+        assert stream_id is not None
+        run = stream_runs.get_stream_run(stream_id)
+        assert run is not None
+        # The producer checkpoints after publishing each chunk.
+        snapshot: dict[str, Any] = {}
+        for _ in range(100):
+            db_session.expire_all()
+            edit_event = await db_session.get(EditEvent, uuid.UUID(stream_id))
+            assert edit_event is not None
+            assert edit_event.status == EditEventStatus.PENDING
+            snapshot = edit_event.output_snapshot or {}
+            if snapshot.get("storyText") == "Dark water":
+                break
+            await asyncio.sleep(0.01)
+        assert snapshot["storyText"] == "Dark water"
+        assert snapshot["seq"] == 3
+
+        queue.put_nowait(_chunk(None, "stop"))
+        assert run.task is not None
+        await run.task
+        await cast(AsyncGenerator[EventEnvelope, None], stream).aclose()
+
+
+async def test_resume_without_live_run_replays_finished_generation(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    empty_story: Story,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    tokens = [_chunk(""), _chunk("The"), _chunk(" end"), _chunk(None, "stop")]
+    queue: asyncio.Queue[ChatCompletionChunk] = asyncio.Queue()
+    for chunk in tokens:
+        queue.put_nowait(chunk)
+
+    with patch(CREATE, new_callable=AsyncMock, return_value=_from_queue(queue)):
+        response = await api_client.post(
+            f"/api/comic-builder/v2/project/{empty_story.project_id}"
+            f"/story/{empty_story.id}/generate",
+            json={"storyPrompt": "An ending"},
+            headers=auth_cookie_header(user.id),
+        )
+    stream_id = _events(response.text)[0]["streamId"]
+    # As if the request landed on another instance.
+    monkeypatch.delitem(stream_runs._runs, stream_id)
+
+    response = await api_client.get(
+        _resume_url(empty_story, stream_id, from_seq=3),
+        headers=auth_cookie_header(user.id),
+    )
+
+    events = _events(response.text)
+    assert [e["eventType"] for e in events] == [
+        "stream.start",
+        "stream.chunk",
+        "stream.end",
+    ]
+    assert [e["seq"] for e in events] == [0, 1, 2]
+    assert events[1]["payload"]["delta"] == "The end"
+
+
+async def test_resume_of_stalled_generation_replays_checkpoint_then_errors(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    empty_story: Story,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "story_stream_stale_seconds", 0)
+    edit_event = EditEvent(
+        project_id=empty_story.project_id,
+        target_type="story",
+        target_id=empty_story.id,
+        operation_type="generate_story",
+        user_instruction="A lighthouse keeper",
+        status=EditEventStatus.PENDING,
+        output_snapshot={"storyText": "Half a sto", "seq": 4, "checkpointAtMs": 0},
+    )
+    db_session.add(edit_event)
+    await db_session.commit()
+
+    response = await api_client.get(
+        _resume_url(empty_story, str(edit_event.id)),
+        headers=auth_cookie_header(user.id),
+    )
+
+    events = _events(response.text)
+    assert [e["eventType"] for e in events] == [
+        "stream.start",
+        "stream.chunk",
+        "stream.error",
+    ]
+    assert events[1]["payload"]["delta"] == "Half a sto"
+    assert events[2]["error"]["code"] == "E_STREAM_INTERRUPTED"
+
+
+async def test_resume_releases_the_request_connection_while_streaming(
+    db_session: AsyncSession,
+    user: User,
+    empty_story: Story,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    queue: asyncio.Queue[ChatCompletionChunk] = asyncio.Queue()
+    for chunk in (_chunk(""), _chunk("Still")):
+        queue.put_nowait(chunk)
+    pool = db_session.bind.sync_engine.pool
+    ids = (user.id, empty_story.project_id, empty_story.id)
+
+    with patch(CREATE, new_callable=AsyncMock, return_value=_from_queue(queue)):
+        stream = await StoryService(db_session).generate_story(
+            *ids, GenerateStoryRequest(story_prompt="A lighthouse keeper")
+        )
+        stream_id = (await anext(stream)).stream_id
+        assert stream_id is not None
+
+        live = await StoryService(db_session).resume_story_stream(
+            *ids, uuid.UUID(stream_id), from_seq=1
+        )
+        assert (await anext(live)).seq == 1
+        assert pool.checkedout() == 0  # type: ignore[attr-defined]
+
+        run = stream_runs.get_stream_run(stream_id)
+        assert run is not None and run.task is not None
+        monkeypatch.delitem(stream_runs._runs, stream_id)
+        followed = await StoryService(db_session).resume_story_stream(
+            *ids, uuid.UUID(stream_id)
+        )
+        assert pool.checkedout() == 0  # type: ignore[attr-defined]
+
+        queue.put_nowait(_chunk(None, "stop"))
+        await run.task
+        for opened in (stream, live, followed):
+            await cast(AsyncGenerator[EventEnvelope, None], opened).aclose()
+
+
+async def test_resume_rejects_unknown_stream_and_other_users(
+    api_client: AsyncClient,
+    user: User,
+    user_factory: Any,
+    empty_story: Story,
+) -> None:
+    response = await api_client.get(
+        _resume_url(empty_story, str(uuid.uuid4())),
+        headers=auth_cookie_header(user.id),
+    )
+    assert response.status_code == 404
+
+    other = await user_factory()
+    response = await api_client.get(
+        _resume_url(empty_story, str(uuid.uuid4())),
+        headers=auth_cookie_header(other.id),
+    )
+    assert response.status_code == 403
@@ -0,0 +1,220 @@
+"""
+Streaming extraction — POST .../panels/generate/stream and .../characters/stream.
+
+Test invariants:
+  1. The response is NDJSON EventEnvelopes: STREAM_START, one STREAM_CHUNK per
+     item, STREAM_END with the count, sharing a stream_id with gapless seq.
+  2. Each panel is committed (with EditEvent and join rows) before the LLM
+     produces the next one, with sequential order_index.
+  3. A failure partway ends the stream with STREAM_ERROR and keeps the panels
+     already emitted.
+  4. Validation errors (404, 422) are returned before the stream starts.
+  5. Characters stream the same way and are persisted.
+"""
+
+import json
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+from unittest.mock import patch
+
+from httpx import AsyncClient
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.auth.models.user import User
+from core.story_engine.models import Character, Panel, Project, Story
+from core.story_engine.models.edit_event import EditEvent
+from core.story_engine.models.panel_character import PanelCharacter
+from core.story_engine.schemas.character import CharacterAttributesSchema
+from core.story_engine.schemas.panel import PanelContent
+from tests.auth_helpers import auth_cookie_header
+
+PANEL_ITERABLE = "core.story_engine.service.panel_service.instructor_client.chat.completions.create_iterable"
+CHARACTER_ITERABLE = "core.story_engine.service.character_service.instructor_client.chat.completions.create_iterable"
+
+
+def _base(project: Project, story: Story) -> str:
+    return f"/api/comic-builder/v2/project/{project.id}/story/{story.id}"
+
+
+def _events(body: str) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in body.splitlines() if line]
+
+
+def _fake_iterable(
+    items: Sequence[BaseModel],
+    before_each: Any = None,
+    fail_after: int | None = None,
+) -> Any:
+    def create_iterable(**kwargs: Any) -> AsyncIterator[BaseModel]:
+        async def stream() -> AsyncIterator[BaseModel]:
+            for index, item in enumerate(items):
+                if fail_after is not None and index == fail_after:
+                    raise RuntimeError("upstream closed")
+                if before_each is not None:
+                    await before_each(index)
+                yield item
+
+        return stream()
+
+    return create_iterable
+
+
+async def _panel_count(db: AsyncSession, story: Story) -> int:
+    result = await db.execute(
+        select(func.count()).select_from(Panel).where(Panel.story_id == story.id)
+    )
+    return int(result.scalar_one())
+
+
+async def test_stream_generate_panels_emits_and_persists_each_panel(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    character: Character,
+) -> None:
+    panels = [
+        PanelContent(background="Forest", dialogue="Hush.", characters=["aragorn"]),
+        PanelContent(background="Fortress", dialogue="", characters=[]),
+    ]
+    persisted_before: list[int] = []
+
+    async def record_persisted(index: int) -> None:
+        persisted_before.append(await _panel_count(db_session, story))
+
+    with patch(PANEL_ITERABLE, _fake_iterable(panels, record_persisted)):
+        response = await api_client.post(
+            f"{_base(project, story)}/panels/generate/stream",
+            headers=auth_cookie_header(user.id),
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = _events(response.text)
+    assert [e["eventType"] for e in events] == [
+        "stream.start",
+        "stream.chunk",
+        "stream.chunk",
+        "stream.end",
+    ]
+    assert [e["seq"] for e in events] == [0, 1, 2, 3]
+    assert len({e["streamId"] for e in events}) == 1
+    assert events[-1]["payload"] == {"count": 2}
+    chunks = [e["payload"]["panel"] for e in events[1:3]]
+    assert [c["orderIndex"] for c in chunks] == [0, 1]
+    assert chunks[0]["attributes"]["background"] == "Forest"
+
+    # Panel N was committed before the LLM produced panel N + 1.
+    assert persisted_before == [0, 1]
+
+    panel_ids = [uuid.UUID(c["id"]) for c in chunks]
+    joins = await db_session.execute(
+        select(PanelCharacter.panel_id).where(PanelCharacter.panel_id.in_(panel_ids))
+    )
+    assert list(joins.scalars()) == [panel_ids[0]]
+    events_count = await db_session.execute(
+        select(func.count())
+        .select_from(EditEvent)
+        .where(EditEvent.target_id.in_(panel_ids))
+    )
+    assert events_count.scalar_one() == 2
+
+
+async def test_stream_generate_panels_failure_keeps_emitted_panels(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    character: Character,
+) -> None:
+    panels = [
+        PanelContent(background="Forest", dialogue="Hush.", characters=[]),
+        PanelContent(background="Fortress", dialogue="", characters=[]),
+    ]
+
+    with patch(PANEL_ITERABLE, _fake_iterable(panels, fail_after=1)):
+        response = await api_client.post(
+            f"{_base(project, story)}/panels/generate/stream",
+            headers=auth_cookie_header(user.id),
+        )
+
+    events = _events(response.text)
+    assert [e["eventType"] for e in events] == [
+        "stream.start",
+        "stream.chunk",
+        "stream.error",
+    ]
+    assert events[-1]["error"]["message"] == "upstream closed"
+    assert await _panel_count(db_session, story) == 1
+
+
+async def test_stream_generate_panels_validates_before_streaming(
+    api_client: AsyncClient,
+    user: User,
+    project: Project,
+    story: Story,
+) -> None:
+    # No characters yet.
+    response = await api_client.post(
+        f"{_base(project, story)}/panels/generate/stream",
+        headers=auth_cookie_header(user.id),
+    )
+    assert response.status_code == 422
+
+    response = await api_client.post(
+        f"/api/comic-builder/v2/project/{project.id}/story/{uuid.uuid4()}"
+        "/panels/generate/stream",
+        headers=auth_cookie_header(user.id),
+    )
+    assert response.status_code == 404
+
+
+async def test_stream_extract_characters_emits_and_persists_each_character(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    user: User,
+    project: Project,
+    story: Story,
+    character: Character,
+) -> None:
+    extracted = [
+        CharacterAttributesSchema(
+            name=name,
+            brief="A hobbit of the Shire.",
+            character_type="humanoid",
+            era="Third Age",
+            visual_form="Short, curly-haired, barefoot",
+            color_palette="earth tones",
+            distinctive_markers="elven cloak",
+            demeanor="Steadfast",
+            role="protagonist",
+        )
+        for name in ("Frodo Baggins", "Samwise")
+    ]
+
+    with patch(CHARACTER_ITERABLE, _fake_iterable(extracted)):
+        response = await api_client.post(
+            f"{_base(project, story)}/characters/stream",
+            headers=auth_cookie_header(user.id),
+        )
+
+    assert response.status_code == 200
+    events = _events(response.text)
+    assert [e["eventType"] for e in events] == [
+        "stream.start",
+        "stream.chunk",
+        "stream.chunk",
+        "stream.end",
+    ]
+    slugs = [e["payload"]["character"]["slug"] for e in events[1:3]]
+    assert slugs == ["frodo-baggins", "samwise"]
+
+    stored = await db_session.execute(
+        select(Character.slug).where(Character.story_id == story.id)
+    )
+    assert set(stored.scalars()) == {"aragorn", "frodo-baggins", "samwise"}
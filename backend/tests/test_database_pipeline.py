@@ -0,0 +1,113 @@
+"""
+psycopg pipeline mode (database.pipeline) and prepared-statement settings.
+
+Test invariants:
+  1. Writes issued inside pipeline() are committed and visible to other sessions.
+  2. set_edit_event_status works inside a pipeline and updates the loaded object.
+  3. A failing statement inside pipeline() raises when the block exits.
+  4. Engine connections use DATABASE_PREPARE_THRESHOLD; -1 disables preparing.
+"""
+
+from collections.abc import AsyncGenerator
+
+import psycopg
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from core.config import settings
+from core.infrastructure.database import _create_engine, pipeline
+from core.story_engine.models import Panel, Project, Story
+from core.story_engine.models.edit_event import (
+    EditEvent,
+    EditEventOperationType,
+    EditEventStatus,
+    EditEventTargetType,
+)
+from core.story_engine.repository import Repository
+
+
+@pytest_asyncio.fixture
+async def panel(db_session: AsyncSession, story: Story) -> Panel:
+    panel = Panel.create(story_id=story.id, order_index=0, attributes={})
+    db_session.add(panel)
+    await db_session.commit()
+    return panel
+
+
+@pytest_asyncio.fixture
+async def engine() -> AsyncGenerator[AsyncEngine, None]:
+    engine = _create_engine(settings.database_url, "test-pipeline")
+    yield engine
+    await engine.dispose()
+
+
+def _pending_event(project: Project, panel: Panel) -> EditEvent:
+    return EditEvent.create_edit_event(
+        project_id=project.id,
+        target_type=EditEventTargetType.PANEL,
+        target_id=panel.id,
+        operation_type=EditEventOperationType.RENDER_PANEL,
+        user_instruction="",
+        status=EditEventStatus.PENDING,
+    )
+
+
+async def test_pipelined_writes_are_committed(
+    engine: AsyncEngine, db_session: AsyncSession, project: Project, panel: Panel
+) -> None:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repository = Repository(session)
+        edit_event = _pending_event(project, panel)
+        await repository.edit_event.add_edit_event_to_db(edit_event)
+        await session.commit()
+
+        async with pipeline(session):
+            await repository.edit_event.set_edit_event_status(
+                edit_event.id,
+                EditEventStatus.SUCCEEDED,
+                output_snapshot={"image_id": "abc"},
+            )
+            await session.commit()
+
+        # Synchronised in place — no reload needed.
+        assert edit_event.status == EditEventStatus.SUCCEEDED
+        assert edit_event.output_snapshot == {"image_id": "abc"}
+
+    stored = (
+        await db_session.execute(select(EditEvent).where(EditEvent.id == edit_event.id))
+    ).scalar_one()
+    assert stored.status == EditEventStatus.SUCCEEDED
+    assert stored.output_snapshot == {"image_id": "abc"}
+
+
+async def test_pipeline_error_raises_on_exit(engine: AsyncEngine) -> None:
+    async with AsyncSession(engine) as session:
+        with pytest.raises(psycopg.errors.UndefinedTable):
+            async with pipeline(session):
+                await session.execute(text("UPDATE no_such_table SET x = 1"))
+        await session.rollback()
+        assert (await session.execute(text("SELECT 1"))).scalar_one() == 1
+
+
+async def test_engine_uses_prepare_threshold(
+    engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        assert raw.driver_connection is not None
+        assert (
+            raw.driver_connection.prepare_threshold
+            == settings.database_prepare_threshold
+        )
+
+    monkeypatch.setattr(settings, "database_prepare_threshold", -1)
+    disabled = _create_engine(settings.database_url, "test-pipeline-unprepared")
+    try:
+        async with disabled.connect() as conn:
+            raw = await conn.get_raw_connection()
+            assert raw.driver_connection is not None
+            assert raw.driver_connection.prepare_threshold is None
+    finally:
+        await disabled.dispose()
@@ -0,0 +1,179 @@
+"""
+Postgres-backed LLM response cache (core.infrastructure.llm_cache).
+
+Test invariants:
+  1. With the cache off (the default) every call goes to the model.
+  2. An identical request is answered from the cache; the model runs once.
+  3. A different prompt or response schema is a different key.
+  4. bypass_cache=True neither reads nor writes the cache.
+  5. Expired entries miss; the table is trimmed to LLM_CACHE_MAX_ENTRIES on
+     the sampled stores that evict, and left alone on the others.
+  6. Hit / miss / bypass counts are exported as metrics.
+"""
+
+import uuid
+from collections.abc import AsyncGenerator
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.infrastructure.llm_cache import service
+from core.infrastructure.llm_cache.models import LLMResponseCacheEntry
+from core.infrastructure.llm_cache.service import (
+    CACHE_REQUESTS,
+    cache_key,
+    cached_completion,
+)
+
+CREATE = (
+    "core.infrastructure.llm_cache.service.instructor_client.chat.completions.create"
+)
+
+
+class Hero(BaseModel):
+    name: str
+    power: str
+
+
+class Villain(BaseModel):
+    name: str
+
+
+@pytest_asyncio.fixture
+async def cache_enabled(
+    monkeypatch: pytest.MonkeyPatch, db_session: AsyncSession
+) -> AsyncGenerator[None, None]:
+    monkeypatch.setattr(settings, "llm_cache_enabled", True)
+    yield
+    await db_session.execute(delete(LLMResponseCacheEntry))
+    await db_session.commit()
+
+
+def _messages(text: str | None = None) -> list:
+    return [{"role": "user", "content": text or f"story {uuid.uuid4()}"}]
+
+
+async def test_disabled_cache_always_calls_model() -> None:
+    messages = _messages()
+    with patch(
+        CREATE, new_callable=AsyncMock, return_value=Hero(name="a", power="b")
+    ) as create:
+        await cached_completion(model="gpt-4o", response_model=Hero, messages=messages)
+        await cached_completion(model="gpt-4o", response_model=Hero, messages=messages)
+
+    assert create.await_count == 2
+
+
+@pytest.mark.usefixtures("cache_enabled")
+async def test_identical_request_is_served_from_cache() -> None:
+    messages = _messages()
+    hits = CACHE_REQUESTS.value(result="hit")
+    misses = CACHE_REQUESTS.value(result="miss")
+    with patch(
+        CREATE, new_callable=AsyncMock, return_value=[Hero(name="Ada", power="math")]
+    ) as create:
+        first = await cached_completion(
+            model="gpt-4o", response_model=list[Hero], messages=messages
+        )
+        second = await cached_completion(
+            model="gpt-4o", response_model=list[Hero], messages=messages, max_retries=3
+        )
+
+    assert create.await_count == 1
+    assert second == first == [Hero(name="Ada", power="math")]
+    assert CACHE_REQUESTS.value(result="miss") == misses + 1
+    assert CACHE_REQUESTS.value(result="hit") == hits + 1
+
+
+def test_key_covers_model_schema_and_messages() -> None:
+    messages = _messages("same")
+    base = cache_key("gpt-4o", Hero, messages, {})
+
+    assert cache_key("gpt-4o", Hero, _messages("same"), {}) == base
+    assert cache_key("gpt-4o-mini", Hero, messages, {}) != base
+    assert cache_key("gpt-4o", Villain, messages, {}) != base
+    assert cache_key("gpt-4o", Hero, _messages("other"), {}) != base
+    assert cache_key("gpt-4o", Hero, messages, {"temperature": 0.9}) != base
+
+
+@pytest.mark.usefixtures("cache_enabled")
+async def test_bypass_skips_read_and_write(db_session: AsyncSession) -> None:
+    messages = _messages()
+    bypasses = CACHE_REQUESTS.value(result="bypass")
+    with patch(
+        CREATE, new_callable=AsyncMock, return_value=Hero(name="a", power="b")
+    ) as create:
+        for _ in range(2):
+            await cached_completion(
+                model="gpt-4o",
+                response_model=Hero,
+                messages=messages,
+                bypass_cache=True,
+            )
+
+    assert create.await_count == 2
+    assert CACHE_REQUESTS.value(result="bypass") == bypasses + 2
+    key = cache_key("gpt-4o", Hero, messages, {})
+    assert await db_session.get(LLMResponseCacheEntry, key) is None
+
+
+@pytest.mark.usefixtures("cache_enabled")
+async def test_expired_entries_miss(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "llm_cache_ttl_seconds", 0)
+    messages = _messages()
+    with patch(
+        CREATE, new_callable=AsyncMock, return_value=Hero(name="a", power="b")
+    ) as create:
+        await cached_completion(model="gpt-4o", response_model=Hero, messages=messages)
+        await cached_completion(model="gpt-4o", response_model=Hero, messages=messages)
+
+    assert create.await_count == 2
+
+
+@pytest.mark.usefixtures("cache_enabled")
+async def test_table_is_trimmed_to_max_entries(
+    monkeypatch: pytest.MonkeyPatch, db_session: AsyncSession
+) -> None:
+    monkeypatch.setattr(settings, "llm_cache_max_entries", 2)
+    monkeypatch.setattr(settings, "llm_cache_evict_every", 1)
+    prompts = [_messages() for _ in range(3)]
+    with patch(CREATE, new_callable=AsyncMock, return_value=Hero(name="a", power="b")):
+        for messages in prompts:
+            await cached_completion(
+                model="gpt-4o", response_model=Hero, messages=messages
+            )
+
+    count = (
+        await db_session.execute(
+            select(func.count()).select_from(LLMResponseCacheEntry)
+        )
+    ).scalar_one()
+    assert count == 2
+    oldest = cache_key("gpt-4o", Hero, prompts[0], {})
+    assert await db_session.get(LLMResponseCacheEntry, oldest) is None
+
+
+@pytest.mark.usefixtures("cache_enabled")
+async def test_unsampled_stores_skip_eviction(
+    monkeypatch: pytest.MonkeyPatch, db_session: AsyncSession
+) -> None:
+    monkeypatch.setattr(settings, "llm_cache_max_entries", 2)
+    monkeypatch.setattr(settings, "llm_cache_evict_every", 100)
+    monkeypatch.setattr(service.random, "randrange", lambda n: n - 1)
+    with patch(CREATE, new_callable=AsyncMock, return_value=Hero(name="a", power="b")):
+        for _ in range(3):
+            await cached_completion(
+                model="gpt-4o", response_model=Hero, messages=_messages()
+            )
+
+    count = (
+        await db_session.execute(
+            select(func.count()).select_from(LLMResponseCacheEntry)
+        )
+    ).scalar_one()
+    assert count == 3
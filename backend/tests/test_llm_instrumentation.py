@@ -0,0 +1,170 @@
+"""
+LLM and fal call instrumentation (core.infrastructure.intelligence.instrumentation).
+
+Test invariants:
+  1. Prompt, cached and completion tokens from instructor responses are counted
+     per model and enclosing prompt_site, or "other" outside one.
+  2. Every SDK request is timed (time to first byte, total) and counted by
+     status under its request model and site, and /metrics exposes the series.
+  3. fal calls record semaphore wait, every reported queue position, time
+     until processing starts and total time, and add fal_queue and fal_run to
+     the caller's PhaseTimings.
+"""
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import pytest
+from fal_client.client import Completed, InProgress, Queued, Status
+from httpx import AsyncClient
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+from core.config import settings
+from core.infrastructure.intelligence import instructor_client, prompt_site
+from core.infrastructure.intelligence import instrumentation as inst
+from core.infrastructure.intelligence.governor import governed_http_client
+from core.infrastructure.intelligence.media_generator import (
+    ConcurrentMediaGenerator,
+    nano_banana,
+)
+from core.infrastructure.phase_timings import PhaseTimings
+
+COMPLETION: dict[str, Any] = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-2024-08-06",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": json.dumps({"name": "E"})},
+        }
+    ],
+}
+
+
+def _completion(prompt_tokens: int, cached_tokens: int) -> ChatCompletion:
+    return ChatCompletion.model_validate(
+        {
+            **COMPLETION,
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": 5,
+                "total_tokens": prompt_tokens + 5,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            },
+        }
+    )
+
+
+def test_usage_is_counted_per_model_and_site() -> None:
+    model = COMPLETION["model"]
+    counters = (inst.PROMPT_TOKENS, inst.PROMPT_CACHED_TOKENS, inst.COMPLETION_TOKENS)
+    before = {
+        site: [c.value(model=model, site=site) for c in counters]
+        for site in ("test.site", "other")
+    }
+
+    # What instructor emits for every raw response it receives.
+    with prompt_site("test.site"):
+        instructor_client.hooks.emit_completion_response(_completion(2048, 1536))
+    instructor_client.hooks.emit_completion_response(_completion(1200, 0))
+
+    after = {
+        site: [c.value(model=model, site=site) for c in counters]
+        for site in ("test.site", "other")
+    }
+    assert [a - b for a, b in zip(after["test.site"], before["test.site"])] == [
+        2048,
+        1536,
+        5,
+    ]
+    assert [a - b for a, b in zip(after["other"], before["other"])] == [1200, 0, 5]
+
+
+async def test_sdk_requests_are_timed_per_model_and_site(
+    api_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "metrics_bearer_token", "scrape-secret")
+
+    def handler(request: Any) -> Any:
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json"},
+            stream=httpx.ByteStream(json.dumps(COMPLETION).encode()),
+        )
+
+    client = AsyncOpenAI(
+        api_key="test",
+        http_client=governed_http_client(
+            inst.InstrumentedTransport(httpx.MockTransport(handler))
+        ),
+    )
+    labels = {"model": "gpt-4o-mini", "site": "test.timed"}
+    requests = inst.LLM_REQUESTS.value(status="200", **labels)
+
+    with prompt_site("test.timed"):
+        await client.chat.completions.create(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": "Hi"}]
+        )
+
+    assert inst.LLM_REQUESTS.value(status="200", **labels) - requests == 1
+    assert inst.LLM_TTFT.count(**labels) >= 1
+    assert inst.LLM_REQUEST_SECONDS.count(**labels) >= 1
+    assert inst.LLM_REQUEST_SECONDS.sum(**labels) >= 0
+
+    metrics = await api_client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    )
+    body = metrics.text
+    assert 'llm_request_seconds_count{model="gpt-4o-mini",site="test.timed"}' in body
+    assert 'openai_queue_wait_seconds_count{model="gpt-4o-mini",site="test.timed"}' in (
+        body
+    )
+
+
+class FakeFalClient:
+    async def subscribe(
+        self, model: str, *, arguments: dict, on_queue_update: Any
+    ) -> dict:
+        for status in (Queued(position=7), Queued(position=2)):
+            on_queue_update(status)
+            await asyncio.sleep(0.01)
+        on_queue_update(InProgress(logs=None))
+        on_queue_update(Completed(logs=None, metrics={}))
+        return {"images": [{"url": "https://fal.example/out.png"}]}
+
+
+async def test_fal_calls_record_queue_positions_and_timings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    generator = ConcurrentMediaGenerator()
+    semaphore = asyncio.Semaphore(1)
+    monkeypatch.setattr(
+        generator, "_get_loop_bound_state", lambda: (semaphore, FakeFalClient())
+    )
+    model = nano_banana.generation_model
+    labels = {"model": model, "site": "test.fal"}
+    positions = inst.FAL_QUEUE_POSITION.count(model=model)
+    position_sum = inst.FAL_QUEUE_POSITION.sum(model=model)
+    seen: list[Status] = []
+    timings = PhaseTimings()
+
+    with prompt_site("test.fal"):
+        await generator.subscribe(
+            {"prompt": "A lighthouse"}, seen.append, timings=timings
+        )
+
+    assert len(seen) == 4
+    assert inst.FAL_QUEUE_POSITION.count(model=model) - positions == 2
+    assert inst.FAL_QUEUE_POSITION.sum(model=model) - position_sum == 9
+    assert inst.FAL_QUEUE_WAIT.count(**labels) == 1
+    assert inst.FAL_QUEUED_SECONDS.count(**labels) == 1
+    assert inst.FAL_QUEUED_SECONDS.sum(**labels) >= 0.02
+    assert inst.FAL_REQUEST_SECONDS.count(**labels) == 1
+    assert set(timings.as_dict()) == {"fal_queue", "fal_run", "total"}
+    assert timings.as_dict()["fal_queue"] >= 20
@@ -0,0 +1,52 @@
+"""
+Prompt layout for prefix caching (core.infrastructure.intelligence.prompts).
+
+Test invariants:
+  1. layered_messages orders system text, then context, then instruction.
+  2. Call sites put the story ahead of anything that varies per call, so two
+     calls about the same story share every message but the last.
+"""
+
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.infrastructure.intelligence import layered_messages
+from core.story_engine.service import CharacterService, PanelService
+from core.story_engine.service.story_service import StoryEditPlanner, StoryService
+
+STORY = "The lighthouse stood alone.\n\nElias climbed the stairs."
+
+
+def test_layered_messages_order_stable_parts_first() -> None:
+    assert layered_messages(system="S", context="C", instruction="I") == [
+        {"role": "system", "content": "S"},
+        {"role": "user", "content": "C"},
+        {"role": "user", "content": "I"},
+    ]
+    assert layered_messages(system="S", instruction="I") == [
+        {"role": "system", "content": "S"},
+        {"role": "user", "content": "I"},
+    ]
+
+
+def test_call_sites_share_a_prefix_across_instructions() -> None:
+    characters = CharacterService(AsyncSession())
+    panels = PanelService(AsyncSession())
+    planner = StoryEditPlanner()
+    builds: list[Any] = [
+        lambda i: characters._character_refinement_messages(STORY, {"name": "E"}, i),
+        lambda i: planner.messages(STORY, i),
+        lambda i: panels._single_panel_messages(STORY, len(i), ["elias"]),
+    ]
+
+    for build in builds:
+        first, second = build("Make it darker"), build("Add a storm")
+        assert first[:-1] == second[:-1]
+        assert first[-1] != second[-1]
+        assert "Elias climbed the stairs." in str(first[-2]["content"])
+
+    refinement = StoryService(AsyncSession())._build_refinement_prompt(
+        STORY, "Add a storm"
+    )
+    assert refinement.index("Elias climbed") < refinement.index("Add a storm")
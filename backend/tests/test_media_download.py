@@ -0,0 +1,159 @@
+"""
+Downloads of fal result images (core.infrastructure.intelligence.media_download).
+
+Test invariants:
+  1. Fetches on one loop share one pooled client; each returns the body and
+     the Content-Type's media type, and reports latency, bytes and the
+     download phase of the caller's PhaseTimings.
+  2. Connection errors, timeouts and 429/5xx are retried after a jittered,
+     growing backoff, up to FAL_DOWNLOAD_MAX_ATTEMPTS attempts in all; other
+     4xx fail on the first attempt.
+  3. A body over FAL_DOWNLOAD_MAX_BYTES, declared or streamed, raises
+     GeneratedImageTooLargeError and is not retried.
+"""
+
+from collections.abc import AsyncIterator, Callable
+
+import httpx
+import pytest
+
+from core.config import settings
+from core.infrastructure.intelligence import instrumentation as inst
+from core.infrastructure.intelligence import prompt_site
+from core.infrastructure.intelligence.media_download import (
+    GeneratedImageDownloader,
+    GeneratedImageTooLargeError,
+)
+from core.infrastructure.phase_timings import PhaseTimings
+
+URL = "https://v3.fal.media/files/out.png"
+SITE = {"site": "test.download"}
+
+
+class Backoff:
+    def __init__(self) -> None:
+        self.delays: list[float] = []
+
+    async def __call__(self, delay: float) -> None:
+        self.delays.append(delay)
+
+
+def _downloader(
+    handler: Callable[[httpx.Request], httpx.Response],
+) -> tuple[GeneratedImageDownloader, Backoff, list[httpx.Request]]:
+    requests: list[httpx.Request] = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+
+    backoff = Backoff()
+    return (
+        GeneratedImageDownloader(transport=httpx.MockTransport(record), sleep=backoff),
+        backoff,
+        requests,
+    )
+
+
+async def test_fetches_share_a_client_and_report_metrics() -> None:
+    downloader, _, requests = _downloader(
+        lambda _: httpx.Response(
+            200, content=b"x" * 2048, headers={"content-type": "image/png; q=1"}
+        )
+    )
+    downloads = inst.FAL_DOWNLOAD_SECONDS.count(**SITE)
+    downloaded_bytes = inst.FAL_DOWNLOAD_BYTES.sum(**SITE)
+    timings = PhaseTimings()
+
+    with prompt_site("test.download"):
+        first = await downloader.fetch(URL, timings)
+        client = downloader._get_loop_bound_client()
+        second = await downloader.fetch(URL)
+
+    assert first.content == b"x" * 2048
+    assert first.media_type == "image/png"
+    assert second == first
+    assert downloader._get_loop_bound_client() is client
+    assert len(requests) == 2
+    assert inst.FAL_DOWNLOAD_SECONDS.count(**SITE) == downloads + 2
+    assert inst.FAL_DOWNLOAD_BYTES.sum(**SITE) == downloaded_bytes + 4096
+    assert "download" in timings.as_dict()
+    await downloader.aclose()
+
+
+async def test_transient_failures_are_retried_with_backoff(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "fal_download_max_attempts", 3)
+    outcomes: list[httpx.Response | Exception] = [
+        httpx.Response(503),
+        httpx.ConnectError("reset"),
+        httpx.Response(200, content=b"image"),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    downloader, backoff, requests = _downloader(handler)
+    retried_503 = inst.FAL_DOWNLOAD_RETRIES.value(reason="503", **SITE)
+    retried_connect = inst.FAL_DOWNLOAD_RETRIES.value(reason="ConnectError", **SITE)
+
+    with prompt_site("test.download"):
+        image = await downloader.fetch(URL)
+
+    assert image.content == b"image"
+    assert image.media_type == ""
+    assert len(requests) == 3
+    assert 0 <= backoff.delays[0] <= 0.25
+    assert 0 <= backoff.delays[1] <= 0.5
+    assert len(backoff.delays) == 2
+    assert inst.FAL_DOWNLOAD_RETRIES.value(reason="503", **SITE) == retried_503 + 1
+    assert (
+        inst.FAL_DOWNLOAD_RETRIES.value(reason="ConnectError", **SITE)
+        == retried_connect + 1
+    )
+
+
+async def test_gives_up_after_max_attempts_and_on_client_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "fal_download_max_attempts", 2)
+    overloaded, _, overloaded_requests = _downloader(lambda _: httpx.Response(429))
+    missing, missing_backoff, missing_requests = _downloader(
+        lambda _: httpx.Response(404)
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await overloaded.fetch(URL)
+    with pytest.raises(httpx.HTTPStatusError):
+        await missing.fetch(URL)
+
+    assert len(overloaded_requests) == 2
+    assert len(missing_requests) == 1
+    assert missing_backoff.delays == []
+
+
+async def test_oversized_bodies_are_refused(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "fal_download_max_bytes", 1024)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for _ in range(4):
+            yield b"x" * 512
+
+    declared, _, declared_requests = _downloader(
+        lambda _: httpx.Response(200, headers={"content-length": "4096"}, content=b"")
+    )
+    streamed, _, streamed_requests = _downloader(
+        lambda _: httpx.Response(200, content=chunks())
+    )
+
+    with pytest.raises(GeneratedImageTooLargeError):
+        await declared.fetch(URL)
+    with pytest.raises(GeneratedImageTooLargeError):
+        await streamed.fetch(URL)
+
+    assert len(declared_requests) == 1
+    assert len(streamed_requests) == 1
@@ -0,0 +1,125 @@
+"""
+OpenAI concurrency governor (core.infrastructure.intelligence.governor).
+
+Test invariants:
+  1. A model never has more than its concurrency cap in flight, and a full
+     lane does not hold up requests for another model.
+  2. A 429 halves the model's limit and pauses new requests for retry-after.
+  3. Requests wait for the token bucket to refill once a minute's budget is
+     spent.
+  4. Every SDK request goes through the governor and gives its permit back
+     once the response is read, including retried 429s.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from core.config import settings
+from core.infrastructure.intelligence import governor
+from core.infrastructure.intelligence.governor import OpenAIGovernor
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "Hello"},
+        }
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "openai_concurrency", {"capped": 2})
+    monkeypatch.setattr(settings, "openai_tokens_per_minute", {"metered": 6000})
+
+
+async def test_concurrency_is_capped_per_model() -> None:
+    gov = OpenAIGovernor()
+    active = peak = 0
+
+    async def call() -> None:
+        nonlocal active, peak
+        permit = await gov.acquire("capped", 0)
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        permit.release()
+
+    calls = asyncio.gather(*(call() for _ in range(6)))
+    await asyncio.sleep(0.005)
+    other = await asyncio.wait_for(gov.acquire("other-model", 0), timeout=0.01)
+    other.release()
+    await calls
+
+    assert peak == 2
+
+
+async def test_rate_limit_halves_limit_and_pauses() -> None:
+    gov = OpenAIGovernor()
+    gov.observe("capped", 429, {"retry-after-ms": "50"})
+
+    started = time.monotonic()
+    permit = await gov.acquire("capped", 0)
+    waited = time.monotonic() - started
+    permit.release()
+
+    assert waited >= 0.04
+    assert governor.CONCURRENCY_LIMIT.value(model="capped") == 1.0
+    # Repeated 429s within a second count as one congestion signal.
+    gov.observe("capped", 429, {})
+    assert governor.CONCURRENCY_LIMIT.value(model="capped") == 1.0
+
+
+async def test_token_bucket_delays_requests() -> None:
+    gov = OpenAIGovernor()
+    (await gov.acquire("metered", 6000)).release()
+
+    started = time.monotonic()
+    (await gov.acquire("metered", 5)).release()
+
+    # 6000 tokens per minute refill 100 per second.
+    assert time.monotonic() - started >= 0.04
+
+
+async def test_sdk_requests_take_and_return_permits() -> None:
+    attempts: list[str] = []
+
+    def handler(request: Any) -> Any:
+        attempts.append(json.loads(request.content)["model"])
+        if len(attempts) == 1:
+            return httpx.Response(429, headers={"retry-after-ms": "10"})
+        # Unread, like a real network response.
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json"},
+            stream=httpx.ByteStream(json.dumps(COMPLETION).encode()),
+        )
+
+    client = AsyncOpenAI(
+        api_key="test",
+        max_retries=1,
+        http_client=governor.governed_http_client(httpx.MockTransport(handler)),
+    )
+    rate_limited = governor.RATE_LIMITED.value(model="gpt-4o")
+
+    completion = await client.chat.completions.create(
+        model="gpt-4o", messages=[{"role": "user", "content": "Hi"}]
+    )
+
+    assert completion.choices[0].message.content == "Hello"
+    assert attempts == ["gpt-4o", "gpt-4o"]
+    assert governor.RATE_LIMITED.value(model="gpt-4o") - rate_limited == 1
+    assert governor.IN_FLIGHT.value(model="gpt-4o") == 0
@@ -0,0 +1,176 @@
+"""
+Connection-pool settings and metrics (core.infrastructure.pool_metrics) and the
+in-process registry behind GET /metrics.
+
+Test invariants:
+  1. Engines pick up the DATABASE_POOL_* settings.
+  2. Checkouts feed the wait histogram, the connection-age histogram and the
+     checked-out / overflow gauges.
+  3. A checkout slower than the warning threshold logs a warning; one that
+     exhausts pool_timeout also counts as a timeout.
+  4. The registry renders valid Prometheus text with cumulative buckets.
+  5. GET /metrics serves the pool metrics to a caller presenting
+     METRICS_BEARER_TOKEN; it is 401 without the token and 404 while unset.
+"""
+
+import asyncio
+import uuid
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from loguru import logger
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import settings
+from core.infrastructure.database import _create_engine
+from core.infrastructure.metrics import MetricsRegistry
+from core.infrastructure.pool_metrics import (
+    CHECKED_OUT,
+    CHECKOUT_TIMEOUTS,
+    CHECKOUT_WAIT,
+    CONNECTION_AGE,
+    CONNECTIONS_OPENED,
+    OVERFLOW,
+)
+
+
+@pytest.fixture
+def pool_name() -> str:
+    return f"test-{uuid.uuid4().hex[:8]}"
+
+
+@pytest_asyncio.fixture
+async def small_engine(
+    monkeypatch: pytest.MonkeyPatch, pool_name: str
+) -> AsyncGenerator[AsyncEngine, None]:
+    """One connection, no overflow, a short timeout and a low warning threshold."""
+    monkeypatch.setattr(settings, "database_pool_size", 1)
+    monkeypatch.setattr(settings, "database_max_overflow", 0)
+    monkeypatch.setattr(settings, "database_pool_timeout", 0.3)
+    monkeypatch.setattr(settings, "database_pool_checkout_warning_seconds", 0.05)
+    engine = _create_engine(settings.database_url, pool_name)
+    yield engine
+    await engine.dispose()
+
+
+async def test_engine_uses_pool_settings(small_engine: AsyncEngine) -> None:
+    pool = small_engine.sync_engine.pool
+    assert pool.size() == 1  # type: ignore[attr-defined]
+    assert pool._max_overflow == 0  # type: ignore[attr-defined]
+    assert pool._timeout == 0.3  # type: ignore[attr-defined]
+    assert pool._recycle == settings.database_pool_recycle
+    assert pool._pre_ping is settings.database_pool_pre_ping
+
+
+async def test_checkout_records_wait_age_and_gauges(
+    small_engine: AsyncEngine, pool_name: str
+) -> None:
+    async with small_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert CHECKED_OUT.value(pool=pool_name) == 1
+        assert OVERFLOW.value(pool=pool_name) == 0
+    assert CHECKED_OUT.value(pool=pool_name) == 0
+
+    async with small_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert CHECKOUT_WAIT.count(pool=pool_name) == 2
+    assert CONNECTION_AGE.count(pool=pool_name) == 2
+    assert CONNECTIONS_OPENED.value(pool=pool_name) == 1
+
+
+async def test_saturated_pool_warns_and_counts_timeouts(
+    small_engine: AsyncEngine, pool_name: str
+) -> None:
+    warnings: list[str] = []
+    sink_id = logger.add(lambda m: warnings.append(m), level="WARNING")
+    try:
+        async with small_engine.connect() as held:
+            await held.execute(text("SELECT 1"))
+
+            # Released after 0.15s: waits past the 0.05s threshold, then succeeds.
+            async def release_soon() -> None:
+                await asyncio.sleep(0.15)
+                await held.close()
+
+            release = asyncio.create_task(release_soon())
+            async with small_engine.connect() as waiter:
+                await waiter.execute(text("SELECT 1"))
+            await release
+
+        assert any("Slow database pool checkout" in w for w in warnings)
+        assert CHECKOUT_TIMEOUTS.value(pool=pool_name) == 0
+
+        async with small_engine.connect() as held:
+            await held.execute(text("SELECT 1"))
+            with pytest.raises(exc.TimeoutError):
+                async with small_engine.connect():
+                    pass
+        assert CHECKOUT_TIMEOUTS.value(pool=pool_name) == 1
+    finally:
+        logger.remove(sink_id)
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs run.", ("queue",))
+    counter.inc(queue='say "hi"')
+    histogram = registry.histogram(
+        "job_seconds", "Job time.", ("queue",), buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, queue="a")
+
+    assert registry.counter("jobs_total", "Jobs run.", ("queue",)) is counter
+    with pytest.raises(ValueError):
+        registry.gauge("jobs_total", "Not a gauge.")
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
+
+    rendered = registry.render()
+    assert "# TYPE jobs_total counter" in rendered
+    assert 'jobs_total{queue="say \\"hi\\""} 1' in rendered
+    assert 'job_seconds_bucket{queue="a",le="0.1"} 1' in rendered
+    assert 'job_seconds_bucket{queue="a",le="1"} 2' in rendered
+    assert 'job_seconds_bucket{queue="a",le="+Inf"} 3' in rendered
+    assert 'job_seconds_count{queue="a"} 3' in rendered
+    assert 'job_seconds_sum{queue="a"} 5.55' in rendered
+
+
+async def test_metrics_endpoint_serves_pool_metrics(
+    api_client: AsyncClient,
+    small_engine: AsyncEngine,
+    pool_name: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "metrics_bearer_token", "scrape-secret")
+    async with small_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    response = await api_client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in response.text
+    assert f'db_pool_checkout_wait_seconds_count{{pool="{pool_name}"}} 1' in (
+        response.text
+    )
+    assert f'db_pool_checked_out{{pool="{pool_name}"}} 0' in response.text
+
+
+async def test_metrics_endpoint_requires_the_token(
+    api_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "metrics_bearer_token", "")
+    assert (await api_client.get("/metrics")).status_code == 404
+
+    monkeypatch.setattr(settings, "metrics_bearer_token", "scrape-secret")
+    missing = await api_client.get("/metrics")
+    wrong = await api_client.get("/metrics", headers={"Authorization": "Bearer guess"})
+    assert missing.status_code == 401
+    assert wrong.status_code == 401
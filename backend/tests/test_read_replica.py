@@ -0,0 +1,157 @@
+"""
+Read-replica routing: get_async_read_session and ReadYourWritesMiddleware.
+
+The "replica" here is DATABASE_URL itself — pointing both URLs at one database
+is the supported local setup. Read sessions are opened read-only, which is how
+these tests tell the two session factories apart.
+
+Test invariants:
+  1. Without DATABASE_REPLICA_URL, read sessions come from the primary factory.
+  2. With a replica configured, read sessions use read-only connections.
+  3. A live primary-pin cookie routes reads back to the primary.
+  4. Write requests set the pin cookie; reads do not; no replica → no cookie.
+  5. Read-only GET routes work end to end against the replica.
+"""
+
+import time
+import uuid
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import aclosing
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from core.auth.models.user import User
+from core.config import settings
+from core.infrastructure.database import (
+    PRIMARY_PIN_COOKIE_NAME,
+    get_async_read_session,
+    get_async_read_session_maker,
+)
+from tests.auth_helpers import auth_cookie_header
+
+
+def _request(cookies: dict[str, str] | None = None) -> Request:
+    cookie_header = "; ".join(f"{k}={v}" for k, v in (cookies or {}).items())
+    scope: dict[str, Any] = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"cookie", cookie_header.encode())] if cookie_header else [],
+    }
+    return Request(scope)
+
+
+async def _read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async for session in get_async_read_session(request):
+        yield session
+
+
+async def _is_read_only(request: Request) -> bool:
+    # aclosing: returning mid-iteration must close the session now, not
+    # whenever the abandoned generator is garbage collected.
+    async with aclosing(_read_session(request)) as sessions:
+        async for session in sessions:
+            result = await session.execute(text("SHOW transaction_read_only"))
+            return bool(result.scalar_one() == "on")
+    raise AssertionError("read session dependency yielded nothing")
+
+
+@pytest.fixture
+def no_replica(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(settings, "database_replica_url", None)
+    get_async_read_session_maker.cache_clear()
+    yield
+    get_async_read_session_maker.cache_clear()
+
+
+@pytest_asyncio.fixture
+async def replica(monkeypatch: pytest.MonkeyPatch) -> AsyncGenerator[None, None]:
+    monkeypatch.setattr(settings, "database_replica_url", settings.database_url)
+    get_async_read_session_maker.cache_clear()
+    yield
+    read_session_maker = get_async_read_session_maker()
+    if read_session_maker is not None:
+        await read_session_maker.kw["bind"].dispose()
+    get_async_read_session_maker.cache_clear()
+
+
+async def test_read_session_uses_primary_without_replica(no_replica: None) -> None:
+    assert get_async_read_session_maker() is None
+    assert await _is_read_only(_request()) is False
+
+
+async def test_read_session_uses_read_only_replica(replica: None) -> None:
+    assert await _is_read_only(_request()) is True
+
+    async for session in _read_session(_request()):
+        with pytest.raises(DBAPIError, match="read-only transaction"):
+            await session.execute(text("CREATE TEMP TABLE should_fail (id int)"))
+
+
+async def test_primary_pin_cookie_routes_reads_to_primary(replica: None) -> None:
+    live = {PRIMARY_PIN_COOKIE_NAME: f"{time.time() + 60:.3f}"}
+    expired = {PRIMARY_PIN_COOKIE_NAME: f"{time.time() - 60:.3f}"}
+    garbage = {PRIMARY_PIN_COOKIE_NAME: "soon"}
+
+    assert await _is_read_only(_request(live)) is False
+    assert await _is_read_only(_request(expired)) is True
+    assert await _is_read_only(_request(garbage)) is True
+
+
+async def test_writes_set_pin_cookie_and_reads_do_not(
+    replica: None, api_client: AsyncClient, user: User
+) -> None:
+    response = await api_client.post(
+        "/api/comic-builder/v2/projects",
+        json={"name": "Replica test"},
+        headers=auth_cookie_header(user.id),
+    )
+    assert response.status_code < 400
+    assert PRIMARY_PIN_COOKIE_NAME in response.cookies
+    pinned_until = float(response.cookies[PRIMARY_PIN_COOKIE_NAME])
+    assert (
+        time.time()
+        < pinned_until
+        <= time.time() + settings.database_replica_pin_seconds
+    )
+
+    response = await api_client.get(
+        "/api/comic-builder/v2/projects", headers=auth_cookie_header(user.id)
+    )
+    assert response.status_code == 200
+    assert PRIMARY_PIN_COOKIE_NAME not in response.cookies
+
+
+async def test_no_pin_cookie_without_replica(
+    no_replica: None, api_client: AsyncClient, user: User
+) -> None:
+    response = await api_client.post(
+        "/api/comic-builder/v2/projects",
+        json={"name": "Primary only"},
+        headers=auth_cookie_header(user.id),
+    )
+    assert response.status_code < 400
+    assert PRIMARY_PIN_COOKIE_NAME not in response.cookies
+
+
+async def test_read_routes_serve_from_replica(
+    replica: None, api_client: AsyncClient, user: User
+) -> None:
+    """GET routes on read sessions work against a read-only connection."""
+    response = await api_client.get(
+        "/api/comic-builder/v2/projects", headers=auth_cookie_header(user.id)
+    )
+    assert response.status_code == 200
+
+    response = await api_client.get(
+        f"/api/comic-builder/v2/projects/{uuid.uuid4()}",
+        headers=auth_cookie_header(user.id),
+    )
+    assert response.status_code == 404